@@ -30,7 +30,8 @@ CREATE TABLE projet.evenement (
     created_by            INT NOT NULL REFERENCES projet.utilisateur(id_utilisateur) ON DELETE SET NULL,
     created_at            TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     tarif                 NUMERIC(10,2) CHECK (tarif >= 0),
-    statut                TEXT
+    statut                TEXT,
+    nb_inscrits           INT NOT NULL DEFAULT 0 CHECK (nb_inscrits >= 0)
 );
 
 
@@ -44,6 +45,7 @@ CREATE TABLE projet.bus (
     description     TEXT,
     capacite_max    INT NOT NULL,
     heure_depart    TIME,
+    nb_inscrits     INT NOT NULL DEFAULT 0 CHECK (nb_inscrits >= 0),
     FOREIGN KEY (id_event)
         REFERENCES projet.evenement(id_event)
         ON DELETE CASCADE
@@ -61,6 +63,63 @@ CREATE TABLE projet.inscription (
     id_bus_aller     INT,
     id_bus_retour    INT,
     created_at       TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (created_by)
+        REFERENCES projet.utilisateur(id_utilisateur)
+        ON DELETE CASCADE,
+    FOREIGN KEY (id_event)
+        REFERENCES projet.evenement(id_event)
+        ON DELETE CASCADE,
+    FOREIGN KEY (id_bus_aller)
+        REFERENCES projet.bus(id_bus)
+        ON DELETE SET NULL,
+    FOREIGN KEY (id_bus_retour)
+        REFERENCES projet.bus(id_bus)
+        ON DELETE SET NULL,
+    -- Une seule inscription par utilisateur et par événement, même sous concurrence
+    CONSTRAINT inscription_utilisateur_evenement UNIQUE (created_by, id_event)
+);
+
+-- ==============================
+--  Compteurs d'inscrits (evenement.nb_inscrits, bus.nb_inscrits)
+--  Tenus à jour par trigger : les contrôles de capacité lisent une seule ligne.
+--  Vérification / correction : python src/main.py counters check [--fix]
+-- ==============================
+CREATE FUNCTION projet.maj_nb_inscrits() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE projet.evenement SET nb_inscrits = nb_inscrits - 1
+        WHERE id_event = OLD.id_event;
+        UPDATE projet.bus SET nb_inscrits = nb_inscrits - 1
+        WHERE id_bus IN (OLD.id_bus_aller, OLD.id_bus_retour);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE projet.evenement SET nb_inscrits = nb_inscrits + 1
+        WHERE id_event = NEW.id_event;
+        UPDATE projet.bus SET nb_inscrits = nb_inscrits + 1
+        WHERE id_bus IN (NEW.id_bus_aller, NEW.id_bus_retour);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER inscription_nb_inscrits
+    AFTER INSERT OR DELETE OR UPDATE OF id_event, id_bus_aller, id_bus_retour
+    ON projet.inscription
+    FOR EACH ROW EXECUTE FUNCTION projet.maj_nb_inscrits();
+
+-- ==============================
+--  Table liste_attente
+-- ==============================
+CREATE TABLE projet.liste_attente (
+    id_attente       SERIAL PRIMARY KEY,
+    id_event         INT NOT NULL,
+    created_by       INT NOT NULL,
+    boit             BOOLEAN NOT NULL,
+    mode_paiement    VARCHAR(50) NOT NULL,
+    id_bus_aller     INT,
+    id_bus_retour    INT,
+    created_at       TIMESTAMP DEFAULT clock_timestamp(),
+    UNIQUE (id_event, created_by),
     FOREIGN KEY (created_by)
         REFERENCES projet.utilisateur(id_utilisateur)
         ON DELETE CASCADE,
@@ -74,3 +133,72 @@ CREATE TABLE projet.inscription (
         REFERENCES projet.bus(id_bus)
         ON DELETE SET NULL
 );
+
+-- Ordre FIFO des promotions
+CREATE INDEX liste_attente_fifo_idx ON projet.liste_attente (id_event, created_at, id_attente);
+
+-- ==============================
+--  Journal des rappels envoyés
+--  Une ligne par inscription et par type de rappel : un rappel n'est jamais
+--  envoyé deux fois, même si le job est relancé (voir service/rappel_service.py).
+-- ==============================
+CREATE TABLE projet.rappel_envoye (
+    code_reservation INT NOT NULL
+        REFERENCES projet.inscription(code_reservation)
+        ON DELETE CASCADE,
+    type_rappel      VARCHAR(20) NOT NULL,
+    envoye_le        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (code_reservation, type_rappel)
+);
+
+-- Inscriptions d'une date : parcours des rappels sans lecture complète de la table
+CREATE INDEX inscription_evenement_idx ON projet.inscription (id_event, code_reservation);
+CREATE INDEX evenement_date_idx ON projet.evenement (date_event);
+
+-- ==============================
+--  Code de réservation (8 chiffres, unique)
+--  Utilisé pour les inscriptions créées en base (promotions de la liste d'attente)
+-- ==============================
+CREATE FUNCTION projet.nouveau_code_reservation() RETURNS INT AS $$
+DECLARE
+    code INT;
+BEGIN
+    LOOP
+        code := 10000000 + floor(random() * 90000000)::INT;
+        EXIT WHEN NOT EXISTS (
+            SELECT 1 FROM projet.inscription WHERE code_reservation = code
+        );
+    END LOOP;
+    RETURN code;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ==============================
+--  Catalogue des événements ouverts (modèle de lecture)
+--  Une ligne par événement en cours, avec les places restantes de l'événement
+--  et des bus par sens. Rafraîchi (CONCURRENTLY) par les services après
+--  chaque écriture qui le modifie (voir service/catalogue_service.py).
+-- ==============================
+CREATE MATERIALIZED VIEW projet.catalogue_evenement AS
+SELECT e.id_event,
+    e.titre,
+    e.lieu,
+    e.date_event,
+    e.tarif,
+    e.capacite_max,
+    e.capacite_max - e.nb_inscrits AS places_restantes,
+    COUNT(b.id_bus) FILTER (WHERE b.sens = 'ALLER') AS nb_bus_aller,
+    COALESCE(SUM(b.capacite_max - b.nb_inscrits) FILTER (WHERE b.sens = 'ALLER'), 0)
+        AS places_bus_aller,
+    COUNT(b.id_bus) FILTER (WHERE b.sens = 'RETOUR') AS nb_bus_retour,
+    COALESCE(SUM(b.capacite_max - b.nb_inscrits) FILTER (WHERE b.sens = 'RETOUR'), 0)
+        AS places_bus_retour
+FROM projet.evenement e
+LEFT JOIN projet.bus b ON b.id_event = e.id_event
+WHERE e.statut = 'en_cours'
+GROUP BY e.id_event;
+
+-- Index unique requis par REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX catalogue_evenement_id_idx ON projet.catalogue_evenement (id_event);
+-- Parcours du catalogue dans l'ordre d'affichage
+CREATE INDEX catalogue_evenement_date_idx ON projet.catalogue_evenement (date_event, id_event);
@@ -0,0 +1,502 @@
+"""
+API HTTP JSON asynchrone (asyncio, bibliothèque standard uniquement).
+
+Expose les services existants pour qu'un seul processus serve toute une promotion :
+
+    POST   /connexion                  {"email", "mot_de_passe"} -> {"token", "utilisateur"}
+    GET    /catalogue                  événements ouverts, places et bus par sens
+    GET    /evenements?statut=en_cours liste des événements
+    GET    /evenements/{id}            détail d'un événement
+    GET    /evenements/{id}/bus        bus d'un événement
+    GET    /inscriptions               inscriptions de l'utilisateur connecté
+    POST   /inscriptions               {"id_event", "id_bus_aller", "id_bus_retour",
+                                        "boit", "mode_paiement"}
+    POST   /inscriptions/groupe        {"id_event", "id_bus_aller", "id_bus_retour",
+                                        "membres": [{"email", "boit", "mode_paiement"}]}
+                                       (l'utilisateur connecté est inclus sauf "inclure_moi": false)
+    POST   /inscriptions/multiples     {"choix": [{"id_event", "id_bus_aller", "id_bus_retour"}],
+                                        "boit", "mode_paiement", "tout_ou_rien"}
+    POST   /inscriptions/{code}/transfert {"email"} : cède la réservation à un autre utilisateur
+    DELETE /inscriptions/{code}        annulation d'une inscription
+
+Les routes /inscriptions demandent l'en-tête "Authorization: Bearer <token>".
+Les appels DAO (bloquants, psycopg2) et Argon2 (coûteux en CPU) sont exécutés dans
+deux pools de threads distincts pour ne jamais bloquer la boucle d'événements.
+Le nombre de requêtes traitées simultanément est borné ; au-delà d'une file
+d'attente maximale, le serveur répond 503 avec un en-tête Retry-After.
+
+Lancement :
+    python src/api/serveur.py --port 8080
+"""
+import argparse
+import asyncio
+import functools
+import json
+import re
+import secrets
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+# Permet le lancement direct du script (python src/api/serveur.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.traces import propager, span  # noqa: E402
+
+TAILLE_MAX_CORPS = 1024 * 1024
+DUREE_SESSION = 8 * 3600
+# Période minimale entre deux purges des sessions expirées (faites à la connexion)
+PERIODE_PURGE_SESSIONS = 300
+
+
+class ErreurHTTP(Exception):
+    """Erreur renvoyée au client avec un code HTTP et un message."""
+
+    def __init__(self, statut: int, message: str):
+        super().__init__(message)
+        self.statut = statut
+        self.message = message
+
+
+class RequeteHTTP:
+    """Requête HTTP analysée."""
+
+    def __init__(self, methode: str, cible: str, entetes: dict, corps: bytes):
+        url = urlsplit(cible)
+        self.methode = methode
+        self.chemin = url.path.rstrip("/") or "/"
+        self.query = dict(parse_qsl(url.query))
+        self.entetes = entetes
+        self.corps = corps
+
+    def json(self) -> dict:
+        """Décode le corps JSON de la requête."""
+        try:
+            donnees = json.loads(self.corps or b"{}")
+        except ValueError:
+            raise ErreurHTTP(400, "Corps JSON invalide")
+        if not isinstance(donnees, dict):
+            raise ErreurHTTP(400, "Un objet JSON est attendu")
+        return donnees
+
+
+class ServeurAPI:
+    """
+    Serveur HTTP/1.1 minimal (keep-alive, JSON) adossé aux services métier.
+    """
+
+    def __init__(
+        self,
+        services: dict,
+        max_concurrence: int = 64,
+        max_attente: int = 1024,
+        workers_dao: int = 16,
+        workers_hachage: int = 4,
+    ):
+        """
+        services: dict avec les clés "utilisateur", "evenement", "inscription", "bus"
+                  (et "catalogue", optionnelle)
+        max_concurrence: nombre de requêtes traitées en même temps
+        max_attente: nombre de requêtes en attente au-delà duquel on répond 503
+        workers_dao: taille du pool de threads pour les appels DAO
+        workers_hachage: taille du pool de threads pour Argon2 (connexion)
+        """
+        self.services = services
+        self.max_concurrence = max_concurrence
+        self.max_attente = max_attente
+        self._semaphore = None
+        self._en_attente = 0
+        self._executor_dao = ThreadPoolExecutor(workers_dao, thread_name_prefix="api-dao")
+        self._executor_hachage = ThreadPoolExecutor(workers_hachage, thread_name_prefix="api-argon2")
+        self._sessions = {}  # token -> (id_utilisateur, expiration)
+        self._prochaine_purge = 0.0
+        self._routes = [
+            ("POST", re.compile(r"^/connexion$"), self.connexion),
+            ("GET", re.compile(r"^/catalogue$"), self.lister_catalogue),
+            ("GET", re.compile(r"^/evenements$"), self.lister_evenements),
+            ("GET", re.compile(r"^/evenements/(\d+)$"), self.detail_evenement),
+            ("GET", re.compile(r"^/evenements/(\d+)/bus$"), self.bus_evenement),
+            ("GET", re.compile(r"^/inscriptions$"), self.mes_inscriptions),
+            ("POST", re.compile(r"^/inscriptions$"), self.creer_inscription),
+            ("POST", re.compile(r"^/inscriptions/groupe$"), self.inscrire_groupe),
+            ("POST", re.compile(r"^/inscriptions/multiples$"), self.inscrire_plusieurs_evenements),
+            ("POST", re.compile(r"^/inscriptions/(\d+)/transfert$"), self.transferer_inscription),
+            ("DELETE", re.compile(r"^/inscriptions/(\d+)$"), self.supprimer_inscription),
+        ]
+
+    # ------------------------------------------------------------------
+    # Exécution des appels bloquants
+    # ------------------------------------------------------------------
+    async def _dao(self, fonction, *args, **kwargs):
+        """Exécute un appel service/DAO bloquant dans le pool dédié."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor_dao, propager(functools.partial(fonction, *args, **kwargs))
+        )
+
+    async def _hachage(self, fonction, *args, **kwargs):
+        """Exécute un appel coûteux en Argon2 dans le pool dédié."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor_hachage, propager(functools.partial(fonction, *args, **kwargs))
+        )
+
+    def _utilisateur_connecte(self, requete: RequeteHTTP) -> int:
+        """Retourne l'id de l'utilisateur authentifié par le token Bearer."""
+        autorisation = requete.entetes.get("authorization", "")
+        token = autorisation[7:] if autorisation.lower().startswith("bearer ") else ""
+        session = self._sessions.get(token)
+        if session is None or session[1] < time.monotonic():
+            self._sessions.pop(token, None)
+            raise ErreurHTTP(401, "Authentification requise")
+        return session[0]
+
+    def _purger_sessions(self):
+        """
+        Supprime les sessions expirées, au plus une fois par PERIODE_PURGE_SESSIONS :
+        un token jamais représenté ne resterait sinon en mémoire indéfiniment.
+        """
+        maintenant = time.monotonic()
+        if maintenant < self._prochaine_purge:
+            return
+        self._prochaine_purge = maintenant + PERIODE_PURGE_SESSIONS
+        for token in [t for t, (_, expiration) in self._sessions.items() if expiration < maintenant]:
+            del self._sessions[token]
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+    async def connexion(self, requete: RequeteHTTP):
+        donnees = requete.json()
+        utilisateur = await self._hachage(
+            self.services["utilisateur"].authentifier,
+            donnees.get("email", ""),
+            donnees.get("mot_de_passe", ""),
+        )
+        if not utilisateur:
+            raise ErreurHTTP(401, "Email ou mot de passe incorrect")
+        self._purger_sessions()
+        token = secrets.token_urlsafe(32)
+        self._sessions[token] = (utilisateur.id_utilisateur, time.monotonic() + DUREE_SESSION)
+        profil = utilisateur.to_dict()
+        profil.pop("mot_de_passe", None)
+        return 200, {"token": token, "utilisateur": profil}
+
+    async def lister_catalogue(self, requete: RequeteHTTP):
+        if "catalogue" not in self.services:
+            raise ErreurHTTP(404, "Catalogue non disponible")
+        evenements = await self._dao(self.services["catalogue"].lister_catalogue)
+        return 200, [evt.to_dict() for evt in evenements]
+
+    async def lister_evenements(self, requete: RequeteHTTP):
+        statut = requete.query.get("statut")
+        if statut:
+            evenements = await self._dao(
+                self.services["evenement"].get_evenement_by, "statut", statut
+            )
+        else:
+            evenements = await self._dao(self.services["evenement"].get_tous_les_evenement)
+        return 200, [evt.to_dict() for evt in evenements]
+
+    async def detail_evenement(self, requete: RequeteHTTP, id_event: str):
+        evenements = await self._dao(
+            self.services["evenement"].get_evenement_by, "id_event", int(id_event)
+        )
+        if not evenements:
+            raise ErreurHTTP(404, f"Événement {id_event} introuvable")
+        return 200, evenements[0].to_dict()
+
+    async def bus_evenement(self, requete: RequeteHTTP, id_event: str):
+        bus = await self._dao(self.services["bus"].get_bus_by, "id_event", int(id_event))
+        return 200, [b.to_dict() for b in bus or []]
+
+    async def mes_inscriptions(self, requete: RequeteHTTP):
+        id_utilisateur = self._utilisateur_connecte(requete)
+        inscriptions = await self._dao(
+            self.services["inscription"].get_inscription_by, "created_by", id_utilisateur
+        )
+        return 200, [ins.to_dict() for ins in inscriptions]
+
+    async def creer_inscription(self, requete: RequeteHTTP):
+        id_utilisateur = self._utilisateur_connecte(requete)
+        donnees = requete.json()
+        try:
+            id_event = int(donnees["id_event"])
+            id_bus_aller = int(donnees["id_bus_aller"])
+            id_bus_retour = int(donnees["id_bus_retour"])
+        except (KeyError, TypeError, ValueError):
+            raise ErreurHTTP(400, "id_event, id_bus_aller et id_bus_retour (entiers) sont requis")
+
+        def inscrire():
+            evenements = self.services["evenement"].get_evenement_by("id_event", id_event)
+            if not evenements:
+                raise ErreurHTTP(404, f"Événement {id_event} introuvable")
+            for id_bus, sens in ((id_bus_aller, "ALLER"), (id_bus_retour, "RETOUR")):
+                bus = self.services["bus"].get_bus_by("id_bus", id_bus)
+                if not bus or bus[0].sens != sens or bus[0].id_event != id_event:
+                    raise ErreurHTTP(400, f"Bus {sens.capitalize()} invalide")
+            return self.services["inscription"].creer_inscription(
+                boit=bool(donnees.get("boit", False)),
+                mode_paiement=donnees.get("mode_paiement", ""),
+                id_event=id_event,
+                nom_event=evenements[0].titre,
+                id_bus_aller=id_bus_aller,
+                id_bus_retour=id_bus_retour,
+                created_by=id_utilisateur,
+            )
+
+        inscription = await self._dao(inscrire)
+        if not inscription:
+            raise ErreurHTTP(409, "Inscription refusée (événement complet ou déjà inscrit)")
+        return 201, inscription.to_dict()
+
+    async def inscrire_groupe(self, requete: RequeteHTTP):
+        id_utilisateur = self._utilisateur_connecte(requete)
+        donnees = requete.json()
+        try:
+            id_event = int(donnees["id_event"])
+            id_bus_aller = int(donnees["id_bus_aller"]) if donnees.get("id_bus_aller") else None
+            id_bus_retour = int(donnees["id_bus_retour"]) if donnees.get("id_bus_retour") else None
+            membres = [
+                {"email": str(m["email"]).strip().lower(), "boit": bool(m.get("boit", False)),
+                 "mode_paiement": m.get("mode_paiement", "")}
+                for m in donnees.get("membres", [])
+            ]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ErreurHTTP(400, "id_event (entier) et membres [{\"email\"}] sont requis")
+        if donnees.get("inclure_moi", True):
+            membres.insert(0, {"created_by": id_utilisateur, "boit": bool(donnees.get("boit", False)),
+                               "mode_paiement": donnees.get("mode_paiement", "")})
+
+        inscriptions = await self._dao(
+            self.services["inscription"].inscrire_groupe, id_event, id_bus_aller, id_bus_retour, membres
+        )
+        if not inscriptions:
+            raise ErreurHTTP(409, "Groupe refusé (places insuffisantes, membre inconnu ou déjà inscrit)")
+        return 201, [ins.to_dict() for ins in inscriptions]
+
+    async def inscrire_plusieurs_evenements(self, requete: RequeteHTTP):
+        id_utilisateur = self._utilisateur_connecte(requete)
+        donnees = requete.json()
+        try:
+            choix = [
+                (int(c["id_event"]),
+                 int(c["id_bus_aller"]) if c.get("id_bus_aller") else None,
+                 int(c["id_bus_retour"]) if c.get("id_bus_retour") else None)
+                for c in donnees["choix"]
+            ]
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ErreurHTTP(400, "choix [{\"id_event\", \"id_bus_aller\", \"id_bus_retour\"}] est requis")
+
+        resultat = await self._dao(
+            self.services["inscription"].inscrire_plusieurs_evenements,
+            id_utilisateur, choix,
+            boit=bool(donnees.get("boit", False)),
+            mode_paiement=donnees.get("mode_paiement", ""),
+            tout_ou_rien=bool(donnees.get("tout_ou_rien", True)),
+        )
+        if resultat is None:
+            raise ErreurHTTP(500, "L'inscription a échoué")
+        corps = {
+            "inscriptions": [ins.to_dict() for ins in resultat["inscriptions"]],
+            "refus": resultat["refus"],
+        }
+        return (201 if resultat["inscriptions"] else 409), corps
+
+    async def transferer_inscription(self, requete: RequeteHTTP, code: str):
+        id_utilisateur = self._utilisateur_connecte(requete)
+        email = requete.json().get("email")
+        if not isinstance(email, str) or not email.strip():
+            raise ErreurHTTP(400, "email est requis")
+
+        inscription = await self._dao(
+            self.services["inscription"].transferer_inscription, int(code), id_utilisateur, email
+        )
+        if not inscription:
+            raise ErreurHTTP(409, "Transfert refusé (réservation introuvable, destinataire inconnu ou déjà inscrit)")
+        return 200, inscription.to_dict()
+
+    async def supprimer_inscription(self, requete: RequeteHTTP, code: str):
+        id_utilisateur = self._utilisateur_connecte(requete)
+        try:
+            ok = await self._dao(
+                self.services["inscription"].supprimer_inscription, int(code), id_utilisateur
+            )
+        except ValueError as e:
+            raise ErreurHTTP(404, str(e))
+        except PermissionError as e:
+            raise ErreurHTTP(403, str(e))
+        if not ok:
+            raise ErreurHTTP(500, "La suppression a échoué")
+        return 204, None
+
+    # ------------------------------------------------------------------
+    # Protocole HTTP
+    # ------------------------------------------------------------------
+    async def _lire_requete(self, reader: asyncio.StreamReader):
+        """Lit une requête complète ; retourne None si le client a fermé la connexion."""
+        ligne = await reader.readline()
+        if not ligne:
+            return None
+        try:
+            methode, cible, _ = ligne.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ErreurHTTP(400, "Ligne de requête invalide")
+
+        entetes = {}
+        while True:
+            ligne = await reader.readline()
+            if ligne in (b"\r\n", b"\n", b""):
+                break
+            nom, _, valeur = ligne.decode("latin-1").partition(":")
+            entetes[nom.strip().lower()] = valeur.strip()
+
+        longueur = int(entetes.get("content-length") or 0)
+        if longueur > TAILLE_MAX_CORPS:
+            raise ErreurHTTP(413, "Corps de requête trop volumineux")
+        corps = await reader.readexactly(longueur) if longueur else b""
+        return RequeteHTTP(methode.upper(), cible, entetes, corps)
+
+    async def _dispatcher(self, requete: RequeteHTTP):
+        """Trouve la route, applique la limite de concurrence et exécute le handler."""
+        for methode, motif, handler in self._routes:
+            correspondance = motif.match(requete.chemin)
+            if correspondance and methode == requete.methode:
+                break
+        else:
+            raise ErreurHTTP(404, "Route inconnue")
+
+        if self._en_attente >= self.max_attente:
+            raise ErreurHTTP(503, "Serveur saturé, réessayez dans un instant")
+        self._en_attente += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._en_attente -= 1
+        try:
+            with span(f"api.{handler.__name__}", methode=requete.methode, chemin=requete.chemin):
+                return await handler(requete, *correspondance.groups())
+        finally:
+            self._semaphore.release()
+
+    @staticmethod
+    def _reponse(statut: int, corps, garder_connexion: bool) -> bytes:
+        """Sérialise une réponse HTTP/1.1."""
+        contenu = b"" if corps is None else json.dumps(
+            corps, ensure_ascii=False, default=str).encode("utf-8")
+        entetes = [
+            f"HTTP/1.1 {statut} {HTTPStatus(statut).phrase}",
+            f"Content-Length: {len(contenu)}",
+            "Connection: " + ("keep-alive" if garder_connexion else "close"),
+        ]
+        if contenu:
+            entetes.append("Content-Type: application/json; charset=utf-8")
+        if statut == 503:
+            entetes.append("Retry-After: 1")
+        return ("\r\n".join(entetes) + "\r\n\r\n").encode("latin-1") + contenu
+
+    async def _traiter_connexion(self, reader, writer):
+        """Boucle keep-alive sur une connexion client."""
+        try:
+            while True:
+                requete = None
+                try:
+                    requete = await self._lire_requete(reader)
+                    if requete is None:
+                        break
+                    statut, corps = await self._dispatcher(requete)
+                    garder = requete.entetes.get("connection", "").lower() != "close"
+                except ErreurHTTP as e:
+                    # Requête mal lue : le flux n'est plus fiable, on ferme la connexion
+                    garder = requete is not None and e.statut < 500
+                    statut, corps = e.statut, {"erreur": e.message}
+                except Exception as e:
+                    statut, corps, garder = 500, {"erreur": f"Erreur interne : {e}"}, False
+                writer.write(self._reponse(statut, corps, garder))
+                await writer.drain()
+                if not garder:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def demarrer(self, hote: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Démarre l'écoute et retourne le serveur asyncio."""
+        self._semaphore = asyncio.Semaphore(self.max_concurrence)
+        return await asyncio.start_server(self._traiter_connexion, hote, port, backlog=1024)
+
+    def fermer(self):
+        """Libère les pools de threads."""
+        self._executor_dao.shutdown(wait=False)
+        self._executor_hachage.shutdown(wait=False)
+
+
+def construire_services() -> dict:
+    """Instancie les services métier exposés par l'API."""
+    from dao.bus_dao import BusDAO
+    from dao.evenement_dao import EvenementDAO
+    from dao.inscription_dao import InscriptionDAO
+    from dao.utilisateur_dao import UtilisateurDAO
+    from service.bus_service import BusService
+    from service.catalogue_service import CatalogueService, activer_rafraichissement
+    from service.evenement_service import EvenementService
+    from service.inscription_service import InscriptionService
+    from service.utilisateur_service import UtilisateurService
+    from utils.journal import configurer_journal
+    from utils.metriques import exposer_metriques
+    from utils.traces import activer_traces
+
+    configurer_journal()
+    exposer_metriques()
+    activer_traces()
+    activer_rafraichissement()
+    return {
+        "utilisateur": UtilisateurService(),
+        "evenement": EvenementService(EvenementDAO(), InscriptionDAO(), UtilisateurDAO(), BusDAO()),
+        "inscription": InscriptionService(InscriptionDAO(), EvenementDAO(), UtilisateurDAO()),
+        "bus": BusService(),
+        "catalogue": CatalogueService(),
+    }
+
+
+async def servir(hote: str, port: int, **options):
+    """Démarre l'API et sert jusqu'à interruption."""
+    api = ServeurAPI(construire_services(), **options)
+    serveur = await api.demarrer(hote, port)
+    print(f"API en écoute sur http://{hote}:{port}")
+    try:
+        async with serveur:
+            await serveur.serve_forever()
+    finally:
+        api.fermer()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP JSON des événements du BDE")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrence", type=int, default=64)
+    parser.add_argument("--max-attente", type=int, default=1024)
+    parser.add_argument("--workers-dao", type=int, default=16)
+    parser.add_argument("--workers-hachage", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(servir(
+            args.hote,
+            args.port,
+            max_concurrence=args.max_concurrence,
+            max_attente=args.max_attente,
+            workers_dao=args.workers_dao,
+            workers_hachage=args.workers_hachage,
+        ))
+    except KeyboardInterrupt:
+        print("\nArrêt de l'API")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmark de charge de l'API HTTP (api/serveur.py).
+
+Des clients virtuels asynchrones (une connexion keep-alive chacun) enchaînent :
+    connexion -> liste des événements -> bus de l'événement -> inscription
+contre une API déjà lancée. Les comptes sont ceux créés par benchmark/peuplement.py
+(option --peupler pour les créer avant le lancement).
+
+Exemple :
+    python src/api/serveur.py --port 8080 &
+    python src/benchmark/charge_api.py --peupler 500 --clients 500 --port 8080
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+# Permet le lancement direct du script (python src/benchmark/charge_api.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark.simulation_ouverture import centile  # noqa: E402
+
+
+class ClientHTTP:
+    """Client HTTP/1.1 keep-alive minimal, suffisant pour l'API JSON."""
+
+    def __init__(self, hote: str, port: int):
+        self.hote = hote
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.token = None
+
+    async def ouvrir(self):
+        self.reader, self.writer = await asyncio.open_connection(self.hote, self.port)
+
+    async def fermer(self):
+        if self.writer:
+            self.writer.close()
+
+    async def requete(self, methode: str, chemin: str, corps: dict = None):
+        """Envoie une requête et retourne (statut, corps JSON décodé ou None)."""
+        contenu = json.dumps(corps).encode() if corps is not None else b""
+        entetes = [f"{methode} {chemin} HTTP/1.1", f"Host: {self.hote}",
+                   f"Content-Length: {len(contenu)}"]
+        if contenu:
+            entetes.append("Content-Type: application/json")
+        if self.token:
+            entetes.append(f"Authorization: Bearer {self.token}")
+        self.writer.write(("\r\n".join(entetes) + "\r\n\r\n").encode() + contenu)
+        await self.writer.drain()
+
+        statut = int((await self.reader.readline()).split()[1])
+        longueur = 0
+        while True:
+            ligne = await self.reader.readline()
+            if ligne in (b"\r\n", b""):
+                break
+            nom, _, valeur = ligne.decode("latin-1").partition(":")
+            if nom.lower() == "content-length":
+                longueur = int(valeur)
+        reponse = await self.reader.readexactly(longueur) if longueur else b""
+        return statut, json.loads(reponse) if reponse else None
+
+
+async def parcours(client: ClientHTTP, email: str, mot_de_passe: str, mesures: dict, codes: Counter):
+    """Parcours d'un étudiant ; chaque étape est chronométrée."""
+    rng = random.Random(email)
+
+    async def etape(nom, methode, chemin, corps=None):
+        debut = time.perf_counter()
+        try:
+            statut, reponse = await client.requete(methode, chemin, corps)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            statut, reponse = 0, None
+        mesures[nom].append(time.perf_counter() - debut)
+        codes[(nom, statut)] += 1
+        return statut, reponse
+
+    statut, reponse = await etape("connexion", "POST", "/connexion",
+                                  {"email": email, "mot_de_passe": mot_de_passe})
+    if statut != 200:
+        return
+    client.token = reponse["token"]
+
+    statut, evenements = await etape("liste_evenements", "GET", "/evenements?statut=en_cours")
+    if statut != 200 or not evenements:
+        return
+    id_event = rng.choice(evenements)["id_event"]
+
+    statut, bus = await etape("choix_bus", "GET", f"/evenements/{id_event}/bus")
+    aller = [b["id_bus"] for b in bus or [] if b["sens"] == "ALLER"]
+    retour = [b["id_bus"] for b in bus or [] if b["sens"] == "RETOUR"]
+    if not aller or not retour:
+        return
+
+    await etape("inscription", "POST", "/inscriptions", {
+        "id_event": id_event,
+        "id_bus_aller": rng.choice(aller),
+        "id_bus_retour": rng.choice(retour),
+        "boit": rng.random() < 0.5,
+        "mode_paiement": "en ligne",
+    })
+
+
+async def lancer(hote: str, port: int, emails: list, mot_de_passe: str) -> dict:
+    """Lance un client par e-mail, tous en même temps, et agrège les mesures."""
+    mesures = defaultdict(list)
+    codes = Counter()
+
+    async def client_virtuel(email):
+        client = ClientHTTP(hote, port)
+        try:
+            await client.ouvrir()
+            await parcours(client, email, mot_de_passe, mesures, codes)
+        except (ConnectionError, OSError):
+            codes[("connexion_tcp", 0)] += 1
+        finally:
+            await client.fermer()
+
+    debut = time.perf_counter()
+    await asyncio.gather(*(client_virtuel(email) for email in emails))
+    duree = time.perf_counter() - debut
+
+    etapes = {}
+    for nom, durees in mesures.items():
+        durees.sort()
+        etapes[nom] = {
+            "n": len(durees),
+            "debit_par_s": len(durees) / duree,
+            "p50_ms": centile(durees, 50) * 1000,
+            "p95_ms": centile(durees, 95) * 1000,
+            "p99_ms": centile(durees, 99) * 1000,
+            "codes": {str(statut): n for (e, statut), n in codes.items() if e == nom},
+        }
+    return {"clients": len(emails), "duree_totale_s": duree, "etapes": etapes}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de charge de l'API HTTP")
+    parser.add_argument("--hote", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--peupler", type=int, default=0,
+                        help="crée N comptes étudiants (et un événement avec ses bus) avant le test")
+    parser.add_argument("--prefixe", default="charge", help="préfixe des e-mails des comptes")
+    parser.add_argument("--json", help="fichier où écrire le rapport JSON")
+    args = parser.parse_args(argv)
+
+    if args.peupler:
+        from benchmark.peuplement import MOT_DE_PASSE_CHARGE, peupler
+
+        args.prefixe = f"api{int(time.time())}"
+        donnees = peupler(args.peupler, prefixe=args.prefixe)
+        emails, mot_de_passe = donnees["emails"], MOT_DE_PASSE_CHARGE
+    else:
+        from benchmark.peuplement import MOT_DE_PASSE_CHARGE
+
+        emails = [f"{args.prefixe}_{i}@ensai.fr" for i in range(args.clients)]
+        mot_de_passe = MOT_DE_PASSE_CHARGE
+
+    rapport = asyncio.run(lancer(args.hote, args.port, emails[:args.clients], mot_de_passe))
+
+    print(f"{rapport['clients']} clients en {rapport['duree_totale_s']:.2f} s")
+    print(f"{'Étape':<18}{'n':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}  codes")
+    for nom, m in rapport["etapes"].items():
+        print(f"{nom:<18}{m['n']:>6}{m['p50_ms']:>9.1f}{m['p95_ms']:>9.1f}"
+              f"{m['p99_ms']:>9.1f}{m['debit_par_s']:>9.1f}  {m['codes']}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rapport, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Comparaison de deux runs de benchmark/performances.py.
+
+Une mesure est en régression quand sa statistique (médiane par défaut) augmente de
+plus du seuil relatif ; --plancher-ms ignore en plus les écarts absolus trop petits
+pour être significatifs sur une machine bruitée. Le code de sortie vaut 1 en cas de
+régression, pour bloquer une intégration continue.
+
+Exemple :
+    python src/benchmark/comparer.py avant.json apres.json --seuil 0.10
+"""
+import argparse
+import json
+import sys
+
+STATISTIQUES = ("mediane_ms", "moyenne_ms", "p95_ms", "min_ms")
+
+
+def comparer(reference: dict, candidat: dict, seuil: float = 0.10,
+             statistique: str = "mediane_ms", plancher_ms: float = 0.0) -> list[dict]:
+    """
+    Compare les résultats de deux runs, mesure par mesure.
+
+    reference, candidat: dicts "resultats" des deux fichiers JSON
+    seuil: hausse relative au-delà de laquelle une mesure est en régression (0.10 = +10 %)
+    statistique: statistique comparée
+    plancher_ms: écart absolu en dessous duquel la mesure est jugée stable
+
+    return: une ligne par mesure {mesure, reference, candidat, ecart, statut}, statut parmi
+            regression, amelioration, stable, nouvelle, disparue
+    """
+    lignes = []
+    for nom in sorted(reference.keys() | candidat.keys()):
+        if nom not in candidat:
+            lignes.append({"mesure": nom, "reference": reference[nom][statistique], "candidat": None,
+                           "ecart": None, "statut": "disparue"})
+            continue
+        if nom not in reference:
+            lignes.append({"mesure": nom, "reference": None, "candidat": candidat[nom][statistique],
+                           "ecart": None, "statut": "nouvelle"})
+            continue
+        avant, apres = reference[nom][statistique], candidat[nom][statistique]
+        ecart = (apres - avant) / avant if avant else 0.0
+        if abs(apres - avant) < plancher_ms or abs(ecart) <= seuil:
+            statut = "stable"
+        else:
+            statut = "regression" if ecart > 0 else "amelioration"
+        lignes.append({"mesure": nom, "reference": avant, "candidat": apres,
+                       "ecart": ecart, "statut": statut})
+    return lignes
+
+
+def _format(valeur) -> str:
+    return "-" if valeur is None else f"{valeur:.4f}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare deux runs de benchmark")
+    parser.add_argument("reference", help="JSON du run de référence")
+    parser.add_argument("candidat", help="JSON du run à évaluer")
+    parser.add_argument("--seuil", type=float, default=0.10, help="hausse relative tolérée (0.10 = 10 %%)")
+    parser.add_argument("--statistique", choices=STATISTIQUES, default="mediane_ms")
+    parser.add_argument("--plancher-ms", type=float, default=0.0,
+                        help="écart absolu ignoré, en millisecondes")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for chemin in (args.reference, args.candidat):
+        with open(chemin, encoding="utf-8") as f:
+            runs.append(json.load(f))
+    lignes = comparer(runs[0]["resultats"], runs[1]["resultats"], args.seuil,
+                      args.statistique, args.plancher_ms)
+
+    for run, chemin in zip(runs, (args.reference, args.candidat)):
+        contexte = run.get("contexte", {})
+        print(f"{chemin} : commit {contexte.get('commit')}, {contexte.get('date')}, "
+              f"Python {contexte.get('python')}")
+    print(f"\n{'Mesure':<52}{'réf. ms':>11}{'cand. ms':>11}{'écart':>9}  statut")
+    for ligne in lignes:
+        ecart = "-" if ligne["ecart"] is None else f"{ligne['ecart']:+.1%}"
+        print(f"{ligne['mesure']:<52}{_format(ligne['reference']):>11}{_format(ligne['candidat']):>11}"
+              f"{ecart:>9}  {ligne['statut']}")
+
+    regressions = [ligne for ligne in lignes if ligne["statut"] == "regression"]
+    print(f"\n{len(regressions)} régression(s) au-delà de {args.seuil:.0%} ({args.statistique})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Benchmark : DAO synchrones (psycopg2, connexion partagée) contre DAO asynchrones
+(psycopg 3, pool DBConnectionAsync) sur des lectures concurrentes.
+
+Trois variantes lancent le même lot de `get_by("id_event", ...)` :
+- sync_threads : EvenementDAO sur un pool de threads (ce que fait l'API HTTP aujourd'hui) ;
+- sync_to_thread : EvenementDAO via asyncio.to_thread depuis une boucle asyncio ;
+- async : EvenementDAOAsync, toutes les lectures lancées avec asyncio.gather.
+
+Exemple :
+    python src/benchmark/dao_async.py --requetes 200 --repetitions 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Permet le lancement direct du script (python src/benchmark/dao_async.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark.simulation_ouverture import centile  # noqa: E402
+
+
+def _chronometrer(fonction, *args) -> float:
+    debut = time.perf_counter()
+    fonction(*args)
+    return time.perf_counter() - debut
+
+
+async def _chronometrer_async(coroutine) -> float:
+    debut = time.perf_counter()
+    await coroutine
+    return time.perf_counter() - debut
+
+
+def variante_sync_threads(ids: list, workers: int) -> tuple[float, list]:
+    from dao.evenement_dao import EvenementDAO
+
+    dao = EvenementDAO()
+    debut = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        latences = list(executor.map(
+            lambda id_event: _chronometrer(dao.get_by, "id_event", id_event), ids))
+    return time.perf_counter() - debut, latences
+
+
+async def variante_sync_to_thread(ids: list) -> tuple[float, list]:
+    from dao.evenement_dao import EvenementDAO
+
+    dao = EvenementDAO()
+    debut = time.perf_counter()
+    latences = await asyncio.gather(*(
+        _chronometrer_async(asyncio.to_thread(dao.get_by, "id_event", id_event))
+        for id_event in ids
+    ))
+    return time.perf_counter() - debut, latences
+
+
+async def variante_async(ids: list) -> tuple[float, list]:
+    from dao.evenement_dao_async import EvenementDAOAsync
+
+    dao = EvenementDAOAsync()
+    debut = time.perf_counter()
+    latences = await asyncio.gather(*(
+        _chronometrer_async(dao.get_by("id_event", id_event)) for id_event in ids
+    ))
+    return time.perf_counter() - debut, latences
+
+
+def resumer(durees: list, latences: list, requetes: int) -> dict:
+    latences = sorted(latences)
+    return {
+        "duree_mediane_ms": statistics.median(durees) * 1000,
+        "debit_par_s": requetes / statistics.median(durees),
+        "p50_ms": centile(latences, 50) * 1000,
+        "p95_ms": centile(latences, 95) * 1000,
+        "p99_ms": centile(latences, 99) * 1000,
+    }
+
+
+async def _lancer_async(ids: list, repetitions: int) -> dict:
+    from dao.db_connection_async import DBConnectionAsync
+
+    resultats = {"sync_to_thread": ([], []), "async": ([], [])}
+    await variante_async(ids[:1])  # ouverture du pool hors mesure
+    for _ in range(repetitions):
+        for nom, variante in (("sync_to_thread", variante_sync_to_thread),
+                              ("async", variante_async)):
+            duree, latences = await variante(ids)
+            resultats[nom][0].append(duree)
+            resultats[nom][1].extend(latences)
+    await DBConnectionAsync().fermer()
+    return resultats
+
+
+def lancer(ids: list, repetitions: int, workers: int) -> dict:
+    """Exécute les trois variantes et retourne un résumé par variante."""
+    resultats = {"sync_threads": ([], [])}
+    for _ in range(repetitions):
+        duree, latences = variante_sync_threads(ids, workers)
+        resultats["sync_threads"][0].append(duree)
+        resultats["sync_threads"][1].extend(latences)
+    resultats.update(asyncio.run(_lancer_async(ids, repetitions)))
+    return {nom: resumer(durees, latences, len(ids))
+            for nom, (durees, latences) in resultats.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DAO synchrones contre DAO asynchrones")
+    parser.add_argument("--requetes", type=int, default=200, help="lectures concurrentes par lot")
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=16,
+                        help="threads de la variante sync_threads")
+    parser.add_argument("--json", help="fichier où écrire les résultats")
+    args = parser.parse_args(argv)
+
+    from dao.evenement_dao import EvenementDAO
+
+    ids = [evt.id_event for evt in EvenementDAO().lister_tous()]
+    if not ids:
+        print("Aucun événement en base : lancer d'abord benchmark/peuplement.py")
+        return
+    ids = [ids[i % len(ids)] for i in range(args.requetes)]
+
+    resume = lancer(ids, args.repetitions, args.workers)
+    print(f"{args.requetes} lectures concurrentes, {args.repetitions} répétitions")
+    print(f"{'Variante':<16}{'lot ms':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for nom, m in resume.items():
+        print(f"{nom:<16}{m['duree_mediane_ms']:>9.1f}{m['debit_par_s']:>9.1f}"
+              f"{m['p50_ms']:>9.1f}{m['p95_ms']:>9.1f}{m['p99_ms']:>9.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resume, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Audit et benchmark du démarrage du CLI.
+
+- audit : lance `python -X importtime -c "import main"` et classe les modules par
+  temps d'import cumulé, en signalant les modules lourds chargés dès le démarrage ;
+- benchmark : mesure le temps entre le lancement de `python src/main.py` et
+  l'affichage du menu principal (la borne relance le CLI pour chaque étudiant).
+
+Exemple :
+    python src/benchmark/demarrage.py --repetitions 20 --json demarrage.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DOSSIER_SRC = Path(__file__).resolve().parent.parent
+
+# Modules qui ne doivent pas être chargés avant l'affichage du menu
+MODULES_LOURDS = ("psycopg2", "argon2", "requests", "dotenv")
+
+MARQUEUR_MENU = "=== MENU PRINCIPAL ==="
+
+
+def analyser_importtime(texte: str) -> list[dict]:
+    """
+    Analyse la sortie de `-X importtime`.
+
+    return: liste de dicts {module, propre_us, cumule_us} triée par temps cumulé décroissant
+    """
+    modules = []
+    for ligne in texte.splitlines():
+        if not ligne.startswith("import time:") or "imported package" in ligne:
+            continue
+        propre, cumule, nom = ligne[len("import time:"):].split("|", 2)
+        modules.append({
+            "module": nom.strip(),
+            "propre_us": int(propre),
+            "cumule_us": int(cumule),
+        })
+    return sorted(modules, key=lambda m: m["cumule_us"], reverse=True)
+
+
+def auditer_imports(module: str = "main") -> list[dict]:
+    """Lance l'import du module sous `-X importtime` et retourne l'analyse."""
+    resultat = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=DOSSIER_SRC,
+        capture_output=True,
+        text=True,
+    )
+    return analyser_importtime(resultat.stderr)
+
+
+def mesurer_premier_menu(timeout: float = 30.0) -> float:
+    """
+    Lance le CLI, attend l'affichage du menu principal puis le quitte (option 3).
+
+    return: temps jusqu'au premier menu, en secondes
+    """
+    debut = time.perf_counter()
+    processus = subprocess.Popen(
+        [sys.executable, "-u", "main.py"],
+        cwd=DOSSIER_SRC,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env={**os.environ, "PYTHONUNBUFFERED": "1"},
+    )
+    try:
+        for ligne in processus.stdout:
+            if MARQUEUR_MENU in ligne:
+                duree = time.perf_counter() - debut
+                break
+            if time.perf_counter() - debut > timeout:
+                raise TimeoutError("Le menu principal ne s'est pas affiché")
+        else:
+            raise RuntimeError("Le CLI s'est arrêté avant d'afficher le menu")
+        processus.communicate("3\n", timeout=timeout)
+    finally:
+        if processus.poll() is None:
+            processus.kill()
+    return duree
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit des imports et temps jusqu'au premier menu")
+    parser.add_argument("--repetitions", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15, help="nombre de modules affichés")
+    parser.add_argument("--json", help="fichier où écrire les résultats")
+    args = parser.parse_args(argv)
+
+    modules = auditer_imports()
+    lourds = sorted({
+        m["module"].split(".")[0] for m in modules if m["module"].split(".")[0] in MODULES_LOURDS
+    })
+
+    print(f"Imports les plus coûteux au démarrage (top {args.top}) :")
+    for m in modules[:args.top]:
+        print(f"  {m['cumule_us'] / 1000:>8.1f} ms  {m['module']}")
+    if lourds:
+        print(f"✗ Modules lourds importés avant le menu : {', '.join(lourds)}")
+    else:
+        print("✓ Aucun module lourd importé avant le menu")
+
+    durees = [mesurer_premier_menu() for _ in range(args.repetitions)]
+    print(f"\nTemps jusqu'au premier menu sur {len(durees)} lancements : "
+          f"médiane {statistics.median(durees) * 1000:.1f} ms, "
+          f"min {min(durees) * 1000:.1f} ms, max {max(durees) * 1000:.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "premier_menu_ms": [d * 1000 for d in durees],
+                "mediane_ms": statistics.median(durees) * 1000,
+                "modules_lourds": lourds,
+                "imports": modules[:args.top],
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Faux serveur Brevo local, pour mesurer l'envoi d'e-mails sans réseau ni quota.
+
+Le serveur accepte les POST de l'API transactionnelle, compte les requêtes et les
+destinataires (un par version de `messageVersions`, sinon ceux de `to`) et répond
+201 après une latence simulée. Des pannes peuvent être injectées : latence, statut
+d'erreur, proportion aléatoire de réponses 503 ; les attributs sont modifiables
+pendant que le serveur tourne.
+
+Scénarios :
+    lot    compare l'envoi d'un e-mail par requête à l'envoi groupé
+    panne  envois unitaires (comme à l'inscription) avant, pendant et après une
+           panne lente du fournisseur : latences et métriques du disjoncteur
+
+Exemples :
+    python src/benchmark/faux_brevo.py --messages 800 --latence 0.05
+    python src/benchmark/faux_brevo.py --scenario panne --messages 60
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Permet le lancement direct du script (python src/benchmark/faux_brevo.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FauxBrevo:
+    """Serveur HTTP local imitant POST /v3/smtp/email ; à utiliser avec `with`."""
+
+    def __init__(self, latence: float = 0.0, statut: int = 201, taux_erreur: float = 0.0,
+                 graine: int = 0):
+        """
+        latence: attente (s) avant chaque réponse
+        statut: statut HTTP des réponses
+        taux_erreur: proportion de réponses 503 tirées au hasard
+        """
+        self.latence = latence
+        self.statut = statut
+        self.taux_erreur = taux_erreur
+        self._aleatoire = random.Random(graine)
+        self.requetes = 0
+        self.destinataires = 0
+        self.corps = []
+        self._verrou = threading.Lock()
+        faux = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                corps = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                versions = corps.get("messageVersions") or [corps]
+                with faux._verrou:
+                    faux.requetes += 1
+                    faux.destinataires += sum(len(v.get("to", [])) for v in versions)
+                    faux.corps.append(corps)
+                    statut = 503 if faux._aleatoire.random() < faux.taux_erreur else faux.statut
+                if faux.latence:
+                    time.sleep(faux.latence)
+                reponse = json.dumps({"messageIds": [f"<{i}@faux>" for i in range(len(versions))]})
+                self.send_response(statut)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(reponse)))
+                self.end_headers()
+                self.wfile.write(reponse.encode())
+
+            def log_message(self, *args):
+                pass
+
+        self.serveur = ThreadingHTTPServer(("127.0.0.1", 0), Gestionnaire)
+        self.serveur.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.serveur.server_address[1]}/v3/smtp/email"
+
+    def __enter__(self):
+        threading.Thread(target=self.serveur.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.serveur.shutdown()
+        self.serveur.server_close()
+
+
+def scenario_panne(api_brevo, messages: list, latence_panne: float):
+    """Latences des envois unitaires par phase : normal, panne lente, rétablissement."""
+    with FauxBrevo() as faux:
+        os.environ["BREVO_URL"] = faux.url
+        tiers = max(len(messages) // 3, 1)
+        for phase, latence, lot in (("normal", 0.0, messages[:tiers]),
+                                    ("panne", latence_panne, messages[tiers:2 * tiers]),
+                                    ("retabli", 0.0, messages[2 * tiers:])):
+            faux.latence = latence
+            if phase == "retabli":
+                # Laisse passer la période d'ouverture pour observer l'appel d'essai
+                time.sleep(api_brevo.disjoncteur_brevo.delai)
+            durees, erreurs = [], 0
+            for message in lot:
+                debut = time.perf_counter()
+                try:
+                    statut, _ = api_brevo.send_email_brevo(**message)
+                    erreurs += statut != 201
+                except Exception:
+                    erreurs += 1
+                durees.append(time.perf_counter() - debut)
+            durees.sort()
+            print(f"{phase:8} : {len(lot)} envoi(s), {erreurs} échec(s), "
+                  f"p50 {durees[len(durees) // 2] * 1000:.1f} ms, max {durees[-1] * 1000:.1f} ms")
+    metriques = api_brevo.disjoncteur_brevo.metriques()
+    print("disjoncteur :", json.dumps(metriques, default=lambda v: round(v, 3)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Envois contre un faux serveur Brevo")
+    parser.add_argument("--scenario", choices=["lot", "panne"], default="lot")
+    parser.add_argument("--messages", type=int, default=800)
+    parser.add_argument("--latence", type=float, default=0.05, help="latence simulée par requête (s)")
+    parser.add_argument("--latence-panne", type=float, default=2.0,
+                        help="latence du fournisseur pendant la panne (s)")
+    parser.add_argument("--versions", type=int, default=100, help="destinataires par requête groupée")
+    parser.add_argument("--debit", type=float, default=10, help="requêtes par seconde au maximum")
+    parser.add_argument("--concurrence", type=int, default=4)
+    args = parser.parse_args()
+
+    os.environ.setdefault("TOKEN_BREVO", "faux")
+    os.environ.setdefault("EMAIL_BREVO", "bde@faux.test")
+    if args.scenario == "panne":
+        # Délais courts pour que la panne soit visible en quelques secondes
+        os.environ.setdefault("BREVO_TIMEOUT_LECTURE", "0.5")
+        os.environ.setdefault("BREVO_DELAI_REOUVERTURE", "2")
+    from utils import api_brevo
+
+    messages = [
+        {"to_email": f"etudiant{i}@ensai.fr", "subject": "Changement d'horaire",
+         "message_text": f"Bonjour étudiant {i}, le départ est décalé."}
+        for i in range(args.messages)
+    ]
+
+    if args.scenario == "panne":
+        scenario_panne(api_brevo, messages, args.latence_panne)
+        return
+
+    for mode in ("unitaire", "groupe"):
+        with FauxBrevo(latence=args.latence) as faux:
+            os.environ["BREVO_URL"] = faux.url
+            debut = time.perf_counter()
+            if mode == "unitaire":
+                resultats = [api_brevo.send_email_brevo(**m) for m in messages]
+            else:
+                resultats = api_brevo.send_emails_brevo(
+                    messages, versions_max=args.versions,
+                    concurrence=args.concurrence, debit=args.debit)
+            duree = time.perf_counter() - debut
+            acceptes = sum(1 for statut, _ in resultats if statut == 201)
+            print(f"{mode:9} : {faux.requetes:5} requête(s), {faux.destinataires} destinataire(s), "
+                  f"{acceptes} accepté(s) en {duree:.2f} s ({acceptes / duree:.0f} e-mails/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Suite de benchmarks : DAO, parcours de service, Argon2 et hydratation des objets métier.
+
+Groupes mesurés :
+- dao : get_by, lister_tous, creer et compter_par_evenement de chaque DAO ;
+- services : creer_inscription, authentifier et modifier_statut ;
+- argon2 : hash_password et verify_password ;
+- hydratation : from_dict de chaque objet métier sur une ligne telle que renvoyée par la base.
+
+Les groupes dao et services tournent contre une base PostgreSQL locale, réinitialisée
+puis peuplée à chaque échelle (nombre d'étudiants ; un événement pour 100 étudiants,
+la moitié des étudiants inscrits). Les résultats sont écrits en JSON, à comparer d'un
+run à l'autre avec benchmark/comparer.py.
+
+Exemple :
+    python src/benchmark/performances.py --echelles 100,1000,10000 --reinitialiser --json avant.json
+    python src/benchmark/performances.py --groupes argon2,hydratation --json avant.json
+"""
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import date, datetime, time as heure, timedelta
+from pathlib import Path
+
+# Permet le lancement direct du script (python src/benchmark/performances.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark.simulation_ouverture import centile  # noqa: E402
+
+GROUPES = ("dao", "services", "argon2", "hydratation")
+GROUPES_BASE = ("dao", "services")
+
+# Une ligne par objet métier, dans la forme renvoyée par RealDictCursor
+LIGNES_TYPES = {
+    "Utilisateur": ("business_object.utilisateur", {
+        "id_utilisateur": 42, "nom": "Martin", "prenom": "Léa", "email": "lea.martin@ensai.fr",
+        "mot_de_passe": "$argon2id$v=19$m=65536,t=3,p=4$c2VsZGVtbw$aGFzaGRlbW8", "role": False,
+        "created_at": datetime(2025, 9, 1, 10, 30),
+    }),
+    "Evenement": ("business_object.evenement", {
+        "id_event": 7, "titre": "Soirée d'intégration", "description_event": "Navettes depuis l'ENSAI",
+        "lieu": "Rennes", "date_event": date(2025, 10, 15), "capacite_max": 300, "created_by": 1,
+        "created_at": datetime(2025, 9, 1, 10, 30), "tarif": 12.5, "statut": "en_cours",
+        "nb_inscrits": 180,
+    }),
+    "EvenementCatalogue": ("business_object.evenement_catalogue", {
+        "id_event": 7, "titre": "Soirée d'intégration", "lieu": "Rennes",
+        "date_event": date(2025, 10, 15), "tarif": 12.5, "capacite_max": 300,
+        "places_restantes": 120, "nb_bus_aller": 4, "places_bus_aller": 20,
+        "nb_bus_retour": 4, "places_bus_retour": 35,
+    }),
+    "Inscription": ("business_object.inscription", {
+        "code_reservation": 48213907, "boit": True, "created_by": 42, "mode_paiement": "en ligne",
+        "id_event": 7, "nom_event": "Soirée d'intégration", "created_at": datetime(2025, 9, 2, 18, 5),
+        "id_bus_aller": 3, "id_bus_retour": 8,
+    }),
+    "Attente": ("business_object.attente", {
+        "id_attente": 5, "id_event": 7, "created_by": 42, "boit": False, "mode_paiement": "espece",
+        "id_bus_aller": 3, "id_bus_retour": 8, "created_at": datetime(2025, 9, 2, 18, 5),
+    }),
+    "Bus": ("business_object.bus", {
+        "id_bus": 3, "id_event": 7, "sens": "ALLER", "description": "Bus aller 1",
+        "heure_depart": heure(20, 0), "capacite_max": 50, "nb_inscrits": 30,
+    }),
+}
+
+
+def resumer(durees: list) -> dict:
+    """Statistiques d'une série de durées (secondes), en millisecondes."""
+    triees = sorted(durees)
+    return {
+        "n": len(durees),
+        "mediane_ms": statistics.median(triees) * 1000,
+        "moyenne_ms": statistics.fmean(triees) * 1000,
+        "p95_ms": centile(triees, 95) * 1000,
+        "min_ms": triees[0] * 1000,
+        "ecart_type_ms": (statistics.stdev(triees) if len(triees) > 1 else 0.0) * 1000,
+    }
+
+
+def mesurer(fonction, repetitions: int, lot: int = 1, echauffement: int = 1) -> dict:
+    """
+    Chronomètre `repetitions` lots de `lot` appels de `fonction` (durée par appel).
+    Les appels d'échauffement remplissent les caches (connexion, imports, plans de requête).
+    """
+    for _ in range(echauffement):
+        fonction()
+    gc.collect()
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        for _ in range(lot):
+            fonction()
+        durees.append((time.perf_counter() - debut) / lot)
+    return resumer(durees)
+
+
+def bench_hydratation(repetitions: int, lot: int = 1000) -> dict:
+    """from_dict de chaque objet métier."""
+    import importlib
+
+    resultats = {}
+    for nom, (module, ligne) in LIGNES_TYPES.items():
+        from_dict = getattr(importlib.import_module(module), nom).from_dict
+        resultats[f"hydratation/{nom}.from_dict"] = mesurer(lambda: from_dict(ligne), repetitions, lot)
+    return resultats
+
+
+def bench_argon2(repetitions: int) -> dict:
+    """Hachage et vérification d'un mot de passe avec les paramètres de production."""
+    from utils.mdp import hash_password, verify_password
+
+    empreinte = hash_password("Benchmark123!")
+    return {
+        "argon2/hash_password": mesurer(lambda: hash_password("Benchmark123!"), repetitions),
+        "argon2/verify_password": mesurer(lambda: verify_password("Benchmark123!", empreinte), repetitions),
+    }
+
+
+def preparer_base(echelle: int) -> dict:
+    """
+    Réinitialise le schéma puis le peuple pour une échelle donnée.
+
+    return: données de peuplement, avec "libres" : étudiants sans inscription
+    """
+    from benchmark.peuplement import peupler, peupler_inscriptions
+    from utils.reset_database import ResetDatabase
+
+    with redirect_stdout(open(os.devnull, "w")):
+        ResetDatabase().lancer()
+    nb_evenements = max(1, echelle // 100)
+    donnees = peupler(echelle, nb_evenements=nb_evenements, capacite_evenement=echelle,
+                      prefixe=f"bench{echelle}")
+    moitie = len(donnees["etudiants"]) // 2
+    peupler_inscriptions(donnees["etudiants"][:moitie], donnees["evenements"])
+    donnees["libres"] = donnees["etudiants"][moitie:]
+    return donnees
+
+
+def couples_libres(donnees: dict):
+    """(étudiant, événement) encore sans inscription, pour les créations répétées."""
+    return itertools.product(donnees["libres"], donnees["evenements"])
+
+
+def bench_dao(donnees: dict, repetitions: int, prefixe: str) -> dict:
+    """Lectures, comptages et créations de chaque DAO."""
+    from business_object.bus import Bus
+    from business_object.evenement import Evenement
+    from business_object.inscription import Inscription
+    from business_object.utilisateur import Utilisateur
+    from dao.bus_dao import BusDAO
+    from dao.evenement_dao import EvenementDAO
+    from dao.inscription_dao import InscriptionDAO
+    from dao.utilisateur_dao import UtilisateurDAO
+
+    utilisateur_dao, evenement_dao = UtilisateurDAO(), EvenementDAO()
+    inscription_dao, bus_dao = InscriptionDAO(), BusDAO()
+    id_event = donnees["evenements"][0]
+    email = donnees["emails"][-1]
+    empreinte = utilisateur_dao.get_by("email", email)[0].mot_de_passe
+    compteur = itertools.count()
+    couples = couples_libres(donnees)
+    codes = itertools.count(1)  # sous les codes tirés par nouveau_code_reservation()
+
+    def nouvel_utilisateur():
+        utilisateur_dao.creer(Utilisateur(nom="Bench", prenom="Dao", mot_de_passe=empreinte,
+                                          email=f"{prefixe}_dao_{next(compteur)}@ensai.fr"))
+
+    def nouvel_evenement():
+        evenement_dao.creer(Evenement(date_event=date.today() + timedelta(days=30), titre="Bench",
+                                      lieu="Rennes", capacite_max=100, created_by=donnees["id_admin"]))
+
+    def nouvelle_inscription():
+        id_utilisateur, id_evenement = next(couples)
+        inscription_dao.creer(Inscription(id_event=id_evenement, id_bus_aller=None, id_bus_retour=None,
+                                          code_reservation=next(codes), mode_paiement="espece",
+                                          created_by=id_utilisateur))
+
+    def nouveau_bus():
+        bus_dao.creer(Bus(id_event=id_event, sens="ALLER", heure_depart="20:00",
+                          capacite_max=50, description="Bench"))
+
+    operations = {
+        "UtilisateurDAO.get_by": lambda: utilisateur_dao.get_by("email", email),
+        "UtilisateurDAO.lister_tous": utilisateur_dao.lister_tous,
+        "UtilisateurDAO.creer": nouvel_utilisateur,
+        "EvenementDAO.get_by": lambda: evenement_dao.get_by("id_event", id_event),
+        "EvenementDAO.lister_tous": evenement_dao.lister_tous,
+        "EvenementDAO.creer": nouvel_evenement,
+        "InscriptionDAO.get_by": lambda: inscription_dao.get_by("id_event", id_event),
+        "InscriptionDAO.creer": nouvelle_inscription,
+        "InscriptionDAO.compter_par_evenement": lambda: inscription_dao.compter_par_evenement(id_event),
+        "BusDAO.get_by": lambda: bus_dao.get_by("id_event", id_event),
+        "BusDAO.lister_tous": bus_dao.lister_tous,
+        "BusDAO.creer": nouveau_bus,
+    }
+    return {f"{prefixe}/dao/{nom}": mesurer(operation, repetitions)
+            for nom, operation in operations.items()}
+
+
+def bench_services(donnees: dict, repetitions: int, prefixe: str) -> dict:
+    """Parcours de service complets (validations, DAO, e-mail vers un backend en mémoire)."""
+    from benchmark.peuplement import MOT_DE_PASSE_CHARGE
+    from dao.bus_dao import BusDAO
+    from dao.evenement_dao import EvenementDAO
+    from dao.inscription_dao import InscriptionDAO
+    from dao.utilisateur_dao import UtilisateurDAO
+    from service.evenement_service import EvenementService
+    from service.inscription_service import InscriptionService
+    from service.utilisateur_service import UtilisateurService
+    from utils.emails import BackendMemoire, configurer_backend
+
+    configurer_backend(BackendMemoire())
+    utilisateur_service = UtilisateurService()
+    evenement_service = EvenementService(EvenementDAO(), InscriptionDAO(), UtilisateurDAO(), BusDAO())
+    inscription_service = InscriptionService(InscriptionDAO(), EvenementDAO(), UtilisateurDAO())
+    id_event = donnees["evenements"][0]
+    email = donnees["emails"][0]
+    # Les créations de bench_dao ont déjà consommé le début des couples libres
+    couples = itertools.islice(couples_libres(donnees), repetitions + 1, None)
+
+    def inscrire():
+        id_utilisateur, id_evenement = next(couples)
+        if inscription_service.creer_inscription(False, "espece", id_evenement, "Bench", None, None,
+                                                 id_utilisateur) is None:
+            raise RuntimeError(f"Inscription refusée ({id_utilisateur}, {id_evenement})")
+
+    operations = {
+        "InscriptionService.creer_inscription": inscrire,
+        "UtilisateurService.authentifier": lambda: utilisateur_service.authentifier(email, MOT_DE_PASSE_CHARGE),
+        "EvenementService.modifier_statut": lambda: evenement_service.modifier_statut(id_event),
+    }
+    with redirect_stdout(open(os.devnull, "w")):
+        return {f"{prefixe}/services/{nom}": mesurer(operation, repetitions)
+                for nom, operation in operations.items()}
+
+
+def contexte() -> dict:
+    """Conditions du run, pour interpréter une comparaison."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True, cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "processeur": platform.processor() or platform.machine(),
+    }
+
+
+def lancer(groupes: list, echelles: list, repetitions: int, repetitions_argon2: int) -> dict:
+    """Exécute les groupes demandés ; les groupes base de données une fois par échelle."""
+    resultats = {}
+    if "hydratation" in groupes:
+        resultats.update(bench_hydratation(repetitions))
+    if "argon2" in groupes:
+        resultats.update(bench_argon2(repetitions_argon2))
+    for echelle in echelles if set(groupes) & set(GROUPES_BASE) else []:
+        donnees = preparer_base(echelle)
+        # Une création par répétition (et par échauffement) pour chacun des deux groupes
+        if len(donnees["libres"]) * len(donnees["evenements"]) < 2 * (repetitions + 1):
+            raise ValueError(f"Échelle {echelle} trop petite pour {repetitions} répétitions")
+        if "dao" in groupes:
+            resultats.update(bench_dao(donnees, repetitions, str(echelle)))
+        if "services" in groupes:
+            resultats.update(bench_services(donnees, repetitions, str(echelle)))
+    return resultats
+
+
+def afficher(resultats: dict):
+    print(f"{'Mesure':<52}{'n':>6}{'méd. ms':>11}{'p95 ms':>11}{'σ ms':>10}")
+    for nom, m in resultats.items():
+        print(f"{nom:<52}{m['n']:>6}{m['mediane_ms']:>11.4f}{m['p95_ms']:>11.4f}{m['ecart_type_ms']:>10.4f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks DAO, services, Argon2 et hydratation")
+    parser.add_argument("--groupes", default=",".join(GROUPES),
+                        help=f"groupes à mesurer, séparés par des virgules ({', '.join(GROUPES)})")
+    parser.add_argument("--echelles", default="100,1000,10000",
+                        help="nombres d'étudiants peuplés, séparés par des virgules")
+    parser.add_argument("--repetitions", type=int, default=50)
+    parser.add_argument("--repetitions-argon2", type=int, default=10)
+    parser.add_argument("--reinitialiser", action="store_true",
+                        help="autorise la réinitialisation du schéma à chaque échelle (destructif), "
+                             "requise par les groupes dao et services")
+    parser.add_argument("--json", help="fichier où écrire les résultats")
+    args = parser.parse_args(argv)
+
+    groupes = [g.strip() for g in args.groupes.split(",") if g.strip()]
+    inconnus = set(groupes) - set(GROUPES)
+    if inconnus:
+        parser.error(f"groupes inconnus : {', '.join(sorted(inconnus))}")
+    if set(groupes) & set(GROUPES_BASE) and not args.reinitialiser:
+        parser.error("les groupes dao et services réinitialisent la base : ajouter --reinitialiser")
+    echelles = [int(e) for e in args.echelles.split(",") if e.strip()]
+
+    resultats = lancer(groupes, echelles, args.repetitions, args.repetitions_argon2)
+    afficher(resultats)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"contexte": contexte(), "parametres": vars(args), "resultats": resultats},
+                      f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Peuplement d'une base PostgreSQL locale pour les tests de charge et les benchmarks.
+
+Les données sont insérées en quelques requêtes multi-lignes (execute_values) :
+le mot de passe est haché une seule fois avec Argon2 puis réutilisé pour tous
+les étudiants, le sel étant contenu dans le hash.
+"""
+from datetime import date, time, timedelta
+
+from psycopg2.extras import execute_values
+
+from dao.db_connection import DBConnection
+from utils.mdp import hash_password
+
+MOT_DE_PASSE_CHARGE = "Charge123!"
+
+
+def peupler(
+    nb_etudiants: int,
+    nb_evenements: int = 1,
+    capacite_evenement: int = 200,
+    nb_bus_par_sens: int = 4,
+    capacite_bus: int = 50,
+    prefixe: str = "charge",
+) -> dict:
+    """
+    Insère un administrateur, des étudiants, des événements en cours et leurs bus.
+
+    nb_etudiants: nombre de comptes étudiants à créer
+    nb_evenements: nombre d'événements "en_cours"
+    capacite_evenement: capacité maximale de chaque événement
+    nb_bus_par_sens: nombre de bus ALLER et de bus RETOUR par événement
+    capacite_bus: capacité de chaque bus
+    prefixe: préfixe des adresses e-mail générées
+
+    return: dict avec les e-mails et les id des étudiants, les id des événements et des bus
+    """
+    hash_commun = hash_password(MOT_DE_PASSE_CHARGE)
+    date_event = date.today() + timedelta(days=14)
+
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO utilisateur (nom, prenom, email, mot_de_passe, role)
+                VALUES (%s, %s, %s, %s, TRUE)
+                RETURNING id_utilisateur;
+                """,
+                ("Admin", prefixe.capitalize(), f"{prefixe}_admin@ensai.fr", hash_commun),
+            )
+            id_admin = cursor.fetchone()["id_utilisateur"]
+
+            emails = [f"{prefixe}_{i}@ensai.fr" for i in range(nb_etudiants)]
+            ids_etudiants = [
+                row["id_utilisateur"]
+                for row in execute_values(
+                    cursor,
+                    """
+                    INSERT INTO utilisateur (nom, prenom, email, mot_de_passe, role)
+                    VALUES %s
+                    RETURNING id_utilisateur;
+                    """,
+                    [("Etudiant", str(i), email, hash_commun, False) for i, email in enumerate(emails)],
+                    page_size=1000,
+                    fetch=True,
+                )
+            ]
+
+            ids_evenements = [
+                row["id_event"]
+                for row in execute_values(
+                    cursor,
+                    """
+                    INSERT INTO evenement (titre, description_event, lieu, date_event,
+                                           capacite_max, created_by, tarif, statut)
+                    VALUES %s
+                    RETURNING id_event;
+                    """,
+                    [
+                        (f"Soirée {prefixe} {i}", "", "Rennes", date_event,
+                         capacite_evenement, id_admin, 10.0, "en_cours")
+                        for i in range(nb_evenements)
+                    ],
+                    fetch=True,
+                )
+            ]
+
+            bus = [
+                (id_event, sens, f"Bus {sens.lower()} {j}",
+                 time(20 + j % 3, 0) if sens == "ALLER" else time(2 + j % 3, 0),
+                 capacite_bus)
+                for id_event in ids_evenements
+                for sens in ("ALLER", "RETOUR")
+                for j in range(nb_bus_par_sens)
+            ]
+            ids_bus = [
+                row["id_bus"]
+                for row in execute_values(
+                    cursor,
+                    """
+                    INSERT INTO bus (id_event, sens, description, heure_depart, capacite_max)
+                    VALUES %s
+                    RETURNING id_bus;
+                    """,
+                    bus,
+                    fetch=True,
+                )
+            ]
+
+    return {
+        "id_admin": id_admin,
+        "emails": emails,
+        "etudiants": ids_etudiants,
+        "mot_de_passe": MOT_DE_PASSE_CHARGE,
+        "evenements": ids_evenements,
+        "bus": ids_bus,
+    }
+
+
+def peupler_inscriptions(ids_etudiants: list, ids_evenements: list) -> int:
+    """
+    Inscrit chaque étudiant à un événement, en les répartissant tour à tour
+    (sans bus, codes de réservation tirés par nouveau_code_reservation()).
+
+    ids_etudiants: étudiants à inscrire
+    ids_evenements: événements à remplir
+
+    return: nombre d'inscriptions créées
+    """
+    if not ids_etudiants or not ids_evenements:
+        return 0
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO inscription (code_reservation, boit, created_by, mode_paiement, id_event)
+                VALUES %s;
+                """,
+                [(i % 2 == 0, id_etudiant, "espece", ids_evenements[i % len(ids_evenements)])
+                 for i, id_etudiant in enumerate(ids_etudiants)],
+                template="(nouveau_code_reservation(), %s, %s, %s, %s)",
+                page_size=1000,
+            )
+    return len(ids_etudiants)
+
+
+def verifier_capacites() -> dict:
+    """
+    Contrôle a posteriori des invariants de capacité.
+
+    return: dict listant les événements et bus en sur-réservation,
+            ainsi que les doublons (même utilisateur inscrit deux fois au même événement)
+    """
+    with DBConnection().connection as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT e.id_event, e.capacite_max, COUNT(i.code_reservation) AS nb_inscrits
+                FROM evenement e
+                JOIN inscription i ON i.id_event = e.id_event
+                GROUP BY e.id_event, e.capacite_max
+                HAVING COUNT(i.code_reservation) > e.capacite_max;
+                """
+            )
+            evenements = [dict(row) for row in cursor.fetchall()]
+
+            cursor.execute(
+                """
+                SELECT b.id_bus, b.sens, b.capacite_max, COUNT(i.code_reservation) AS nb_inscrits
+                FROM bus b
+                JOIN inscription i
+                  ON (b.sens = 'ALLER' AND i.id_bus_aller = b.id_bus)
+                  OR (b.sens = 'RETOUR' AND i.id_bus_retour = b.id_bus)
+                GROUP BY b.id_bus, b.sens, b.capacite_max
+                HAVING COUNT(i.code_reservation) > b.capacite_max;
+                """
+            )
+            bus = [dict(row) for row in cursor.fetchall()]
+
+            cursor.execute(
+                """
+                SELECT created_by, id_event, COUNT(*) AS nb
+                FROM inscription
+                GROUP BY created_by, id_event
+                HAVING COUNT(*) > 1;
+                """
+            )
+            doublons = [dict(row) for row in cursor.fetchall()]
+
+    return {"evenements": evenements, "bus": bus, "doublons": doublons}
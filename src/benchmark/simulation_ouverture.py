@@ -0,0 +1,310 @@
+"""
+Test de charge : simulation de l'ouverture des inscriptions à un événement.
+
+Chaque étudiant virtuel déroule un parcours scripté :
+    connexion -> liste des événements -> choix des bus -> inscription -> (annulation)
+Les parcours sont répartis sur un nombre configurable de threads ou de processus,
+contre une base PostgreSQL locale. Les e-mails ne partent pas : ils sont collectés
+en mémoire (threads) ou écrits en JSON Lines, un fichier par processus (processus).
+
+Le rapport donne, par étape, le débit, les latences p50/p95/p99, les taux de rejet
+et d'erreur, puis vérifie qu'aucune capacité (événement ou bus) n'a été dépassée et
+que chaque inscription réussie a produit son e-mail de confirmation.
+
+Exemple :
+    python src/benchmark/simulation_ouverture.py --etudiants 500 --workers 50 --reinitialiser
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Permet le lancement direct du script (python src/benchmark/simulation_ouverture.py)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+ETAPES = ("connexion", "liste_evenements", "choix_bus", "inscription", "annulation")
+
+# Configuration du worker courant (thread principal ou processus fils)
+_config = {}
+_services = None
+
+
+def _initialiser_worker(config: dict, silencieux: bool = True):
+    """Prépare un worker : backend d'e-mails local et sorties console coupées."""
+    global _config
+    _config = config
+    from utils.emails import BackendFichier, BackendMemoire, configurer_backend
+
+    if config.get("dossier_emails"):
+        configurer_backend(BackendFichier(os.path.join(config["dossier_emails"], "emails-{pid}.jsonl")))
+    else:
+        configurer_backend(BackendMemoire())
+    if silencieux:
+        sys.stdout = open(os.devnull, "w")
+
+
+def _construire_services():
+    """Instancie les services une seule fois par worker."""
+    global _services
+    if _services is None:
+        from dao.bus_dao import BusDAO
+        from dao.evenement_dao import EvenementDAO
+        from dao.inscription_dao import InscriptionDAO
+        from dao.utilisateur_dao import UtilisateurDAO
+        from service.bus_service import BusService
+        from service.evenement_service import EvenementService
+        from service.inscription_service import InscriptionService
+        from service.utilisateur_service import UtilisateurService
+
+        _services = (
+            UtilisateurService(),
+            EvenementService(EvenementDAO(), InscriptionDAO(), UtilisateurDAO(), BusDAO()),
+            InscriptionService(InscriptionDAO(), EvenementDAO(), UtilisateurDAO()),
+            BusService(),
+        )
+    return _services
+
+
+def _chronometrer(mesures: list, etape: str, fonction, *args, **kwargs):
+    """
+    Exécute une étape et enregistre (etape, durée, statut).
+    Un retour vide/None compte comme un rejet métier, une exception comme une erreur.
+    """
+    debut = time.perf_counter()
+    try:
+        resultat = fonction(*args, **kwargs)
+        statut = "ok" if resultat else "rejet"
+    except Exception:
+        resultat = None
+        statut = "erreur"
+    mesures.append((etape, time.perf_counter() - debut, statut))
+    return resultat
+
+
+def parcours_etudiant(email: str) -> list:
+    """
+    Déroule le parcours complet d'un étudiant.
+
+    email: adresse de l'étudiant virtuel (mot de passe commun du peuplement)
+
+    return: liste de tuples (etape, durée en secondes, statut)
+    """
+    service_utilisateur, service_evenement, service_inscription, service_bus = (
+        _construire_services()
+    )
+    rng = random.Random(email)
+    mesures = []
+
+    utilisateur = _chronometrer(
+        mesures, "connexion", service_utilisateur.authentifier, email, _config["mot_de_passe"]
+    )
+    if not utilisateur:
+        return mesures
+
+    evenements = _chronometrer(
+        mesures, "liste_evenements", service_evenement.get_evenement_by, "statut", "en_cours"
+    )
+    if not evenements:
+        return mesures
+    cibles = [e for e in evenements if e.id_event in _config["evenements"]] or evenements
+    evenement = rng.choice(cibles)
+
+    bus = _chronometrer(
+        mesures, "choix_bus", service_bus.get_bus_by, "id_event", evenement.id_event
+    )
+    bus_aller = [b for b in bus or [] if b.sens == "ALLER"]
+    bus_retour = [b for b in bus or [] if b.sens == "RETOUR"]
+    if not bus_aller or not bus_retour:
+        return mesures
+
+    inscription = _chronometrer(
+        mesures,
+        "inscription",
+        service_inscription.creer_inscription,
+        boit=rng.random() < 0.5,
+        mode_paiement=rng.choice(["espece", "en ligne"]),
+        id_event=evenement.id_event,
+        nom_event=evenement.titre,
+        id_bus_aller=rng.choice(bus_aller).id_bus,
+        id_bus_retour=rng.choice(bus_retour).id_bus,
+        created_by=utilisateur.id_utilisateur,
+    )
+
+    if inscription and rng.random() < _config["proba_annulation"]:
+        _chronometrer(
+            mesures,
+            "annulation",
+            service_inscription.supprimer_inscription,
+            inscription.code_reservation,
+            utilisateur.id_utilisateur,
+        )
+    return mesures
+
+
+def centile(valeurs_triees: list, p: float) -> float:
+    """Centile par rang le plus proche sur une liste déjà triée."""
+    if not valeurs_triees:
+        return 0.0
+    rang = math.ceil(p / 100 * len(valeurs_triees))
+    return valeurs_triees[min(max(rang, 1), len(valeurs_triees)) - 1]
+
+
+def agreger(resultats: list, duree_totale: float) -> dict:
+    """Calcule débit, latences et taux par étape à partir des mesures brutes."""
+    par_etape = defaultdict(list)
+    for mesures in resultats:
+        for etape, duree, statut in mesures:
+            par_etape[etape].append((duree, statut))
+
+    rapport = {"duree_totale_s": duree_totale, "parcours": len(resultats), "etapes": {}}
+    for etape in ETAPES:
+        mesures = par_etape.get(etape, [])
+        durees = sorted(d for d, _ in mesures)
+        n = len(mesures)
+        rapport["etapes"][etape] = {
+            "n": n,
+            "ok": sum(1 for _, s in mesures if s == "ok"),
+            "rejets": sum(1 for _, s in mesures if s == "rejet"),
+            "erreurs": sum(1 for _, s in mesures if s == "erreur"),
+            "taux_erreur": (sum(1 for _, s in mesures if s == "erreur") / n) if n else 0.0,
+            "debit_par_s": n / duree_totale if duree_totale else 0.0,
+            "p50_ms": centile(durees, 50) * 1000,
+            "p95_ms": centile(durees, 95) * 1000,
+            "p99_ms": centile(durees, 99) * 1000,
+        }
+    rapport["debit_parcours_par_s"] = len(resultats) / duree_totale if duree_totale else 0.0
+    return rapport
+
+
+def compter_confirmations(messages) -> int:
+    """Nombre d'e-mails de confirmation d'inscription parmi les messages produits."""
+    return sum(1 for m in messages if m["subject"].startswith("Confirmation d'inscription"))
+
+
+def lancer(emails: list, config: dict, workers: int, mode: str = "threads") -> dict:
+    """
+    Lance tous les parcours en parallèle et retourne le rapport agrégé.
+
+    mode: "threads" (une connexion partagée) ou "processus" (une connexion par processus)
+    """
+    from utils.emails import backend_email, configurer_backend
+
+    debut = time.perf_counter()
+    if mode == "processus":
+        with tempfile.TemporaryDirectory() as dossier:
+            # "spawn" : chaque processus ouvre sa propre connexion au lieu d'hériter du socket parent
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialiser_worker,
+                initargs=({**config, "dossier_emails": dossier},),
+            ) as executor:
+                resultats = list(executor.map(parcours_etudiant, emails, chunksize=8))
+            # Les fichiers sont complets : chaque processus vide son tampon en se terminant
+            messages = [json.loads(ligne) for fichier in Path(dossier).glob("*.jsonl")
+                        for ligne in fichier.read_text(encoding="utf-8").splitlines()]
+    else:
+        _initialiser_worker(config, silencieux=False)
+        with open(os.devnull, "w") as puits, redirect_stdout(puits):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                resultats = list(executor.map(parcours_etudiant, emails))
+        messages = backend_email().envoyes
+        configurer_backend(None)
+
+    rapport = agreger(resultats, time.perf_counter() - debut)
+    rapport["emails"] = {"produits": len(messages), "confirmations": compter_confirmations(messages)}
+    return rapport
+
+
+def afficher(rapport: dict, violations: dict):
+    """Affiche le rapport sous forme de tableau."""
+    print(f"\n{rapport['parcours']} parcours en {rapport['duree_totale_s']:.2f} s "
+          f"({rapport['debit_parcours_par_s']:.1f} parcours/s)\n")
+    print(f"{'Étape':<18}{'n':>6}{'ok':>6}{'rejets':>8}{'erreurs':>9}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'op/s':>9}")
+    for etape, m in rapport["etapes"].items():
+        print(f"{etape:<18}{m['n']:>6}{m['ok']:>6}{m['rejets']:>8}{m['erreurs']:>9}"
+              f"{m['p50_ms']:>9.1f}{m['p95_ms']:>9.1f}{m['p99_ms']:>9.1f}{m['debit_par_s']:>9.1f}")
+
+    confirmations = rapport["emails"]["confirmations"]
+    inscriptions = rapport["etapes"]["inscription"]["ok"]
+    print(f"\nE-mails produits : {rapport['emails']['produits']} "
+          f"(confirmations {confirmations}/{inscriptions} inscriptions)")
+    if confirmations != inscriptions:
+        print("✗ Des inscriptions réussies n'ont pas produit leur confirmation")
+
+    print("\nContrôle des capacités :")
+    if not any(violations.values()):
+        print("✓ Aucune sur-réservation ni doublon")
+    for evt in violations["evenements"]:
+        print(f"✗ Événement {evt['id_event']} : {evt['nb_inscrits']}/{evt['capacite_max']}")
+    for bus in violations["bus"]:
+        print(f"✗ Bus {bus['id_bus']} ({bus['sens']}) : {bus['nb_inscrits']}/{bus['capacite_max']}")
+    for doublon in violations["doublons"]:
+        print(f"✗ Utilisateur {doublon['created_by']} inscrit {doublon['nb']} fois "
+              f"à l'événement {doublon['id_event']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulation d'une ouverture d'inscriptions")
+    parser.add_argument("--etudiants", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=50)
+    parser.add_argument("--mode", choices=["threads", "processus"], default="threads")
+    parser.add_argument("--capacite", type=int, default=200, help="capacité de l'événement")
+    parser.add_argument("--bus", type=int, default=4, help="nombre de bus par sens")
+    parser.add_argument("--capacite-bus", type=int, default=50)
+    parser.add_argument("--proba-annulation", type=float, default=0.1)
+    parser.add_argument("--reinitialiser", action="store_true",
+                        help="réinitialise le schéma avant le peuplement (destructif)")
+    parser.add_argument("--json", help="fichier où écrire le rapport JSON")
+    parser.add_argument("--metriques",
+                        help="fichier où écrire les métriques Prometheus en fin de run (mode threads)")
+    args = parser.parse_args(argv)
+
+    from benchmark.peuplement import peupler, verifier_capacites
+    from utils.metriques import REGISTRE, exposer_metriques
+    from utils.reset_database import ResetDatabase
+
+    # METRIQUES_PORT : métriques consultables pendant le run
+    exposer_metriques()
+
+    if args.reinitialiser:
+        ResetDatabase().lancer()
+
+    donnees = peupler(
+        args.etudiants,
+        capacite_evenement=args.capacite,
+        nb_bus_par_sens=args.bus,
+        capacite_bus=args.capacite_bus,
+        prefixe=f"charge{int(time.time())}",
+    )
+    config = {
+        "mot_de_passe": donnees["mot_de_passe"],
+        "evenements": donnees["evenements"],
+        "proba_annulation": args.proba_annulation,
+    }
+
+    rapport = lancer(donnees["emails"], config, args.workers, args.mode)
+    violations = verifier_capacites()
+    rapport["violations"] = violations
+    rapport["parametres"] = vars(args)
+
+    afficher(rapport, violations)
+    if args.metriques:
+        REGISTRE.ecrire(args.metriques)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rapport, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Optional
+
+
+class Attente:
+
+    """
+    Classe métier représentant une place dans la liste d'attente d'un évènement complet.
+    Elle contient les choix que l'inscription reprendra lors de la promotion.
+    """
+
+    def __init__(
+        self,
+        id_event: int,
+        created_by: int,
+        boit: bool = False,
+        mode_paiement: str = "",
+        id_bus_aller: Optional[int] = None,
+        id_bus_retour: Optional[int] = None,
+        id_attente: Optional[int] = None,
+        created_at: Optional[datetime] = None
+    ):
+        """
+        Constructeur de la classe Attente.
+        """
+        # ========================== VALIDATIONS ==========================
+        if not id_event or not isinstance(id_event, int):
+            raise ValueError("L'ID de l'événement est obligatoire et doit être un entier.")
+
+        if not created_by or not isinstance(created_by, int):
+            raise ValueError("L'ID de l'utilisateur est obligatoire et doit être un entier.")
+
+        if not isinstance(boit, bool):
+            raise TypeError("Le champ 'boit' doit être de type bool.")
+
+        if mode_paiement not in ("espece", "en ligne", ""):
+            raise ValueError("Le mode de paiement doit être 'espece', 'en ligne' ou vide.")
+        # =================================================================
+
+        self.id_attente = id_attente
+        self.id_event = id_event
+        self.created_by = created_by
+        self.boit = boit
+        self.mode_paiement = mode_paiement
+        self.id_bus_aller = id_bus_aller
+        self.id_bus_retour = id_bus_retour
+        self.created_at = created_at
+
+    def __repr__(self):
+        """Représentation texte"""
+        return f"<Attente {self.created_by} - événement {self.id_event}>"
+
+    def to_dict(self) -> dict:
+        """Convertit l'objet en dictionnaire"""
+        return {
+            "id_attente": self.id_attente,
+            "id_event": self.id_event,
+            "created_by": self.created_by,
+            "boit": self.boit,
+            "mode_paiement": self.mode_paiement,
+            "id_bus_aller": self.id_bus_aller,
+            "id_bus_retour": self.id_bus_retour,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "Attente":
+        created_at = data.get("created_at")
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+
+        return Attente(
+            id_attente=data.get("id_attente"),
+            id_event=data.get("id_event"),
+            created_by=data.get("created_by"),
+            boit=data.get("boit", False),
+            mode_paiement=data.get("mode_paiement", ""),
+            id_bus_aller=data.get("id_bus_aller"),
+            id_bus_retour=data.get("id_bus_retour"),
+            created_at=created_at,
+        )
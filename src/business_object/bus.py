@@ -13,6 +13,7 @@ class Bus:
         description (list): Liste des arrêts
         heure_depart (datetime): Heure de départ
         capacite_max (int): Capacité maximale du bus
+        nb_inscrits (int): Nombre d'inscrits (compteur maintenu par la base)
     """
     
     def __init__(
@@ -22,7 +23,8 @@ class Bus:
         heure_depart: str,
         capacite_max: int,
         description: str,
-        id_bus: int = None
+        id_bus: int = None,
+        nb_inscrits: int = 0
     ):
         """
         Constructeur de la classe Bus.
@@ -77,6 +79,7 @@ class Bus:
             self.heure_depart = heure_depart
         
         self.capacite_max = capacite_max
+        self.nb_inscrits = nb_inscrits
     
     @classmethod
     def from_dict(cls, data: dict):
@@ -101,7 +104,8 @@ class Bus:
             heure_depart=heure_depart,
             capacite_max=data.get("capacite_max"),
             description=data.get("description"),
-            id_bus=data.get("id_bus")
+            id_bus=data.get("id_bus"),
+            nb_inscrits=data.get("nb_inscrits") or 0
         )
     
     def to_dict(self):
@@ -117,7 +121,8 @@ class Bus:
             "sens": self.sens,
             "description": self.description,
             "heure_depart": self.heure_depart.strftime("%H:%M") if isinstance(self.heure_depart, datetime) else self.heure_depart,
-            "capacite_max": self.capacite_max
+            "capacite_max": self.capacite_max,
+            "nb_inscrits": self.nb_inscrits
         }
     
     def __repr__(self):
@@ -21,7 +21,8 @@ class Evenement:
         description_event: str = "",
         created_at: Optional[datetime] = None,
         tarif: float = 0.00,
-        statut : str = "en_cours"
+        statut : str = "en_cours",
+        nb_inscrits: int = 0
     ):
         """
         Constructeur de la classe Evenement.
@@ -35,6 +36,7 @@ class Evenement:
         description_event: Description détaillée de l'événement
         created_at: Date de création de l'événement
         tarif: Tarif de participation à l'événement
+        nb_inscrits: Nombre d'inscrits (compteur maintenu par la base)
         """
 
         # ========================== VALIDATIONS ==========================
@@ -85,6 +87,7 @@ class Evenement:
         # Quantize pour garantir exactement 2 décimales
         self.tarif = Decimal(str(tarif)).quantize(Decimal('0.01'))
         self.statut = statut
+        self.nb_inscrits = nb_inscrits
 
     # ************************ Méthodes ***********************************************
 
@@ -128,7 +131,8 @@ class Evenement:
             "created_by": self.created_by,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "tarif": f"{self.tarif:.2f}",  # Formatage avec exactement 2 décimales,
-            "statut": self.statut
+            "statut": self.statut,
+            "nb_inscrits": self.nb_inscrits
             }
 
     @staticmethod
@@ -160,5 +164,6 @@ class Evenement:
             created_at=date_created_at,
             created_by=data.get("created_by"),
             tarif=data.get("tarif", 0),
-            statut=data.get("statut", "en_cours")
+            statut=data.get("statut", "en_cours"),
+            nb_inscrits=data.get("nb_inscrits") or 0
         )
\ No newline at end of file
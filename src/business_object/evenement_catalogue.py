@@ -0,0 +1,80 @@
+from datetime import date
+from decimal import Decimal
+
+
+class EvenementCatalogue:
+    """
+    Ligne du catalogue des événements ouverts (vue matérialisée catalogue_evenement).
+    Objet de lecture seule : il résume un événement pour les écrans de liste,
+    sans passer par Evenement, Bus et Inscription.
+    """
+
+    def __init__(
+        self,
+        id_event: int,
+        titre: str,
+        lieu: str,
+        date_event: date,
+        tarif=0,
+        capacite_max: int = 0,
+        places_restantes: int = 0,
+        nb_bus_aller: int = 0,
+        places_bus_aller: int = 0,
+        nb_bus_retour: int = 0,
+        places_bus_retour: int = 0
+    ):
+        self.id_event = id_event
+        self.titre = titre
+        self.lieu = lieu
+        self.date_event = date_event
+        self.tarif = Decimal(str(tarif)).quantize(Decimal('0.01'))
+        self.capacite_max = capacite_max
+        self.places_restantes = places_restantes
+        self.nb_bus_aller = nb_bus_aller
+        self.places_bus_aller = places_bus_aller
+        self.nb_bus_retour = nb_bus_retour
+        self.places_bus_retour = places_bus_retour
+
+    def __str__(self) -> str:
+        return (
+            f"- ID: {self.id_event}, Titre: {self.titre}, Lieu: {self.lieu}, "
+            f"Date: {self.date_event}, Tarif: {self.tarif:.2f}€, "
+            f"Places restantes: {self.places_restantes}, "
+            f"Bus aller: {self.nb_bus_aller} ({self.places_bus_aller} places), "
+            f"Bus retour: {self.nb_bus_retour} ({self.places_bus_retour} places)"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "id_event": self.id_event,
+            "titre": self.titre,
+            "lieu": self.lieu,
+            "date_event": self.date_event.isoformat() if self.date_event else None,
+            "tarif": f"{self.tarif:.2f}",
+            "capacite_max": self.capacite_max,
+            "places_restantes": self.places_restantes,
+            "nb_bus_aller": self.nb_bus_aller,
+            "places_bus_aller": self.places_bus_aller,
+            "nb_bus_retour": self.nb_bus_retour,
+            "places_bus_retour": self.places_bus_retour,
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "EvenementCatalogue":
+        date_event = data.get("date_event")
+        if isinstance(date_event, str):
+            date_event = date.fromisoformat(date_event)
+
+        return EvenementCatalogue(
+            id_event=data.get("id_event"),
+            titre=data.get("titre", ""),
+            lieu=data.get("lieu", ""),
+            date_event=date_event,
+            tarif=data.get("tarif") or 0,
+            capacite_max=data.get("capacite_max", 0),
+            places_restantes=data.get("places_restantes", 0),
+            nb_bus_aller=data.get("nb_bus_aller", 0),
+            places_bus_aller=data.get("places_bus_aller", 0),
+            nb_bus_retour=data.get("nb_bus_retour", 0),
+            places_bus_retour=data.get("places_bus_retour", 0),
+        )
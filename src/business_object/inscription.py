@@ -12,8 +12,8 @@ class Inscription:
     def __init__(
         self,
         id_event: int,
-        id_bus_aller: int,
-        id_bus_retour: int,
+        id_bus_aller: Optional[int],
+        id_bus_retour: Optional[int],
         code_reservation: Optional[int] = None,
         boit: bool = False,
         mode_paiement: str = "",
@@ -44,9 +44,10 @@ class Inscription:
         if not isinstance(nom_event, str):
             raise ValueError("Le nom de l'événement doit être une chaîne.")
 
-        if not isinstance(id_bus_aller, int):
+        # None : passager pas encore affecté à un bus (voir BusService.affecter_bus)
+        if id_bus_aller is not None and not isinstance(id_bus_aller, int):
             raise TypeError("L'identifiant du bus aller doit être un entier")
-        if not isinstance(id_bus_retour, int):
+        if id_bus_retour is not None and not isinstance(id_bus_retour, int):
             raise TypeError("L'identifiant du bus retour doit être un entier")
         # =================================================================
 
@@ -108,6 +109,6 @@ class Inscription:
             id_event=data.get("id_event", ""),
             nom_event=data.get("nom_event", ""),
             created_at=created_at,
-            id_bus_aller=data.get("id_bus_aller", ""),
-            id_bus_retour=data.get("id_bus_retour", ""),
+            id_bus_aller=data.get("id_bus_aller"),
+            id_bus_retour=data.get("id_bus_retour"),
         )
\ No newline at end of file
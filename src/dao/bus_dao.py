@@ -1,5 +1,173 @@
+from typing import Callable, Optional
 from business_object.bus import Bus
-from dao.db_connection import DBConnection
+from dao.db_connection import DBConnection, executer_lot
+
+# Requêtes partagées avec la DAO asynchrone (dao/bus_dao_async.py)
+COLONNES_BUS = {
+    "id_bus",
+    "id_event",
+    "sens",
+    "description",
+    "heure_depart",
+    "capacite_max",
+    "nb_inscrits"
+}
+
+SQL_CREER_BUS = """
+    INSERT INTO bus (id_event, sens, description, heure_depart, capacite_max)
+    VALUES (%s, %s, %s, %s, %s)
+    RETURNING id_bus;
+"""
+
+# Insertion groupée (execute_values) : une requête pour toute une flotte
+SQL_CREER_BUS_GROUPE = """
+    INSERT INTO bus (id_event, sens, description, heure_depart, capacite_max)
+    VALUES %s
+    RETURNING id_bus;
+"""
+
+SQL_SELECT_BUS = """
+    SELECT id_bus, id_event, sens, description, heure_depart, capacite_max, nb_inscrits
+    FROM bus
+"""
+
+SQL_LISTER_BUS = "SELECT * FROM bus ORDER BY id_event"
+
+SQL_SUPPRIMER_BUS = "DELETE FROM bus WHERE id_bus = %s"
+
+# Verrou de l'événement : une affectation à la fois, les inscriptions attendent
+SQL_VERROUILLER_EVENEMENT = """
+    SELECT id_event FROM evenement WHERE id_event = %(id_event)s FOR UPDATE;
+"""
+
+SQL_BUS_EVENEMENT = """
+    SELECT id_bus, UPPER(sens) AS sens, capacite_max, heure_depart
+    FROM bus
+    WHERE id_event = %(id_event)s
+    ORDER BY id_bus;
+"""
+
+# Passagers par ordre de priorité, avec l'heure de départ de leur bus actuel
+SQL_PASSAGERS_EVENEMENT = """
+    SELECT i.code_reservation, i.id_bus_aller, i.id_bus_retour,
+        ba.heure_depart AS heure_aller, br.heure_depart AS heure_retour
+    FROM inscription i
+    LEFT JOIN bus ba ON ba.id_bus = i.id_bus_aller
+    LEFT JOIN bus br ON br.id_bus = i.id_bus_retour
+    WHERE i.id_event = %(id_event)s
+    ORDER BY i.created_at, i.code_reservation;
+"""
+
+# Départs de tous les bus avec la date de leur événement (index des horaires)
+SQL_HORAIRES_BUS = """
+    SELECT b.id_bus, b.id_event, UPPER(b.sens) AS sens, b.heure_depart, e.date_event
+    FROM bus b
+    JOIN evenement e ON e.id_event = b.id_event
+    WHERE b.heure_depart IS NOT NULL;
+"""
+
+SQL_BUS_A_SUPPRIMER = """
+    SELECT id_event, UPPER(sens) AS sens, heure_depart
+    FROM bus
+    WHERE id_bus = %(id_bus)s;
+"""
+
+# Bus restants du même événement et du même sens, avec leurs places libres
+SQL_BUS_RESTANTS = """
+    SELECT id_bus, GREATEST(capacite_max - nb_inscrits, 0) AS capacite_max, heure_depart
+    FROM bus
+    WHERE id_event = %(id_event)s
+    AND UPPER(sens) = %(sens)s
+    AND id_bus <> %(id_bus)s
+    ORDER BY id_bus;
+"""
+
+# Passagers du bus supprimé, avec de quoi les prévenir
+SQL_PASSAGERS_BUS = """
+    SELECT i.code_reservation, u.email, u.nom, u.prenom, e.titre AS nom_event
+    FROM inscription i
+    JOIN utilisateur u ON u.id_utilisateur = i.created_by
+    JOIN evenement e ON e.id_event = i.id_event
+    WHERE i.{colonne} = %(id_bus)s
+    ORDER BY i.created_at, i.code_reservation;
+"""
+COLONNE_SENS = {"ALLER": "id_bus_aller", "RETOUR": "id_bus_retour"}
+
+# Mise à jour groupée : une seule requête pour toutes les réaffectations.
+# maj_aller / maj_retour indiquent les colonnes à écrire, NULL compris (passager sans place)
+SQL_REAFFECTER = """
+    UPDATE inscription i
+    SET id_bus_aller = CASE WHEN v.maj_aller THEN v.aller ELSE i.id_bus_aller END,
+        id_bus_retour = CASE WHEN v.maj_retour THEN v.retour ELSE i.id_bus_retour END
+    FROM (VALUES %s) AS v(code, maj_aller, aller, maj_retour, retour)
+    WHERE i.code_reservation = v.code;
+"""
+GABARIT_REAFFECTER = "(%s, %s::boolean, %s::int, %s::boolean, %s::int)"
+
+# Besoins en bus de tous les événements ouverts en une requête agrégée :
+# inscrits, inscriptions récentes (rythme de remplissage) et flotte existante par sens
+SQL_BESOINS_FLOTTE = """
+    WITH rythme AS (
+        SELECT id_event, COUNT(*) AS inscriptions_recentes
+        FROM inscription
+        WHERE created_at >= NOW() - make_interval(days => %(fenetre_jours)s)
+        GROUP BY id_event
+    ),
+    flotte AS (
+        SELECT id_event,
+            COUNT(*) FILTER (WHERE UPPER(sens) = 'ALLER') AS nb_bus_aller,
+            COALESCE(SUM(capacite_max) FILTER (WHERE UPPER(sens) = 'ALLER'), 0) AS places_aller,
+            COUNT(*) FILTER (WHERE UPPER(sens) = 'RETOUR') AS nb_bus_retour,
+            COALESCE(SUM(capacite_max) FILTER (WHERE UPPER(sens) = 'RETOUR'), 0) AS places_retour
+        FROM bus
+        GROUP BY id_event
+    )
+    SELECT e.id_event, e.titre, e.date_event, e.capacite_max, e.nb_inscrits,
+        COALESCE(r.inscriptions_recentes, 0) AS inscriptions_recentes,
+        GREATEST(e.date_event - CURRENT_DATE, 0) AS jours_restants,
+        COALESCE(f.nb_bus_aller, 0) AS nb_bus_aller,
+        COALESCE(f.places_aller, 0) AS places_aller,
+        COALESCE(f.nb_bus_retour, 0) AS nb_bus_retour,
+        COALESCE(f.places_retour, 0) AS places_retour
+    FROM evenement e
+    LEFT JOIN rythme r ON r.id_event = e.id_event
+    LEFT JOIN flotte f ON f.id_event = e.id_event
+    WHERE e.statut = 'en_cours'
+    AND (%(id_event)s::int IS NULL OR e.id_event = %(id_event)s::int)
+    ORDER BY e.date_event, e.id_event;
+"""
+
+
+def lignes_reaffectation(plans: dict) -> list[tuple]:
+    """
+    Lignes de SQL_REAFFECTER pour les plans aller et retour d'un événement :
+    les passagers déplacés prennent leur nouveau bus, les passagers non placés
+    perdent le leur (leur place a pu être donnée à un autre).
+
+    plans: {"ALLER": plan, "RETOUR": plan}, avec "affectation" et "non_places"
+
+    return: (code, maj_aller, aller, maj_retour, retour) par réservation modifiée
+    """
+    aller, retour = plans["ALLER"], plans["RETOUR"]
+    a_ecrire_aller = aller["affectation"].keys() | set(aller.get("non_places", ()))
+    a_ecrire_retour = retour["affectation"].keys() | set(retour.get("non_places", ()))
+    return [
+        (code, code in a_ecrire_aller, aller["affectation"].get(code),
+         code in a_ecrire_retour, retour["affectation"].get(code))
+        for code in sorted(a_ecrire_aller | a_ecrire_retour)
+    ]
+
+
+def sql_get_by_bus(column: str) -> str:
+    """Requête de recherche par colonne (colonne vérifiée par liste blanche)."""
+    if column not in COLONNES_BUS:
+        raise ValueError(f"Colonne '{column}' non autorisée.")
+    return SQL_SELECT_BUS + f"WHERE {column} = %(value)s;"
+
+
+def parametres_bus(bus: Bus) -> tuple:
+    """Paramètres d'insertion d'un bus."""
+    return (bus.id_event, bus.sens, bus.description, bus.heure_depart, bus.capacite_max)
 
 
 class BusDAO:
@@ -8,46 +176,29 @@ class BusDAO:
     @staticmethod
     def creer(bus: Bus) -> Bus:
         """Insère un nouveau bus dans la base de données."""
-        query = """
-            INSERT INTO bus (id_event, sens, description, heure_depart, capacite_max)
-            VALUES (%s, %s, %s, %s, %s)
-            RETURNING id_bus;
-        """
         with DBConnection().connection as connection:
             with connection.cursor() as cursor:
-                cursor.execute(
-                    query,
-                    (
-                        bus.id_event,
-                        bus.sens,
-                        bus.description,
-                        bus.heure_depart,
-                        bus.capacite_max,
-                    ),
-                )
+                cursor.execute(SQL_CREER_BUS, parametres_bus(bus))
                 bus.id_bus = cursor.fetchone()["id_bus"]
         return bus
     
+    @staticmethod
+    def creer_plusieurs(bus: list[Bus]) -> list[Bus]:
+        """Insère plusieurs bus en une seule requête ; les id_bus sont renseignés."""
+        if not bus:
+            return []
+        with DBConnection().transaction() as cursor:
+            lignes = executer_lot(cursor, SQL_CREER_BUS_GROUPE, [parametres_bus(b) for b in bus],
+                                  page_size=len(bus), fetch=True)
+        # RETURNING conserve l'ordre des VALUES
+        for b, ligne in zip(bus, lignes):
+            b.id_bus = ligne["id_bus"]
+        return bus
+
     @staticmethod
     def get_by(column: str, value) -> list[Bus]:
         # Liste blanche pour éviter les injections SQL via le nom de colonne
-        allowed_columns = {
-            "id_bus",
-            "id_event",
-            "sens",
-            "description",
-            "heure_depart",
-            "capacite_max"
-        }
-
-        if column not in allowed_columns:
-            raise ValueError(f"Colonne '{column}' non autorisée.")
-
-        query = f"""
-            SELECT id_bus, id_event, sens, description, heure_depart, capacite_max
-            FROM bus
-            WHERE {column} = %(value)s;
-        """
+        query = sql_get_by_bus(column)
 
         with DBConnection().connection.cursor() as cursor:
             cursor.execute(query, {"value": value})
@@ -60,18 +211,129 @@ class BusDAO:
     @staticmethod
     def lister_tous() -> list[Bus]:
         """Retourne tous les bus"""
-        query = "SELECT * FROM bus ORDER BY id_event"
         with DBConnection().connection as connection:
             with connection.cursor() as cursor:
-                cursor.execute(query)
+                cursor.execute(SQL_LISTER_BUS)
                 rows = cursor.fetchall()
                 return [Bus.from_dict(row) for row in rows]
    
+    @staticmethod
+    def lister_horaires() -> list[dict]:
+        """Départs de tous les bus (id_bus, id_event, sens, heure_depart, date_event)."""
+        with DBConnection().connection as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(SQL_HORAIRES_BUS)
+                return [dict(row) for row in cursor.fetchall()]
+
     @staticmethod
     def supprimer(id_bus: int) -> bool:
         """Supprime un bus par son ID."""
-        query = "DELETE FROM bus WHERE id_bus = %s"
         with DBConnection().connection as connection:
             with connection.cursor() as cursor:
-                cursor.execute(query, (id_bus,))
+                cursor.execute(SQL_SUPPRIMER_BUS, (id_bus,))
                 return cursor.rowcount > 0
+
+    @staticmethod
+    def reaffecter(id_event: int, planifier: Callable[[list, list], dict]) -> Optional[dict]:
+        """
+        Recalcule et enregistre l'affectation des passagers d'un événement à ses bus,
+        en une transaction (l'événement est verrouillé le temps du calcul).
+
+        id_event  : ID de l'événement
+        planifier : fonction (bus, passagers) -> {"ALLER": plan, "RETOUR": plan},
+                    chaque plan ayant une clé "affectation" {code_reservation: id_bus}
+
+        return : le résultat de planifier, ou None si l'événement n'existe pas
+        """
+        with DBConnection().transaction() as cursor:
+            cursor.execute(SQL_VERROUILLER_EVENEMENT, {"id_event": id_event})
+            if not cursor.fetchone():
+                return None
+            cursor.execute(SQL_BUS_EVENEMENT, {"id_event": id_event})
+            bus = [dict(row) for row in cursor.fetchall()]
+            cursor.execute(SQL_PASSAGERS_EVENEMENT, {"id_event": id_event})
+            passagers = [dict(row) for row in cursor.fetchall()]
+
+            plans = planifier(bus, passagers)
+
+            lignes = lignes_reaffectation(plans)
+            if lignes:
+                executer_lot(cursor, SQL_REAFFECTER, lignes,
+                             template=GABARIT_REAFFECTER, page_size=len(lignes))
+            return plans
+
+    @staticmethod
+    def besoins_flotte(fenetre_jours: int, id_event: Optional[int] = None) -> list[dict]:
+        """
+        Données de dimensionnement de la flotte des événements en cours.
+
+        fenetre_jours : période (en jours) sur laquelle est mesuré le rythme d'inscription
+        id_event      : limite le calcul à un événement (tous les événements en cours sinon)
+
+        return : une ligne par événement (nb_inscrits, inscriptions_recentes,
+                 jours_restants, nombre de bus et places existants par sens)
+        """
+        with DBConnection().connection as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(SQL_BESOINS_FLOTTE,
+                               {"fenetre_jours": fenetre_jours, "id_event": id_event})
+                return [dict(row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def supprimer_et_redistribuer(id_bus: int, planifier: Callable[[list, list], dict]) -> Optional[dict]:
+        """
+        Supprime un bus et replace ses passagers dans les autres bus de l'événement
+        qui vont dans le même sens, en une transaction.
+
+        id_bus    : ID du bus à supprimer
+        planifier : fonction (bus restants, passagers) -> plan, avec "affectation"
+                    {code_reservation: id_bus} et "non_places" [code_reservation]
+                    (bus restants : capacite_max = places encore libres)
+
+        return : {"id_event", "sens", "replaces": lignes des passagers replacés
+                 (avec id_bus), "non_places": lignes des passagers sans bus},
+                 ou None si le bus n'existe pas
+        """
+        with DBConnection().transaction() as cursor:
+            cursor.execute(SQL_BUS_A_SUPPRIMER, {"id_bus": id_bus})
+            bus = cursor.fetchone()
+            if not bus:
+                return None
+            # Même ordre de verrouillage que les inscriptions : l'événement d'abord
+            cursor.execute(SQL_VERROUILLER_EVENEMENT, {"id_event": bus["id_event"]})
+
+            colonne = COLONNE_SENS.get(bus["sens"])
+            passagers, restants = [], []
+            if colonne:
+                cursor.execute(SQL_PASSAGERS_BUS.format(colonne=colonne), {"id_bus": id_bus})
+                passagers = [dict(row) for row in cursor.fetchall()]
+            if passagers:
+                cursor.execute(SQL_BUS_RESTANTS,
+                               {"id_event": bus["id_event"], "sens": bus["sens"], "id_bus": id_bus})
+                restants = [dict(row) for row in cursor.fetchall()]
+
+            # ON DELETE SET NULL détache les passagers, le trigger met les compteurs à jour
+            cursor.execute(SQL_SUPPRIMER_BUS, (id_bus,))
+
+            affectation = {}
+            if passagers:
+                plan = planifier(restants, [
+                    {"code_reservation": p["code_reservation"], "id_bus": None,
+                     "heure_souhaitee": bus["heure_depart"]}
+                    for p in passagers
+                ])
+                affectation = plan["affectation"]
+            if affectation:
+                aller = colonne == "id_bus_aller"
+                lignes = [(code, aller, nouveau if aller else None, not aller, None if aller else nouveau)
+                          for code, nouveau in affectation.items()]
+                executer_lot(cursor, SQL_REAFFECTER, lignes,
+                             template=GABARIT_REAFFECTER, page_size=len(lignes))
+
+        return {
+            "id_event": bus["id_event"],
+            "sens": bus["sens"],
+            "replaces": [dict(p, id_bus=affectation[p["code_reservation"]])
+                         for p in passagers if p["code_reservation"] in affectation],
+            "non_places": [p for p in passagers if p["code_reservation"] not in affectation],
+        }
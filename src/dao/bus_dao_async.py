@@ -0,0 +1,43 @@
+from business_object.bus import Bus
+from dao.bus_dao import (
+    SQL_CREER_BUS,
+    SQL_LISTER_BUS,
+    SQL_SUPPRIMER_BUS,
+    parametres_bus,
+    sql_get_by_bus,
+)
+from dao.db_connection_async import DBConnectionAsync
+
+
+class BusDAOAsync:
+    """Version asynchrone de BusDAO (mêmes requêtes SQL, même Bus.from_dict)."""
+
+    @staticmethod
+    async def creer(bus: Bus) -> Bus:
+        """Insère un nouveau bus dans la base de données."""
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(SQL_CREER_BUS, parametres_bus(bus))
+            bus.id_bus = (await cursor.fetchone())["id_bus"]
+        return bus
+
+    @staticmethod
+    async def get_by(column: str, value) -> list[Bus]:
+        query = sql_get_by_bus(column)
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(query, {"value": value})
+            rows = await cursor.fetchall()
+        return [Bus.from_dict(row) for row in rows]
+
+    @staticmethod
+    async def lister_tous() -> list[Bus]:
+        """Retourne tous les bus"""
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(SQL_LISTER_BUS)
+            return [Bus.from_dict(row) for row in await cursor.fetchall()]
+
+    @staticmethod
+    async def supprimer(id_bus: int) -> bool:
+        """Supprime un bus par son ID."""
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(SQL_SUPPRIMER_BUS, (id_bus,))
+            return cursor.rowcount > 0
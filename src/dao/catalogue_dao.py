@@ -0,0 +1,46 @@
+from typing import List
+from business_object.evenement_catalogue import EvenementCatalogue
+from dao.db_connection import DBConnection
+from utils.journal import journal
+
+log = journal(__name__)
+
+# Parcours de l'index catalogue_evenement_date_idx
+SQL_LISTER_CATALOGUE = """
+    SELECT id_event, titre, lieu, date_event, tarif, capacite_max,
+        places_restantes, nb_bus_aller, places_bus_aller,
+        nb_bus_retour, places_bus_retour
+    FROM catalogue_evenement
+    ORDER BY date_event, id_event;
+"""
+
+# CONCURRENTLY : les lectures du catalogue ne sont pas bloquées pendant le rafraîchissement.
+# Doit s'exécuter hors transaction (connexion partagée en autocommit).
+SQL_RAFRAICHIR_CATALOGUE = "REFRESH MATERIALIZED VIEW CONCURRENTLY catalogue_evenement;"
+
+
+class CatalogueDAO:
+    """Accès au catalogue des événements ouverts (vue matérialisée)."""
+
+    def lister(self) -> List[EvenementCatalogue]:
+        """Retourne le catalogue, trié par date, en une seule lecture."""
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(SQL_LISTER_CATALOGUE)
+                    return [EvenementCatalogue.from_dict(row) for row in cursor.fetchall()]
+        except Exception:
+            log.exception("dao.catalogue.lister.echec", "Erreur lors de la lecture du catalogue")
+            return []
+
+    def rafraichir(self) -> bool:
+        """Recalcule le catalogue ; True si le rafraîchissement a réussi."""
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(SQL_RAFRAICHIR_CATALOGUE)
+                    return True
+        except Exception:
+            log.exception("dao.catalogue.rafraichir.echec",
+                          "Erreur lors du rafraîchissement du catalogue")
+            return False
@@ -1,9 +1,106 @@
 # dao/db_connection.py
 import os
-import dotenv
-import psycopg2
-from psycopg2.extras import RealDictCursor
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from utils.metriques import histogramme
 from utils.singleton import Singleton
+from utils.traces import span
+
+DUREE_REQUETES = histogramme("bde_dao_requete_secondes",
+                             "Durée d'exécution des requêtes SQL", ("requete",))
+
+# Constantes SQL_* des modules dao, indexées par texte ; chaque module dao est
+# parcouru une fois, quand il apparaît dans sys.modules
+_requetes_connues = {}
+_modules_indexes = set()
+_nb_modules_vus = 0
+
+# Noms des requêtes construites dynamiquement (get_by...), taille bornée
+_noms_construits = {}
+TAILLE_MAX_NOMS = 1000
+
+
+def _indexer_requetes():
+    """Ajoute à l'index les SQL_* des modules dao chargés depuis le dernier appel."""
+    global _nb_modules_vus
+    if len(sys.modules) == _nb_modules_vus:
+        return
+    _nb_modules_vus = len(sys.modules)
+    for nom_module, module in list(sys.modules.items()):
+        if nom_module.startswith("dao.") and nom_module not in _modules_indexes:
+            _modules_indexes.add(nom_module)
+            for variable, valeur in list(vars(module).items()):
+                if variable.startswith("SQL_") and isinstance(valeur, str):
+                    _requetes_connues.setdefault(valeur, variable.lower())
+
+
+def _nom_generique(sql: str) -> str:
+    """Verbe et table de la requête (début du texte seulement)."""
+    texte = sql[:300].lower()
+    verbe = texte.split(None, 1)[0] if texte.strip() else "vide"
+    table = re.search(r"\b(?:from|into|update|view)\s+(?:\w+\.)?(\w+)", texte)
+    return "_".join(["sql", verbe] + ([table.group(1)] if table else []))
+
+
+def nom_requete(sql) -> str:
+    """
+    Nom d'une requête pour les métriques : la constante SQL_* d'un module dao qui
+    la contient, sinon le verbe et la table (requêtes construites, ex. get_by).
+    """
+    if isinstance(sql, bytes):
+        # Texte produit par execute_values, données comprises : jamais mis en cache
+        # (les lots passent par executer_lot, qui donne le nom de leur gabarit)
+        return _nom_generique(sql[:300].decode("utf-8", "replace"))
+    if not isinstance(sql, str):
+        sql = str(sql)
+    nom = _requetes_connues.get(sql) or _noms_construits.get(sql)
+    if nom is None:
+        _indexer_requetes()
+        nom = _requetes_connues.get(sql)
+    if nom is None:
+        nom = _nom_generique(sql)
+        if len(_noms_construits) < TAILLE_MAX_NOMS:
+            _noms_construits[sql] = nom
+    return nom
+
+
+def executer_lot(cursor, sql: str, lignes: list, **options):
+    """
+    execute_values mesuré sous le nom du gabarit `sql` (execute_values exécute un
+    texte où les données sont déjà insérées).
+    """
+    from psycopg2.extras import execute_values
+
+    cursor.nom_lot = nom_requete(sql)
+    try:
+        return execute_values(cursor, sql, lignes, **options)
+    finally:
+        cursor.nom_lot = None
+
+
+def curseur_mesure(classe_curseur):
+    """
+    Sous-classe de curseur qui mesure la durée de chaque execute() par requête
+    (métrique, et span quand les traces sont actives).
+    """
+
+    class CurseurMesure(classe_curseur):
+        # Nom imposé pendant un executer_lot
+        nom_lot = None
+
+        def execute(self, query, vars=None):
+            nom = self.nom_lot or nom_requete(query)
+            debut = time.perf_counter()
+            try:
+                with span(nom):
+                    return super().execute(query, vars)
+            finally:
+                DUREE_REQUETES.observer(time.perf_counter() - debut, requete=nom)
+
+    return CurseurMesure
 
 
 class DBConnection(metaclass=Singleton):
@@ -14,20 +111,61 @@ class DBConnection(metaclass=Singleton):
 
     def __init__(self):
         """Ouverture de la connexion"""
+        # Imports différés : psycopg2 et dotenv ne sont chargés qu'à la première connexion
+        import dotenv
+        import psycopg2
+        from psycopg2.extras import RealDictCursor
+
         dotenv.load_dotenv()
 
-        self.__connection = psycopg2.connect(
+        self.__parametres = dict(
             host=os.environ["POSTGRES_HOST"],
             port=os.environ["POSTGRES_PORT"],
             database=os.environ["POSTGRES_DATABASE"],
             user=os.environ["POSTGRES_USER"],
             password=os.environ["POSTGRES_PASSWORD"],
             options=f"-c search_path={os.environ['POSTGRES_SCHEMA']}",
-            cursor_factory=RealDictCursor,
+            cursor_factory=curseur_mesure(RealDictCursor),
         )
+        self.__connection = psycopg2.connect(**self.__parametres)
 
         self.__connection.autocommit = True
 
+        # Pool des connexions transactionnelles, créé au premier besoin
+        self.__pool = None
+        self.__verrou_pool = threading.Lock()
+        self.__places_pool = None
+
     @property
     def connection(self):
         return self.__connection
+
+    @contextmanager
+    def transaction(self):
+        """
+        Fournit un curseur sur une connexion dédiée, hors autocommit.
+        Tout ce qui est exécuté dans le bloc est validé à la sortie,
+        ou annulé si une exception est levée.
+
+        La connexion partagée reste en autocommit : les transactions passent par un
+        pool (POSTGRES_POOL_MAX connexions, 10 par défaut) pour ne pas se mélanger
+        entre threads.
+        """
+        if self.__pool is None:
+            with self.__verrou_pool:
+                if self.__pool is None:
+                    from psycopg2.pool import ThreadedConnectionPool
+
+                    taille = int(os.environ.get("POSTGRES_POOL_MAX", 10))
+                    self.__places_pool = threading.BoundedSemaphore(taille)
+                    self.__pool = ThreadedConnectionPool(1, taille, **self.__parametres)
+
+        # Attend une connexion libre plutôt que de lever PoolError
+        with self.__places_pool:
+            connection = self.__pool.getconn()
+            try:
+                with connection:
+                    with connection.cursor() as cursor:
+                        yield cursor
+            finally:
+                self.__pool.putconn(connection)
@@ -0,0 +1,54 @@
+# dao/db_connection_async.py
+import os
+from contextlib import asynccontextmanager
+from utils.singleton import Singleton
+
+
+class DBConnectionAsync(metaclass=Singleton):
+    """
+    Pool de connexions asynchrones (psycopg 3) pour les DAO asynchrones.
+    Les connexions renvoient des lignes sous forme de dict, comme le RealDictCursor
+    de DBConnection, ce qui permet de réutiliser les mêmes from_dict.
+    """
+
+    def __init__(self):
+        """Création du pool (ouvert à la première connexion)"""
+        # Imports différés, comme pour DBConnection
+        import dotenv
+        from psycopg.conninfo import make_conninfo
+        from psycopg.rows import dict_row
+        from psycopg_pool import AsyncConnectionPool
+
+        dotenv.load_dotenv()
+
+        conninfo = make_conninfo(
+            host=os.environ["POSTGRES_HOST"],
+            port=os.environ["POSTGRES_PORT"],
+            dbname=os.environ["POSTGRES_DATABASE"],
+            user=os.environ["POSTGRES_USER"],
+            password=os.environ["POSTGRES_PASSWORD"],
+            options=f"-c search_path={os.environ['POSTGRES_SCHEMA']}",
+        )
+        self.__pool = AsyncConnectionPool(
+            conninfo,
+            min_size=int(os.environ.get("POSTGRES_POOL_ASYNC_MIN", 2)),
+            max_size=int(os.environ.get("POSTGRES_POOL_ASYNC_MAX", 20)),
+            kwargs={"row_factory": dict_row, "autocommit": True},
+            open=False,
+        )
+
+    @property
+    def pool(self):
+        return self.__pool
+
+    @asynccontextmanager
+    async def connexion(self):
+        """Emprunte une connexion au pool (ouvert au premier appel)."""
+        if self.__pool.closed:
+            await self.__pool.open()
+        async with self.__pool.connection() as connection:
+            yield connection
+
+    async def fermer(self):
+        """Ferme le pool et toutes ses connexions."""
+        await self.__pool.close()
@@ -1,9 +1,131 @@
 from typing import List, Optional
 from dao.db_connection import DBConnection
+from dao.liste_attente_dao import ListeAttenteDAO
 from business_object.evenement import Evenement
 from utils.singleton import Singleton
 from datetime import datetime
 from datetime import date
+from utils.journal import journal
+
+log = journal(__name__)
+
+# Requêtes partagées avec la DAO asynchrone (dao/evenement_dao_async.py)
+COLONNES_EVENEMENT = {
+    "id_event",
+    "titre",
+    "description_event",
+    "lieu",
+    "date_event",
+    "capacite_max",
+    "created_by",
+    "created_at",
+    "tarif",
+    "statut",
+    "nb_inscrits"
+}
+
+SQL_CREER_EVENEMENT = """
+    INSERT INTO evenement (
+        titre, description_event, lieu, 
+        date_event, capacite_max, created_by, 
+        created_at, tarif, statut
+    )
+    VALUES (%(titre)s, %(description_event)s, %(lieu)s, 
+            %(date_event)s, %(capacite_max)s, %(created_by)s,
+            %(created_at)s, %(tarif)s, %(statut)s)
+    RETURNING id_event;
+"""
+
+SQL_SELECT_EVENEMENT = """
+    SELECT id_event, titre, description_event, lieu,
+        date_event, capacite_max, created_by,
+        created_at, tarif, statut, nb_inscrits
+    FROM evenement
+"""
+
+SQL_LISTER_EVENEMENTS = SQL_SELECT_EVENEMENT + "ORDER BY date_event DESC;"
+
+SQL_SUPPRIMER_EVENEMENT = """
+    DELETE FROM evenement
+    WHERE id_event = %(id_event)s;
+"""
+
+# Destinataires d'une diffusion : un inscrit par ligne, en une seule jointure
+SQL_DESTINATAIRES_EVENEMENT = """
+    SELECT u.email, u.nom, u.prenom
+    FROM inscription i
+    JOIN utilisateur u ON u.id_utilisateur = i.created_by
+    WHERE i.id_event = %(id_event)s
+    ORDER BY i.code_reservation;
+"""
+
+SQL_MODIFIER_STATUT = """
+    UPDATE evenement
+    SET statut = %(statut)s
+    WHERE id_event = %(id_event)s;
+"""
+
+# La capacité ne peut pas descendre sous le nombre d'inscrits
+SQL_MODIFIER_CAPACITE = """
+    UPDATE evenement
+    SET capacite_max = %(capacite_max)s
+    WHERE id_event = %(id_event)s
+    AND %(capacite_max)s >= nb_inscrits
+    RETURNING id_event;
+"""
+
+# Écarts entre les compteurs nb_inscrits et le décompte réel des inscriptions
+SQL_ECARTS_COMPTEURS = """
+    SELECT 'evenement' AS table_compteur, e.id_event AS id,
+        e.nb_inscrits, COUNT(i.code_reservation) AS attendu
+    FROM evenement e
+    LEFT JOIN inscription i ON i.id_event = e.id_event
+    GROUP BY e.id_event
+    HAVING e.nb_inscrits <> COUNT(i.code_reservation)
+    UNION ALL
+    SELECT 'bus', b.id_bus,
+        b.nb_inscrits, COUNT(i.code_reservation)
+    FROM bus b
+    LEFT JOIN inscription i ON b.id_bus IN (i.id_bus_aller, i.id_bus_retour)
+    GROUP BY b.id_bus
+    HAVING b.nb_inscrits <> COUNT(i.code_reservation)
+    ORDER BY 1, 2;
+"""
+
+# Les écritures sur inscription attendent la fin de la correction
+SQL_VERROUILLER_INSCRIPTIONS = "LOCK TABLE inscription IN SHARE MODE;"
+
+SQL_CORRIGER_COMPTEURS = """
+    UPDATE evenement e
+    SET nb_inscrits = (SELECT COUNT(*) FROM inscription i WHERE i.id_event = e.id_event);
+    UPDATE bus b
+    SET nb_inscrits = (
+        SELECT COUNT(*) FROM inscription i WHERE b.id_bus IN (i.id_bus_aller, i.id_bus_retour)
+    );
+"""
+
+
+def sql_get_by_evenement(column: str) -> str:
+    """Requête de recherche par colonne (colonne vérifiée par liste blanche)."""
+    if column not in COLONNES_EVENEMENT:
+        raise ValueError(f"Colonne '{column}' non autorisée.")
+    return SQL_SELECT_EVENEMENT + f"WHERE {column} = %(value)s;"
+
+
+def parametres_evenement(evenement: Evenement) -> dict:
+    """Paramètres d'insertion d'un événement."""
+    return {
+        "titre": evenement.titre,
+        "description_event": evenement.description_event,
+        "lieu": evenement.lieu,
+        "date_event": evenement.date_event,
+        "capacite_max": evenement.capacite_max,
+        "created_by": evenement.created_by,
+        "created_at": evenement.created_at,
+        "tarif": float(evenement.tarif),
+        "statut": evenement.statut,
+    }
+
 
 class EvenementDAO(metaclass=Singleton):
     """
@@ -23,94 +145,40 @@ class EvenementDAO(metaclass=Singleton):
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        INSERT INTO evenement (
-                            titre, description_event, lieu, 
-                            date_event, capacite_max, created_by, 
-                            created_at, tarif, statut
-                        )
-                        VALUES (%(titre)s, %(description_event)s, %(lieu)s, 
-                                %(date_event)s, %(capacite_max)s, %(created_by)s,
-                                %(created_at)s, %(tarif)s, %(statut)s)
-                        RETURNING id_event;
-                        """,
-                        {
-                            "titre": evenement.titre,
-                            "description_event": evenement.description_event,
-                            "lieu": evenement.lieu,
-                            "date_event": evenement.date_event,
-                            "capacite_max": evenement.capacite_max,
-                            "created_by": evenement.created_by,
-                            "created_at": evenement.created_at,
-                            "tarif": float(evenement.tarif),
-                            "statut": evenement.statut,
-                        },
-                    )
+                    cursor.execute(SQL_CREER_EVENEMENT, parametres_evenement(evenement))
                     result = cursor.fetchone()
                     if result:
                         evenement.id_event = result["id_event"]
                         return True
                     return False
-        except Exception as e:
-            print(f"Erreur lors de la création de l'événement : {e}")
+        except Exception:
+            log.exception("dao.evenement.creer.echec", "Erreur lors de la création de l'événement")
             return False
 
     def lister_tous(self) -> List[Evenement]:
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT id_event, titre, description_event, lieu,
-                            date_event, capacite_max, created_by,
-                            created_at, tarif, statut
-                        FROM evenement
-                        ORDER BY date_event DESC;
-                        """
-                    )
+                    cursor.execute(SQL_LISTER_EVENEMENTS)
                     rows = cursor.fetchall()
 
-                    evenements = []
-                    for row in rows:
-                        # transformer chaque tuple SQL en dict
-                        columns = [desc[0] for desc in cursor.description]
-                        row_dict = dict(zip(columns, row))
-
-                        # reconstruire proprement l'objet métier
-                        evenements.append(Evenement.from_dict(row_dict))
-
-                    return evenements
+                    # Lignes dict (RealDictCursor) ou tuples : on reconstruit un dict
+                    columns = [desc[0] for desc in cursor.description or []]
+                    return [
+                        Evenement.from_dict(
+                            row if isinstance(row, dict) else dict(zip(columns, row))
+                        )
+                        for row in rows
+                    ]
 
-        except Exception as e:
-            print(f"Erreur lors de la récupération des événements : {e}")
+        except Exception:
+            log.exception("dao.evenement.lister_tous.echec",
+                          "Erreur lors de la récupération des événements")
             return []
 
     def get_by(self, column: str, value) -> list[Evenement]:
         # Liste blanche pour éviter les injections SQL via le nom de colonne
-        allowed_columns = {
-            "id_event",
-            "titre",
-            "description_event",
-            "lieu",
-            "date_event",
-            "capacite_max",
-            "created_by",
-            "created_at",
-            "tarif",
-            "statut"
-        }
-
-        if column not in allowed_columns:
-            raise ValueError(f"Colonne '{column}' non autorisée.")
-
-        query = f"""
-            SELECT id_event, titre, description_event, lieu,
-                date_event, capacite_max, created_by,
-                created_at, tarif, statut
-            FROM evenement
-            WHERE {column} = %(value)s;
-        """
+        query = sql_get_by_evenement(column)
 
         with DBConnection().connection.cursor() as cursor:
             cursor.execute(query, {"value": value})
@@ -132,18 +200,29 @@ class EvenementDAO(metaclass=Singleton):
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        DELETE FROM evenement
-                        WHERE id_event = %(id_event)s;
-                        """,
-                        {"id_event": evenement.id_event},
-                    )
+                    cursor.execute(SQL_SUPPRIMER_EVENEMENT, {"id_event": evenement.id_event})
                     return cursor.rowcount > 0
-        except Exception as e:
-            print(f"Erreur lors de la suppression de l'événement : {e}")
+        except Exception:
+            log.exception("dao.evenement.supprimer.echec",
+                          "Erreur lors de la suppression de l'événement")
             return False
 
+    def destinataires(self, id_event: int) -> List[dict]:
+        """
+        Adresses des inscrits d'un événement, pour une diffusion.
+
+        return : liste de dicts {email, nom, prenom}, vide en cas d'erreur
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(SQL_DESTINATAIRES_EVENEMENT, {"id_event": id_event})
+                    return [dict(row) for row in cursor.fetchall()]
+        except Exception:
+            log.exception("dao.evenement.destinataires.echec",
+                          "Erreur lors de la récupération des inscrits")
+            return []
+
     def modifier_statut(self, id_event: int, nouveau_statut: str) -> bool:
         """
         Met à jour uniquement le statut d'un événement dans la base de données.
@@ -157,17 +236,49 @@ class EvenementDAO(metaclass=Singleton):
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
-                        """
-                        UPDATE evenement
-                        SET statut = %(statut)s
-                        WHERE id_event = %(id_event)s;
-                        """,
-                        {
-                            "statut": nouveau_statut,
-                            "id_event": id_event
-                        },
+                        SQL_MODIFIER_STATUT, {"statut": nouveau_statut, "id_event": id_event}
                     )
                     return cursor.rowcount > 0
-        except Exception as e:
-            print(f"Erreur lors de la mise à jour du statut : {e}")
+        except Exception:
+            log.exception("dao.evenement.modifier_statut.echec",
+                          "Erreur lors de la mise à jour du statut")
             return False
+
+    def modifier_capacite(self, id_event: int, capacite_max: int) -> Optional[List[dict]]:
+        """
+        Modifie la capacité d'un événement et, dans la même transaction, promeut
+        la liste d'attente sur les places ajoutées.
+
+        return : inscriptions créées par la promotion (éventuellement vide),
+                 ou None si la capacité n'a pas pu être modifiée
+        """
+        try:
+            with DBConnection().transaction() as cursor:
+                cursor.execute(
+                    SQL_MODIFIER_CAPACITE, {"capacite_max": capacite_max, "id_event": id_event}
+                )
+                if not cursor.fetchone():
+                    return None
+                return ListeAttenteDAO.promouvoir(cursor, id_event)
+        except Exception:
+            log.exception("dao.evenement.modifier_capacite.echec",
+                          "Erreur lors de la modification de la capacité")
+            return None
+
+    def verifier_compteurs(self, corriger: bool = False) -> List[dict]:
+        """
+        Recalcule les compteurs nb_inscrits des événements et des bus
+        à partir des inscriptions et retourne les écarts constatés.
+
+        corriger : si True, les compteurs sont recalculés dans la même transaction
+
+        return : liste de dicts {table_compteur, id, nb_inscrits, attendu}
+        """
+        with DBConnection().transaction() as cursor:
+            if corriger:
+                cursor.execute(SQL_VERROUILLER_INSCRIPTIONS)
+            cursor.execute(SQL_ECARTS_COMPTEURS)
+            ecarts = [dict(row) for row in cursor.fetchall()]
+            if corriger and ecarts:
+                cursor.execute(SQL_CORRIGER_COMPTEURS)
+        return ecarts
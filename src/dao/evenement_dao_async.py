@@ -0,0 +1,93 @@
+from typing import List
+from dao.db_connection_async import DBConnectionAsync
+from dao.evenement_dao import (
+    SQL_CREER_EVENEMENT,
+    SQL_LISTER_EVENEMENTS,
+    SQL_MODIFIER_STATUT,
+    SQL_SUPPRIMER_EVENEMENT,
+    parametres_evenement,
+    sql_get_by_evenement,
+)
+from business_object.evenement import Evenement
+from utils.singleton import Singleton
+from utils.journal import journal
+
+log = journal(__name__)
+
+
+class EvenementDAOAsync(metaclass=Singleton):
+    """
+    Version asynchrone d'EvenementDAO : mêmes requêtes SQL, même hydratation
+    (Evenement.from_dict), exécutées sur le pool psycopg 3 de DBConnectionAsync.
+    """
+
+    async def creer(self, evenement: Evenement) -> bool:
+        """
+        Crée un nouvel événement dans la base de données.
+
+        return: True si création réussie, False sinon
+        """
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(
+                    SQL_CREER_EVENEMENT, parametres_evenement(evenement)
+                )
+                result = await cursor.fetchone()
+                if result:
+                    evenement.id_event = result["id_event"]
+                    return True
+                return False
+        except Exception:
+            log.exception("dao.evenement.creer.echec", "Erreur lors de la création de l'événement")
+            return False
+
+    async def lister_tous(self) -> List[Evenement]:
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(SQL_LISTER_EVENEMENTS)
+                return [Evenement.from_dict(row) for row in await cursor.fetchall()]
+        except Exception:
+            log.exception("dao.evenement.lister_tous.echec",
+                          "Erreur lors de la récupération des événements")
+            return []
+
+    async def get_by(self, column: str, value) -> list[Evenement]:
+        query = sql_get_by_evenement(column)
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(query, {"value": value})
+            rows = await cursor.fetchall()
+        return [Evenement.from_dict(row) for row in rows]
+
+    async def supprimer(self, evenement: Evenement) -> bool:
+        """
+        Supprime un événement de la base de données.
+
+        return: True si suppression réussie, False sinon
+        """
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(
+                    SQL_SUPPRIMER_EVENEMENT, {"id_event": evenement.id_event}
+                )
+                return cursor.rowcount > 0
+        except Exception:
+            log.exception("dao.evenement.supprimer.echec",
+                          "Erreur lors de la suppression de l'événement")
+            return False
+
+    async def modifier_statut(self, id_event: int, nouveau_statut: str) -> bool:
+        """
+        Met à jour uniquement le statut d'un événement.
+
+        return : True si la mise à jour a réussi, False sinon
+        """
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(
+                    SQL_MODIFIER_STATUT, {"statut": nouveau_statut, "id_event": id_event}
+                )
+                return cursor.rowcount > 0
+        except Exception:
+            log.exception("dao.evenement.modifier_statut.echec",
+                          "Erreur lors de la mise à jour du statut")
+            return False
@@ -1,6 +1,220 @@
 from dao.db_connection import DBConnection
+from dao.liste_attente_dao import ListeAttenteDAO
 from typing import Optional, List
 from business_object.inscription import Inscription
+from utils.journal import journal
+
+log = journal(__name__)
+
+# Requêtes partagées avec la DAO asynchrone (dao/inscription_dao_async.py)
+COLONNES_INSCRIPTION = {
+    "code_reservation",
+    "boit",
+    "created_by",
+    "mode_paiement",
+    "id_event",
+    "id_bus_aller",
+    "id_bus_retour",
+    "created_at"
+}
+
+# Toute inscription retire l'utilisateur de la liste d'attente de l'événement,
+# dans la même requête (sinon la promotion le réinscrirait)
+SQL_CREER_INSCRIPTION = """
+    WITH cree AS (
+        INSERT INTO inscription
+        (code_reservation, boit, created_by, mode_paiement,
+         id_event, id_bus_aller, id_bus_retour, created_at)
+        VALUES (%(code_reservation)s, %(boit)s, %(created_by)s,
+                %(mode_paiement)s, %(id_event)s,
+                %(id_bus_aller)s, %(id_bus_retour)s, %(created_at)s)
+        RETURNING code_reservation, id_event, created_by
+    ),
+    retrait_attente AS (
+        DELETE FROM liste_attente l
+        USING cree c
+        WHERE l.id_event = c.id_event AND l.created_by = c.created_by
+    )
+    SELECT code_reservation FROM cree;
+"""
+
+SQL_SELECT_INSCRIPTION = """
+    SELECT code_reservation, boit, created_by, mode_paiement, 
+        id_event, id_bus_aller, id_bus_retour, created_at
+    FROM inscription
+"""
+
+SQL_LISTER_INSCRIPTIONS = SQL_SELECT_INSCRIPTION + ";"
+
+# Compteur maintenu par trigger (voir data/init_db.sql) : lecture d'une seule ligne
+SQL_COMPTER_PAR_EVENEMENT = """
+    SELECT nb_inscrits as count
+    FROM evenement
+    WHERE id_event = %(id_event)s;
+"""
+
+SQL_SUPPRIMER_INSCRIPTION = """
+    DELETE FROM inscription
+    WHERE code_reservation = %(code_reservation)s;
+"""
+
+SQL_SUPPRIMER_INSCRIPTION_RETOURNER_EVENEMENT = """
+    DELETE FROM inscription
+    WHERE code_reservation = %(code_reservation)s
+    RETURNING id_event;
+"""
+
+SQL_EST_DEJA_INSCRIT = """
+    SELECT 1
+    FROM inscription
+    WHERE created_by = %(created_by)s
+    AND id_event = %(id_event)s
+    LIMIT 1;
+"""
+
+
+# Inscriptions groupées : verrous pris dans l'ordre événement puis bus (comme le trigger)
+SQL_VERROUILLER_PLACES_EVENEMENT = """
+    SELECT titre, statut, capacite_max - nb_inscrits AS places
+    FROM evenement
+    WHERE id_event = %(id_event)s
+    FOR UPDATE;
+"""
+
+SQL_VERROUILLER_PLACES_BUS = """
+    SELECT id_bus, id_event, UPPER(sens) AS sens, capacite_max - nb_inscrits AS places
+    FROM bus
+    WHERE id_bus = ANY(%(ids)s::int[])
+    ORDER BY id_bus
+    FOR UPDATE;
+"""
+
+# Validation de tous les membres d'un groupe en une requête (par id ou par e-mail)
+SQL_MEMBRES_GROUPE = """
+    SELECT u.id_utilisateur, u.email, u.nom, u.prenom,
+        (i.created_by IS NOT NULL) AS deja_inscrit
+    FROM utilisateur u
+    LEFT JOIN inscription i
+        ON i.created_by = u.id_utilisateur AND i.id_event = %(id_event)s
+    WHERE u.id_utilisateur = ANY(%(ids)s::int[])
+    OR u.email = ANY(%(emails)s::text[]);
+"""
+
+# Insertion multi-lignes : une requête pour tout le groupe
+SQL_CREER_GROUPE = """
+    WITH crees AS (
+        INSERT INTO inscription
+        (code_reservation, boit, created_by, mode_paiement,
+         id_event, id_bus_aller, id_bus_retour)
+        SELECT nouveau_code_reservation(), m.boit, m.created_by, m.mode_paiement,
+            %(id_event)s, %(id_bus_aller)s, %(id_bus_retour)s
+        FROM unnest(%(created_by)s::int[], %(boit)s::boolean[], %(mode_paiement)s::text[])
+            AS m(created_by, boit, mode_paiement)
+        RETURNING code_reservation, boit, created_by, mode_paiement,
+            id_event, id_bus_aller, id_bus_retour, created_at
+    ),
+    retrait_attente AS (
+        DELETE FROM liste_attente l
+        USING crees c
+        WHERE l.id_event = c.id_event AND l.created_by = c.created_by
+    )
+    SELECT * FROM crees;
+"""
+
+
+# Transfert d'une réservation en une requête : la ligne est verrouillée par l'UPDATE,
+# le destinataire ne doit pas déjà être inscrit (garanti par la contrainte unique)
+# et quitte la liste d'attente de l'événement s'il y figurait.
+SQL_TRANSFERER_INSCRIPTION = """
+    WITH transfert AS (
+        UPDATE inscription i
+        SET created_by = dest.id_utilisateur
+        FROM utilisateur dest, utilisateur src, evenement e
+        WHERE i.code_reservation = %(code_reservation)s
+        AND i.created_by = %(cedant)s
+        AND dest.email = %(email)s
+        AND dest.id_utilisateur <> i.created_by
+        AND src.id_utilisateur = i.created_by
+        AND e.id_event = i.id_event
+        AND NOT EXISTS (
+            SELECT 1 FROM inscription j
+            WHERE j.id_event = i.id_event AND j.created_by = dest.id_utilisateur
+        )
+        RETURNING i.code_reservation, i.boit, i.created_by, i.mode_paiement,
+            i.id_event, i.id_bus_aller, i.id_bus_retour, i.created_at,
+            e.titre AS nom_event, dest.email, dest.nom, dest.prenom,
+            src.email AS email_cedant, src.nom AS nom_cedant, src.prenom AS prenom_cedant
+    ),
+    retrait_attente AS (
+        DELETE FROM liste_attente l
+        USING transfert t
+        WHERE l.id_event = t.id_event AND l.created_by = t.created_by
+    )
+    SELECT * FROM transfert;
+"""
+
+
+# Inscription à plusieurs événements : tous les événements choisis en une requête
+SQL_VERROUILLER_EVENEMENTS = """
+    SELECT e.id_event, e.titre, e.statut, e.capacite_max - e.nb_inscrits AS places,
+        EXISTS (
+            SELECT 1 FROM inscription i
+            WHERE i.id_event = e.id_event AND i.created_by = %(created_by)s
+        ) AS deja_inscrit
+    FROM evenement e
+    WHERE e.id_event = ANY(%(ids)s::int[])
+    ORDER BY e.id_event
+    FOR UPDATE OF e;
+"""
+
+SQL_UTILISATEUR_INSCRIPTION = """
+    SELECT id_utilisateur, email, nom, prenom
+    FROM utilisateur
+    WHERE id_utilisateur = %(created_by)s;
+"""
+
+SQL_CREER_MULTIPLES = """
+    WITH crees AS (
+        INSERT INTO inscription
+        (code_reservation, boit, created_by, mode_paiement,
+         id_event, id_bus_aller, id_bus_retour)
+        SELECT nouveau_code_reservation(), %(boit)s, %(created_by)s, %(mode_paiement)s,
+            c.id_event, c.id_bus_aller, c.id_bus_retour
+        FROM unnest(%(id_event)s::int[], %(id_bus_aller)s::int[], %(id_bus_retour)s::int[])
+            WITH ORDINALITY AS c(id_event, id_bus_aller, id_bus_retour, rang)
+        ORDER BY c.rang
+        RETURNING code_reservation, boit, created_by, mode_paiement,
+            id_event, id_bus_aller, id_bus_retour, created_at
+    ),
+    retrait_attente AS (
+        DELETE FROM liste_attente l
+        USING crees c
+        WHERE l.id_event = c.id_event AND l.created_by = c.created_by
+    )
+    SELECT * FROM crees;
+"""
+
+
+def sql_get_by_inscription(column: str) -> str:
+    """Requête de recherche par colonne (colonne vérifiée par liste blanche)."""
+    if column not in COLONNES_INSCRIPTION:
+        raise ValueError(f"Colonne '{column}' non autorisée.")
+    return SQL_SELECT_INSCRIPTION + f"WHERE {column} = %(value)s;"
+
+
+def parametres_inscription(inscription: Inscription) -> dict:
+    """Paramètres d'insertion d'une inscription."""
+    return {
+        "code_reservation": inscription.code_reservation,
+        "boit": inscription.boit,
+        "created_by": inscription.created_by,
+        "mode_paiement": inscription.mode_paiement,
+        "id_event": inscription.id_event,
+        "id_bus_aller": inscription.id_bus_aller,
+        "id_bus_retour": inscription.id_bus_retour,
+        "created_at": inscription.created_at,
+    }
+
 
 class InscriptionDAO:
 
@@ -15,57 +229,19 @@ class InscriptionDAO:
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        INSERT INTO inscription 
-                        (code_reservation, boit, created_by, mode_paiement, 
-                         id_event, id_bus_aller, id_bus_retour, created_at)
-                        VALUES (%(code_reservation)s, %(boit)s, %(created_by)s, 
-                                %(mode_paiement)s, %(id_event)s, 
-                                %(id_bus_aller)s, %(id_bus_retour)s, %(created_at)s)
-                        RETURNING code_reservation;
-                        """,
-                        {
-                            "code_reservation": inscription.code_reservation,
-                            "boit": inscription.boit,
-                            "created_by": inscription.created_by,
-                            "mode_paiement": inscription.mode_paiement,
-                            "id_event": inscription.id_event,
-                            "id_bus_aller": inscription.id_bus_aller,
-                            "id_bus_retour": inscription.id_bus_retour,
-                            "created_at": inscription.created_at,
-                        },
-                    )
+                    cursor.execute(SQL_CREER_INSCRIPTION, parametres_inscription(inscription))
                     code_reservation = cursor.fetchone()["code_reservation"]
                     inscription.code_reservation = code_reservation
                     return inscription
 
-        except Exception as e:
-            print(f"Erreur lors de la création de l'inscription : {e}")
+        except Exception:
+            log.exception("dao.inscription.creer.echec",
+                          "Erreur lors de la création de l'inscription")
             return None
 
     def get_by(self, column: str, value) -> list[Inscription]:
         # Liste blanche pour éviter les injections SQL via le nom de colonne
-        allowed_columns = {
-            "code_reservation",
-            "boit",
-            "created_by",
-            "mode_paiement",
-            "id_event",
-            "id_bus_aller",
-            "id_bus_retour",
-            "created_at"
-        }
-
-        if column not in allowed_columns:
-            raise ValueError(f"Colonne '{column}' non autorisée.")
-
-        query = f"""
-            SELECT code_reservation, boit, created_by, mode_paiement, 
-                id_event, id_bus_aller, id_bus_retour, created_at
-            FROM inscription
-            WHERE {column} = %(value)s;
-        """
+        query = sql_get_by_inscription(column)
 
         with DBConnection().connection.cursor() as cursor:
             cursor.execute(query, {"value": value})
@@ -84,13 +260,7 @@ class InscriptionDAO:
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT code_reservation, boit, created_by, mode_paiement,
-                               id_event, id_bus_aller, id_bus_retour, created_at
-                        FROM inscription;
-                        """
-                    )
+                    cursor.execute(SQL_LISTER_INSCRIPTIONS)
                     rows = cursor.fetchall()
                     return [
                         Inscription(
@@ -105,8 +275,9 @@ class InscriptionDAO:
                         )
                         for row in rows
                     ]
-        except Exception as e:
-            print(f"Erreur lors du listage des inscriptions : {e}")
+        except Exception:
+            log.exception("dao.inscription.lister_toutes.echec",
+                          "Erreur lors du listage des inscriptions")
             return []
 
     def compter_par_evenement(self, id_event: int) -> int:
@@ -116,18 +287,12 @@ class InscriptionDAO:
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    cursor.execute(
-                        """
-                        SELECT COUNT(*) as count
-                        FROM inscription 
-                        WHERE id_event = %(id_event)s;
-                        """,
-                        {"id_event": id_event}
-                    )
+                    cursor.execute(SQL_COMPTER_PAR_EVENEMENT, {"id_event": id_event})
                     resultat = cursor.fetchone()
                     return resultat["count"] if resultat else 0
-        except Exception as e:
-            print(f"Erreur lors du comptage des inscriptions : {e}")
+        except Exception:
+            log.exception("dao.inscription.compter_par_evenement.echec",
+                          "Erreur lors du comptage des inscriptions")
             return 0
 
     def supprimer(self, inscription: Inscription) -> bool:
@@ -142,16 +307,14 @@ class InscriptionDAO:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
-                        """
-                        DELETE FROM inscription
-                        WHERE code_reservation = %(code_reservation)s;
-                        """,
+                        SQL_SUPPRIMER_INSCRIPTION,
                         {"code_reservation": inscription.code_reservation},
                     )
                     return cursor.rowcount > 0
 
-        except Exception as e:
-            print(f"Erreur lors de la suppression de l'inscription : {e}")
+        except Exception:
+            log.exception("dao.inscription.supprimer.echec",
+                          "Erreur lors de la suppression de l'inscription")
             return False
 
     def est_deja_inscrit(self, created_by: int, id_event: int) -> bool:
@@ -167,17 +330,252 @@ class InscriptionDAO:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
                     cursor.execute(
-                        """
-                        SELECT 1
-                        FROM inscription
-                        WHERE created_by = %(created_by)s
-                        AND id_event = %(id_event)s
-                        LIMIT 1;
-                        """,
-                        {"created_by": created_by, "id_event": id_event}
+                        SQL_EST_DEJA_INSCRIT, {"created_by": created_by, "id_event": id_event}
                     )
                     return cursor.fetchone() is not None
 
-        except Exception as e:
-            print(f"Erreur lors de la vérification de l'inscription : {e}")
+        except Exception:
+            log.exception("dao.inscription.est_deja_inscrit.echec",
+                          "Erreur lors de la vérification de l'inscription")
             return False
+
+    def supprimer_et_promouvoir(self, inscription: Inscription) -> Optional[List[dict]]:
+        """
+        Supprime une inscription et, dans la même transaction, promeut la liste
+        d'attente de l'événement sur la place libérée.
+
+        inscription : Objet Inscription à supprimer (doit contenir code_reservation)
+
+        return : inscriptions créées par la promotion (éventuellement vide),
+                 ou None si la suppression a échoué
+        """
+        try:
+            with DBConnection().transaction() as cursor:
+                cursor.execute(
+                    SQL_SUPPRIMER_INSCRIPTION_RETOURNER_EVENEMENT,
+                    {"code_reservation": inscription.code_reservation},
+                )
+                supprimee = cursor.fetchone()
+                if not supprimee:
+                    return None
+                return ListeAttenteDAO.promouvoir(cursor, supprimee["id_event"])
+
+        except Exception:
+            log.exception("dao.inscription.supprimer_et_promouvoir.echec",
+                          "Erreur lors de la suppression de l'inscription")
+            return None
+
+    def transferer(self, code_reservation: int, cedant: int, email_destinataire: str) -> Optional[dict]:
+        """
+        Transfère une réservation à un autre utilisateur en une seule requête :
+        mêmes bus et même code, seul le titulaire change.
+
+        code_reservation   : code de la réservation à céder
+        cedant             : ID du titulaire actuel
+        email_destinataire : e-mail du nouveau titulaire
+
+        return : la réservation transférée (avec nom_event et les coordonnées des deux
+                 utilisateurs), ou None si le transfert est impossible
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(SQL_TRANSFERER_INSCRIPTION, {
+                        "code_reservation": code_reservation,
+                        "cedant": cedant,
+                        "email": email_destinataire,
+                    })
+                    resultat = cursor.fetchone()
+                    return dict(resultat) if resultat else None
+        except Exception:
+            log.exception("dao.inscription.transferer.echec",
+                          "Erreur lors du transfert de l'inscription")
+            return None
+
+    def creer_multiples(self, created_by: int, choix: List[tuple], boit: bool,
+                        mode_paiement: str, tout_ou_rien: bool = True) -> Optional[dict]:
+        """
+        Inscrit un utilisateur à plusieurs événements en une transaction.
+        Les événements puis les bus choisis sont verrouillés et lus en une requête
+        chacun, les places sont vérifiées pour l'ensemble des choix, et les
+        inscriptions acceptées sont insérées en une seule requête.
+
+        choix        : liste de (id_event, id_bus_aller, id_bus_retour)
+        tout_ou_rien : True pour ne rien inscrire si un choix est refusé,
+                       False pour inscrire tous les choix possibles
+
+        return : {"utilisateur": {email, nom, prenom}, "inscriptions": lignes créées
+                 (avec nom_event), "refus": [{"id_event", "motif"}]},
+                 ou None si l'utilisateur est introuvable ou en cas d'erreur
+        """
+        try:
+            with DBConnection().transaction() as cursor:
+                cursor.execute(SQL_UTILISATEUR_INSCRIPTION, {"created_by": created_by})
+                utilisateur = cursor.fetchone()
+                if not utilisateur:
+                    log.avertissement("dao.inscription.creer_multiples.utilisateur_introuvable",
+                                      "Utilisateur introuvable", created_by=created_by)
+                    return None
+
+                cursor.execute(SQL_VERROUILLER_EVENEMENTS, {
+                    "ids": sorted({id_event for id_event, _, _ in choix}), "created_by": created_by,
+                })
+                evenements = {ligne["id_event"]: dict(ligne) for ligne in cursor.fetchall()}
+                ids_bus = sorted({id_bus for _, aller, retour in choix
+                                  for id_bus in (aller, retour) if id_bus is not None})
+                bus = {}
+                if ids_bus:
+                    cursor.execute(SQL_VERROUILLER_PLACES_BUS, {"ids": ids_bus})
+                    bus = {ligne["id_bus"]: dict(ligne) for ligne in cursor.fetchall()}
+
+                acceptes, refus, vus = [], [], set()
+                for id_event, aller, retour in choix:
+                    motif = self._motif_refus(evenements.get(id_event), id_event, aller, retour, bus, vus)
+                    if motif:
+                        refus.append({"id_event": id_event, "motif": motif})
+                        continue
+                    # Les places réservées par les choix précédents ne sont plus disponibles
+                    vus.add(id_event)
+                    evenements[id_event]["places"] -= 1
+                    for id_bus in (aller, retour):
+                        if id_bus is not None:
+                            bus[id_bus]["places"] -= 1
+                    acceptes.append((id_event, aller, retour))
+
+                crees = []
+                if acceptes and not (refus and tout_ou_rien):
+                    cursor.execute(SQL_CREER_MULTIPLES, {
+                        "boit": boit,
+                        "created_by": created_by,
+                        "mode_paiement": mode_paiement,
+                        "id_event": [c[0] for c in acceptes],
+                        "id_bus_aller": [c[1] for c in acceptes],
+                        "id_bus_retour": [c[2] for c in acceptes],
+                    })
+                    crees = [dict(ligne, nom_event=evenements[ligne["id_event"]]["titre"])
+                             for ligne in cursor.fetchall()]
+
+        except Exception:
+            log.exception("dao.inscription.creer_multiples.echec",
+                          "Erreur lors de l'inscription aux événements")
+            return None
+
+        return {"utilisateur": dict(utilisateur), "inscriptions": crees, "refus": refus}
+
+    @staticmethod
+    def _motif_refus(evenement: Optional[dict], id_event: int, aller: Optional[int],
+                     retour: Optional[int], bus: dict, vus: set) -> Optional[str]:
+        """Raison pour laquelle un choix ne peut pas être inscrit, None s'il est valide."""
+        if evenement is None:
+            return "événement introuvable"
+        if id_event in vus:
+            return "événement choisi plusieurs fois"
+        if evenement["deja_inscrit"]:
+            return "déjà inscrit"
+        if evenement["statut"] == "passe":
+            return "événement passé"
+        if evenement["places"] <= 0:
+            return "événement complet"
+        for sens, id_bus in (("ALLER", aller), ("RETOUR", retour)):
+            if id_bus is None:
+                continue
+            ligne = bus.get(id_bus)
+            if not ligne or ligne["sens"] != sens or ligne["id_event"] != id_event:
+                return f"bus {sens.lower()} {id_bus} invalide"
+            if ligne["places"] <= 0:
+                return f"bus {sens.lower()} {id_bus} complet"
+        return None
+
+    @staticmethod
+    def reserver_places(cursor, id_event: int, id_bus_aller: Optional[int],
+                        id_bus_retour: Optional[int], nombre: int) -> str:
+        """
+        Verrouille l'événement et les bus choisis, et vérifie qu'ils ont `nombre` places.
+        À appeler dans une transaction (DBConnection().transaction()).
+
+        return : titre de l'événement
+        raise  : ValueError si l'événement ou un bus est introuvable, invalide ou complet,
+                 ou si l'événement est passé
+        """
+        cursor.execute(SQL_VERROUILLER_PLACES_EVENEMENT, {"id_event": id_event})
+        evenement = cursor.fetchone()
+        if not evenement:
+            raise ValueError(f"Événement {id_event} introuvable.")
+        if evenement["statut"] == "passe":
+            raise ValueError(f"Événement '{evenement['titre']}' passé.")
+        if evenement["places"] < nombre:
+            raise ValueError(f"Événement '{evenement['titre']}' : {max(evenement['places'], 0)} "
+                             f"place(s) restante(s) pour {nombre} inscription(s).")
+
+        choix = {sens: id_bus for sens, id_bus in (("ALLER", id_bus_aller), ("RETOUR", id_bus_retour))
+                 if id_bus is not None}
+        if choix:
+            cursor.execute(SQL_VERROUILLER_PLACES_BUS, {"ids": sorted(set(choix.values()))})
+            bus = {ligne["id_bus"]: ligne for ligne in cursor.fetchall()}
+            for sens, id_bus in choix.items():
+                ligne = bus.get(id_bus)
+                if not ligne or ligne["sens"] != sens or ligne["id_event"] != id_event:
+                    raise ValueError(f"Bus {sens.capitalize()} {id_bus} invalide pour cet événement.")
+                if ligne["places"] < nombre:
+                    raise ValueError(f"Bus {sens.capitalize()} {id_bus} : {max(ligne['places'], 0)} "
+                                     f"place(s) restante(s) pour {nombre} passager(s).")
+        return evenement["titre"]
+
+    def creer_groupe(self, id_event: int, id_bus_aller: Optional[int], id_bus_retour: Optional[int],
+                     membres: List[dict]) -> Optional[List[dict]]:
+        """
+        Inscrit un groupe à un événement en une transaction : tout le groupe est inscrit,
+        ou personne.
+
+        membres : dicts {"created_by" ou "email", "boit", "mode_paiement"}
+
+        return : une ligne par inscription créée (avec email, nom, prenom, nom_event),
+                 ou None si le groupe est refusé (le motif est affiché)
+        """
+        ids = [m["created_by"] for m in membres if m.get("created_by") is not None]
+        emails = [m["email"] for m in membres if m.get("created_by") is None and m.get("email")]
+        try:
+            with DBConnection().transaction() as cursor:
+                titre = self.reserver_places(cursor, id_event, id_bus_aller, id_bus_retour, len(membres))
+
+                cursor.execute(SQL_MEMBRES_GROUPE, {"id_event": id_event, "ids": ids, "emails": emails})
+                trouves = cursor.fetchall()
+                par_id = {u["id_utilisateur"]: u for u in trouves}
+                par_email = {u["email"]: u for u in trouves}
+
+                utilisateurs = []
+                for membre in membres:
+                    utilisateur = (par_id.get(membre["created_by"]) if membre.get("created_by") is not None
+                                   else par_email.get(membre.get("email")))
+                    if not utilisateur:
+                        raise ValueError(f"Utilisateur {membre.get('created_by') or membre.get('email')} introuvable.")
+                    if utilisateur["deja_inscrit"]:
+                        raise ValueError(f"{utilisateur['prenom']} {utilisateur['nom']} est déjà inscrit(e).")
+                    utilisateurs.append(utilisateur)
+                if len({u["id_utilisateur"] for u in utilisateurs}) < len(utilisateurs):
+                    raise ValueError("Un même utilisateur apparaît plusieurs fois dans le groupe.")
+
+                cursor.execute(SQL_CREER_GROUPE, {
+                    "id_event": id_event,
+                    "id_bus_aller": id_bus_aller,
+                    "id_bus_retour": id_bus_retour,
+                    "created_by": [u["id_utilisateur"] for u in utilisateurs],
+                    "boit": [bool(m.get("boit", False)) for m in membres],
+                    "mode_paiement": [m.get("mode_paiement", "") for m in membres],
+                })
+                crees = cursor.fetchall()
+
+        except ValueError as e:
+            log.avertissement("dao.inscription.creer_groupe.refus", str(e))
+            return None
+        except Exception:
+            log.exception("dao.inscription.creer_groupe.echec",
+                          "Erreur lors de l'inscription du groupe")
+            return None
+
+        par_id = {u["id_utilisateur"]: u for u in utilisateurs}
+        return [
+            dict(ligne, email=par_id[ligne["created_by"]]["email"], nom=par_id[ligne["created_by"]]["nom"],
+                 prenom=par_id[ligne["created_by"]]["prenom"], nom_event=titre)
+            for ligne in crees
+        ]
@@ -0,0 +1,99 @@
+from typing import List, Optional
+from dao.db_connection_async import DBConnectionAsync
+from dao.inscription_dao import (
+    SQL_COMPTER_PAR_EVENEMENT,
+    SQL_CREER_INSCRIPTION,
+    SQL_EST_DEJA_INSCRIT,
+    SQL_LISTER_INSCRIPTIONS,
+    SQL_SUPPRIMER_INSCRIPTION,
+    parametres_inscription,
+    sql_get_by_inscription,
+)
+from business_object.inscription import Inscription
+from utils.journal import journal
+
+log = journal(__name__)
+
+
+class InscriptionDAOAsync:
+    """
+    Version asynchrone d'InscriptionDAO : mêmes requêtes SQL, même hydratation
+    (Inscription.from_dict), exécutées sur le pool psycopg 3 de DBConnectionAsync.
+    """
+
+    async def creer(self, inscription: Inscription) -> Optional[Inscription]:
+        """
+        Crée une nouvelle inscription.
+
+        return: l'inscription créée, ou None si échec
+        """
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(
+                    SQL_CREER_INSCRIPTION, parametres_inscription(inscription)
+                )
+                inscription.code_reservation = (await cursor.fetchone())["code_reservation"]
+                return inscription
+        except Exception:
+            log.exception("dao.inscription.creer.echec",
+                          "Erreur lors de la création de l'inscription")
+            return None
+
+    async def get_by(self, column: str, value) -> list[Inscription]:
+        query = sql_get_by_inscription(column)
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(query, {"value": value})
+            rows = await cursor.fetchall()
+        return [Inscription.from_dict(row) for row in rows]
+
+    async def lister_toutes(self) -> List[Inscription]:
+        """Liste toutes les inscriptions."""
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(SQL_LISTER_INSCRIPTIONS)
+                return [Inscription.from_dict(row) for row in await cursor.fetchall()]
+        except Exception:
+            log.exception("dao.inscription.lister_toutes.echec",
+                          "Erreur lors du listage des inscriptions")
+            return []
+
+    async def compter_par_evenement(self, id_event: int) -> int:
+        """Retourne le nombre d'inscriptions pour un événement donné."""
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(
+                    SQL_COMPTER_PAR_EVENEMENT, {"id_event": id_event}
+                )
+                resultat = await cursor.fetchone()
+                return resultat["count"] if resultat else 0
+        except Exception:
+            log.exception("dao.inscription.compter_par_evenement.echec",
+                          "Erreur lors du comptage des inscriptions")
+            return 0
+
+    async def supprimer(self, inscription: Inscription) -> bool:
+        """Supprime une inscription ; True si la suppression a réussi."""
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(
+                    SQL_SUPPRIMER_INSCRIPTION,
+                    {"code_reservation": inscription.code_reservation},
+                )
+                return cursor.rowcount > 0
+        except Exception:
+            log.exception("dao.inscription.supprimer.echec",
+                          "Erreur lors de la suppression de l'inscription")
+            return False
+
+    async def est_deja_inscrit(self, created_by: int, id_event: int) -> bool:
+        """Vérifie si un utilisateur est déjà inscrit à un événement."""
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(
+                    SQL_EST_DEJA_INSCRIT, {"created_by": created_by, "id_event": id_event}
+                )
+                return await cursor.fetchone() is not None
+        except Exception:
+            log.exception("dao.inscription.est_deja_inscrit.echec",
+                          "Erreur lors de la vérification de l'inscription")
+            return False
@@ -0,0 +1,195 @@
+from typing import List, Optional
+from business_object.attente import Attente
+from dao.db_connection import DBConnection
+from utils.journal import journal
+
+log = journal(__name__)
+
+SQL_AJOUTER_ATTENTE = """
+    INSERT INTO liste_attente
+    (id_event, created_by, boit, mode_paiement, id_bus_aller, id_bus_retour)
+    VALUES (%(id_event)s, %(created_by)s, %(boit)s, %(mode_paiement)s,
+            %(id_bus_aller)s, %(id_bus_retour)s)
+    ON CONFLICT (id_event, created_by) DO NOTHING
+    RETURNING id_attente, created_at;
+"""
+
+SQL_RETIRER_ATTENTE = """
+    DELETE FROM liste_attente
+    WHERE id_event = %(id_event)s
+    AND created_by = %(created_by)s;
+"""
+
+SQL_LISTER_ATTENTE = """
+    SELECT id_attente, id_event, created_by, boit, mode_paiement,
+        id_bus_aller, id_bus_retour, created_at
+    FROM liste_attente
+    WHERE id_event = %(id_event)s
+    ORDER BY created_at, id_attente;
+"""
+
+SQL_POSITION_ATTENTE = """
+    SELECT COUNT(*) AS position
+    FROM liste_attente l, liste_attente moi
+    WHERE moi.id_event = %(id_event)s
+    AND moi.created_by = %(created_by)s
+    AND l.id_event = moi.id_event
+    AND (l.created_at, l.id_attente) <= (moi.created_at, moi.id_attente);
+"""
+
+# Verrouille l'événement : les annulations et promotions d'un même événement
+# sont sérialisées, chacune voit les places libérées par les précédentes.
+SQL_PLACES_LIBRES = """
+    SELECT capacite_max - nb_inscrits AS places
+    FROM evenement
+    WHERE id_event = %(id_event)s
+    FOR UPDATE;
+"""
+
+# Retire les premiers de la file (FIFO) et crée leurs inscriptions en une requête.
+# Les attentes d'utilisateurs déjà inscrits par ailleurs sont écartées et supprimées :
+# les promouvoir violerait la contrainte unique et annulerait toute la transaction.
+# Un bus demandé n'est gardé que s'il lui reste une place pour ce promu (rang dans
+# l'ordre de la file parmi les promus du même bus) ; sinon l'inscription est créée
+# sans ce bus, comme une inscription directe le refuserait. Le verrou de
+# l'événement (SQL_PLACES_LIBRES) protège aussi les compteurs de ses bus.
+SQL_PROMOUVOIR = """
+    WITH perimes AS (
+        DELETE FROM liste_attente l
+        WHERE l.id_event = %(id_event)s
+        AND EXISTS (
+            SELECT 1 FROM inscription j
+            WHERE j.id_event = l.id_event AND j.created_by = l.created_by
+        )
+    ),
+    promus AS (
+        DELETE FROM liste_attente
+        WHERE id_attente IN (
+            SELECT l.id_attente
+            FROM liste_attente l
+            WHERE l.id_event = %(id_event)s
+            AND NOT EXISTS (
+                SELECT 1 FROM inscription j
+                WHERE j.id_event = l.id_event AND j.created_by = l.created_by
+            )
+            ORDER BY l.created_at, l.id_attente
+            LIMIT %(places)s
+        )
+        RETURNING *
+    ),
+    crees AS (
+        INSERT INTO inscription
+        (code_reservation, boit, created_by, mode_paiement,
+         id_event, id_bus_aller, id_bus_retour)
+        SELECT nouveau_code_reservation(), p.boit, p.created_by, p.mode_paiement, p.id_event,
+            CASE WHEN p.rang_aller <= ba.capacite_max - ba.nb_inscrits THEN p.id_bus_aller END,
+            CASE WHEN p.rang_retour <= br.capacite_max - br.nb_inscrits THEN p.id_bus_retour END
+        FROM (
+            SELECT promus.*,
+                ROW_NUMBER() OVER (PARTITION BY id_bus_aller ORDER BY created_at, id_attente) AS rang_aller,
+                ROW_NUMBER() OVER (PARTITION BY id_bus_retour ORDER BY created_at, id_attente) AS rang_retour
+            FROM promus
+        ) p
+        LEFT JOIN bus ba ON ba.id_bus = p.id_bus_aller
+        LEFT JOIN bus br ON br.id_bus = p.id_bus_retour
+        ORDER BY p.created_at, p.id_attente
+        RETURNING code_reservation, boit, created_by, mode_paiement,
+            id_event, id_bus_aller, id_bus_retour, created_at
+    )
+    SELECT crees.*, u.email, u.nom, u.prenom, e.titre AS nom_event
+    FROM crees
+    JOIN utilisateur u ON u.id_utilisateur = crees.created_by
+    JOIN evenement e ON e.id_event = crees.id_event;
+"""
+
+
+class ListeAttenteDAO:
+    """Accès aux données de la liste d'attente des événements complets."""
+
+    @staticmethod
+    def promouvoir(cursor, id_event: int) -> List[dict]:
+        """
+        Transforme en inscriptions les premières places de la liste d'attente,
+        dans la limite des places libres de l'événement.
+        À appeler dans une transaction (DBConnection().transaction()) : la promotion
+        est validée ou annulée avec l'opération qui a libéré les places.
+
+        cursor   : curseur de la transaction en cours
+        id_event : ID de l'événement
+
+        return : lignes des inscriptions créées (avec email, nom, prenom, nom_event)
+        """
+        cursor.execute(SQL_PLACES_LIBRES, {"id_event": id_event})
+        resultat = cursor.fetchone()
+        places = resultat["places"] if resultat else 0
+        if places <= 0:
+            return []
+
+        cursor.execute(SQL_PROMOUVOIR, {"id_event": id_event, "places": places})
+        return [dict(row) for row in cursor.fetchall()]
+
+    def ajouter(self, attente: Attente) -> Optional[List[dict]]:
+        """
+        Ajoute un utilisateur en fin de liste d'attente (une seule insertion).
+        Si des places sont libres au même moment, la file est promue aussitôt.
+
+        return : inscriptions issues de la promotion (éventuellement vide),
+                 ou None si l'utilisateur est déjà en attente ou en cas d'erreur
+        """
+        try:
+            with DBConnection().transaction() as cursor:
+                cursor.execute(SQL_AJOUTER_ATTENTE, attente.to_dict())
+                resultat = cursor.fetchone()
+                if not resultat:
+                    return None
+                attente.id_attente = resultat["id_attente"]
+                attente.created_at = resultat["created_at"]
+                return self.promouvoir(cursor, attente.id_event)
+        except Exception:
+            log.exception("dao.liste_attente.ajouter.echec",
+                          "Erreur lors de l'ajout en liste d'attente")
+            return None
+
+    def retirer(self, id_event: int, created_by: int) -> bool:
+        """Retire un utilisateur de la liste d'attente d'un événement."""
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        SQL_RETIRER_ATTENTE, {"id_event": id_event, "created_by": created_by}
+                    )
+                    return cursor.rowcount > 0
+        except Exception:
+            log.exception("dao.liste_attente.retirer.echec",
+                          "Erreur lors du retrait de la liste d'attente")
+            return False
+
+    def lister_par_evenement(self, id_event: int) -> List[Attente]:
+        """Liste d'attente d'un événement, dans l'ordre de promotion."""
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(SQL_LISTER_ATTENTE, {"id_event": id_event})
+                    return [Attente.from_dict(row) for row in cursor.fetchall()]
+        except Exception:
+            log.exception("dao.liste_attente.lister_par_evenement.echec",
+                          "Erreur lors du listage de la liste d'attente")
+            return []
+
+    def position(self, id_event: int, created_by: int) -> int:
+        """
+        Rang d'un utilisateur dans la liste d'attente (1 = prochain promu),
+        0 s'il n'y figure pas.
+        """
+        try:
+            with DBConnection().connection as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        SQL_POSITION_ATTENTE, {"id_event": id_event, "created_by": created_by}
+                    )
+                    resultat = cursor.fetchone()
+                    return resultat["position"] if resultat else 0
+        except Exception:
+            log.exception("dao.liste_attente.position.echec",
+                          "Erreur lors du calcul de la position en liste d'attente")
+            return 0
@@ -0,0 +1,72 @@
+from datetime import date
+from typing import Iterator, List
+from dao.db_connection import DBConnection
+from utils.singleton import Singleton
+
+# Inscrits aux événements d'une date, avec leurs bus, hors rappels déjà envoyés.
+# Une seule requête, lue par paquets sur un curseur serveur.
+SQL_RAPPELS_A_ENVOYER = """
+    SELECT i.code_reservation, u.email, u.nom, u.prenom,
+        e.id_event, e.titre, e.lieu, e.date_event,
+        ba.heure_depart AS heure_aller, ba.description AS bus_aller,
+        br.heure_depart AS heure_retour, br.description AS bus_retour
+    FROM evenement e
+    JOIN inscription i ON i.id_event = e.id_event
+    JOIN utilisateur u ON u.id_utilisateur = i.created_by
+    LEFT JOIN bus ba ON ba.id_bus = i.id_bus_aller
+    LEFT JOIN bus br ON br.id_bus = i.id_bus_retour
+    WHERE e.date_event = %(jour)s
+    AND NOT EXISTS (
+        SELECT 1 FROM rappel_envoye r
+        WHERE r.code_reservation = i.code_reservation
+        AND r.type_rappel = %(type_rappel)s
+    )
+    ORDER BY e.id_event, i.code_reservation;
+"""
+
+SQL_MARQUER_ENVOYES = """
+    INSERT INTO rappel_envoye (code_reservation, type_rappel)
+    SELECT code, %(type_rappel)s FROM unnest(%(codes)s::int[]) AS code
+    ON CONFLICT DO NOTHING;
+"""
+
+
+class RappelDAO(metaclass=Singleton):
+    """Lecture des rappels à envoyer et journal des rappels envoyés."""
+
+    def parcourir_a_envoyer(self, jour: date, type_rappel: str,
+                            taille_paquet: int = 1000) -> Iterator[List[dict]]:
+        """
+        Parcourt les rappels à envoyer pour les événements de `jour`, par paquets.
+
+        La requête est lue sur un curseur serveur (nommé) : seules `taille_paquet`
+        lignes sont en mémoire à la fois, quel que soit le nombre d'inscrits.
+
+        return : itérateur de listes de dicts (code_reservation, email, nom, prenom,
+                 id_event, titre, lieu, date_event, heure_aller, bus_aller,
+                 heure_retour, bus_retour)
+        """
+        with DBConnection().transaction() as cursor:
+            with cursor.connection.cursor(name="rappels") as curseur_serveur:
+                curseur_serveur.itersize = taille_paquet
+                curseur_serveur.execute(
+                    SQL_RAPPELS_A_ENVOYER, {"jour": jour, "type_rappel": type_rappel}
+                )
+                while True:
+                    lignes = curseur_serveur.fetchmany(taille_paquet)
+                    if not lignes:
+                        break
+                    yield [dict(ligne) for ligne in lignes]
+
+    def marquer_envoyes(self, codes: List[int], type_rappel: str) -> int:
+        """
+        Journalise les rappels envoyés, en une requête.
+
+        return : nombre de lignes ajoutées au journal
+        """
+        if not codes:
+            return 0
+        with DBConnection().connection as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(SQL_MARQUER_ENVOYES, {"codes": list(codes), "type_rappel": type_rappel})
+                return cursor.rowcount
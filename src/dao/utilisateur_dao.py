@@ -1,9 +1,75 @@
 # dao/utilisateur_dao.py
 from typing import Optional, List
-from psycopg2.errors import UniqueViolation
 from business_object.utilisateur import Utilisateur
 from dao.db_connection import DBConnection
+from dao.liste_attente_dao import ListeAttenteDAO
 from datetime import datetime
+from utils.journal import journal
+
+log = journal(__name__)
+
+# Requêtes partagées avec la DAO asynchrone (dao/utilisateur_dao_async.py)
+COLONNES_UTILISATEUR = {
+    "id_utilisateur",
+    "nom",
+    "prenom",
+    "email",
+    "mot_de_passe",
+    "role",
+    "created_at"
+}
+
+SQL_CREER_UTILISATEUR = """
+    INSERT INTO projet.utilisateur (nom, prenom, email, mot_de_passe, role, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s)
+    RETURNING id_utilisateur;
+"""
+
+SQL_LISTER_UTILISATEURS = "SELECT * FROM utilisateur ORDER BY id_utilisateur"
+
+SQL_SUPPRIMER_UTILISATEUR = "DELETE FROM utilisateur WHERE id_utilisateur = %s"
+
+# Verrouille, dans l'ordre des id (comme les inscriptions groupées), les événements
+# dont les inscriptions de l'utilisateur vont disparaître par cascade
+SQL_VERROUILLER_EVENEMENTS_UTILISATEUR = """
+    SELECT e.id_event
+    FROM evenement e
+    WHERE e.id_event IN (
+        SELECT id_event FROM inscription WHERE created_by = %(id_utilisateur)s
+    )
+    ORDER BY e.id_event
+    FOR UPDATE;
+"""
+
+SQL_SUPPRIMER_UTILISATEUR_RETOURNER = """
+    DELETE FROM utilisateur
+    WHERE id_utilisateur = %(id_utilisateur)s
+    RETURNING id_utilisateur;
+"""
+
+SQL_SELECT_UTILISATEUR = """
+    SELECT id_utilisateur, nom, prenom, email, mot_de_passe, role, created_at
+    FROM projet.utilisateur
+"""
+
+
+def sql_get_by_utilisateur(column: str) -> str:
+    """Requête de recherche par colonne (colonne vérifiée par liste blanche)."""
+    if column not in COLONNES_UTILISATEUR:
+        raise ValueError(f"Colonne '{column}' non autorisée.")
+    return SQL_SELECT_UTILISATEUR + f"WHERE {column} = %(value)s;"
+
+
+def parametres_utilisateur(utilisateur: Utilisateur) -> tuple:
+    """Paramètres d'insertion d'un utilisateur."""
+    return (
+        utilisateur.nom,
+        utilisateur.prenom,
+        utilisateur.email,
+        utilisateur.mot_de_passe,
+        utilisateur.role,
+        utilisateur.created_at,
+    )
 
 
 class UtilisateurDAO:
@@ -11,25 +77,12 @@ class UtilisateurDAO:
 
     @staticmethod
     def creer(utilisateur: Utilisateur) -> Utilisateur:
-        query = """
-            INSERT INTO projet.utilisateur (nom, prenom, email, mot_de_passe, role, created_at)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            RETURNING id_utilisateur;
-        """
+        from psycopg2.errors import UniqueViolation
+
         try:
             with DBConnection().connection as connection:
                 with connection.cursor() as cursor:
-                    cursor.execute(
-                        query,
-                        (
-                            utilisateur.nom,
-                            utilisateur.prenom,
-                            utilisateur.email,
-                            utilisateur.mot_de_passe,
-                            utilisateur.role,
-                            utilisateur.created_at,
-                        ),
-                    )
+                    cursor.execute(SQL_CREER_UTILISATEUR, parametres_utilisateur(utilisateur))
                     utilisateur.id_utilisateur = cursor.fetchone()["id_utilisateur"]
             return utilisateur
         except UniqueViolation as e:
@@ -39,41 +92,50 @@ class UtilisateurDAO:
 
     @staticmethod
     def lister_tous() -> List[Utilisateur]:
-        query = "SELECT * FROM utilisateur ORDER BY id_utilisateur"
         with DBConnection().connection as connection:
             with connection.cursor() as cursor:
-                cursor.execute(query)
+                cursor.execute(SQL_LISTER_UTILISATEURS)
                 rows = cursor.fetchall()
                 return [Utilisateur.from_dict(row) for row in rows]
 
     @staticmethod
     def supprimer(id_utilisateur: int) -> bool:
-        query = "DELETE FROM utilisateur WHERE id_utilisateur = %s"
         with DBConnection().connection as connection:
             with connection.cursor() as cursor:
-                cursor.execute(query, (id_utilisateur,))
+                cursor.execute(SQL_SUPPRIMER_UTILISATEUR, (id_utilisateur,))
                 return cursor.rowcount > 0
 
+    @staticmethod
+    def supprimer_et_promouvoir(id_utilisateur: int) -> Optional[List[dict]]:
+        """
+        Supprime un utilisateur et, dans la même transaction, promeut la liste
+        d'attente des événements où ses inscriptions (supprimées par cascade)
+        libèrent des places.
+
+        return : inscriptions créées par la promotion (éventuellement vide),
+                 ou None si l'utilisateur est introuvable ou en cas d'erreur
+        """
+        parametres = {"id_utilisateur": id_utilisateur}
+        try:
+            with DBConnection().transaction() as cursor:
+                cursor.execute(SQL_VERROUILLER_EVENEMENTS_UTILISATEUR, parametres)
+                evenements = [ligne["id_event"] for ligne in cursor.fetchall()]
+                cursor.execute(SQL_SUPPRIMER_UTILISATEUR_RETOURNER, parametres)
+                if not cursor.fetchone():
+                    return None
+                promotions = []
+                for id_event in evenements:
+                    promotions += ListeAttenteDAO.promouvoir(cursor, id_event)
+                return promotions
+        except Exception:
+            log.exception("dao.utilisateur.supprimer_et_promouvoir.echec",
+                          "Erreur lors de la suppression de l'utilisateur",
+                          id_utilisateur=id_utilisateur)
+            return None
+
     def get_by(self, column: str, value) -> list[Utilisateur]:
         # Liste blanche pour éviter les injections SQL via le nom de colonne
-        allowed_columns = {
-            "id_utilisateur",
-            "nom",
-            "prenom",
-            "email",
-            "mot_de_passe",
-            "role",
-            "created_at"
-        }
-
-        if column not in allowed_columns:
-            raise ValueError(f"Colonne '{column}' non autorisée.")
-
-        query = f"""
-            SELECT id_utilisateur, nom, prenom, email, mot_de_passe, role, created_at
-            FROM projet.utilisateur
-            WHERE {column} = %(value)s;
-        """
+        query = sql_get_by_utilisateur(column)
 
         with DBConnection().connection.cursor() as cursor:
             cursor.execute(query, {"value": value})
@@ -0,0 +1,49 @@
+from typing import List
+from business_object.utilisateur import Utilisateur
+from dao.db_connection_async import DBConnectionAsync
+from dao.utilisateur_dao import (
+    SQL_CREER_UTILISATEUR,
+    SQL_LISTER_UTILISATEURS,
+    SQL_SUPPRIMER_UTILISATEUR,
+    parametres_utilisateur,
+    sql_get_by_utilisateur,
+)
+
+
+class UtilisateurDAOAsync:
+    """Version asynchrone d'UtilisateurDAO (mêmes requêtes SQL, même Utilisateur.from_dict)."""
+
+    @staticmethod
+    async def creer(utilisateur: Utilisateur) -> Utilisateur:
+        from psycopg.errors import UniqueViolation
+
+        try:
+            async with DBConnectionAsync().connexion() as connection:
+                cursor = await connection.execute(
+                    SQL_CREER_UTILISATEUR, parametres_utilisateur(utilisateur)
+                )
+                utilisateur.id_utilisateur = (await cursor.fetchone())["id_utilisateur"]
+            return utilisateur
+        except UniqueViolation as e:
+            # Gestion des contraintes d'unicité
+            if "utilisateur_email_key" in str(e):
+                raise ValueError(f"Un utilisateur avec l'email '{utilisateur.email}' existe déjà")
+
+    @staticmethod
+    async def lister_tous() -> List[Utilisateur]:
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(SQL_LISTER_UTILISATEURS)
+            return [Utilisateur.from_dict(row) for row in await cursor.fetchall()]
+
+    @staticmethod
+    async def supprimer(id_utilisateur: int) -> bool:
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(SQL_SUPPRIMER_UTILISATEUR, (id_utilisateur,))
+            return cursor.rowcount > 0
+
+    async def get_by(self, column: str, value) -> list[Utilisateur]:
+        query = sql_get_by_utilisateur(column)
+        async with DBConnectionAsync().connexion() as connection:
+            cursor = await connection.execute(query, {"value": value})
+            rows = await cursor.fetchall()
+        return [Utilisateur.from_dict(row) for row in rows]
@@ -1,71 +1,141 @@
 """
 Point d'entrée principal de l'application de gestion d'événements.
 Lance l'interface utilisateur et initialise les services.
-"""
 
-from dao.db_connection import DBConnection
+Le démarrage est volontairement léger : la borne relance le CLI pour chaque étudiant,
+le menu doit donc s'afficher sans attendre les modules lourds (psycopg2, argon2,
+requests, dotenv) ni l'ouverture de la connexion. Les services sont construits à la
+demande et préchauffés en tâche de fond pendant que l'utilisateur lit le menu.
+Pour auditer les imports : python -X importtime src/main.py
+
+Avec des arguments, le CLI passe en mode batch non interactif (voir view/cli_batch.py) :
+    python src/main.py events list --format csv
 
-# Import des DAO
-from dao.evenement_dao import EvenementDAO
-from dao.inscription_dao import InscriptionDAO
-from dao.utilisateur_dao import UtilisateurDAO
-from dao.bus_dao import BusDAO
+Les options --profil* (voir utils/profilage.py) profilent la session interactive
+ou la commande batch et écrivent les rapports à la sortie :
+    python src/main.py --profil cprofile --profil-memoire
+"""
 
-# Import des services
-from service.utilisateur_service import UtilisateurService
-from service.evenement_service import EvenementService
-from service.inscription_service import InscriptionService
-from service.bus_service import BusService
+import sys
+import threading
 
-# Import des vues
+from utils.paresseux import Paresseux
 from view.menu_principal import MenuPrincipal
 
 
+def construire_services() -> tuple:
+    """
+    Construit les quatre services sous forme de proxys paresseux.
+
+    return: (service_utilisateur, service_evenement, service_inscription, service_bus)
+    """
+
+    def utilisateur():
+        from service.utilisateur_service import UtilisateurService
+
+        return UtilisateurService()
+
+    def evenement():
+        from dao.bus_dao import BusDAO
+        from dao.evenement_dao import EvenementDAO
+        from dao.inscription_dao import InscriptionDAO
+        from dao.utilisateur_dao import UtilisateurDAO
+        from service.evenement_service import EvenementService
+
+        return EvenementService(EvenementDAO(), InscriptionDAO(), UtilisateurDAO(), BusDAO())
+
+    def inscription():
+        from dao.evenement_dao import EvenementDAO
+        from dao.inscription_dao import InscriptionDAO
+        from dao.utilisateur_dao import UtilisateurDAO
+        from service.inscription_service import InscriptionService
+
+        return InscriptionService(InscriptionDAO(), EvenementDAO(), UtilisateurDAO())
+
+    def bus():
+        from service.bus_service import BusService
+
+        return BusService()
+
+    return tuple(Paresseux(fabrique) for fabrique in (utilisateur, evenement, inscription, bus))
+
+
+def prechauffer(services: tuple):
+    """
+    Ouvre la connexion et construit les services en arrière-plan.
+    Une erreur de connexion ne bloque pas l'affichage du menu : elle est journalisée
+    et relevée au premier accès à un service non construit (voir session()).
+    """
+    try:
+        from dao.db_connection import DBConnection
+        from service.catalogue_service import activer_rafraichissement
+        from service.diffusion import activer_diffusion
+
+        activer_rafraichissement()
+        activer_diffusion()
+        DBConnection()
+        for service in services:
+            service.prechauffer()
+        # Charge aussi le hasher Argon2 avant la première connexion
+        from utils.mdp import _hasher
+
+        _hasher()
+    except Exception as e:
+        from utils.journal import journal
+
+        journal(__name__).exception("demarrage.connexion.echec",
+                                    "Erreur de connexion à la base de données", erreur=str(e))
+        erreur = ConnectionError(str(e))
+        erreur.__cause__ = e
+        for service in services:
+            service.echouer(erreur)
+
+
 def main():
     """
     Fonction principale qui démarre l'application.
     """
+    from utils.profilage import arreter_profilage, demarrer_profilage, lire_options
+
+    options, arguments = lire_options(sys.argv[1:])
+    demarrer_profilage(options)
+    try:
+        if arguments:
+            from view.cli_batch import main as main_batch
+
+            sys.exit(main_batch(arguments))
+        session()
+    finally:
+        arreter_profilage()
+
+
+def session():
+    """
+    Session interactive : menu principal jusqu'à ce que l'utilisateur quitte.
+    """
+    # Journal JSON écrit par un thread de fond (logs/application.jsonl), métriques
+    # publiées si METRIQUES_PORT ou METRIQUES_FICHIER est défini, traces si TRACE_TAUX > 0
+    from utils.journal import configurer_journal
+    from utils.metriques import exposer_metriques
+    from utils.traces import activer_traces
+
+    configurer_journal()
+    exposer_metriques()
+    activer_traces()
+
     print("=" * 60)
     print("   BIENVENUE - Système de Gestion d'Événements")
     print("=" * 60)
 
-    # Vérifier la connexion à la base de données
-    try:
-        with DBConnection().connection as conn:
-            print("✓ Connexion à la base de données réussie")
-    except Exception as e:
-        print(f"✗ Erreur de connexion à la base de données : {e}")
-        return
-
-    # ==== Initialisation des DAO ====
-    evenement_dao = EvenementDAO()
-    inscription_dao = InscriptionDAO()
-    utilisateur_dao = UtilisateurDAO()
-    bus_dao = BusDAO()
-
-    # ==== Initialisation des Services ====
-    service_utilisateur = UtilisateurService()
-    service_evenement = EvenementService(
-        evenement_dao,
-        inscription_dao,
-        utilisateur_dao,
-        bus_dao
-    )
-    service_inscription = InscriptionService(
-        inscription_dao,
-        evenement_dao,
-        utilisateur_dao
-    )
-    service_bus = BusService()
+    services = construire_services()
+    threading.Thread(target=prechauffer, args=(services,), daemon=True).start()
 
     # ==== Lancer le menu principal ====
-    menu = MenuPrincipal(
-        service_utilisateur,
-        service_evenement,
-        service_inscription,
-        service_bus
-    )
-    menu.afficher()
+    menu = MenuPrincipal(*services)
+    try:
+        menu.afficher()
+    except ConnectionError as e:
+        print(f"✗ Erreur de connexion à la base de données : {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,194 @@
+"""
+Affectation des passagers aux bus d'un événement (un sens à la fois).
+
+Problème de bin packing avec préférences : chaque bus a une capacité et une heure
+de départ, chaque passager peut avoir une heure souhaitée. L'algorithme :
+
+1. choisit les bus à utiliser : les bus déjà occupés par des passagers conservés,
+   ceux qui sont les plus proches de l'heure souhaitée d'au moins un passager, et
+   d'autres si la capacité ne suffit pas ; puis ferme les bus peu demandés dont
+   les passagers tiennent dans un bus ouvert partant à une heure voisine
+   (regroupement des bus sous-remplis) ;
+2. place les passagers qui ont une heure souhaitée, par ordre de priorité
+   (ordre d'inscription), dans le bus ouvert le plus proche de cette heure qui a
+   encore de la place ;
+3. répartit les autres sur le bus ouvert le moins chargé (équilibrage).
+
+Complexité : O(P x B) pour P passagers et B bus, soit quelques dizaines de
+millisecondes pour 2 000 passagers et 40 bus.
+"""
+import heapq
+from datetime import datetime, time
+from typing import Optional
+
+MINUTES_PAR_JOUR = 24 * 60
+
+# Deux bus partant à moins de 30 minutes d'intervalle sont interchangeables
+TOLERANCE_MINUTES = 30
+
+
+def minutes(heure) -> Optional[int]:
+    """Convertit une heure (time, datetime ou "HH:MM") en minutes depuis minuit."""
+    if heure is None:
+        return None
+    if isinstance(heure, str):
+        heure = datetime.strptime(heure[:5], "%H:%M").time()
+    if isinstance(heure, (time, datetime)):
+        return heure.hour * 60 + heure.minute
+    return None
+
+
+def ecart(a: int, b: int) -> int:
+    """Écart en minutes entre deux heures, sur un cadran de 24 h (23:30 et 00:30 : 60)."""
+    d = abs(a - b) % MINUTES_PAR_JOUR
+    return min(d, MINUTES_PAR_JOUR - d)
+
+
+def planifier_sens(bus: list, passagers: list, conserver: bool = False,
+                   tolerance: int = TOLERANCE_MINUTES) -> dict:
+    """
+    Calcule l'affectation des passagers d'un sens aux bus de ce sens.
+
+    bus: liste de dicts {"id_bus", "capacite_max", "heure_depart"}
+    passagers: liste de dicts {"code_reservation", "id_bus" (actuel ou None),
+               "heure_souhaitee" (ou None)}, par ordre de priorité
+    conserver: True pour ne placer que les passagers sans bus (les autres restent
+               dans le leur), False pour tout réaffecter
+    tolerance: écart maximal (minutes) entre deux bus pour regrouper leurs passagers
+
+    return: {"affectation": {code_reservation: id_bus} (uniquement les changements),
+             "non_places": [code_reservation], "bus_utilises": [id_bus]}
+    """
+    capacites = {b["id_bus"]: b["capacite_max"] for b in bus}
+    heures = {b["id_bus"]: minutes(b["heure_depart"]) for b in bus}
+    restant = dict(capacites)
+
+    # Passagers conservés dans leur bus (mode "non affectés uniquement")
+    a_placer = []
+    for passager in passagers:
+        actuel = passager.get("id_bus")
+        if conserver and actuel in restant and restant[actuel] > 0:
+            restant[actuel] -= 1
+        else:
+            a_placer.append(passager)
+    obligatoires = {id_bus for id_bus in capacites if restant[id_bus] < capacites[id_bus]}
+
+    # Heure souhaitée en minutes ; par défaut celle du bus actuel
+    souhaits = []
+    for passager in a_placer:
+        heure = minutes(passager.get("heure_souhaitee"))
+        if heure is None and passager.get("id_bus") in heures:
+            heure = heures[passager["id_bus"]]
+        souhaits.append(heure)
+
+    # 1. Choix des bus : demande = passagers dont c'est le bus le plus proche
+    demande = dict.fromkeys(capacites, 0)
+    avec_heure = [id_bus for id_bus in capacites if heures[id_bus] is not None]
+    for heure in souhaits:
+        if heure is not None and avec_heure:
+            demande[min(avec_heure, key=lambda b: (ecart(heures[b], heure), b))] += 1
+
+    # Chaque bus demandé est ouvert, puis d'autres si la capacité ne suffit pas
+    rang = sorted(
+        (b for b in capacites if b not in obligatoires),
+        key=lambda b: (-demande[b], -capacites[b], b),
+    )
+    besoin = len(a_placer) - sum(restant[b] for b in obligatoires)
+    ouverts = set(obligatoires)
+    for id_bus in rang:
+        if besoin <= 0 and demande[id_bus] == 0:
+            break
+        ouverts.add(id_bus)
+        besoin -= restant[id_bus]
+
+    # Regroupement : un bus peu demandé est fermé si la capacité reste suffisante
+    # et qu'un autre bus ouvert part à moins de `tolerance` minutes
+    for id_bus in sorted(ouverts - obligatoires, key=lambda b: (demande[b], capacites[b], b)):
+        if -besoin < restant[id_bus]:
+            continue
+        proche = demande[id_bus] == 0 or (heures[id_bus] is not None and any(
+            heures[autre] is not None and ecart(heures[autre], heures[id_bus]) <= tolerance
+            for autre in ouverts if autre != id_bus
+        ))
+        if proche:
+            ouverts.discard(id_bus)
+            besoin += restant[id_bus]
+
+    reserve = [b for b in rang if b not in ouverts]  # ouverts seulement en cas de besoin
+    affectation, non_places = {}, []
+
+    def placer(passager, id_bus):
+        restant[id_bus] -= 1
+        if passager.get("id_bus") != id_bus:
+            affectation[passager["code_reservation"]] = id_bus
+
+    # 2. Passagers avec une heure souhaitée : bus ouvert le plus proche avec de la place
+    sans_heure = []
+    for passager, heure in zip(a_placer, souhaits):
+        if heure is None:
+            sans_heure.append(passager)
+            continue
+        candidats = [b for b in ouverts if restant[b] > 0 and heures[b] is not None]
+        if not candidats:
+            candidats = [b for b in ouverts if restant[b] > 0]
+        if not candidats and reserve:
+            ouverts.add(reserve[0])
+            candidats = [reserve.pop(0)]
+        if not candidats:
+            non_places.append(passager["code_reservation"])
+            continue
+        meilleur = min(
+            candidats,
+            key=lambda b: (ecart(heures[b], heure) if heures[b] is not None else MINUTES_PAR_JOUR,
+                           -restant[b], b),
+        )
+        placer(passager, meilleur)
+
+    # 3. Passagers sans préférence : bus ouvert le moins chargé d'abord
+    tas = [(-restant[b], b) for b in ouverts if restant[b] > 0]
+    heapq.heapify(tas)
+    for passager in sans_heure:
+        if not tas and reserve:
+            id_bus = reserve.pop(0)
+            ouverts.add(id_bus)
+            tas = [(-restant[id_bus], id_bus)]
+        if not tas:
+            non_places.append(passager["code_reservation"])
+            continue
+        _, id_bus = heapq.heappop(tas)
+        placer(passager, id_bus)
+        if restant[id_bus] > 0:
+            heapq.heappush(tas, (-restant[id_bus], id_bus))
+
+    return {
+        "affectation": affectation,
+        "non_places": non_places,
+        "bus_utilises": sorted(b for b in ouverts if restant[b] < capacites[b]),
+    }
+
+
+def planifier_evenement(bus: list, passagers: list, conserver: bool = False) -> dict:
+    """
+    Applique planifier_sens à l'aller et au retour d'un événement.
+
+    bus: lignes {"id_bus", "sens", "capacite_max", "heure_depart"}
+    passagers: lignes {"code_reservation", "id_bus_aller", "id_bus_retour",
+               "heure_aller", "heure_retour"} par ordre d'inscription ; faute de
+               préférence enregistrée, l'heure souhaitée est celle du bus actuel
+
+    return: {"ALLER": plan, "RETOUR": plan}
+    """
+    plans = {}
+    for sens, colonne, heure in (("ALLER", "id_bus_aller", "heure_aller"),
+                                 ("RETOUR", "id_bus_retour", "heure_retour")):
+        bus_sens = [b for b in bus if (b["sens"] or "").upper() == sens]
+        ids = {b["id_bus"] for b in bus_sens}
+        plans[sens] = planifier_sens(
+            bus_sens,
+            [{"code_reservation": p["code_reservation"],
+              # Un bus d'un autre sens ou d'un autre événement ne compte pas
+              "id_bus": p[colonne] if p[colonne] in ids else None,
+              "heure_souhaitee": p[heure]} for p in passagers],
+            conserver=conserver,
+        )
+    return plans
@@ -1,8 +1,21 @@
+import threading
+from datetime import date
 from typing import Optional
 from business_object.bus import Bus
 from dao.bus_dao import BusDAO
 from dao.evenement_dao import EvenementDAO
 from time import time
+from service.affectation_bus import planifier_evenement, planifier_sens
+from service.catalogue_service import signaler_modification
+from service.horaires_bus import IndexHorairesBus, moment_depart
+from service.notifications import notifier_suppression_bus
+from service.planification_flotte import projeter_besoins
+from utils.journal import journal
+from utils.metriques import compteur
+
+log = journal(__name__)
+
+ACCES_CACHE = compteur("bde_cache_acces_total", "Accès aux caches (hit / miss)", ("cache", "resultat"))
 
 
 class BusService:
@@ -11,6 +24,9 @@ class BusService:
     def __init__(self):
         self.bus_dao = BusDAO()
         self.evenement_dao = EvenementDAO()
+        # Index des départs, chargé en une requête au premier besoin
+        self._index_horaires = None
+        self._verrou_index = threading.Lock()
 
     def creer_bus(self, 
                   id_event: int, 
@@ -50,29 +66,40 @@ class BusService:
             capacite_max=capacite_max
         )
         
+        # Chevauchement avec les bus d'autres événements : signalé, pas bloquant
+        depart = self._depart(nouveau_bus)
+        self._signaler_conflits(nouveau_bus, depart)
+
         # --- 3. Appel à la DAO ---
         try:
             # L'appel à la DAO exécute la logique SQL et met à jour nouveau_bus.id_bus
             bus_cree = self.bus_dao.creer(nouveau_bus)
+            signaler_modification()
+            self._indexer(bus_cree, depart)
             
             return bus_cree
             
-        except Exception as e:
+        except Exception:
             # Gérer les exceptions de la DAO
-            print(f"Erreur lors de la création du bus dans le service : {e}")
+            log.exception("service.bus.creer_bus.echec",
+                          "Erreur lors de la création du bus dans le service")
             return None
 
-    def supprimer_bus(self, id_bus: int) -> bool:
+    def supprimer_bus(self, id_bus: int, redistribuer: bool = False) -> bool:
         """
         Supprime un bus (réservé aux admins).
         
         Args:
             id_bus: ID du bus à supprimer
+            redistribuer: replacer les passagers dans les autres bus du même sens
+                          (voir supprimer_bus_et_redistribuer)
             
         Returns:
             True si suppression réussie, False sinon
             
         """
+        if redistribuer:
+            return self.supprimer_bus_et_redistribuer(id_bus) is not None
         
         # Vérification que le bus existe
         bus = self.bus_dao.get_by("id_bus", id_bus)
@@ -81,11 +108,233 @@ class BusService:
             return False
         
         try:
-            return self.bus_dao.supprimer(id_bus)
-        except Exception as e:
-            print(f"Erreur lors de la suppression du bus : {e}")
+            supprime = self.bus_dao.supprimer(id_bus)
+            if supprime:
+                signaler_modification()
+                self._desindexer(id_bus)
+            return supprime
+        except Exception:
+            log.exception("service.bus.supprimer_bus.echec", "Erreur lors de la suppression du bus")
             return False
 
+    def supprimer_bus_et_redistribuer(self, id_bus: int) -> Optional[dict]:
+        """
+        Supprime un bus et replace ses passagers dans les autres bus de l'événement
+        partant dans le même sens (au plus près de l'heure du bus supprimé), dans la
+        limite des places libres. Tous les passagers concernés sont prévenus par un
+        seul envoi groupé.
+
+        id_bus : ID du bus à supprimer
+
+        return : {"id_event", "sens", "replaces": passagers replacés (avec id_bus),
+                 "non_places": passagers restés sans bus}, None en cas d'erreur
+        """
+        try:
+            rapport = self.bus_dao.supprimer_et_redistribuer(id_bus, planifier_sens)
+        except Exception:
+            log.exception("service.bus.supprimer_bus_et_redistribuer.echec",
+                          "Erreur lors de la suppression du bus")
+            return None
+        if rapport is None:
+            print(f"Bus {id_bus} introuvable")
+            return None
+
+        signaler_modification()
+        self._desindexer(id_bus)
+        notifier_suppression_bus(rapport)
+        return rapport
+
+    def affecter_bus(self, id_event: int, reequilibrer: bool = False) -> Optional[dict]:
+        """
+        Affecte automatiquement les inscrits d'un événement à ses bus aller et retour,
+        en respectant les capacités et l'heure de départ de chacun, et en regroupant
+        les passagers dans le moins de bus possible.
+
+        id_event     : ID de l'événement
+        reequilibrer : False pour ne placer que les inscrits sans bus,
+                       True pour réaffecter tout le monde
+
+        return : par sens ("ALLER", "RETOUR"), {"affectes": nombre de passagers
+                 déplacés ou placés, "non_places": codes de réservation sans place,
+                 "bus_utilises": ids des bus occupés} ; None en cas d'erreur
+        """
+        def planifier(bus, passagers):
+            return planifier_evenement(bus, passagers, conserver=not reequilibrer)
+
+        try:
+            plans = self.bus_dao.reaffecter(id_event, planifier)
+        except Exception:
+            log.exception("service.bus.planifier.echec", "Erreur lors de l'affectation des bus")
+            return None
+        if plans is None:
+            print(f"Événement {id_event} introuvable")
+            return None
+
+        signaler_modification()
+        return {
+            sens: {
+                "affectes": len(plan["affectation"]),
+                "non_places": plan["non_places"],
+                "bus_utilises": plan["bus_utilises"],
+            }
+            for sens, plan in plans.items()
+        }
+
+    def planifier_flotte(self,
+                         capacite_vehicule: int,
+                         fenetre_jours: int = 7,
+                         id_event: Optional[int] = None) -> list[dict]:
+        """
+        Estime le nombre de bus aller et retour nécessaires pour les événements en cours,
+        à partir des inscrits et du rythme d'inscription des derniers jours.
+
+        capacite_vehicule : nombre de places des bus à prévoir
+        fenetre_jours     : période de mesure du rythme d'inscription (7 jours par défaut)
+        id_event          : limite le calcul à un événement (tous les événements en cours sinon)
+
+        return : une ligne de besoins par événement (voir projeter_besoins), [] en cas d'erreur
+        """
+        if capacite_vehicule <= 0 or fenetre_jours <= 0:
+            print("Erreur de validation : la capacité et la fenêtre doivent être positives.")
+            return []
+        try:
+            lignes = self.bus_dao.besoins_flotte(fenetre_jours, id_event)
+        except Exception:
+            log.exception("service.bus.planifier_flotte.echec",
+                          "Erreur lors du calcul des besoins en bus")
+            return []
+        return [projeter_besoins(ligne, capacite_vehicule, fenetre_jours) for ligne in lignes]
+
+    def creer_flotte(self,
+                     besoins: list[dict],
+                     capacite_vehicule: int,
+                     heure_aller: time = None,
+                     heure_retour: time = None) -> list[Bus]:
+        """
+        Crée en une seule insertion les bus manquants calculés par planifier_flotte.
+
+        besoins           : lignes retournées par planifier_flotte
+        capacite_vehicule : capacité des bus créés
+        heure_aller       : heure de départ des bus aller (optionnelle)
+        heure_retour      : heure de départ des bus retour (optionnelle)
+
+        return : les bus créés (avec leur id_bus), [] en cas d'erreur
+        """
+        nouveaux_bus = [
+            Bus(
+                id_event=ligne["id_event"],
+                sens=sens,
+                heure_depart=heure,
+                capacite_max=capacite_vehicule,
+                description=f"{sens.capitalize()} {ligne['bus_' + sens] + numero}",
+            )
+            for ligne in besoins
+            for sens, heure in (("aller", heure_aller), ("retour", heure_retour))
+            for numero in range(1, ligne["a_creer_" + sens] + 1)
+        ]
+        if not nouveaux_bus:
+            return []
+
+        departs = [self._depart(bus, ligne.get("date_event"))
+                   for bus, ligne in zip(nouveaux_bus, self._lignes_par_bus(besoins))]
+        for bus, depart in zip(nouveaux_bus, departs):
+            self._signaler_conflits(bus, depart)
+
+        try:
+            bus_crees = self.bus_dao.creer_plusieurs(nouveaux_bus)
+        except Exception:
+            log.exception("service.bus.creer_flotte.echec",
+                          "Erreur lors de la création de la flotte")
+            return []
+        signaler_modification()
+        for bus, depart in zip(bus_crees, departs):
+            self._indexer(bus, depart)
+        return bus_crees
+
+    @staticmethod
+    def _lignes_par_bus(besoins: list[dict]) -> list[dict]:
+        """Ligne de besoins de chaque bus créé par creer_flotte, dans le même ordre."""
+        return [
+            ligne
+            for ligne in besoins
+            for sens in ("aller", "retour")
+            for _ in range(ligne["a_creer_" + sens])
+        ]
+
+    # ------------------------------------------------------------------
+    # Horaires : chevauchements entre événements et planning des véhicules
+    # ------------------------------------------------------------------
+
+    def index_horaires(self) -> IndexHorairesBus:
+        """Index en mémoire des départs de tous les bus (une requête au premier appel)."""
+        if self._index_horaires is None:
+            with self._verrou_index:
+                if self._index_horaires is None:
+                    ACCES_CACHE.inc(cache="horaires_bus", resultat="miss")
+                    self._index_horaires = IndexHorairesBus.depuis_lignes(self.bus_dao.lister_horaires())
+                    return self._index_horaires
+        ACCES_CACHE.inc(cache="horaires_bus", resultat="hit")
+        return self._index_horaires
+
+    def _depart(self, bus: Bus, date_event: date = None):
+        """Date et heure de départ d'un bus, None si elles ne sont pas connues."""
+        try:
+            if date_event is None:
+                evenements = self.evenement_dao.get_by("id_event", bus.id_event)
+                date_event = evenements[0].date_event if evenements else None
+            return moment_depart(date_event, bus.heure_depart, bus.sens)
+        except Exception as e:
+            log.avertissement("service.bus.horaires.echec", "Vérification des horaires impossible",
+                              id_bus=bus.id_bus, erreur=str(e))
+            return None
+
+    def _signaler_conflits(self, bus: Bus, depart) -> list[int]:
+        if depart is None:
+            return []
+        try:
+            conflits = self.index_horaires().conflits(depart, id_event=bus.id_event)
+        except Exception as e:
+            log.avertissement("service.bus.horaires.echec", "Vérification des horaires impossible",
+                              id_bus=bus.id_bus, erreur=str(e))
+            return []
+        if conflits:
+            print(f"⚠️ Départ du {depart:%d/%m à %H:%M} en même temps que les bus {conflits} "
+                  "d'autres événements.")
+        return conflits
+
+    def _indexer(self, bus: Optional[Bus], depart):
+        if bus is not None and depart is not None and self._index_horaires is not None:
+            self._index_horaires.ajouter(bus.id_bus, bus.id_event, depart)
+
+    def _desindexer(self, id_bus: int):
+        if self._index_horaires is not None:
+            self._index_horaires.retirer(id_bus)
+
+    def conflits_horaires(self, jour: date) -> list[dict]:
+        """
+        Chevauchements entre bus d'événements différents pour une date.
+
+        return : une ligne {"id_bus", "conflits": [id_bus]} par bus en conflit
+        """
+        index = self.index_horaires()
+        resultat = []
+        for depart, id_bus, id_event in index.departs(jour):
+            conflits = [autre for autre in index.conflits(depart, id_event=id_event) if autre != id_bus]
+            if conflits:
+                resultat.append({"id_bus": id_bus, "depart": depart, "conflits": conflits})
+        return resultat
+
+    def planning_vehicules(self, jour: date) -> list[list[int]]:
+        """
+        Nombre minimal de véhicules pour assurer tous les départs d'une date, et les
+        bus assurés par chacun (voir IndexHorairesBus.planning).
+        """
+        try:
+            return self.index_horaires().planning(jour)
+        except Exception:
+            log.exception("service.bus.planning_vehicules.echec",
+                          "Erreur lors du calcul du planning des véhicules")
+            return []
 
     def get_bus_by(self, field: str, value) -> Optional[Bus]:
         """
@@ -102,9 +351,9 @@ class BusService:
             # Capture la validation du champ
             print(f"Champ non autorisé : {ve}")
             return None
-        except Exception as e:
+        except Exception:
             # Autres erreurs (connexion, SQL, etc.)
-            print(f"Erreur lors de la récupération du bus : {e}")
+            log.exception("service.bus.get_bus_by.echec", "Erreur lors de la récupération du bus")
             return None
 
 
@@ -112,6 +361,7 @@ class BusService:
         """Récupère tous les bus."""
         try:
             return self.bus_dao.lister_tous()
-        except Exception as e:
-            print(f"Erreur lors de la récupération des bus : {e}")
+        except Exception:
+            log.exception("service.bus.get_tous_les_bus.echec",
+                          "Erreur lors de la récupération des bus")
             return []
\ No newline at end of file
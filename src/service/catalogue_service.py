@@ -0,0 +1,98 @@
+import atexit
+import os
+import threading
+from typing import List, Optional
+from business_object.evenement_catalogue import EvenementCatalogue
+from dao.catalogue_dao import CatalogueDAO
+from utils.metriques import compteur
+
+ACCES_CACHE = compteur("bde_cache_acces_total", "Accès aux caches (hit / miss)", ("cache", "resultat"))
+
+
+class RafraichisseurCatalogue:
+    """
+    Regroupe les demandes de rafraîchissement du catalogue.
+
+    Chaque écriture des services appelle demander() ; le rafraîchissement part
+    `delai` secondes après la première demande et couvre toutes celles reçues
+    entre-temps. Une rafale d'inscriptions à l'ouverture ne coûte donc qu'un
+    REFRESH par fenêtre. Avec delai = 0, le rafraîchissement est immédiat.
+    """
+
+    def __init__(self, catalogue_dao, delai: float):
+        self.catalogue_dao = catalogue_dao
+        self.delai = delai
+        self._verrou = threading.Lock()
+        self._minuteur = None
+
+    def demander(self):
+        """Signale que le catalogue doit être recalculé."""
+        if self.delai <= 0:
+            ACCES_CACHE.inc(cache="catalogue", resultat="miss")
+            self.catalogue_dao.rafraichir()
+            return
+        with self._verrou:
+            if self._minuteur is None:
+                ACCES_CACHE.inc(cache="catalogue", resultat="miss")
+                self._minuteur = threading.Timer(self.delai, self._rafraichir)
+                self._minuteur.daemon = True
+                self._minuteur.start()
+            else:
+                # Demande couverte par le rafraîchissement déjà programmé
+                ACCES_CACHE.inc(cache="catalogue", resultat="hit")
+
+    def _rafraichir(self):
+        # Les demandes qui arrivent pendant le REFRESH en programment un nouveau
+        with self._verrou:
+            self._minuteur = None
+        self.catalogue_dao.rafraichir()
+
+    def vider(self):
+        """Exécute tout de suite un rafraîchissement en attente (à la sortie du programme)."""
+        with self._verrou:
+            minuteur, self._minuteur = self._minuteur, None
+        if minuteur is not None:
+            minuteur.cancel()
+            self.catalogue_dao.rafraichir()
+
+
+# Rafraîchisseur actif, None tant qu'un point d'entrée ne l'a pas activé
+_rafraichisseur: Optional[RafraichisseurCatalogue] = None
+
+
+def activer_rafraichissement(delai: float = None, catalogue_dao=None) -> RafraichisseurCatalogue:
+    """
+    Active les rafraîchissements du catalogue déclenchés par les écritures.
+    Appelé par les points d'entrée (CLI, mode batch, API) ; sans activation,
+    signaler_modification() ne fait rien (tests unitaires, scripts de charge).
+
+    delai: fenêtre de regroupement en secondes (CATALOGUE_DELAI, 0.5 par défaut)
+    """
+    global _rafraichisseur
+    if _rafraichisseur is None:
+        if delai is None:
+            delai = float(os.environ.get("CATALOGUE_DELAI", 0.5))
+        _rafraichisseur = RafraichisseurCatalogue(catalogue_dao or CatalogueDAO(), delai)
+        atexit.register(_rafraichisseur.vider)
+    return _rafraichisseur
+
+
+def signaler_modification():
+    """Hook appelé par les services après une écriture qui modifie le catalogue."""
+    if _rafraichisseur is not None:
+        _rafraichisseur.demander()
+
+
+class CatalogueService:
+    """Lecture du catalogue des événements ouverts pour les écrans de liste."""
+
+    def __init__(self, catalogue_dao=None):
+        self.catalogue_dao = catalogue_dao or CatalogueDAO()
+
+    def lister_catalogue(self) -> List[EvenementCatalogue]:
+        """Événements en cours avec places restantes et bus disponibles par sens."""
+        return self.catalogue_dao.lister()
+
+    def rafraichir(self) -> bool:
+        """Recalcule le catalogue immédiatement."""
+        return self.catalogue_dao.rafraichir()
@@ -0,0 +1,243 @@
+"""
+Diffusion d'un message à tous les inscrits d'un événement.
+
+Le message est rendu une seule fois : le texte commun contient des paramètres
+Brevo (`{{ params.prenom }}`), seuls les destinataires et leurs paramètres changent.
+Les paramètres communs (titre, texte libre d'un admin) sont ajoutés à ceux de chaque
+destinataire : Brevo les insère comme des données, sans les interpréter.
+Les envois partent en arrière-plan, par paquets, sur un thread dédié : l'appelant
+(suppression d'un événement, annonce d'un admin) n'attend pas l'API d'e-mails.
+
+Chaque diffusion est journalisée dans un dossier (DIFFUSION_DOSSIER, `.diffusions`
+par défaut) : `<id>.json` contient le message et les destinataires, `<id>.etat.json`
+l'avancement, mis à jour après chaque paquet. Une diffusion interrompue (arrêt du
+programme) reprend au premier paquet non envoyé lors de l'activation suivante.
+Une fois la diffusion terminée, `<id>.json` est supprimé : seul l'état, sans e-mail
+ni nom, reste sur le disque.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from utils.emails import envoyer_emails
+from utils.journal import journal
+from utils.metriques import jauge
+
+log = journal(__name__)
+
+EMAILS_EN_ATTENTE = jauge("bde_emails_en_attente", "E-mails de diffusion pas encore envoyés")
+
+TAILLE_PAQUET = 500
+
+
+class PipelineDiffusion:
+    """File de diffusions traitée par un thread d'envoi, avec journal de reprise."""
+
+    def __init__(self, dossier: str = None, taille_paquet: int = TAILLE_PAQUET):
+        self.dossier = Path(dossier or os.environ.get("DIFFUSION_DOSSIER", ".diffusions"))
+        self.taille_paquet = taille_paquet
+        self._file = queue.Queue()
+        self._etats = {}
+        self._verrou = threading.Lock()
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # API publique
+    # ------------------------------------------------------------------
+
+    def soumettre(self, sujet: str, texte: str, destinataires: list, id_event: int = None,
+                  params: dict = None) -> str:
+        """
+        Journalise une diffusion et la met en file ; retourne immédiatement.
+
+        sujet, texte: message commun, pouvant utiliser {{ params.prenom }} et {{ params.nom }}
+        destinataires: lignes {email, nom, prenom} (EvenementDAO.destinataires)
+        params: paramètres Brevo communs à tous les destinataires
+
+        return: identifiant de la diffusion
+        """
+        id_diffusion = uuid.uuid4().hex
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        travail = {
+            "id": id_diffusion,
+            "id_event": id_event,
+            "sujet": sujet,
+            "texte": texte,
+            "params": params or {},
+            "destinataires": [
+                {"email": d["email"], "nom": d.get("nom", ""), "prenom": d.get("prenom", "")}
+                for d in destinataires
+            ],
+        }
+        self._ecrire(self.dossier / f"{id_diffusion}.json", travail)
+        etat = {
+            "id": id_diffusion,
+            "id_event": id_event,
+            "statut": "en_attente",
+            "total": len(destinataires),
+            "traites": 0,
+            "acceptes": 0,
+            "echecs": 0,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._sauver_etat(etat)
+        self._file.put(id_diffusion)
+        self._demarrer()
+        return id_diffusion
+
+    def reprendre(self) -> list[str]:
+        """Remet en file les diffusions journalisées non terminées."""
+        repris = []
+        for chemin in sorted(self.dossier.glob("*.etat.json")):
+            etat = json.loads(chemin.read_text(encoding="utf-8"))
+            if etat["statut"] == "termine":
+                # Arrêt entre la fin de la diffusion et la suppression de son message
+                (self.dossier / f"{etat['id']}.json").unlink(missing_ok=True)
+            elif etat["id"] not in self._etats:
+                with self._verrou:
+                    self._etats[etat["id"]] = etat
+                self._file.put(etat["id"])
+                repris.append(etat["id"])
+        if repris:
+            log.info("diffusion.reprise", f"Reprise de {len(repris)} diffusion(s) interrompue(s)",
+                     diffusions=repris)
+            self._demarrer()
+        return repris
+
+    def progression(self, id_diffusion: str) -> Optional[dict]:
+        """Avancement d'une diffusion : statut, total, traites, acceptes, echecs."""
+        with self._verrou:
+            etat = self._etats.get(id_diffusion)
+            if etat is not None:
+                return dict(etat)
+        chemin = self.dossier / f"{id_diffusion}.etat.json"
+        if chemin.exists():
+            return json.loads(chemin.read_text(encoding="utf-8"))
+        return None
+
+    def en_attente(self) -> int:
+        """Nombre d'e-mails restant à envoyer, toutes diffusions confondues."""
+        with self._verrou:
+            return sum(etat["total"] - etat["traites"] for etat in self._etats.values()
+                       if etat["statut"] != "termine")
+
+    def attendre(self, timeout: float = None) -> bool:
+        """Attend la fin des diffusions en file ; False si le délai est écoulé."""
+        fin = threading.Event()
+        threading.Thread(target=lambda: (self._file.join(), fin.set()), daemon=True).start()
+        return fin.wait(timeout)
+
+    # ------------------------------------------------------------------
+    # Thread d'envoi
+    # ------------------------------------------------------------------
+
+    def _demarrer(self):
+        with self._verrou:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._travailler, name="diffusion", daemon=True)
+                self._thread.start()
+
+    def _travailler(self):
+        while True:
+            id_diffusion = self._file.get()
+            try:
+                self._traiter(id_diffusion)
+            except Exception:
+                log.exception("diffusion.echec", "Diffusion interrompue", id_diffusion=id_diffusion)
+            finally:
+                self._file.task_done()
+
+    def _traiter(self, id_diffusion: str):
+        travail = json.loads((self.dossier / f"{id_diffusion}.json").read_text(encoding="utf-8"))
+        etat = self.progression(id_diffusion)
+        etat["statut"] = "en_cours"
+
+        destinataires = travail["destinataires"]
+        communs = travail.get("params", {})
+        # Reprise : les paquets déjà envoyés (etat["traites"]) ne sont pas renvoyés
+        for debut in range(etat["traites"], len(destinataires), self.taille_paquet):
+            paquet = destinataires[debut:debut + self.taille_paquet]
+            messages = [
+                {
+                    "to_email": d["email"],
+                    "to_name": f"{d['prenom']} {d['nom']}".strip() or "Destinataire",
+                    "subject": travail["sujet"],
+                    "message_text": travail["texte"],
+                    "params": {**communs, "prenom": d["prenom"], "nom": d["nom"]},
+                }
+                for d in paquet
+            ]
+            try:
+                resultats = envoyer_emails(messages)
+            except Exception as e:
+                resultats = [(None, str(e))] * len(messages)
+            acceptes = sum(1 for statut, _ in resultats if statut and 200 <= statut < 300)
+            etat["traites"] = debut + len(paquet)
+            etat["acceptes"] += acceptes
+            etat["echecs"] += len(paquet) - acceptes
+            self._sauver_etat(etat)
+
+        etat["statut"] = "termine"
+        self._sauver_etat(etat)
+        # Les destinataires (e-mails, noms) ne sont gardés que le temps de l'envoi
+        (self.dossier / f"{id_diffusion}.json").unlink(missing_ok=True)
+        log.info("diffusion.termine", "Diffusion terminée", id_diffusion=id_diffusion,
+                 id_event=etat["id_event"], total=etat["total"], acceptes=etat["acceptes"],
+                 echecs=etat["echecs"])
+
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    def _sauver_etat(self, etat: dict):
+        with self._verrou:
+            self._etats[etat["id"]] = dict(etat)
+        self._ecrire(self.dossier / f"{etat['id']}.etat.json", etat)
+
+    @staticmethod
+    def _ecrire(chemin: Path, donnees: dict):
+        # Écriture atomique : un arrêt brutal laisse l'ancienne version intacte
+        temporaire = chemin.with_suffix(".tmp")
+        temporaire.write_text(json.dumps(donnees, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporaire, chemin)
+
+
+# Pipeline actif, None tant qu'un point d'entrée ne l'a pas activé
+_pipeline: Optional[PipelineDiffusion] = None
+
+
+def activer_diffusion(dossier: str = None, delai_sortie: float = 5.0) -> PipelineDiffusion:
+    """
+    Active les diffusions et reprend celles qui ont été interrompues.
+    Appelé par les points d'entrée (CLI, mode batch, API) ; sans activation,
+    diffuser() ne fait rien (tests unitaires, scripts de charge).
+
+    delai_sortie: temps laissé aux envois en cours à la fin du programme
+    """
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = PipelineDiffusion(dossier)
+        EMAILS_EN_ATTENTE.suivre(_pipeline.en_attente)
+        _pipeline.reprendre()
+        atexit.register(_pipeline.attendre, delai_sortie)
+    return _pipeline
+
+
+def diffuser(sujet: str, texte: str, destinataires: list, id_event: int = None,
+             params: dict = None) -> Optional[str]:
+    """Met une diffusion en file sur le pipeline actif ; retourne son identifiant."""
+    if _pipeline is None or not destinataires:
+        return None
+    return _pipeline.soumettre(sujet, texte, destinataires, id_event, params)
+
+
+def progression_diffusion(id_diffusion: str) -> Optional[dict]:
+    """Avancement d'une diffusion du pipeline actif."""
+    if _pipeline is None:
+        return None
+    return _pipeline.progression(id_diffusion)
@@ -4,6 +4,12 @@ from business_object.inscription import Inscription
 from business_object.utilisateur import Utilisateur
 from datetime import date
 import random
+from service.catalogue_service import signaler_modification
+from service.diffusion import diffuser
+from service.notifications import modele_annonce, modele_annulation, notifier_promotions
+from utils.journal import journal
+
+log = journal(__name__)
 
 STATUTS_VALIDES = ['en_cours', 'passe']
 
@@ -55,6 +61,7 @@ class EvenementService:
 
             if self.evenement_dao.creer(nouvel_evenement):
                 print(f"Événement '{titre}' créé avec succès.")
+                signaler_modification()
                 return nouvel_evenement
             else:
                 print("Erreur lors de la création de l'événement.")
@@ -70,16 +77,18 @@ class EvenementService:
         except ValueError as ve:
             print(f"Champ non autorisé : {ve}")
             return []
-        except Exception as e:
-            print(f"Erreur lors de la récupération de l'événement : {e}")
+        except Exception:
+            log.exception("service.evenement.get_evenement_by.echec",
+                          "Erreur lors de la récupération de l'événement")
             return []
 
     def get_tous_les_evenement(self) -> List[Evenement]:
         """Récupère tous les événements."""
         try:
             return self.evenement_dao.lister_tous()
-        except Exception as e:
-            print(f"Erreur lors de la récupération des événements : {e}")
+        except Exception:
+            log.exception("service.evenement.get_tous_les_evenement.echec",
+                          "Erreur lors de la récupération des événements")
             return []
 
     def supprimer_evenement(self, id_event: int) -> bool:
@@ -91,19 +100,51 @@ class EvenementService:
             print(f"❌ Impossible de supprimer : aucun événement avec id {id_event}.")
             return False
 
+        # Les inscriptions disparaissent avec l'événement : les destinataires sont lus avant
+        destinataires = self.evenement_dao.destinataires(id_event)
         try:
             succes = self.evenement_dao.supprimer(evenement[0])
             if succes:
                 print(f"✔️ Événement {id_event} supprimé avec succès.")
+                signaler_modification()
+                sujet, message, params = modele_annulation(evenement[0])
+                diffuser(sujet, message, destinataires, id_event, params)
                 return True
             else:
                 print("❌ Erreur lors de la suppression de l'événement.")
                 return False
 
-        except Exception as e:
-            print(f"❌ Exception lors de la suppression : {e}")
+        except Exception:
+            log.exception("service.evenement.supprimer_evenement.echec",
+                          "Exception lors de la suppression", id_event=id_event)
             return False
 
+    def diffuser_message(self, id_event: int, texte: str) -> Optional[str]:
+        """
+        Envoie une annonce à tous les inscrits d'un événement, en arrière-plan.
+
+        return: identifiant de la diffusion (suivi par progression_diffusion),
+                None si l'événement est introuvable, sans inscrit ou si les
+                diffusions ne sont pas activées
+        """
+        evenement = self.evenement_dao.get_by("id_event", id_event)
+        if not evenement:
+            print(f"❌ Impossible de diffuser : événement {id_event} introuvable.")
+            return None
+        if not texte.strip():
+            print("❌ Le message est vide.")
+            return None
+
+        destinataires = self.evenement_dao.destinataires(id_event)
+        if not destinataires:
+            print("Aucun inscrit à prévenir.")
+            return None
+        sujet, message, params = modele_annonce(evenement[0], texte.strip())
+        id_diffusion = diffuser(sujet, message, destinataires, id_event, params)
+        if id_diffusion:
+            print(f"✔️ Diffusion à {len(destinataires)} inscrit(s) lancée.")
+        return id_diffusion
+
     def modifier_statut(self, id_event: int) -> bool:
         """
         Met automatiquement à jour le statut d’un événement selon :
@@ -137,5 +178,53 @@ class EvenementService:
         if evenement.statut != nouveau_statut:
             self.evenement_dao.modifier_statut(id_event, nouveau_statut)
             print(f"✔️ Statut mis à jour : {evenement.statut} → {nouveau_statut}")
+            signaler_modification()
+
+        return True
+
+    def modifier_capacite(self, id_event: int, capacite_max: int) -> bool:
+        """
+        Modifie la capacité d'un événement.
+        Les places ajoutées sont attribuées à la liste d'attente dans la même transaction,
+        puis les utilisateurs promus sont prévenus par e-mail.
+        """
+        if not isinstance(capacite_max, int) or capacite_max <= 0:
+            print("❌ La capacité doit être un entier strictement positif.")
+            return False
+
+        evenement = self.evenement_dao.get_by("id_event", id_event)
+        if not evenement:
+            print(f"❌ Impossible de modifier la capacité : événement {id_event} introuvable.")
+            return False
+
+        promotions = self.evenement_dao.modifier_capacite(id_event, capacite_max)
+        if promotions is None:
+            print("❌ La capacité ne peut pas être inférieure au nombre d'inscrits.")
+            return False
 
+        print(f"✔️ Capacité de l'événement {id_event} : {evenement[0].capacite_max} → {capacite_max}")
+        notifier_promotions(promotions)
+        signaler_modification()
+        self.modifier_statut(id_event)
         return True
+
+    def verifier_compteurs(self, corriger: bool = False) -> List[dict]:
+        """
+        Contrôle la cohérence des compteurs d'inscrits (événements et bus)
+        maintenus par les triggers, et les corrige sur demande.
+
+        return: les écarts constatés (vide si tout est cohérent)
+        """
+        try:
+            ecarts = self.evenement_dao.verifier_compteurs(corriger)
+        except Exception:
+            log.exception("service.evenement.verifier_compteurs.echec",
+                          "Erreur lors de la vérification des compteurs")
+            return []
+
+        if not ecarts:
+            print("✔️ Compteurs d'inscrits cohérents.")
+        for ecart in ecarts:
+            print(f"{'✔️ Corrigé' if corriger else '❌ Écart'} : {ecart['table_compteur']} "
+                  f"{ecart['id']} compte {ecart['nb_inscrits']} inscrits au lieu de {ecart['attendu']}")
+        return ecarts
@@ -0,0 +1,128 @@
+"""
+Index en mémoire des départs de bus, pour repérer les chevauchements entre
+événements d'une même date et calculer le nombre minimal de véhicules.
+
+Un bus occupe son véhicule de son départ jusqu'à `duree` plus tard (trajet et
+retour du car). Les départs sont rangés par date dans des listes triées : la
+recherche des chevauchements d'un départ est une dichotomie, en O(log n) plus le
+nombre de conflits trouvés.
+"""
+import bisect
+import heapq
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from service.affectation_bus import minutes
+
+# Durée pendant laquelle un car est mobilisé par un départ
+DUREE_TRAJET = timedelta(minutes=90)
+
+# Un bus retour qui part avant midi part le lendemain de l'événement (retour de soirée)
+HEURE_LIMITE_RETOUR = 12 * 60
+
+
+def moment_depart(date_event: date, heure_depart, sens: str = "") -> Optional[datetime]:
+    """Date et heure de départ d'un bus, None si l'heure est inconnue."""
+    total = minutes(heure_depart)
+    if date_event is None or total is None:
+        return None
+    depart = datetime.combine(date_event, time(total // 60, total % 60))
+    if (sens or "").upper() == "RETOUR" and total < HEURE_LIMITE_RETOUR:
+        depart += timedelta(days=1)
+    return depart
+
+
+class IndexHorairesBus:
+    """Départs de bus indexés par date, avec recherche des chevauchements."""
+
+    def __init__(self, duree: timedelta = DUREE_TRAJET):
+        self.duree = duree
+        self._par_jour = {}  # date -> liste triée de (départ, id_bus)
+        self._departs = {}   # id_bus -> départ
+        self._evenements = {}  # id_bus -> id_event
+        self._verrou = threading.Lock()
+
+    @classmethod
+    def depuis_lignes(cls, lignes: list, duree: timedelta = DUREE_TRAJET) -> "IndexHorairesBus":
+        """Construit l'index à partir des lignes de BusDAO.lister_horaires."""
+        index = cls(duree)
+        for ligne in lignes:
+            depart = moment_depart(ligne["date_event"], ligne["heure_depart"], ligne["sens"])
+            if depart is not None:
+                index.ajouter(ligne["id_bus"], ligne["id_event"], depart)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._departs)
+
+    def ajouter(self, id_bus: int, id_event: int, depart: datetime):
+        """Ajoute (ou déplace) le départ d'un bus."""
+        with self._verrou:
+            self._retirer(id_bus)
+            bisect.insort(self._par_jour.setdefault(depart.date(), []), (depart, id_bus))
+            self._departs[id_bus] = depart
+            self._evenements[id_bus] = id_event
+
+    def retirer(self, id_bus: int):
+        """Retire le départ d'un bus (bus supprimé)."""
+        with self._verrou:
+            self._retirer(id_bus)
+
+    def _retirer(self, id_bus: int):
+        depart = self._departs.pop(id_bus, None)
+        if depart is None:
+            return
+        self._evenements.pop(id_bus, None)
+        jour = self._par_jour[depart.date()]
+        del jour[bisect.bisect_left(jour, (depart, id_bus))]
+
+    def departs(self, jour: date) -> list[tuple]:
+        """Départs d'une date : (départ, id_bus, id_event) par heure."""
+        with self._verrou:
+            return [(depart, id_bus, self._evenements[id_bus])
+                    for depart, id_bus in self._par_jour.get(jour, [])]
+
+    def conflits(self, depart: datetime, id_event: Optional[int] = None) -> list[int]:
+        """
+        Bus dont le créneau chevauche un départ à `depart`.
+
+        id_event : si renseigné, seuls les bus des autres événements sont signalés
+                   (les bus d'un même événement sont prévus pour partir ensemble)
+
+        return : ids des bus en conflit, par heure de départ
+        """
+        resultat = []
+        with self._verrou:
+            # Un créneau qui déborde de minuit peut toucher la veille ou le lendemain
+            for jour in {(depart - self.duree).date(), depart.date(), (depart + self.duree).date()}:
+                departs = self._par_jour.get(jour, [])
+                debut = bisect.bisect_right(departs, (depart - self.duree, float("inf")))
+                fin = bisect.bisect_left(departs, (depart + self.duree, float("-inf")))
+                resultat.extend(departs[debut:fin])
+            return [
+                id_bus for _, id_bus in sorted(resultat)
+                if id_event is None or self._evenements[id_bus] != id_event
+            ]
+
+    def planning(self, jour: date) -> list[list[int]]:
+        """
+        Planning minimal des véhicules pour une date : chaque véhicule enchaîne des
+        départs qui ne se chevauchent pas, et le nombre de véhicules est le plus petit
+        possible (égal au nombre maximal de créneaux simultanés).
+
+        return : pour chaque véhicule, les ids des bus qu'il assure, dans l'ordre
+        """
+        with self._verrou:
+            departs = list(self._par_jour.get(jour, []))
+
+        vehicules = []
+        libres = []  # tas de (fin du dernier créneau, numéro du véhicule)
+        for depart, id_bus in departs:
+            if libres and libres[0][0] <= depart:
+                _, numero = heapq.heappop(libres)
+            else:
+                numero = len(vehicules)
+                vehicules.append([])
+            vehicules[numero].append(id_bus)
+            heapq.heappush(libres, (depart + self.duree, numero))
+        return vehicules
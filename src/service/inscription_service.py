@@ -2,13 +2,39 @@ from typing import Optional, List
 from business_object.inscription import Inscription
 from dao.inscription_dao import InscriptionDAO
 from dao.evenement_dao import EvenementDAO
+from dao.liste_attente_dao import ListeAttenteDAO
+from business_object.attente import Attente
 from service.evenement_service import EvenementService
 from dao.utilisateur_dao import UtilisateurDAO
 from business_object.utilisateur import Utilisateur
 import random
 import string
 import random
-from utils.api_brevo import send_email_brevo
+from utils.emails import envoyer_email
+from service.catalogue_service import signaler_modification
+from service.notifications import (
+    notifier_inscriptions,
+    notifier_promotions,
+    notifier_recapitulatif,
+    notifier_transfert,
+)
+from utils.journal import journal
+from utils.metriques import compteur
+
+log = journal(__name__)
+
+INSCRIPTIONS_CREEES = compteur("bde_inscriptions_creees_total", "Inscriptions créées", ("parcours",))
+INSCRIPTIONS_REFUSEES = compteur("bde_inscriptions_refusees_total", "Inscriptions refusées",
+                                 ("motif",))
+
+
+def categorie_refus(motif: str) -> str:
+    """Catégorie de métrique d'un motif de refus de InscriptionDAO.creer_multiples."""
+    if motif == "déjà inscrit":
+        return "doublon"
+    if motif.endswith("complet"):
+        return "complet"
+    return "invalide"
 
 
 class InscriptionService:
@@ -21,6 +47,7 @@ class InscriptionService:
         self.inscription_dao = InscriptionDAO()
         self.evenement_dao = EvenementDAO()
         self.utilisateur_dao = UtilisateurDAO()
+        self.liste_attente_dao = ListeAttenteDAO()
 
 
     def generer_code_reservation(self, longueur: int = 8) -> str:
@@ -39,6 +66,12 @@ class InscriptionService:
             if not self.inscription_dao.get_by("code_reservation", code):
                 return code
 
+    @staticmethod
+    def _refuser(motif: str, message: str, **champs):
+        """Journalise et compte le refus d'une inscription."""
+        INSCRIPTIONS_REFUSEES.inc(motif=motif)
+        log.avertissement("service.inscription.creer.refus", message, motif=motif, **champs)
+
     def creer_inscription(
         self,
         boit: bool,
@@ -53,13 +86,15 @@ class InscriptionService:
         # 1. Validation : l'utilisateur existe
         utilisateur = self.utilisateur_dao.get_by("id_utilisateur", created_by)
         if not utilisateur:
-            print(f"❌ Erreur : Utilisateur {created_by} introuvable.")
+            self._refuser("utilisateur_introuvable", f"Utilisateur {created_by} introuvable",
+                          created_by=created_by)
             return None
 
         # 2. Validation : l'événement existe
         evenement_list = self.evenement_dao.get_by("id_event", id_event)
         if not evenement_list:
-            print(f"❌ Erreur : Événement {id_event} introuvable.")
+            self._refuser("evenement_introuvable", f"Événement {id_event} introuvable",
+                          id_event=id_event)
             return None
 
         evenement = evenement_list[0]  # extraction de l’objet Evenement
@@ -67,12 +102,14 @@ class InscriptionService:
         # 3. Validation : capacité disponible ?
         nb_inscrits = self.inscription_dao.compter_par_evenement(id_event)
         if nb_inscrits >= evenement.capacite_max:
-            print(f"❌ Erreur : Événement '{nom_event}' complet ({nb_inscrits}/{evenement.capacite_max}).")
+            self._refuser("complet", f"Événement '{nom_event}' complet", id_event=id_event,
+                          inscrits=nb_inscrits, capacite_max=evenement.capacite_max)
             return None
 
         # 4. Validation : l'utilisateur est-il déjà inscrit ?
         if self.inscription_dao.est_deja_inscrit(created_by, id_event):
-            print(f"❌ Erreur : L'utilisateur {created_by} est déjà inscrit à {nom_event}.")
+            self._refuser("doublon", f"L'utilisateur {created_by} est déjà inscrit à {nom_event}",
+                          id_event=id_event, created_by=created_by)
             return None
 
         # 5. Génération du code de réservation
@@ -94,7 +131,11 @@ class InscriptionService:
             # 7. Enregistrer en base
             created = self.inscription_dao.creer(inscription)
 
-            if created:
+            if not created:
+                INSCRIPTIONS_REFUSEES.inc(motif="erreur")
+            else:
+                INSCRIPTIONS_CREEES.inc(parcours="unitaire")
+                signaler_modification()
 
                 # 8. Envoi email automatique
                 try:
@@ -106,20 +147,149 @@ class InscriptionService:
                         f"Votre code de réservation : {code_reservation}\n\n"
                         "Merci et à bientôt !"
                     )
-                    send_email_brevo(to_email, subject, message_text)
-                    print(f"✅ Email de confirmation envoyé à {to_email}")
-                except Exception as e:
-                    print(f"⚠️ Échec de l'envoi de l'email : {e}")
+                    statut, reponse = envoyer_email(to_email, subject, message_text)
+                    if statut and 200 <= statut < 300:
+                        log.info("email.confirmation.envoi", code_reservation=code_reservation)
+                    else:
+                        log.erreur("email.envoi.echec", "Échec de l'envoi de l'email de confirmation",
+                                   code_reservation=code_reservation, statut=statut, reponse=reponse)
+                except Exception:
+                    log.exception("email.envoi.echec", "Échec de l'envoi de l'email de confirmation",
+                                  code_reservation=code_reservation)
 
             return created
 
         except ValueError as e:
-            print(f"❌ Erreur de validation : {e}")
+            self._refuser("validation", f"Erreur de validation : {e}",
+                          id_event=id_event, created_by=created_by)
             return None
 
 
 
 
+    def inscrire_groupe(
+        self,
+        id_event: int,
+        id_bus_aller: Optional[int],
+        id_bus_retour: Optional[int],
+        membres: List[dict]
+    ) -> Optional[List[Inscription]]:
+        """
+        Inscrit plusieurs étudiants ensemble au même événement et dans les mêmes bus.
+        Les membres sont validés en une requête, les places de l'événement et des bus
+        sont réservées pour tout le groupe dans une seule transaction (tout ou rien),
+        et les confirmations partent en un seul envoi groupé.
+
+        id_event      : ID de l'événement
+        id_bus_aller  : bus aller commun (None : affectation automatique plus tard)
+        id_bus_retour : bus retour commun (None : affectation automatique plus tard)
+        membres       : dicts {"created_by" (ID) ou "email", "boit", "mode_paiement"}
+
+        return : les inscriptions créées, ou None si le groupe est refusé
+        """
+        if not membres:
+            print("❌ Erreur : Le groupe est vide.")
+            return None
+        for membre in membres:
+            if membre.get("mode_paiement", "") not in ("espece", "en ligne", ""):
+                print("❌ Erreur : Le mode de paiement doit être 'espece', 'en ligne' ou vide.")
+                return None
+
+        lignes = self.inscription_dao.creer_groupe(id_event, id_bus_aller, id_bus_retour, membres)
+        if lignes is None:
+            INSCRIPTIONS_REFUSEES.inc(len(membres), motif="groupe_refuse")
+            return None
+
+        INSCRIPTIONS_CREEES.inc(len(lignes), parcours="groupe")
+        signaler_modification()
+        envoyes = notifier_inscriptions(lignes)
+        print(f"✅ {len(lignes)} inscription(s) confirmée(s), {envoyes} e-mail(s) envoyé(s)")
+        return [Inscription.from_dict(ligne) for ligne in lignes]
+
+    def inscrire_plusieurs_evenements(
+        self,
+        created_by: int,
+        choix: List[tuple],
+        boit: bool = False,
+        mode_paiement: str = "",
+        tout_ou_rien: bool = True
+    ) -> Optional[dict]:
+        """
+        Inscrit un utilisateur à plusieurs événements d'un coup (week-end, soirée + brunch...)
+        dans une seule transaction, avec un seul e-mail de confirmation.
+
+        created_by    : ID de l'utilisateur
+        choix         : liste de (id_event, id_bus_aller, id_bus_retour) ; un bus peut être None
+        boit          : consommation d'alcool (commune à toutes les inscriptions)
+        mode_paiement : 'espece', 'en ligne' ou vide
+        tout_ou_rien  : True pour ne rien inscrire si un seul choix est impossible,
+                        False pour inscrire tous les choix possibles
+
+        return : {"inscriptions": [Inscription], "refus": [{"id_event", "motif"}]},
+                 ou None en cas d'erreur
+        """
+        if not choix:
+            print("❌ Erreur : Aucun événement choisi.")
+            return None
+        if mode_paiement not in ("espece", "en ligne", ""):
+            print("❌ Erreur : Le mode de paiement doit être 'espece', 'en ligne' ou vide.")
+            return None
+
+        resultat = self.inscription_dao.creer_multiples(
+            created_by, [tuple(c) for c in choix], boit, mode_paiement, tout_ou_rien
+        )
+        if resultat is None:
+            return None
+
+        for refus in resultat["refus"]:
+            INSCRIPTIONS_REFUSEES.inc(motif=categorie_refus(refus["motif"]))
+            print(f"❌ Événement {refus['id_event']} : {refus['motif']}")
+        if resultat["inscriptions"]:
+            INSCRIPTIONS_CREEES.inc(len(resultat["inscriptions"]), parcours="multiple")
+            signaler_modification()
+            notifier_recapitulatif(resultat["utilisateur"], resultat["inscriptions"])
+            print(f"✅ {len(resultat['inscriptions'])} inscription(s) confirmée(s)")
+        elif tout_ou_rien and resultat["refus"]:
+            print("❌ Aucune inscription : un des choix est impossible.")
+
+        return {
+            "inscriptions": [Inscription.from_dict(ligne) for ligne in resultat["inscriptions"]],
+            "refus": resultat["refus"],
+        }
+
+    def transferer_inscription(
+        self,
+        code_reservation: int,
+        id_utilisateur: int,
+        email_destinataire: str
+    ) -> Optional[Inscription]:
+        """
+        Cède une réservation à un autre étudiant, sans passer par une annulation :
+        la place et les bus sont conservés, seul le titulaire change. Le cédant et
+        le destinataire sont prévenus par e-mail.
+
+        code_reservation   : code de la réservation à céder
+        id_utilisateur     : ID de l'utilisateur connecté (titulaire actuel)
+        email_destinataire : e-mail du nouveau titulaire
+
+        return : l'inscription transférée, ou None si le transfert est impossible
+        """
+        if not code_reservation or not email_destinataire:
+            print("❌ Erreur : Un code de réservation et un e-mail sont requis.")
+            return None
+
+        transfert = self.inscription_dao.transferer(
+            code_reservation, id_utilisateur, email_destinataire.strip().lower()
+        )
+        if not transfert:
+            print("❌ Transfert impossible : réservation introuvable ou pas à vous, "
+                  "destinataire inconnu ou déjà inscrit à cet événement.")
+            return None
+
+        notifier_transfert(transfert)
+        print(f"✅ Réservation {code_reservation} transférée à {transfert['email']}")
+        return Inscription.from_dict(transfert)
+
     def lister_toutes_inscriptions(self) -> List[Inscription]:
         """
         Liste toutes les inscriptions.
@@ -192,10 +362,80 @@ class InscriptionService:
         if inscription.created_by != id_utilisateur:
             raise PermissionError("Vous ne pouvez supprimer qu'une inscription que vous avez vous-même créée.")
 
-        # 4. Suppression
-        suppression_ok = self.inscription_dao.supprimer(inscription)
+        # 4. Suppression, et promotion de la liste d'attente dans la même transaction
+        promotions = self.inscription_dao.supprimer_et_promouvoir(inscription)
+        suppression_ok = promotions is not None
 
         if suppression_ok:
             print(f"INFO : Inscription {code_reservation} supprimée par l'utilisateur {id_utilisateur}.")
+            # 5. E-mails envoyés une fois la transaction validée
+            notifier_promotions(promotions)
+            signaler_modification()
 
         return suppression_ok
+
+    def rejoindre_liste_attente(
+        self,
+        boit: bool,
+        mode_paiement: str,
+        id_event: int,
+        id_bus_aller: int,
+        id_bus_retour: int,
+        created_by: int
+    ) -> Optional[Attente]:
+        """
+        Place un utilisateur en liste d'attente d'un événement complet.
+        Les places libérées sont attribuées dans l'ordre d'arrivée (voir ListeAttenteDAO.promouvoir).
+
+        return: l'entrée de liste d'attente, ou None si refusée
+        """
+        if not self.utilisateur_dao.get_by("id_utilisateur", created_by):
+            print(f"❌ Erreur : Utilisateur {created_by} introuvable.")
+            return None
+
+        evenement = self.evenement_dao.get_by("id_event", id_event)
+        if not evenement:
+            print(f"❌ Erreur : Événement {id_event} introuvable.")
+            return None
+
+        # La liste d'attente est réservée aux événements complets : sinon la promotion
+        # immédiate contournerait les contrôles de l'inscription directe
+        if evenement[0].nb_inscrits < evenement[0].capacite_max:
+            print(f"❌ Erreur : L'événement {id_event} a encore des places, inscrivez-vous directement.")
+            return None
+
+        if self.inscription_dao.est_deja_inscrit(created_by, id_event):
+            print(f"❌ Erreur : L'utilisateur {created_by} est déjà inscrit à l'événement {id_event}.")
+            return None
+
+        try:
+            attente = Attente(
+                id_event=id_event,
+                created_by=created_by,
+                boit=boit,
+                mode_paiement=mode_paiement,
+                id_bus_aller=id_bus_aller,
+                id_bus_retour=id_bus_retour,
+            )
+        except (TypeError, ValueError) as e:
+            print(f"❌ Erreur de validation : {e}")
+            return None
+
+        promotions = self.liste_attente_dao.ajouter(attente)
+        if promotions is None:
+            print(f"❌ Erreur : L'utilisateur {created_by} est déjà en liste d'attente.")
+            return None
+
+        # Une place était peut-être libre entre-temps : la file a déjà été promue
+        if promotions:
+            notifier_promotions(promotions)
+            signaler_modification()
+        return attente
+
+    def quitter_liste_attente(self, id_event: int, created_by: int) -> bool:
+        """Retire un utilisateur de la liste d'attente d'un événement."""
+        return self.liste_attente_dao.retirer(id_event, created_by)
+
+    def position_liste_attente(self, id_event: int, created_by: int) -> int:
+        """Rang dans la liste d'attente (1 = prochain promu), 0 si absent."""
+        return self.liste_attente_dao.position(id_event, created_by)
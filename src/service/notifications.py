@@ -0,0 +1,260 @@
+from utils.emails import envoyer_emails
+from utils.journal import journal
+
+log = journal(__name__)
+
+
+def notifier_promotions(promotions: list) -> int:
+    """
+    Prévient par e-mail, en un seul lot, les utilisateurs promus depuis la liste d'attente.
+    À appeler après la validation de la transaction qui a créé les inscriptions.
+
+    promotions: lignes retournées par ListeAttenteDAO.promouvoir
+
+    return: nombre d'e-mails acceptés par l'API
+    """
+    if not promotions:
+        return 0
+
+    messages = [
+        {
+            "to_email": promu["email"],
+            "subject": f"Place obtenue pour {promu['nom_event']}",
+            "message_text": (
+                f"Bonjour {promu['nom']},\n\n"
+                f"Une place s'est libérée : vous quittez la liste d'attente et votre inscription "
+                f"à l'événement '{promu['nom_event']}' est confirmée.\n"
+                f"Votre code de réservation : {promu['code_reservation']}\n\n"
+                "Merci et à bientôt !"
+            ),
+        }
+        for promu in promotions
+    ]
+    try:
+        resultats = envoyer_emails(messages)
+    except Exception:
+        log.exception("email.envoi.echec", "Échec de l'envoi des e-mails de promotion", notification="promotion")
+        return 0
+
+    envoyes = sum(1 for statut, _ in resultats if statut and 200 <= statut < 300)
+    print(f"✅ {len(promotions)} inscription(s) promue(s) depuis la liste d'attente, "
+          f"{envoyes} e-mail(s) envoyé(s)")
+    return envoyes
+
+
+def notifier_inscriptions(inscriptions: list) -> int:
+    """
+    Envoie en un seul lot les confirmations d'inscriptions créées ensemble
+    (inscription de groupe).
+
+    inscriptions: lignes avec code_reservation, email, nom et nom_event
+
+    return: nombre d'e-mails acceptés par l'API
+    """
+    if not inscriptions:
+        return 0
+
+    messages = [
+        {
+            "to_email": inscription["email"],
+            "subject": f"Confirmation d'inscription à {inscription['nom_event']}",
+            "message_text": (
+                f"Bonjour {inscription['nom']},\n\n"
+                f"Votre inscription à l'événement '{inscription['nom_event']}' a été confirmée.\n"
+                f"Votre code de réservation : {inscription['code_reservation']}\n\n"
+                "Merci et à bientôt !"
+            ),
+        }
+        for inscription in inscriptions
+    ]
+    try:
+        resultats = envoyer_emails(messages)
+    except Exception:
+        log.exception("email.envoi.echec", "Échec de l'envoi des e-mails de confirmation", notification="confirmation")
+        return 0
+
+    return sum(1 for statut, _ in resultats if statut and 200 <= statut < 300)
+
+
+def notifier_recapitulatif(utilisateur: dict, inscriptions: list) -> int:
+    """
+    Envoie un seul e-mail récapitulant plusieurs inscriptions d'un même utilisateur.
+
+    utilisateur: dict avec email et nom
+    inscriptions: lignes avec code_reservation et nom_event
+
+    return: 1 si l'e-mail a été accepté par l'API, 0 sinon
+    """
+    if not inscriptions:
+        return 0
+
+    lignes = "\n".join(
+        f"- {inscription['nom_event']} : code de réservation {inscription['code_reservation']}"
+        for inscription in inscriptions
+    )
+    message = {
+        "to_email": utilisateur["email"],
+        "subject": f"Confirmation de {len(inscriptions)} inscription(s)",
+        "message_text": (
+            f"Bonjour {utilisateur['nom']},\n\n"
+            f"Vos inscriptions sont confirmées :\n{lignes}\n\n"
+            "Merci et à bientôt !"
+        ),
+    }
+    try:
+        resultats = envoyer_emails([message])
+    except Exception:
+        log.exception("email.envoi.echec", "Échec de l'envoi de l'e-mail récapitulatif", notification="recapitulatif")
+        return 0
+
+    return sum(1 for statut, _ in resultats if statut and 200 <= statut < 300)
+
+
+def notifier_transfert(transfert: dict) -> int:
+    """
+    Prévient en un seul envoi le cédant et le nouveau titulaire d'une réservation.
+
+    transfert: ligne retournée par InscriptionDAO.transferer
+
+    return: nombre d'e-mails acceptés par l'API
+    """
+    nom_event = transfert["nom_event"]
+    messages = [
+        {
+            "to_email": transfert["email_cedant"],
+            "subject": f"Réservation transférée pour {nom_event}",
+            "message_text": (
+                f"Bonjour {transfert['nom_cedant']},\n\n"
+                f"Votre réservation {transfert['code_reservation']} pour l'événement '{nom_event}' "
+                f"a bien été transférée à {transfert['prenom']} {transfert['nom']}.\n\n"
+                "Merci et à bientôt !"
+            ),
+        },
+        {
+            "to_email": transfert["email"],
+            "subject": f"Confirmation d'inscription à {nom_event}",
+            "message_text": (
+                f"Bonjour {transfert['nom']},\n\n"
+                f"{transfert['prenom_cedant']} {transfert['nom_cedant']} vous a transféré sa place "
+                f"pour l'événement '{nom_event}'.\n"
+                f"Votre code de réservation : {transfert['code_reservation']}\n\n"
+                "Merci et à bientôt !"
+            ),
+        },
+    ]
+    try:
+        resultats = envoyer_emails(messages)
+    except Exception:
+        log.exception("email.envoi.echec", "Échec de l'envoi des e-mails de transfert", notification="transfert")
+        return 0
+
+    return sum(1 for statut, _ in resultats if statut and 200 <= statut < 300)
+
+
+def notifier_suppression_bus(rapport: dict) -> int:
+    """
+    Prévient en un seul lot les passagers d'un bus supprimé : nouveau bus pour ceux
+    qui ont été replacés, absence de bus pour les autres.
+
+    rapport: résultat de BusDAO.supprimer_et_redistribuer
+
+    return: nombre d'e-mails acceptés par l'API
+    """
+    sens = rapport["sens"].lower()
+    messages = [
+        {
+            "to_email": passager["email"],
+            "subject": f"Changement de bus pour {passager['nom_event']}",
+            "message_text": (
+                f"Bonjour {passager['nom']},\n\n"
+                f"Votre bus {sens} pour l'événement '{passager['nom_event']}' a été supprimé.\n"
+                f"Vous avez été placé(e) dans le bus {passager['id_bus']}.\n"
+                f"Votre code de réservation : {passager['code_reservation']}\n\n"
+                "Merci et à bientôt !"
+            ),
+        }
+        for passager in rapport["replaces"]
+    ] + [
+        {
+            "to_email": passager["email"],
+            "subject": f"Changement de bus pour {passager['nom_event']}",
+            "message_text": (
+                f"Bonjour {passager['nom']},\n\n"
+                f"Votre bus {sens} pour l'événement '{passager['nom_event']}' a été supprimé "
+                "et les autres bus sont complets : vous n'avez plus de bus pour ce trajet.\n"
+                "Le BDE reviendra vers vous dès qu'une place sera disponible.\n\n"
+                "Merci de votre compréhension."
+            ),
+        }
+        for passager in rapport["non_places"]
+    ]
+    if not messages:
+        return 0
+
+    try:
+        resultats = envoyer_emails(messages)
+    except Exception:
+        log.exception("email.envoi.echec", "Échec de l'envoi des e-mails de changement de bus", notification="changement_bus")
+        return 0
+
+    return sum(1 for statut, _ in resultats if statut and 200 <= statut < 300)
+
+
+def modele_annulation(evenement) -> tuple[str, str, dict]:
+    """
+    Message d'annulation d'un événement, rendu une seule fois pour tous les inscrits
+    (le prénom est un paramètre Brevo substitué à l'envoi).
+
+    return: (sujet, texte, params communs)
+    """
+    return (
+        "Annulation de {{ params.titre }}",
+        "Bonjour {{ params.prenom }},\n\n"
+        "L'événement '{{ params.titre }}' prévu le {{ params.date }} à {{ params.lieu }} "
+        "est annulé. Votre inscription et vos réservations de bus sont supprimées.\n\n"
+        "Merci de votre compréhension.",
+        {"titre": evenement.titre, "date": str(evenement.date_event), "lieu": evenement.lieu},
+    )
+
+
+def modele_annonce(evenement, texte: str) -> tuple[str, str, dict]:
+    """
+    Annonce d'un admin aux inscrits d'un événement, rendue une seule fois.
+
+    Le texte libre et le titre passent en paramètres Brevo : insérés comme des
+    données, un "{{" ou un "{%" qu'ils contiennent n'est pas interprété.
+
+    return: (sujet, texte, params communs)
+    """
+    return (
+        "Information sur {{ params.titre }}",
+        "Bonjour {{ params.prenom }},\n\n"
+        "{{ params.annonce }}\n\n"
+        "— Le BDE, pour l'événement '{{ params.titre }}' du {{ params.date }}",
+        {"titre": evenement.titre, "date": str(evenement.date_event), "annonce": texte},
+    )
+
+
+def message_rappel(ligne: dict) -> dict:
+    """
+    Rappel de la veille pour une inscription : date, lieu et horaires de ses bus.
+
+    ligne: ligne de RappelDAO.parcourir_a_envoyer
+    """
+    def horaire(heure, description):
+        if heure is None:
+            return "aucun bus réservé"
+        return f"départ à {heure.strftime('%H:%M')}" + (f" ({description})" if description else "")
+
+    return {
+        "to_email": ligne["email"],
+        "subject": f"Rappel : {ligne['titre']} demain",
+        "message_text": (
+            f"Bonjour {ligne['prenom']},\n\n"
+            f"L'événement '{ligne['titre']}' a lieu demain, le {ligne['date_event']}, à {ligne['lieu']}.\n"
+            f"Bus aller : {horaire(ligne['heure_aller'], ligne['bus_aller'])}\n"
+            f"Bus retour : {horaire(ligne['heure_retour'], ligne['bus_retour'])}\n"
+            f"Votre code de réservation : {ligne['code_reservation']}\n\n"
+            "À demain !"
+        ),
+    }
@@ -0,0 +1,47 @@
+"""
+Dimensionnement de la flotte de bus des événements.
+
+À partir des inscrits actuels et du rythme d'inscription récent, on projette le
+nombre de passagers le jour de l'événement (plafonné par la capacité de
+l'événement), puis le nombre de bus nécessaires dans chaque sens pour une
+capacité de véhicule donnée. Chaque inscrit prend un bus aller et un bus retour.
+"""
+import math
+
+
+def projeter_besoins(ligne: dict, capacite_vehicule: int, fenetre_jours: int) -> dict:
+    """
+    Calcule les bus à créer pour un événement.
+
+    ligne: ligne de BusDAO.besoins_flotte (nb_inscrits, inscriptions_recentes,
+           jours_restants, capacite_max, nb_bus_* et places_* par sens)
+    capacite_vehicule: nombre de places d'un bus à créer
+    fenetre_jours: période sur laquelle inscriptions_recentes a été compté
+
+    return: {"id_event", "titre", "date_event", "inscrits", "rythme_par_jour",
+             "projection", et par sens "bus_<sens>" (existants), "places_<sens>",
+             "bus_necessaires_<sens>" (total) et "a_creer_<sens>"}
+    """
+    rythme = ligne["inscriptions_recentes"] / fenetre_jours if fenetre_jours > 0 else 0
+    projection = ligne["nb_inscrits"] + math.ceil(rythme * ligne["jours_restants"])
+    if ligne.get("capacite_max"):
+        projection = min(projection, ligne["capacite_max"])
+    projection = max(projection, ligne["nb_inscrits"])
+
+    besoins = {
+        "id_event": ligne["id_event"],
+        "titre": ligne.get("titre"),
+        "date_event": ligne.get("date_event"),
+        "inscrits": ligne["nb_inscrits"],
+        "rythme_par_jour": round(rythme, 2),
+        "projection": projection,
+    }
+    for sens in ("aller", "retour"):
+        places = ligne[f"places_{sens}"]
+        manque = max(projection - places, 0)
+        a_creer = math.ceil(manque / capacite_vehicule)
+        besoins[f"bus_{sens}"] = ligne[f"nb_bus_{sens}"]
+        besoins[f"places_{sens}"] = places
+        besoins[f"bus_necessaires_{sens}"] = ligne[f"nb_bus_{sens}"] + a_creer
+        besoins[f"a_creer_{sens}"] = a_creer
+    return besoins
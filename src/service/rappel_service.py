@@ -0,0 +1,53 @@
+from datetime import date, timedelta
+from dao.rappel_dao import RappelDAO
+from service.notifications import message_rappel
+from utils.emails import envoyer_emails
+from utils.journal import journal
+
+log = journal(__name__)
+
+# Type de rappel enregistré dans le journal rappel_envoye
+RAPPEL_VEILLE = "veille"
+
+
+class RappelService:
+    """
+    Rappels par e-mail la veille des événements, avec les horaires de bus.
+
+    Le job lit les inscrits en une requête parcourue par paquets (mémoire bornée),
+    envoie chaque paquet en un lot et journalise les rappels acceptés : relancé, il
+    ne renvoie que ceux qui manquent.
+    """
+
+    def __init__(self):
+        self.rappel_dao = RappelDAO()
+
+    def envoyer_rappels(self, jour: date = None, taille_paquet: int = 1000) -> dict:
+        """
+        Envoie les rappels des événements de `jour` (demain par défaut).
+
+        return: {"jour", "paquets", "envoyes", "echecs"}
+        """
+        jour = jour or date.today() + timedelta(days=1)
+        rapport = {"jour": jour, "paquets": 0, "envoyes": 0, "echecs": 0}
+
+        for lignes in self.rappel_dao.parcourir_a_envoyer(jour, RAPPEL_VEILLE, taille_paquet):
+            try:
+                resultats = envoyer_emails([message_rappel(ligne) for ligne in lignes])
+            except Exception as e:
+                log.exception("email.envoi.echec", "Échec de l'envoi d'un paquet de rappels",
+                              notification="rappel", taille=len(lignes))
+                resultats = [(None, str(e))] * len(lignes)
+
+            envoyes = [
+                ligne["code_reservation"]
+                for ligne, (statut, _) in zip(lignes, resultats)
+                if statut and 200 <= statut < 300
+            ]
+            self.rappel_dao.marquer_envoyes(envoyes, RAPPEL_VEILLE)
+            rapport["paquets"] += 1
+            rapport["envoyes"] += len(envoyes)
+            rapport["echecs"] += len(lignes) - len(envoyes)
+
+        log.info("rappel.envoi.termine", f"Rappels du {jour} envoyés", **rapport)
+        return rapport
@@ -1,9 +1,15 @@
 from business_object.utilisateur import Utilisateur
 from dao.utilisateur_dao import UtilisateurDAO
+from service.catalogue_service import signaler_modification
+from service.notifications import notifier_promotions
 from utils.mdp import hash_password
+from utils.metriques import compteur
 from typing import Optional
 from datetime import datetime
 
+CONNEXIONS = compteur("bde_connexions_total", "Tentatives de connexion", ("resultat",))
+
+
 class UtilisateurService:
     """
     Couche service pour la gestion des utilisateurs.
@@ -66,6 +72,7 @@ class UtilisateurService:
 
         # Aucun utilisateur trouvé
         if not utilisateurs:
+            CONNEXIONS.inc(resultat="utilisateur_inconnu")
             print("Utilisateur introuvable.")
             return None
 
@@ -74,9 +81,11 @@ class UtilisateurService:
 
         # Vérification du mot de passe
         if not utilisateur.verify_password(mot_de_passe):
+            CONNEXIONS.inc(resultat="mot_de_passe_incorrect")
             print("Mot de passe incorrect.")
             return None
 
+        CONNEXIONS.inc(resultat="succes")
         print(f"Connexion réussie : {utilisateur.prenom}, {utilisateur.nom}")
         return utilisateur
 
@@ -115,10 +124,14 @@ class UtilisateurService:
             return False
 
 
-        # Suppression via la DAO
-        suppression_ok = self.utilisateur_dao.supprimer(id_utilisateur)
+        # Suppression via la DAO : les places libérées par ses inscriptions
+        # sont proposées à la liste d'attente dans la même transaction
+        promotions = self.utilisateur_dao.supprimer_et_promouvoir(id_utilisateur)
+        suppression_ok = promotions is not None
         if suppression_ok:
             print(f"Utilisateur '{utilisateur_cible.prenom}', {utilisateur_cible.nom} supprimé avec succès.")
+            notifier_promotions(promotions)
+            signaler_modification()
         else:
             print("Erreur lors de la suppression de l'utilisateur.")
         return suppression_ok
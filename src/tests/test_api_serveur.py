@@ -0,0 +1,133 @@
+import asyncio
+import time
+from unittest.mock import Mock
+
+from api.serveur import ServeurAPI
+from benchmark.charge_api import ClientHTTP
+
+
+def _services():
+    """Services mockés exposés par l'API"""
+    utilisateur = Mock(id_utilisateur=7)
+    utilisateur.to_dict.return_value = {"id_utilisateur": 7, "mot_de_passe": "hash"}
+    evenement = Mock(id_event=1, titre="Gala")
+    evenement.to_dict.return_value = {"id_event": 1, "titre": "Gala"}
+    bus_aller = Mock(id_bus=10, sens="ALLER", id_event=1)
+    bus_retour = Mock(id_bus=11, sens="RETOUR", id_event=1)
+    inscription = Mock()
+    inscription.to_dict.return_value = {"code_reservation": 12345678}
+
+    services = {"utilisateur": Mock(), "evenement": Mock(), "inscription": Mock(), "bus": Mock()}
+    services["utilisateur"].authentifier.return_value = utilisateur
+    services["evenement"].get_evenement_by.return_value = [evenement]
+    services["bus"].get_bus_by.side_effect = lambda champ, valeur: (
+        [bus_aller] if valeur == 10 else [bus_retour]
+    )
+    services["inscription"].creer_inscription.return_value = inscription
+    return services
+
+
+async def _scenario(services, requetes, **options):
+    """Démarre l'API sur un port libre et rejoue une suite de requêtes."""
+    api = ServeurAPI(services, **options)
+    serveur = await api.demarrer("127.0.0.1", 0)
+    port = serveur.sockets[0].getsockname()[1]
+    client = ClientHTTP("127.0.0.1", port)
+    await client.ouvrir()
+    reponses = []
+    try:
+        for methode, chemin, corps in requetes:
+            statut, reponse = await client.requete(methode, chemin, corps)
+            if chemin == "/connexion" and statut == 200:
+                client.token = reponse["token"]
+            reponses.append((statut, reponse))
+    finally:
+        await client.fermer()
+        serveur.close()
+        await serveur.wait_closed()
+        api.fermer()
+    return reponses
+
+
+def test_connexion_puis_inscription():
+    """Un utilisateur connecté peut s'inscrire ; le hash n'est jamais renvoyé"""
+    services = _services()
+    reponses = asyncio.run(_scenario(services, [
+        ("POST", "/connexion", {"email": "a@ensai.fr", "mot_de_passe": "x"}),
+        ("POST", "/inscriptions", {"id_event": 1, "id_bus_aller": 10, "id_bus_retour": 11}),
+    ]))
+
+    assert reponses[0][0] == 200
+    assert "mot_de_passe" not in reponses[0][1]["utilisateur"]
+    assert reponses[1] == (201, {"code_reservation": 12345678})
+    assert services["inscription"].creer_inscription.call_args.kwargs["created_by"] == 7
+
+
+def test_inscription_de_groupe_inclut_l_utilisateur_connecte():
+    """Le groupe est transmis en un appel, l'utilisateur connecté en tête"""
+    services = _services()
+    services["inscription"].inscrire_groupe.return_value = [services["inscription"].creer_inscription.return_value]
+    reponses = asyncio.run(_scenario(services, [
+        ("POST", "/connexion", {"email": "a@ensai.fr", "mot_de_passe": "x"}),
+        ("POST", "/inscriptions/groupe", {"id_event": 1, "id_bus_aller": 10,
+                                         "membres": [{"email": "B@ensai.fr", "boit": True}]}),
+    ]))
+
+    assert reponses[1] == (201, [{"code_reservation": 12345678}])
+    id_event, aller, retour, membres = services["inscription"].inscrire_groupe.call_args[0]
+    assert (id_event, aller, retour) == (1, 10, None)
+    assert [m.get("created_by") or m["email"] for m in membres] == [7, "b@ensai.fr"]
+
+
+def test_transfert_d_inscription():
+    """Le transfert est refusé (409) quand le service le refuse"""
+    services = _services()
+    services["inscription"].transferer_inscription.return_value = None
+    reponses = asyncio.run(_scenario(services, [
+        ("POST", "/connexion", {"email": "a@ensai.fr", "mot_de_passe": "x"}),
+        ("POST", "/inscriptions/12345678/transfert", {"email": "b@ensai.fr"}),
+    ]))
+
+    assert reponses[1][0] == 409
+    services["inscription"].transferer_inscription.assert_called_once_with(12345678, 7, "b@ensai.fr")
+
+
+def test_inscription_sans_token_refusee():
+    """Les routes /inscriptions exigent un token"""
+    reponses = asyncio.run(_scenario(_services(), [
+        ("POST", "/inscriptions", {"id_event": 1, "id_bus_aller": 10, "id_bus_retour": 11}),
+    ]))
+
+    assert reponses[0][0] == 401
+
+
+def test_liste_evenements_et_route_inconnue():
+    """La liste des événements est servie en JSON, une route inconnue donne 404"""
+    reponses = asyncio.run(_scenario(_services(), [
+        ("GET", "/evenements?statut=en_cours", None),
+        ("GET", "/inconnue", None),
+    ]))
+
+    assert reponses[0] == (200, [{"id_event": 1, "titre": "Gala"}])
+    assert reponses[1][0] == 404
+
+
+def test_saturation_renvoie_503():
+    """Au-delà de la file d'attente maximale, le serveur répond 503"""
+    reponses = asyncio.run(_scenario(_services(), [
+        ("GET", "/evenements", None),
+    ], max_attente=0))
+
+    assert reponses[0][0] == 503
+
+
+def test_connexion_purge_les_sessions_expirees():
+    """Une connexion supprime les tokens expirés jamais représentés"""
+    api = ServeurAPI(_services())
+    api._sessions = {"expire": (1, time.monotonic() - 1), "valide": (2, time.monotonic() + 60)}
+
+    statut, corps = asyncio.run(api.connexion(Mock(json=lambda: {"email": "a@ensai.fr", "mot_de_passe": "x"})))
+    api.fermer()
+
+    assert statut == 200
+    assert set(api._sessions) == {"valide", corps["token"]}
@@ -0,0 +1,82 @@
+import json
+
+from benchmark.comparer import comparer, main as comparer_main
+from benchmark.demarrage import analyser_importtime
+from benchmark.performances import LIGNES_TYPES, bench_hydratation, mesurer
+from benchmark.simulation_ouverture import agreger, centile
+
+
+def test_centile_rang_le_plus_proche():
+    """Vérifie le calcul des centiles sur une liste triée"""
+    valeurs = [float(i) for i in range(1, 101)]
+    assert centile(valeurs, 50) == 50.0
+    assert centile(valeurs, 95) == 95.0
+    assert centile(valeurs, 99) == 99.0
+    assert centile([], 50) == 0.0
+
+
+def test_agreger_compte_ok_rejets_erreurs():
+    """Vérifie l'agrégation des mesures par étape"""
+    resultats = [
+        [("connexion", 0.010, "ok"), ("inscription", 0.020, "ok")],
+        [("connexion", 0.030, "ok"), ("inscription", 0.040, "rejet")],
+        [("connexion", 0.050, "erreur")],
+    ]
+    rapport = agreger(resultats, duree_totale=1.0)
+
+    assert rapport["parcours"] == 3
+    assert rapport["etapes"]["connexion"]["n"] == 3
+    assert rapport["etapes"]["connexion"]["erreurs"] == 1
+    assert rapport["etapes"]["inscription"]["rejets"] == 1
+    assert rapport["etapes"]["annulation"]["n"] == 0
+    assert round(rapport["etapes"]["connexion"]["p50_ms"]) == 30
+
+
+def test_analyser_importtime_trie_par_cumul():
+    """Vérifie l'analyse de la sortie de -X importtime"""
+    texte = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   dotenv\n"
+        "import time:       300 |       4500 | main\n"
+        "ligne parasite\n"
+    )
+    modules = analyser_importtime(texte)
+
+    assert [m["module"] for m in modules] == ["main", "dotenv"]
+    assert modules[0]["cumule_us"] == 4500
+
+
+def test_mesurer_par_lot():
+    """Un échauffement hors mesure, puis une durée par appel pour chaque lot"""
+    appels = []
+    resume = mesurer(lambda: appels.append(1), repetitions=5, lot=10)
+
+    assert len(appels) == 51
+    assert resume["n"] == 5
+    assert 0 <= resume["min_ms"] <= resume["mediane_ms"] <= resume["p95_ms"]
+
+
+def test_hydratation_de_chaque_objet_metier():
+    resultats = bench_hydratation(repetitions=2, lot=2)
+    assert set(resultats) == {f"hydratation/{nom}.from_dict" for nom in LIGNES_TYPES}
+
+
+def test_comparer_signale_les_regressions():
+    reference = {"a": {"mediane_ms": 10.0}, "b": {"mediane_ms": 10.0}, "c": {"mediane_ms": 10.0},
+                 "d": {"mediane_ms": 0.001}, "disparue": {"mediane_ms": 1.0}}
+    candidat = {"a": {"mediane_ms": 12.0}, "b": {"mediane_ms": 10.5}, "c": {"mediane_ms": 5.0},
+                "d": {"mediane_ms": 0.002}, "nouvelle": {"mediane_ms": 1.0}}
+    statuts = {ligne["mesure"]: ligne["statut"] for ligne in comparer(reference, candidat, seuil=0.10)}
+
+    assert statuts == {"a": "regression", "b": "stable", "c": "amelioration", "d": "regression",
+                       "disparue": "disparue", "nouvelle": "nouvelle"}
+    assert comparer(reference, candidat, plancher_ms=0.01)[3]["statut"] == "stable"
+
+
+def test_comparer_code_de_sortie(tmp_path):
+    avant, apres = tmp_path / "avant.json", tmp_path / "apres.json"
+    avant.write_text(json.dumps({"resultats": {"argon2/hash_password": {"mediane_ms": 40.0}}}))
+    apres.write_text(json.dumps({"resultats": {"argon2/hash_password": {"mediane_ms": 50.0}}}))
+
+    assert comparer_main([str(avant), str(apres), "--seuil", "0.3"]) == 0
+    assert comparer_main([str(avant), str(apres)]) == 1
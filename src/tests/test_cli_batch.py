@@ -0,0 +1,136 @@
+import json
+from unittest.mock import Mock
+
+from view.cli_batch import main
+
+
+def _services():
+    """Services mockés injectés dans le CLI batch"""
+    evenement = Mock()
+    evenement.to_dict.return_value = {"id_event": 1, "titre": "Gala", "statut": "en_cours"}
+    services = {"evenement": Mock(), "inscription": Mock(), "bus": Mock()}
+    services["evenement"].get_evenement_by.return_value = [evenement]
+    services["evenement"].creer_evenement.return_value = evenement
+    return services
+
+
+def test_events_list_json(capsys):
+    """La liste des événements est écrite en JSON sur stdout"""
+    services = _services()
+
+    code = main(["events", "list", "--statut", "en_cours"], services=services)
+
+    assert code == 0
+    assert json.loads(capsys.readouterr().out) == [
+        {"id_event": 1, "titre": "Gala", "statut": "en_cours"}
+    ]
+    services["evenement"].get_evenement_by.assert_called_once_with("statut", "en_cours")
+
+
+def test_events_create_depuis_csv_en_parallele(tmp_path, capsys):
+    """Chaque ligne du fichier donne lieu à une création, même avec plusieurs jobs"""
+    fichier = tmp_path / "evenements.csv"
+    fichier.write_text(
+        "titre,lieu,date_event,capacite_max\n"
+        "Gala,Rennes,2030-01-10,100\n"
+        "Brunch,Bruz,2030-01-11,50\n",
+        encoding="utf-8",
+    )
+    services = _services()
+
+    code = main(
+        ["events", "create", "--from", str(fichier), "--created-by", "1", "--jobs", "2"],
+        services=services,
+    )
+
+    assert code == 0
+    assert services["evenement"].creer_evenement.call_count == 2
+    assert len(json.loads(capsys.readouterr().out)) == 2
+
+
+def test_events_create_entree_invalide_code_retour(tmp_path, capsys):
+    """Une ligne invalide est signalée et le code de sortie vaut 1"""
+    fichier = tmp_path / "evenements.json"
+    fichier.write_text(json.dumps([{"titre": "Sans date"}]), encoding="utf-8")
+
+    code = main(["events", "create", "--from", str(fichier)], services=_services())
+
+    assert code == 1
+    assert json.loads(capsys.readouterr().out)[0]["resultat"] == "erreur"
+
+
+def test_counters_check_signale_les_ecarts(capsys):
+    """Un compteur désynchronisé donne un code de sortie 1 tant qu'il n'est pas corrigé"""
+    services = _services()
+    services["evenement"].verifier_compteurs.return_value = [
+        {"table_compteur": "bus", "id": 4, "nb_inscrits": 12, "attendu": 11}
+    ]
+
+    assert main(["counters", "check"], services=services) == 1
+    assert json.loads(capsys.readouterr().out)[0]["attendu"] == 11
+    services["evenement"].verifier_compteurs.assert_called_once_with(corriger=False)
+
+    assert main(["counters", "check", "--fix"], services=services) == 0
+    assert json.loads(capsys.readouterr().out)[0]["resultat"] == "corrige"
+
+
+def test_buses_plan_cree_les_bus_manquants(capsys):
+    """Le plan de flotte est affiché, puis les bus manquants sont créés en un appel"""
+    services = _services()
+    besoins = [{"id_event": 1, "projection": 120, "a_creer_aller": 2, "a_creer_retour": 1}]
+    services["bus"].planifier_flotte.return_value = besoins
+    services["bus"].creer_flotte.return_value = [Mock(), Mock(), Mock()]
+
+    code = main(["buses", "plan", "--capacity", "50", "--create", "--heure-aller", "20:00"],
+                services=services)
+
+    assert code == 0
+    assert json.loads(capsys.readouterr().out)[0]["resultat"] == "ok"
+    services["bus"].planifier_flotte.assert_called_once_with(50, fenetre_jours=7, id_event=None)
+    assert services["bus"].creer_flotte.call_args[0][2].hour == 20
+
+
+def test_buses_schedule_signale_les_chevauchements(capsys):
+    """Chaque bus reçoit son véhicule ; un chevauchement donne un code de sortie 1"""
+    services = _services()
+    services["bus"].planning_vehicules.return_value = [[1, 3], [2]]
+    services["bus"].conflits_horaires.return_value = [{"id_bus": 2, "conflits": [1]}]
+
+    assert main(["buses", "schedule", "--date", "2026-11-20"], services=services) == 1
+
+    lignes = json.loads(capsys.readouterr().out)
+    assert [(l["vehicule"], l["id_bus"]) for l in lignes] == [(1, 1), (1, 3), (2, 2)]
+    assert lignes[2]["conflits"] == "1"
+
+
+def test_events_broadcast_suit_la_progression(capsys, monkeypatch):
+    """La commande attend la fin de la diffusion et signale les échecs"""
+    services = _services()
+    services["evenement"].diffuser_message.return_value = "d1"
+    etats = iter([
+        {"statut": "en_cours", "total": 3, "traites": 2, "acceptes": 2, "echecs": 0},
+        {"statut": "termine", "total": 3, "traites": 3, "acceptes": 2, "echecs": 1},
+    ])
+    monkeypatch.setattr("service.diffusion.progression_diffusion", lambda _: next(etats))
+
+    code = main(["events", "broadcast", "--event", "3", "--message", "Info", "--interval", "0"],
+                services=services)
+
+    assert code == 1
+    assert json.loads(capsys.readouterr().out)[0]["echecs"] == 1
+    services["evenement"].diffuser_message.assert_called_once_with(3, "Info")
+
+
+def test_reminders_send(capsys):
+    """La date est transmise au job et le rapport est écrit"""
+    services = _services()
+    services["rappel"] = Mock()
+    services["rappel"].envoyer_rappels.return_value = {
+        "jour": "2026-11-20", "paquets": 1, "envoyes": 3, "echecs": 0}
+
+    assert main(["reminders", "send", "--date", "2026-11-20"], services=services) == 0
+
+    assert json.loads(capsys.readouterr().out)[0]["envoyes"] == 3
+    appel = services["rappel"].envoyer_rappels.call_args
+    assert appel[0][0].isoformat() == "2026-11-20"
+    assert appel[1] == {"taille_paquet": 1000}
@@ -272,7 +272,45 @@ class TestIntegrationBus:
         for bus in bus_crees:
             print(f"   '{bus.description}' → sens : {bus.sens}")
 
+    def test_suppression_bus_avec_redistribution(self):
+        """
+        Test 7 : Suppression d'un bus avec redistribution.
+        Les passagers vont dans l'autre bus aller tant qu'il reste de la place,
+        les autres restent sans bus et sont signalés.
+        """
+        from unittest.mock import patch
+        from dao.inscription_dao import InscriptionDAO
+        from service.inscription_service import InscriptionService
+
+        supprime = self.bus_service.creer_bus(self.test_event.id_event, "aller", "A", "20:00", 10)
+        restant = self.bus_service.creer_bus(self.test_event.id_event, "aller", "B", "20:30", 2)
+        retour = self.bus_service.creer_bus(self.test_event.id_event, "retour", "R", "03:00", 10)
+
+        inscription_service = InscriptionService(None, None, None)
+        with patch("service.inscription_service.envoyer_email"):
+            for i in range(3):
+                utilisateur = Utilisateur(nom=f"passager{i}", prenom="Test",
+                                          email=f"passager{i}@example.com", mot_de_passe="Password123!")
+                self.utilisateur_dao.creer(utilisateur)
+                assert inscription_service.creer_inscription(
+                    boit=False, mode_paiement="espece", id_event=self.test_event.id_event,
+                    nom_event=self.test_event.titre, id_bus_aller=supprime.id_bus,
+                    id_bus_retour=retour.id_bus, created_by=utilisateur.id_utilisateur,
+                )
+
+        with patch("service.notifications.envoyer_emails", return_value=[]) as envoi:
+            rapport = self.bus_service.supprimer_bus_et_redistribuer(supprime.id_bus)
+
+        assert len(rapport["replaces"]) == 2
+        assert len(rapport["non_places"]) == 1
+        envoi.assert_called_once()
+        assert self.bus_dao.get_by("id_bus", restant.id_bus)[0].nb_inscrits == 2
+        inscriptions = InscriptionDAO().get_by("id_event", self.test_event.id_event)
+        assert sorted(str(ins.id_bus_aller) for ins in inscriptions) == sorted(
+            [str(restant.id_bus)] * 2 + ["None"])
+        assert all(ins.id_bus_retour == retour.id_bus for ins in inscriptions)
+
 
 if __name__ == "__main__":
     # Pour exécuter les tests directement
-    pytest.main([__file__, "-v"])
\ No newline at end of file
+    pytest.main([__file__, "-v"])
@@ -251,6 +251,42 @@ class TestIntegrationInscription:
         
         print(f"✅ Inscription {code_reservation} supprimée avec succès")
 
+    def test_compteurs_nb_inscrits_maintenus_par_trigger(self):
+        """
+        Les compteurs nb_inscrits de l'événement et des bus suivent
+        les créations, changements de bus et suppressions d'inscriptions.
+        """
+        inscription = self.inscription_service.creer_inscription(
+            boit=False,
+            mode_paiement="espece",
+            id_event=self.test_event.id_event,
+            nom_event=self.test_event.titre,
+            id_bus_aller=self.bus_aller.id_bus,
+            id_bus_retour=self.bus_retour.id_bus,
+            created_by=self.test_user.id_utilisateur
+        )
+        assert inscription is not None
+
+        def compteurs():
+            evenement = self.evenement_dao.get_by("id_event", self.test_event.id_event)[0]
+            aller = self.bus_dao.get_by("id_bus", self.bus_aller.id_bus)[0]
+            retour = self.bus_dao.get_by("id_bus", self.bus_retour.id_bus)[0]
+            return evenement.nb_inscrits, aller.nb_inscrits, retour.nb_inscrits
+
+        assert compteurs() == (1, 1, 1)
+        assert self.inscription_dao.compter_par_evenement(self.test_event.id_event) == 1
+
+        # Suppression du bus retour : ON DELETE SET NULL sur l'inscription
+        self.bus_dao.supprimer(self.bus_retour.id_bus)
+        evenement = self.evenement_dao.get_by("id_event", self.test_event.id_event)[0]
+        assert evenement.nb_inscrits == 1
+
+        self.inscription_dao.supprimer(inscription)
+        evenement = self.evenement_dao.get_by("id_event", self.test_event.id_event)[0]
+        aller = self.bus_dao.get_by("id_bus", self.bus_aller.id_bus)[0]
+        assert (evenement.nb_inscrits, aller.nb_inscrits) == (0, 0)
+        assert self.evenement_dao.verifier_compteurs() == []
+
 
 if __name__ == "__main__":
     # Pour exécuter les tests directement
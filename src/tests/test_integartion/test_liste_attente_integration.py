@@ -0,0 +1,148 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from unittest.mock import patch
+from business_object.attente import Attente
+from business_object.bus import Bus
+from business_object.evenement import Evenement
+from business_object.utilisateur import Utilisateur
+from dao.bus_dao import BusDAO
+from dao.evenement_dao import EvenementDAO
+from dao.inscription_dao import InscriptionDAO
+from dao.liste_attente_dao import ListeAttenteDAO
+from dao.utilisateur_dao import UtilisateurDAO
+from service.evenement_service import EvenementService
+from service.inscription_service import InscriptionService
+
+CAPACITE = 5
+
+
+class TestIntegrationListeAttente:
+    """
+    Tests d'intégration de la liste d'attente : promotion FIFO lors des annulations
+    (y compris simultanées) et des augmentations de capacité.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup(self, utilisateur_test):
+        self.inscription_service = InscriptionService(InscriptionDAO(), EvenementDAO(), UtilisateurDAO())
+        self.evenement_service = EvenementService(
+            EvenementDAO(), InscriptionDAO(), UtilisateurDAO(), BusDAO()
+        )
+
+        self.evenement = Evenement(
+            titre="Gala complet",
+            description_event="Test liste d'attente",
+            lieu="Rennes",
+            date_event=date.today() + timedelta(days=30),
+            capacite_max=CAPACITE,
+            created_by=utilisateur_test.id_utilisateur,
+            tarif=10.0
+        )
+        EvenementDAO().creer(self.evenement)
+        self.bus_aller = BusDAO().creer(Bus(
+            id_event=self.evenement.id_event, sens="aller", description="Aller",
+            capacite_max=50, heure_depart="20:00"))
+        self.bus_retour = BusDAO().creer(Bus(
+            id_event=self.evenement.id_event, sens="retour", description="Retour",
+            capacite_max=50, heure_depart="03:00"))
+
+        # Les e-mails de promotion ne partent pas pendant les tests
+        with patch("service.notifications.envoyer_emails", return_value=[]) as envoi, \
+                patch("service.inscription_service.envoyer_email"):
+            self.envoi = envoi
+            self.inscrits = [self._inscrire(self._utilisateur(f"inscrit{i}")) for i in range(CAPACITE)]
+            self.en_attente = [self._utilisateur(f"attente{i}") for i in range(CAPACITE)]
+            for utilisateur in self.en_attente:
+                assert self.inscription_service.rejoindre_liste_attente(
+                    boit=False, mode_paiement="espece", id_event=self.evenement.id_event,
+                    id_bus_aller=self.bus_aller.id_bus, id_bus_retour=self.bus_retour.id_bus,
+                    created_by=utilisateur.id_utilisateur,
+                )
+            yield
+
+    def _utilisateur(self, nom):
+        utilisateur = Utilisateur(nom=nom, prenom="Test", email=f"{nom}@example.com",
+                                  mot_de_passe="Password123!")
+        UtilisateurDAO().creer(utilisateur)
+        return utilisateur
+
+    def _inscrire(self, utilisateur):
+        inscription = self.inscription_service.creer_inscription(
+            boit=False, mode_paiement="espece", id_event=self.evenement.id_event,
+            nom_event=self.evenement.titre, id_bus_aller=self.bus_aller.id_bus,
+            id_bus_retour=self.bus_retour.id_bus, created_by=utilisateur.id_utilisateur,
+        )
+        assert inscription is not None
+        return utilisateur, inscription
+
+    def _inscrits_en_base(self):
+        return {ins.created_by for ins in InscriptionDAO().get_by("id_event", self.evenement.id_event)}
+
+    def test_position_fifo(self):
+        for rang, utilisateur in enumerate(self.en_attente, start=1):
+            assert self.inscription_service.position_liste_attente(
+                self.evenement.id_event, utilisateur.id_utilisateur) == rang
+
+    def test_annulation_promeut_le_premier(self):
+        utilisateur, inscription = self.inscrits[0]
+
+        assert self.inscription_service.supprimer_inscription(
+            inscription.code_reservation, utilisateur.id_utilisateur)
+
+        inscrits = self._inscrits_en_base()
+        assert len(inscrits) == CAPACITE
+        assert self.en_attente[0].id_utilisateur in inscrits
+        assert self.en_attente[1].id_utilisateur not in inscrits
+        messages = self.envoi.call_args[0][0]
+        assert [m["to_email"] for m in messages] == [self.en_attente[0].email]
+
+    def test_annulations_simultanees(self):
+        def annuler(couple):
+            utilisateur, inscription = couple
+            return self.inscription_service.supprimer_inscription(
+                inscription.code_reservation, utilisateur.id_utilisateur)
+
+        with ThreadPoolExecutor(max_workers=CAPACITE) as executor:
+            assert all(executor.map(annuler, self.inscrits))
+
+        # Chaque place libérée est allée à exactement un utilisateur en attente
+        assert self._inscrits_en_base() == {u.id_utilisateur for u in self.en_attente}
+        assert ListeAttenteDAO().lister_par_evenement(self.evenement.id_event) == []
+
+    def test_augmentation_capacite(self):
+        assert self.evenement_service.modifier_capacite(self.evenement.id_event, CAPACITE + 2)
+
+        inscrits = self._inscrits_en_base()
+        assert len(inscrits) == CAPACITE + 2
+        assert {u.id_utilisateur for u in self.en_attente[:2]} <= inscrits
+        restants = ListeAttenteDAO().lister_par_evenement(self.evenement.id_event)
+        assert [a.created_by for a in restants] == [u.id_utilisateur for u in self.en_attente[2:]]
+
+    def test_capacite_inferieure_aux_inscrits_refusee(self):
+        assert not self.evenement_service.modifier_capacite(self.evenement.id_event, CAPACITE - 1)
+
+    def test_inscrit_pendant_l_attente(self):
+        # Inscrit par ailleurs : il quitte la file et ne bloque plus la promotion.
+        # Suppression brute (sans promotion) : une place se libère
+        assert UtilisateurDAO().supprimer(self.inscrits[0][0].id_utilisateur)
+        with patch("service.inscription_service.envoyer_email"):
+            self._inscrire(self.en_attente[0])
+        assert self.inscription_service.position_liste_attente(
+            self.evenement.id_event, self.en_attente[0].id_utilisateur) == 0
+
+        # Attente périmée (insertion directe) : la promotion doit l'ignorer
+        assert ListeAttenteDAO().ajouter(Attente(
+            id_event=self.evenement.id_event, created_by=self.en_attente[0].id_utilisateur,
+            mode_paiement="espece")) == []
+        with patch("service.notifications.envoyer_emails", return_value=[]):
+            assert self.evenement_service.modifier_capacite(self.evenement.id_event, CAPACITE + 5)
+
+        assert self._inscrits_en_base() >= {u.id_utilisateur for u in self.en_attente}
+        assert ListeAttenteDAO().lister_par_evenement(self.evenement.id_event) == []
+
+    def test_suppression_utilisateur_promeut(self):
+        promotions = UtilisateurDAO.supprimer_et_promouvoir(self.inscrits[0][0].id_utilisateur)
+
+        assert [p["created_by"] for p in promotions] == [self.en_attente[0].id_utilisateur]
+        assert self.en_attente[0].id_utilisateur in self._inscrits_en_base()
@@ -0,0 +1,120 @@
+import random
+import time
+import unittest
+from datetime import time as heure
+from service.affectation_bus import ecart, planifier_evenement, planifier_sens
+
+
+def bus(id_bus, capacite, depart):
+    return {"id_bus": id_bus, "capacite_max": capacite, "heure_depart": depart}
+
+
+def passager(code, id_bus=None, souhait=None):
+    return {"code_reservation": code, "id_bus": id_bus, "heure_souhaitee": souhait}
+
+
+class TestAffectationBus(unittest.TestCase):
+    """Tests unitaires de l'algorithme d'affectation des passagers aux bus"""
+
+    def _occupation(self, plan, passagers):
+        occupation = {}
+        for p in passagers:
+            id_bus = plan["affectation"].get(p["code_reservation"], p["id_bus"])
+            if p["code_reservation"] not in plan["non_places"]:
+                occupation[id_bus] = occupation.get(id_bus, 0) + 1
+        return occupation
+
+    def test_ecart_cadran_24h(self):
+        """Test 1: 23:30 et 00:30 sont à une heure d'écart"""
+        self.assertEqual(ecart(23 * 60 + 30, 30), 60)
+
+    def test_capacites_respectees_et_non_places(self):
+        """Test 2: Aucun bus ne dépasse sa capacité, l'excédent est signalé"""
+        lignes = [bus(1, 2, "20:00"), bus(2, 3, "21:00")]
+        passagers = [passager(i) for i in range(1, 8)]
+
+        plan = planifier_sens(lignes, passagers)
+
+        self.assertEqual(self._occupation(plan, passagers), {1: 2, 2: 3})
+        self.assertEqual(plan["non_places"], [6, 7])
+
+    def test_heure_souhaitee_respectee(self):
+        """Test 3: Chaque passager va dans le bus le plus proche de son heure"""
+        lignes = [bus(1, 10, heure(20, 0)), bus(2, 10, heure(23, 0))]
+        passagers = [passager(1, souhait="22:45"), passager(2, souhait="19:30")]
+
+        plan = planifier_sens(lignes, passagers)
+
+        self.assertEqual(plan["affectation"], {1: 2, 2: 1})
+
+    def test_priorite_a_l_ordre_d_inscription(self):
+        """Test 4: Bus préféré complet : le dernier inscrit est reporté sur un autre"""
+        lignes = [bus(1, 1, "20:00"), bus(2, 5, "23:00")]
+        passagers = [passager(1, souhait="20:00"), passager(2, souhait="20:00")]
+
+        plan = planifier_sens(lignes, passagers)
+
+        self.assertEqual(plan["affectation"], {1: 1, 2: 2})
+
+    def test_regroupement_bus_sous_remplis(self):
+        """Test 5: Trois passagers dans trois bus de 50 : regroupés dans un seul"""
+        lignes = [bus(1, 50, "20:00"), bus(2, 50, "20:00"), bus(3, 50, "20:00")]
+        passagers = [passager(1, 1), passager(2, 2), passager(3, 3)]
+
+        plan = planifier_sens(lignes, passagers)
+
+        self.assertEqual(len(plan["bus_utilises"]), 1)
+        self.assertEqual(plan["non_places"], [])
+
+    def test_regroupement_bus_proches(self):
+        """Test 6: Deux bus à 15 minutes d'écart, peu remplis : un seul est gardé"""
+        lignes = [bus(1, 50, "20:00"), bus(2, 50, "20:15"), bus(3, 50, "23:00")]
+        passagers = [passager(1, 1), passager(2, 2), passager(3, 3)]
+
+        plan = planifier_sens(lignes, passagers)
+
+        self.assertEqual(len(plan["bus_utilises"]), 2)
+        self.assertIn(3, plan["bus_utilises"])
+
+    def test_conserver_ne_deplace_personne(self):
+        """Test 7: En mode conserver, seuls les passagers sans bus sont placés"""
+        lignes = [bus(1, 2, "20:00"), bus(2, 2, "21:00")]
+        passagers = [passager(1, 1), passager(2, 2), passager(3), passager(4)]
+
+        plan = planifier_sens(lignes, passagers, conserver=True)
+
+        self.assertEqual(set(plan["affectation"]), {3, 4})
+        self.assertEqual(self._occupation(plan, passagers), {1: 2, 2: 2})
+
+    def test_planifier_evenement_separe_les_sens(self):
+        """Test 8: Aller et retour sont planifiés chacun sur leurs bus"""
+        lignes = [dict(bus(1, 5, "20:00"), sens="ALLER"), dict(bus(2, 5, "03:00"), sens="RETOUR")]
+        passagers = [{"code_reservation": 1, "id_bus_aller": None, "id_bus_retour": None,
+                      "heure_aller": None, "heure_retour": None}]
+
+        plans = planifier_evenement(lignes, passagers)
+
+        self.assertEqual(plans["ALLER"]["affectation"], {1: 1})
+        self.assertEqual(plans["RETOUR"]["affectation"], {1: 2})
+
+    def test_performance_2000_passagers_40_bus(self):
+        """Test 9: 2 000 passagers et 40 bus en bien moins d'une seconde"""
+        aleatoire = random.Random(0)
+        lignes = [bus(i, 50, heure(18 + i % 6, 0)) for i in range(1, 41)]
+        passagers = [
+            passager(i, aleatoire.choice([None, aleatoire.randint(1, 40)]),
+                     aleatoire.choice([None, "19:00", "22:00"]))
+            for i in range(1, 2001)
+        ]
+
+        debut = time.perf_counter()
+        plan = planifier_sens(lignes, passagers)
+        duree = time.perf_counter() - debut
+
+        self.assertLess(duree, 0.5)
+        self.assertEqual(plan["non_places"], [])
+        self.assertTrue(all(n <= 50 for n in self._occupation(plan, passagers).values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -180,6 +180,136 @@ class TestBusService(unittest.TestCase):
         self.assertEqual(len(resultat), 2)
         self.bus_service.bus_dao.lister_tous.assert_called_once()
 
+    def test_affecter_bus_rapport(self):
+        """
+        Test 8: Affectation automatique
+        Vérifie que le plan calculé dans la transaction de la DAO est résumé par sens
+        """
+        # La DAO appelle la fonction de planification avec les lignes lues en base
+        bus = [
+            {"id_bus": 1, "sens": "ALLER", "capacite_max": 1, "heure_depart": "20:00"},
+            {"id_bus": 2, "sens": "RETOUR", "capacite_max": 5, "heure_depart": "03:00"},
+        ]
+        passagers = [
+            {"code_reservation": code, "id_bus_aller": None, "id_bus_retour": None,
+             "heure_aller": None, "heure_retour": None}
+            for code in (11, 22)
+        ]
+        self.bus_service.bus_dao.reaffecter.side_effect = lambda id_event, planifier: planifier(bus, passagers)
+
+        rapport = self.bus_service.affecter_bus(1)
+
+        self.assertEqual(rapport["ALLER"], {"affectes": 1, "non_places": [22], "bus_utilises": [1]})
+        self.assertEqual(rapport["RETOUR"]["affectes"], 2)
+
+    def test_affecter_bus_evenement_introuvable(self):
+        """
+        Test 9: Affectation sur un événement inexistant
+        Vérifie que la méthode retourne None
+        """
+        self.bus_service.bus_dao.reaffecter.return_value = None
+
+        self.assertIsNone(self.bus_service.affecter_bus(999))
+
+    def test_planifier_flotte_projection(self):
+        """
+        Test 10: Dimensionnement de la flotte
+        Vérifie la projection (rythme x jours restants, plafonnée par la capacité)
+        et le nombre de bus à créer dans chaque sens
+        """
+        self.bus_service.bus_dao.besoins_flotte.return_value = [{
+            "id_event": 1, "titre": "Gala", "date_event": None, "capacite_max": 200,
+            "nb_inscrits": 60, "inscriptions_recentes": 70, "jours_restants": 5,
+            "nb_bus_aller": 1, "places_aller": 50, "nb_bus_retour": 0, "places_retour": 0,
+        }]
+
+        besoins = self.bus_service.planifier_flotte(50, fenetre_jours=7)
+
+        # 10 inscriptions par jour pendant 5 jours : 110 passagers attendus
+        self.assertEqual(besoins[0]["projection"], 110)
+        self.assertEqual(besoins[0]["a_creer_aller"], 2)
+        self.assertEqual(besoins[0]["a_creer_retour"], 3)
+        self.bus_service.bus_dao.besoins_flotte.assert_called_once_with(7, None)
+
+    def test_creer_flotte_insertion_groupee(self):
+        """
+        Test 11: Création de la flotte
+        Vérifie que tous les bus manquants partent en un seul appel à la DAO
+        """
+        besoins = [{"id_event": 1, "bus_aller": 1, "a_creer_aller": 2,
+                    "bus_retour": 0, "a_creer_retour": 1}]
+        self.bus_service.bus_dao.creer_plusieurs.side_effect = lambda bus: bus
+
+        bus_crees = self.bus_service.creer_flotte(besoins, 50, "20:00", "03:00")
+
+        self.bus_service.bus_dao.creer_plusieurs.assert_called_once()
+        self.assertEqual([b.sens for b in bus_crees], ["ALLER", "ALLER", "RETOUR"])
+        self.assertEqual([b.description for b in bus_crees], ["Aller 2", "Aller 3", "Retour 1"])
+
+    @patch("service.notifications.envoyer_emails", return_value=[(201, "")] * 3)
+    def test_supprimer_bus_et_redistribuer(self, envoi):
+        """
+        Test 12: Suppression d'un bus avec redistribution
+        Vérifie que les passagers vont dans le bus restant tant qu'il a de la place,
+        que les autres sont signalés, et que tous sont prévenus en un seul envoi
+        """
+        passagers = [
+            {"code_reservation": code, "email": f"{code}@example.com", "nom": "Nom",
+             "prenom": "Prenom", "nom_event": "Gala"}
+            for code in (1, 2, 3)
+        ]
+        restants = [{"id_bus": 8, "capacite_max": 2, "heure_depart": "20:00"}]
+
+        def supprimer_et_redistribuer(id_bus, planifier):
+            plan = planifier(restants, [{"code_reservation": p["code_reservation"], "id_bus": None,
+                                         "heure_souhaitee": "20:15"} for p in passagers])
+            return {
+                "id_event": 1, "sens": "ALLER",
+                "replaces": [dict(p, id_bus=plan["affectation"][p["code_reservation"]])
+                             for p in passagers if p["code_reservation"] in plan["affectation"]],
+                "non_places": [p for p in passagers if p["code_reservation"] in plan["non_places"]],
+            }
+        self.bus_service.bus_dao.supprimer_et_redistribuer.side_effect = supprimer_et_redistribuer
+
+        rapport = self.bus_service.supprimer_bus_et_redistribuer(5)
+
+        self.assertEqual([p["id_bus"] for p in rapport["replaces"]], [8, 8])
+        self.assertEqual([p["code_reservation"] for p in rapport["non_places"]], [3])
+        envoi.assert_called_once()
+        self.assertEqual(len(envoi.call_args[0][0]), 3)
+
+    @patch("builtins.print")
+    def test_creer_bus_signale_chevauchement(self, mock_print):
+        """
+        Test 14: Création d'un bus qui part en même temps que celui d'un autre événement
+        Vérifie que le chevauchement est signalé sans bloquer la création,
+        et que l'index des horaires est chargé une seule fois
+        """
+        jour = datetime(2026, 11, 20).date()
+        self.bus_service.bus_dao.lister_horaires.return_value = [
+            {"id_bus": 7, "id_event": 2, "sens": "ALLER", "heure_depart": "20:00", "date_event": jour}
+        ]
+        self.bus_service.evenement_dao.get_by.return_value = [Mock(date_event=jour)]
+        self.bus_service.bus_dao.creer.side_effect = lambda bus: setattr(bus, "id_bus", 8) or bus
+
+        bus = self.bus_service.creer_bus(1, "Aller", "Navette", "20:30", 50)
+        self.bus_service.creer_bus(1, "Aller", "Navette 2", "20:30", 50)
+
+        self.assertEqual(bus.id_bus, 8)
+        self.assertIn("[7]", str(mock_print.call_args_list[0]))
+        self.bus_service.bus_dao.lister_horaires.assert_called_once()
+        self.assertEqual(self.bus_service.index_horaires().conflits(datetime(2026, 11, 20, 20, 45)), [7, 8])
+
+    def test_supprimer_bus_et_redistribuer_introuvable(self):
+        """
+        Test 13: Suppression avec redistribution d'un bus inexistant
+        Vérifie que la méthode retourne None et que supprimer_bus retourne False
+        """
+        self.bus_service.bus_dao.supprimer_et_redistribuer.return_value = None
+
+        self.assertIsNone(self.bus_service.supprimer_bus_et_redistribuer(999))
+        self.assertFalse(self.bus_service.supprimer_bus(999, redistribuer=True))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
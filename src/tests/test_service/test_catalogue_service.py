@@ -0,0 +1,75 @@
+import time
+from datetime import date
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+import service.catalogue_service as catalogue_service
+from business_object.evenement_catalogue import EvenementCatalogue
+from service.catalogue_service import CatalogueService, RafraichisseurCatalogue
+
+
+def test_rafraichissement_immediat_sans_delai():
+    """Avec un délai nul, chaque demande rafraîchit aussitôt"""
+    dao = Mock()
+    rafraichisseur = RafraichisseurCatalogue(dao, delai=0)
+
+    rafraichisseur.demander()
+    rafraichisseur.demander()
+
+    assert dao.rafraichir.call_count == 2
+
+
+def test_demandes_rapprochees_regroupees():
+    """Une rafale de demandes ne déclenche qu'un seul rafraîchissement"""
+    dao = Mock()
+    rafraichisseur = RafraichisseurCatalogue(dao, delai=0.05)
+
+    for _ in range(50):
+        rafraichisseur.demander()
+    time.sleep(0.2)
+
+    dao.rafraichir.assert_called_once()
+
+
+def test_vider_execute_le_rafraichissement_en_attente():
+    """À la sortie, une demande en attente est exécutée tout de suite"""
+    dao = Mock()
+    rafraichisseur = RafraichisseurCatalogue(dao, delai=60)
+
+    rafraichisseur.demander()
+    rafraichisseur.vider()
+    rafraichisseur.vider()
+
+    dao.rafraichir.assert_called_once()
+
+
+def test_signaler_modification_inactif_par_defaut():
+    """Sans activation par un point d'entrée, le hook ne fait rien"""
+    with patch.object(catalogue_service, "_rafraichisseur", None):
+        catalogue_service.signaler_modification()
+
+
+def test_signaler_modification_active():
+    """Une fois activé, le hook transmet la demande au rafraîchisseur"""
+    rafraichisseur = Mock()
+    with patch.object(catalogue_service, "_rafraichisseur", rafraichisseur):
+        catalogue_service.signaler_modification()
+    rafraichisseur.demander.assert_called_once()
+
+
+def test_lister_catalogue():
+    """Le service délègue la lecture du catalogue à la DAO"""
+    dao = Mock()
+    dao.lister.return_value = [
+        EvenementCatalogue.from_dict({
+            "id_event": 1, "titre": "Gala", "lieu": "Rennes", "date_event": date(2030, 1, 10),
+            "tarif": Decimal("12.5"), "capacite_max": 100, "places_restantes": 40,
+            "nb_bus_aller": 2, "places_bus_aller": 30, "nb_bus_retour": 2, "places_bus_retour": 35,
+        })
+    ]
+
+    catalogue = CatalogueService(dao).lister_catalogue()
+
+    assert catalogue[0].to_dict()["tarif"] == "12.50"
+    assert catalogue[0].places_bus_retour == 35
+    assert "Places restantes: 40" in str(catalogue[0])
@@ -0,0 +1,81 @@
+import json
+from unittest.mock import patch
+
+from service.diffusion import PipelineDiffusion, diffuser
+
+
+def destinataires(n):
+    return [{"email": f"e{i}@ensai.fr", "nom": f"Nom{i}", "prenom": f"Prenom{i}"} for i in range(n)]
+
+
+@patch("service.diffusion.envoyer_emails")
+def test_diffusion_par_paquets_message_rendu_une_fois(mock_envoi, tmp_path):
+    """Test 1: 5 inscrits, paquets de 2 : 3 envois, même texte, paramètres par inscrit"""
+    mock_envoi.side_effect = lambda messages: [(201, "ok")] * len(messages)
+    pipeline = PipelineDiffusion(tmp_path, taille_paquet=2)
+
+    id_diffusion = pipeline.soumettre("Sujet", "Bonjour {{ params.prenom }}", destinataires(5), 1)
+
+    assert pipeline.attendre(timeout=5)
+    assert mock_envoi.call_count == 3
+    messages = [m for appel in mock_envoi.call_args_list for m in appel[0][0]]
+    assert {m["message_text"] for m in messages} == {"Bonjour {{ params.prenom }}"}
+    assert messages[4]["params"] == {"prenom": "Prenom4", "nom": "Nom4"}
+    etat = pipeline.progression(id_diffusion)
+    assert (etat["statut"], etat["traites"], etat["acceptes"], etat["echecs"]) == ("termine", 5, 5, 0)
+
+
+@patch("service.diffusion.envoyer_emails")
+def test_params_communs_et_journal_supprime(mock_envoi, tmp_path):
+    """Test 1 bis: Paramètres communs ajoutés à chaque message ; destinataires effacés une fois terminé"""
+    mock_envoi.side_effect = lambda messages: [(201, "ok")] * len(messages)
+    pipeline = PipelineDiffusion(tmp_path)
+
+    id_diffusion = pipeline.soumettre("S", "{{ params.annonce }}", destinataires(2), 1,
+                                      {"annonce": "{{ x }}"})
+
+    assert pipeline.attendre(timeout=5)
+    messages = mock_envoi.call_args[0][0]
+    assert messages[1]["params"] == {"annonce": "{{ x }}", "prenom": "Prenom1", "nom": "Nom1"}
+    assert not (tmp_path / f"{id_diffusion}.json").exists()
+    assert pipeline.progression(id_diffusion)["statut"] == "termine"
+
+
+@patch("service.diffusion.envoyer_emails")
+def test_reprise_apres_interruption(mock_envoi, tmp_path):
+    """Test 2: Une diffusion interrompue reprend après le dernier paquet journalisé"""
+    mock_envoi.side_effect = lambda messages: [(201, "ok")] * len(messages)
+    (tmp_path / "abc.json").write_text(json.dumps(
+        {"id": "abc", "id_event": 1, "sujet": "S", "texte": "T", "destinataires": destinataires(5)}))
+    (tmp_path / "abc.etat.json").write_text(json.dumps(
+        {"id": "abc", "id_event": 1, "statut": "en_cours", "total": 5,
+         "traites": 2, "acceptes": 2, "echecs": 0}))
+    pipeline = PipelineDiffusion(tmp_path, taille_paquet=2)
+
+    assert pipeline.reprendre() == ["abc"]
+    assert pipeline.attendre(timeout=5)
+
+    envoyes = [m["to_email"] for appel in mock_envoi.call_args_list for m in appel[0][0]]
+    assert envoyes == ["e2@ensai.fr", "e3@ensai.fr", "e4@ensai.fr"]
+    etat = json.loads((tmp_path / "abc.etat.json").read_text())
+    assert (etat["statut"], etat["acceptes"]) == ("termine", 5)
+    assert not (tmp_path / "abc.json").exists()
+    assert pipeline.reprendre() == []
+
+
+@patch("service.diffusion.envoyer_emails")
+def test_echecs_comptes(mock_envoi, tmp_path):
+    """Test 3: Une erreur d'envoi compte les messages du paquet en échec sans arrêter la diffusion"""
+    mock_envoi.side_effect = [Exception("API indisponible"), [(201, "ok")]]
+    pipeline = PipelineDiffusion(tmp_path, taille_paquet=2)
+
+    id_diffusion = pipeline.soumettre("S", "T", destinataires(3))
+
+    assert pipeline.attendre(timeout=5)
+    etat = pipeline.progression(id_diffusion)
+    assert (etat["statut"], etat["acceptes"], etat["echecs"]) == ("termine", 1, 2)
+
+
+def test_diffuser_sans_activation():
+    """Test 4: Sans pipeline activé, diffuser() ne fait rien"""
+    assert diffuser("S", "T", destinataires(1)) is None
@@ -293,4 +293,79 @@ class TestModifierStatut:
 
         # Assert
         assert resultat is True
-        mock_daos["evenement_dao"].modifier_statut.assert_not_called()
\ No newline at end of file
+        mock_daos["evenement_dao"].modifier_statut.assert_not_called()
+    @patch("service.notifications.envoyer_emails")
+    def test_modifier_capacite_promeut_liste_attente(self, mock_envoi, evenement_service, mock_daos, fake_evenement):
+        """Test 6: Augmentation de capacité - les promus sont prévenus en un lot"""
+        # Arrange
+        mock_daos["evenement_dao"].get_by.return_value = [fake_evenement]
+        mock_daos["evenement_dao"].modifier_capacite.return_value = [
+            {"email": "a@ensai.fr", "nom": "A", "nom_event": "Conférence", "code_reservation": 11111111}
+        ]
+        mock_daos["inscription_dao"].compter_par_evenement.return_value = 101
+        mock_envoi.return_value = [(201, "ok")]
+
+        # Act
+        resultat = evenement_service.modifier_capacite(1, 120)
+
+        # Assert
+        assert resultat is True
+        mock_daos["evenement_dao"].modifier_capacite.assert_called_once_with(1, 120)
+        mock_envoi.assert_called_once()
+
+    def test_modifier_capacite_sous_nb_inscrits(self, evenement_service, mock_daos, fake_evenement):
+        """Test 7: Capacité refusée par la DAO (inférieure au nombre d'inscrits)"""
+        mock_daos["evenement_dao"].get_by.return_value = [fake_evenement]
+        mock_daos["evenement_dao"].modifier_capacite.return_value = None
+
+        assert evenement_service.modifier_capacite(1, 10) is False
+
+
+class TestDiffusion:
+    """Tests pour la diffusion de messages aux inscrits"""
+
+    @patch("service.evenement_service.diffuser", return_value="d1")
+    def test_suppression_previent_les_inscrits(self, mock_diffuser, evenement_service, mock_daos, fake_evenement):
+        """Test 1: Les inscrits, lus avant la suppression, reçoivent l'annulation"""
+        mock_daos["evenement_dao"].get_by.return_value = [fake_evenement]
+        mock_daos["evenement_dao"].supprimer.return_value = True
+        inscrits = [{"email": "a@ensai.fr", "nom": "A", "prenom": "Alice"}]
+        mock_daos["evenement_dao"].destinataires.return_value = inscrits
+
+        assert evenement_service.supprimer_evenement(1) is True
+
+        sujet, texte, destinataires, id_event, params = mock_diffuser.call_args[0]
+        assert "Annulation" in sujet and "{{ params.prenom }}" in texte
+        assert (destinataires, id_event) == (inscrits, 1)
+        assert params["titre"] == fake_evenement.titre
+
+    @patch("service.evenement_service.diffuser", return_value="d1")
+    def test_diffuser_message(self, mock_diffuser, evenement_service, mock_daos, fake_evenement):
+        """Test 2: Une annonce est mise en file pour tous les inscrits"""
+        mock_daos["evenement_dao"].get_by.return_value = [fake_evenement]
+        mock_daos["evenement_dao"].destinataires.return_value = [{"email": "a@ensai.fr"}]
+
+        assert evenement_service.diffuser_message(1, "Départ avancé à 19h") == "d1"
+        assert mock_diffuser.call_args[0][4]["annonce"] == "Départ avancé à 19h"
+
+    @patch("service.evenement_service.diffuser", return_value="d1")
+    def test_diffuser_message_texte_non_interprete(self, mock_diffuser, evenement_service, mock_daos,
+                                                   fake_evenement):
+        """Test 2 bis: Le texte de l'admin n'est pas collé dans le gabarit Brevo"""
+        mock_daos["evenement_dao"].get_by.return_value = [fake_evenement]
+        mock_daos["evenement_dao"].destinataires.return_value = [{"email": "a@ensai.fr"}]
+
+        evenement_service.diffuser_message(1, "Code promo {{ params.email }} {% if x %}")
+
+        _, texte, _, _, params = mock_diffuser.call_args[0]
+        assert "{% if" not in texte and "{{ params.annonce }}" in texte
+        assert params["annonce"] == "Code promo {{ params.email }} {% if x %}"
+
+    @patch("service.evenement_service.diffuser")
+    def test_diffuser_message_sans_inscrit(self, mock_diffuser, evenement_service, mock_daos, fake_evenement):
+        """Test 3: Sans inscrit, aucune diffusion n'est créée"""
+        mock_daos["evenement_dao"].get_by.return_value = [fake_evenement]
+        mock_daos["evenement_dao"].destinataires.return_value = []
+
+        assert evenement_service.diffuser_message(1, "Info") is None
+        mock_diffuser.assert_not_called()
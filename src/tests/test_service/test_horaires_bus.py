@@ -0,0 +1,61 @@
+import unittest
+from datetime import date, datetime, time, timedelta
+from service.horaires_bus import IndexHorairesBus, moment_depart
+
+JOUR = date(2026, 11, 20)
+
+
+def a(heure, minute=0, jour=JOUR):
+    return datetime.combine(jour, time(heure, minute))
+
+
+class TestHorairesBus(unittest.TestCase):
+    """Tests unitaires de l'index des horaires de bus"""
+
+    def setUp(self):
+        self.index = IndexHorairesBus(duree=timedelta(minutes=90))
+        self.index.ajouter(1, 10, a(20))
+        self.index.ajouter(2, 20, a(21))
+        self.index.ajouter(3, 20, a(22, 30))
+
+    def test_moment_depart_retour_le_lendemain(self):
+        """Test 1: Un retour à 03:00 part le lendemain de l'événement"""
+        self.assertEqual(moment_depart(JOUR, "03:00", "RETOUR"), a(3, jour=JOUR + timedelta(days=1)))
+        self.assertEqual(moment_depart(JOUR, time(20, 0), "ALLER"), a(20))
+        self.assertIsNone(moment_depart(JOUR, None, "ALLER"))
+
+    def test_conflits(self):
+        """Test 2: Seuls les créneaux qui se chevauchent sont signalés"""
+        self.assertEqual(self.index.conflits(a(20, 30)), [1, 2])
+        # Les bus d'un même événement partent ensemble sans conflit
+        self.assertEqual(self.index.conflits(a(21, 30), id_event=20), [])
+        # 21:30 -> 23:00 : le bus 1 (20:00 -> 21:30) est libre à temps
+        self.assertEqual(self.index.conflits(a(21, 30), id_event=10), [2, 3])
+
+    def test_conflits_apres_minuit(self):
+        """Test 3: Un départ à 00:30 chevauche le bus de 23:30 la veille"""
+        self.index.ajouter(4, 30, a(23, 30))
+        lendemain = a(0, 30, jour=JOUR + timedelta(days=1))
+        self.assertIn(4, self.index.conflits(lendemain))
+
+    def test_retirer(self):
+        """Test 4: Un bus supprimé ne crée plus de conflit"""
+        self.index.retirer(2)
+        self.assertEqual(self.index.conflits(a(21, 15)), [1, 3])
+        self.assertEqual(len(self.index), 2)
+
+    def test_planning_minimal(self):
+        """Test 5: 20:00, 21:00 et 22:30 : deux véhicules, le premier enchaîne 20:00 et 22:30"""
+        self.assertEqual(self.index.planning(JOUR), [[1, 3], [2]])
+
+    def test_depuis_lignes(self):
+        """Test 6: Construction depuis les lignes de la DAO (heure inconnue ignorée)"""
+        index = IndexHorairesBus.depuis_lignes([
+            {"id_bus": 1, "id_event": 1, "sens": "ALLER", "heure_depart": time(20, 0), "date_event": JOUR},
+            {"id_bus": 2, "id_event": 1, "sens": "ALLER", "heure_depart": None, "date_event": JOUR},
+        ])
+        self.assertEqual(len(index), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -74,7 +74,7 @@ class TestInscriptionService(unittest.TestCase):
         self.mock_inscription_dao.creer.return_value = mock_inscription_created
         
         # Act
-        with patch('service.inscription_service.send_email_brevo'):
+        with patch('service.inscription_service.envoyer_email'):
             resultat = self.service.creer_inscription(
                 boit=True,
                 mode_paiement="en ligne",
@@ -186,6 +186,28 @@ class TestInscriptionService(unittest.TestCase):
         self.assertIsNone(resultat)
         self.mock_inscription_dao.creer.assert_not_called()
 
+    def test_creer_inscription_refus_comptes_par_motif(self):
+        """Les refus sont comptés par motif : complet, puis doublon"""
+        from service.inscription_service import INSCRIPTIONS_REFUSEES
+
+        avant = INSCRIPTIONS_REFUSEES.valeurs()
+        mock_evenement = Mock()
+        mock_evenement.capacite_max = 50
+        self.mock_utilisateur_dao.get_by.return_value = [Mock()]
+        self.mock_evenement_dao.get_by.return_value = [mock_evenement]
+        parametres = dict(boit=False, mode_paiement="espece", id_event=1, nom_event="Event",
+                          id_bus_aller=1, id_bus_retour=2, created_by=1)
+
+        self.mock_inscription_dao.compter_par_evenement.return_value = 50
+        self.service.creer_inscription(**parametres)
+        self.mock_inscription_dao.compter_par_evenement.return_value = 20
+        self.mock_inscription_dao.est_deja_inscrit.return_value = True
+        self.service.creer_inscription(**parametres)
+
+        apres = INSCRIPTIONS_REFUSEES.valeurs()
+        for motif in ("complet", "doublon"):
+            self.assertEqual(apres[(motif,)] - avant.get((motif,), 0), 1)
+
     def test_lister_toutes_inscriptions(self):
         """Test 8: Lister toutes les inscriptions"""
         # Arrange
@@ -228,14 +250,47 @@ class TestInscriptionService(unittest.TestCase):
         mock_inscription.created_by = 1
         mock_inscription.code_reservation = 12345678
         self.mock_inscription_dao.get_by.return_value = [mock_inscription]
-        self.mock_inscription_dao.supprimer.return_value = True
+        self.mock_inscription_dao.supprimer_et_promouvoir.return_value = []
         
         # Act
         resultat = self.service.supprimer_inscription("12345678", 1)
         
         # Assert
         self.assertTrue(resultat)
-        self.mock_inscription_dao.supprimer.assert_called_once()
+        self.mock_inscription_dao.supprimer_et_promouvoir.assert_called_once_with(mock_inscription)
+
+    @patch('service.notifications.envoyer_emails')
+    def test_supprimer_inscription_promotion_notifiee(self, mock_envoi):
+        """Test 11 bis: La place libérée est promue et le promu prévenu en un seul lot"""
+        # Arrange
+        mock_inscription = Mock(spec=Inscription)
+        mock_inscription.created_by = 1
+        mock_inscription.code_reservation = 12345678
+        self.mock_inscription_dao.get_by.return_value = [mock_inscription]
+        self.mock_inscription_dao.supprimer_et_promouvoir.return_value = [
+            {"email": "a@ensai.fr", "nom": "A", "nom_event": "Gala", "code_reservation": 11111111},
+            {"email": "b@ensai.fr", "nom": "B", "nom_event": "Gala", "code_reservation": 22222222},
+        ]
+        mock_envoi.return_value = [(201, "ok"), (201, "ok")]
+
+        # Act
+        resultat = self.service.supprimer_inscription("12345678", 1)
+
+        # Assert
+        self.assertTrue(resultat)
+        mock_envoi.assert_called_once()
+        messages = mock_envoi.call_args[0][0]
+        self.assertEqual([m["to_email"] for m in messages], ["a@ensai.fr", "b@ensai.fr"])
+
+    def test_supprimer_inscription_echec(self):
+        """Test 11 ter: Échec de la transaction de suppression"""
+        mock_inscription = Mock(spec=Inscription)
+        mock_inscription.created_by = 1
+        mock_inscription.code_reservation = 12345678
+        self.mock_inscription_dao.get_by.return_value = [mock_inscription]
+        self.mock_inscription_dao.supprimer_et_promouvoir.return_value = None
+
+        self.assertFalse(self.service.supprimer_inscription("12345678", 1))
 
     def test_supprimer_inscription_permission_refusee(self):
         """Test 12: Échec suppression - utilisateur non propriétaire"""
@@ -264,6 +319,158 @@ class TestInscriptionService(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.service.supprimer_inscription("99999999", 1)
 
+    def test_rejoindre_liste_attente_succes(self):
+        """Test 15: Ajout en liste d'attente"""
+        self.service.liste_attente_dao = Mock()
+        self.service.liste_attente_dao.ajouter.return_value = []
+        self.mock_utilisateur_dao.get_by.return_value = [Mock()]
+        self.mock_evenement_dao.get_by.return_value = [Mock(nb_inscrits=100, capacite_max=100)]
+        self.mock_inscription_dao.est_deja_inscrit.return_value = False
+
+        attente = self.service.rejoindre_liste_attente(
+            boit=False, mode_paiement="espece", id_event=1,
+            id_bus_aller=1, id_bus_retour=2, created_by=1
+        )
+
+        self.assertIsNotNone(attente)
+        self.assertEqual(attente.id_event, 1)
+        self.service.liste_attente_dao.ajouter.assert_called_once_with(attente)
+
+    def test_rejoindre_liste_attente_deja_inscrit(self):
+        """Test 16: Un inscrit ne rejoint pas la liste d'attente"""
+        self.service.liste_attente_dao = Mock()
+        self.mock_utilisateur_dao.get_by.return_value = [Mock()]
+        self.mock_evenement_dao.get_by.return_value = [Mock(nb_inscrits=100, capacite_max=100)]
+        self.mock_inscription_dao.est_deja_inscrit.return_value = True
+
+        attente = self.service.rejoindre_liste_attente(
+            boit=False, mode_paiement="espece", id_event=1,
+            id_bus_aller=1, id_bus_retour=2, created_by=1
+        )
+
+        self.assertIsNone(attente)
+        self.service.liste_attente_dao.ajouter.assert_not_called()
+
+    def test_rejoindre_liste_attente_deja_en_attente(self):
+        """Test 17: Double ajout refusé"""
+        self.service.liste_attente_dao = Mock()
+        self.service.liste_attente_dao.ajouter.return_value = None
+        self.mock_utilisateur_dao.get_by.return_value = [Mock()]
+        self.mock_evenement_dao.get_by.return_value = [Mock(nb_inscrits=100, capacite_max=100)]
+        self.mock_inscription_dao.est_deja_inscrit.return_value = False
+
+        self.assertIsNone(self.service.rejoindre_liste_attente(
+            boit=False, mode_paiement="espece", id_event=1,
+            id_bus_aller=1, id_bus_retour=2, created_by=1
+        ))
+
+    def test_rejoindre_liste_attente_evenement_non_complet(self):
+        """Test 17 bis: Pas de liste d'attente tant qu'il reste des places"""
+        self.service.liste_attente_dao = Mock()
+        self.mock_utilisateur_dao.get_by.return_value = [Mock()]
+        self.mock_evenement_dao.get_by.return_value = [Mock(nb_inscrits=99, capacite_max=100)]
+        self.mock_inscription_dao.est_deja_inscrit.return_value = False
+
+        self.assertIsNone(self.service.rejoindre_liste_attente(
+            boit=False, mode_paiement="espece", id_event=1,
+            id_bus_aller=1, id_bus_retour=2, created_by=1
+        ))
+        self.service.liste_attente_dao.ajouter.assert_not_called()
+
+    @patch("service.notifications.envoyer_emails")
+    def test_inscrire_groupe_un_seul_envoi(self, envoi):
+        """Test 18: Inscription de groupe confirmée par un seul envoi groupé"""
+        envoi.return_value = [(201, ""), (201, "")]
+        self.mock_inscription_dao.creer_groupe.return_value = [
+            {"code_reservation": code, "created_by": membre, "boit": False, "mode_paiement": "espece",
+             "id_event": 3, "id_bus_aller": 1, "id_bus_retour": 2, "created_at": None,
+             "email": f"{membre}@ensai.fr", "nom": "Nom", "prenom": "Prenom", "nom_event": "Gala"}
+            for code, membre in ((11111111, 1), (22222222, 2))
+        ]
+        membres = [{"created_by": 1, "mode_paiement": "espece"}, {"email": "2@ensai.fr", "mode_paiement": "espece"}]
+
+        inscriptions = self.service.inscrire_groupe(3, 1, 2, membres)
+
+        self.assertEqual([i.created_by for i in inscriptions], [1, 2])
+        self.mock_inscription_dao.creer_groupe.assert_called_once_with(3, 1, 2, membres)
+        envoi.assert_called_once()
+        self.assertEqual(len(envoi.call_args[0][0]), 2)
+
+    @patch("service.notifications.envoyer_emails")
+    def test_inscrire_groupe_refuse(self, envoi):
+        """Test 19: Groupe refusé par la DAO : aucun e-mail"""
+        self.mock_inscription_dao.creer_groupe.return_value = None
+
+        self.assertIsNone(self.service.inscrire_groupe(3, 1, 2, [{"created_by": 1}]))
+        self.assertIsNone(self.service.inscrire_groupe(3, 1, 2, []))
+        envoi.assert_not_called()
+
+    @patch("service.notifications.envoyer_emails")
+    def test_transferer_inscription(self, envoi):
+        """Test 20: Transfert : nouvelle titulaire, et un seul envoi pour les deux parties"""
+        envoi.return_value = [(201, ""), (201, "")]
+        self.mock_inscription_dao.transferer.return_value = {
+            "code_reservation": 12345678, "created_by": 2, "boit": False, "mode_paiement": "espece",
+            "id_event": 3, "id_bus_aller": 1, "id_bus_retour": 2, "created_at": None,
+            "nom_event": "Gala", "email": "b@ensai.fr", "nom": "B", "prenom": "b",
+            "email_cedant": "a@ensai.fr", "nom_cedant": "A", "prenom_cedant": "a",
+        }
+
+        inscription = self.service.transferer_inscription(12345678, 1, " B@ensai.fr ")
+
+        self.assertEqual(inscription.created_by, 2)
+        self.assertEqual(inscription.id_bus_aller, 1)
+        self.mock_inscription_dao.transferer.assert_called_once_with(12345678, 1, "b@ensai.fr")
+        envoi.assert_called_once()
+        self.assertEqual([m["to_email"] for m in envoi.call_args[0][0]], ["a@ensai.fr", "b@ensai.fr"])
+
+    @patch("service.notifications.envoyer_emails")
+    def test_transferer_inscription_refuse(self, envoi):
+        """Test 21: Transfert refusé : aucun e-mail"""
+        self.mock_inscription_dao.transferer.return_value = None
+
+        self.assertIsNone(self.service.transferer_inscription(12345678, 1, "b@ensai.fr"))
+        envoi.assert_not_called()
+
+    @patch("service.notifications.envoyer_emails")
+    def test_inscrire_plusieurs_evenements_un_seul_mail(self, envoi):
+        """Test 22: Plusieurs inscriptions, un seul e-mail récapitulatif"""
+        envoi.return_value = [(201, "")]
+        self.mock_inscription_dao.creer_multiples.return_value = {
+            "utilisateur": {"email": "a@ensai.fr", "nom": "A", "prenom": "a"},
+            "inscriptions": [
+                {"code_reservation": code, "created_by": 1, "boit": False, "mode_paiement": "espece",
+                 "id_event": id_event, "id_bus_aller": None, "id_bus_retour": None,
+                 "created_at": None, "nom_event": titre}
+                for code, id_event, titre in ((11111111, 1, "Soirée"), (22222222, 2, "Brunch"))
+            ],
+            "refus": [],
+        }
+
+        resultat = self.service.inscrire_plusieurs_evenements(1, [(1, None, None), (2, None, None)],
+                                                               mode_paiement="espece")
+
+        self.assertEqual([i.id_event for i in resultat["inscriptions"]], [1, 2])
+        envoi.assert_called_once()
+        messages = envoi.call_args[0][0]
+        self.assertEqual(len(messages), 1)
+        self.assertIn("Brunch", messages[0]["message_text"])
+
+    @patch("service.notifications.envoyer_emails")
+    def test_inscrire_plusieurs_evenements_refus(self, envoi):
+        """Test 23: Tout ou rien refusé : aucun e-mail, motifs renvoyés"""
+        self.mock_inscription_dao.creer_multiples.return_value = {
+            "utilisateur": {"email": "a@ensai.fr", "nom": "A", "prenom": "a"},
+            "inscriptions": [],
+            "refus": [{"id_event": 2, "motif": "événement complet"}],
+        }
+
+        resultat = self.service.inscrire_plusieurs_evenements(1, [(1, None, None), (2, None, None)])
+
+        self.assertEqual(resultat["inscriptions"], [])
+        self.assertEqual(resultat["refus"][0]["id_event"], 2)
+        envoi.assert_not_called()
+
 
 if __name__ == "__main__":
-    unittest.main()
\ No newline at end of file
+    unittest.main()
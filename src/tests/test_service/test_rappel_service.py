@@ -0,0 +1,63 @@
+import unittest
+from datetime import date, time
+from unittest.mock import MagicMock, patch
+
+from service.rappel_service import RAPPEL_VEILLE, RappelService
+
+
+def ligne(code, heure_aller=time(20, 0)):
+    return {"code_reservation": code, "email": f"e{code}@ensai.fr", "nom": "Nom", "prenom": "Prenom",
+            "id_event": 1, "titre": "Gala", "lieu": "Rennes", "date_event": date(2026, 11, 20),
+            "heure_aller": heure_aller, "bus_aller": "Car 1", "heure_retour": None, "bus_retour": None}
+
+
+class TestRappelService(unittest.TestCase):
+    """Tests unitaires du job de rappels"""
+
+    def setUp(self):
+        with patch("service.rappel_service.RappelDAO"):
+            self.service = RappelService()
+        self.service.rappel_dao = MagicMock()
+
+    @patch("service.rappel_service.envoyer_emails")
+    def test_seuls_les_rappels_acceptes_sont_journalises(self, mock_envoi):
+        """Test 1: Un rappel refusé par l'API n'est pas marqué, il repartira au prochain passage"""
+        self.service.rappel_dao.parcourir_a_envoyer.return_value = iter([[ligne(1), ligne(2)]])
+        mock_envoi.return_value = [(201, "ok"), (503, "indisponible")]
+
+        rapport = self.service.envoyer_rappels(date(2026, 11, 20))
+
+        self.assertEqual((rapport["envoyes"], rapport["echecs"]), (1, 1))
+        self.service.rappel_dao.marquer_envoyes.assert_called_once_with([1], RAPPEL_VEILLE)
+        texte = mock_envoi.call_args[0][0][0]["message_text"]
+        self.assertIn("départ à 20:00 (Car 1)", texte)
+        self.assertIn("Bus retour : aucun bus réservé", texte)
+
+    @patch("service.rappel_service.envoyer_emails")
+    def test_volume_traite_par_paquets(self, mock_envoi):
+        """Test 2: 20 000 inscrits, paquets de 1 000 : 20 lots, jamais plus de 1 000 messages"""
+        def paquets():
+            for debut in range(0, 20000, 1000):
+                yield [ligne(code) for code in range(debut, debut + 1000)]
+
+        self.service.rappel_dao.parcourir_a_envoyer.return_value = paquets()
+        mock_envoi.side_effect = lambda messages: [(201, "ok")] * len(messages)
+
+        rapport = self.service.envoyer_rappels(date(2026, 11, 20), taille_paquet=1000)
+
+        self.assertEqual((rapport["paquets"], rapport["envoyes"]), (20, 20000))
+        self.assertEqual(max(len(appel[0][0]) for appel in mock_envoi.call_args_list), 1000)
+
+    @patch("service.rappel_service.envoyer_emails")
+    def test_demain_par_defaut(self, mock_envoi):
+        """Test 3: Sans date, les rappels portent sur les événements du lendemain"""
+        self.service.rappel_dao.parcourir_a_envoyer.return_value = iter([])
+
+        rapport = self.service.envoyer_rappels()
+
+        self.assertEqual((rapport["jour"] - date.today()).days, 1)
+        mock_envoi.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -209,14 +209,16 @@ def test_supprimer_utilisateur_par_admin_success(service, utilisateur_admin, uti
     """Test la suppression réussie par un admin."""
     # Arrange
     service.utilisateur_dao.get_by_id.return_value = utilisateur_participant
-    service.utilisateur_dao.supprimer.return_value = True
+    service.utilisateur_dao.supprimer_et_promouvoir.return_value = [{"code_reservation": 1}]
 
     # Act
-    resultat = service.supprimer_utilisateur(utilisateur_admin, 1)
+    with patch("service.utilisateur_service.notifier_promotions") as notifier:
+        resultat = service.supprimer_utilisateur(utilisateur_admin, 1)
 
     # Assert
     assert resultat is True
-    service.utilisateur_dao.supprimer.assert_called_once_with(1)
+    service.utilisateur_dao.supprimer_et_promouvoir.assert_called_once_with(1)
+    notifier.assert_called_once_with([{"code_reservation": 1}])
 
 
 def test_supprimer_utilisateur_non_admin_refuse(service, utilisateur_participant):
@@ -228,7 +230,7 @@ def test_supprimer_utilisateur_non_admin_refuse(service, utilisateur_participant
 
     # Assert
     assert resultat is False
-    service.utilisateur_dao.supprimer.assert_not_called()
+    service.utilisateur_dao.supprimer_et_promouvoir.assert_not_called()
 
 
 def test_supprimer_utilisateur_inexistant(service, utilisateur_admin):
@@ -241,14 +243,14 @@ def test_supprimer_utilisateur_inexistant(service, utilisateur_admin):
 
     # Assert
     assert resultat is False
-    service.utilisateur_dao.supprimer.assert_not_called()
+    service.utilisateur_dao.supprimer_et_promouvoir.assert_not_called()
 
 
 def test_supprimer_utilisateur_echec_dao(service, utilisateur_admin, utilisateur_participant):
     """Test le cas où la DAO échoue lors de la suppression."""
     # Arrange
     service.utilisateur_dao.get_by_id.return_value = utilisateur_participant
-    service.utilisateur_dao.supprimer.return_value = False
+    service.utilisateur_dao.supprimer_et_promouvoir.return_value = None
 
     # Act
     resultat = service.supprimer_utilisateur(utilisateur_admin, 1)
@@ -0,0 +1,155 @@
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from benchmark.faux_brevo import FauxBrevo
+from utils import api_brevo
+from utils.api_brevo import LimiteurDebit, decouper_lots, send_email_brevo, send_emails_brevo
+from utils.disjoncteur import CircuitOuvert, Disjoncteur
+
+
+def messages(n):
+    return [{"to_email": f"e{i}@ensai.fr", "subject": "Sujet", "message_text": f"Bonjour {i}"}
+            for i in range(n)]
+
+
+@pytest.fixture
+def env_brevo(monkeypatch):
+    monkeypatch.setenv("TOKEN_BREVO", "cle")
+    monkeypatch.setenv("EMAIL_BREVO", "bde@ensai.fr")
+    # Disjoncteur neuf pour chaque test
+    monkeypatch.setattr(api_brevo, "disjoncteur_brevo",
+                        Disjoncteur("Brevo", seuil=2, delai=60, est_echec=api_brevo._echec_http))
+    monkeypatch.setattr(api_brevo, "_limiteur", None)
+
+
+def test_decouper_lots_respecte_nombre_et_taille():
+    """Les paquets ne dépassent ni le nombre de versions ni la taille maximale"""
+    assert decouper_lots(messages(5), versions_max=2) == [[0, 1], [2, 3], [4]]
+    assert len(decouper_lots(messages(5), octets_max=1)) == 5
+
+
+def test_envoi_groupe_une_requete_par_paquet(env_brevo):
+    """250 destinataires, 100 par requête : 3 requêtes, un résultat par message"""
+    session = Mock()
+    session.post.return_value = Mock(status_code=201, text="ok")
+
+    with patch("utils.api_brevo.session_brevo", return_value=session):
+        resultats = send_emails_brevo(messages(250), versions_max=100, concurrence=3, debit=0)
+
+    assert session.post.call_count == 3
+    assert resultats == [(201, "ok")] * 250
+    versions = [len(c.kwargs["json"]["messageVersions"]) for c in session.post.call_args_list]
+    assert sorted(versions) == [50, 100, 100]
+
+
+def test_echec_d_un_paquet_n_affecte_que_ses_messages(env_brevo):
+    """Une exception sur une requête donne (None, erreur) aux seuls messages du paquet"""
+    session = Mock()
+    session.post.side_effect = [Mock(status_code=201, text="ok"), Exception("timeout")]
+
+    with patch("utils.api_brevo.session_brevo", return_value=session):
+        resultats = send_emails_brevo(messages(4), versions_max=2, concurrence=1, debit=0)
+
+    assert resultats == [(201, "ok"), (201, "ok"), (None, "timeout"), (None, "timeout")]
+
+
+def test_limiteur_debit():
+    """Cinq requêtes à 50 par seconde sans rafale prennent au moins 80 ms"""
+    limiteur = LimiteurDebit(50)
+    debut = time.perf_counter()
+    for _ in range(5):
+        limiteur.attendre()
+    assert time.perf_counter() - debut >= 0.075
+
+
+def test_limiteur_partage_par_le_processus(env_brevo, monkeypatch):
+    """Deux lots envoyés sans débit explicite puisent dans le même budget BREVO_DEBIT"""
+    monkeypatch.setenv("BREVO_DEBIT", "20")
+    monkeypatch.setenv("BREVO_CONCURRENCE", "1")
+    session = Mock()
+    session.post.return_value = Mock(status_code=201, text="ok")
+
+    debut = time.perf_counter()
+    with patch("utils.api_brevo.session_brevo", return_value=session):
+        send_emails_brevo(messages(2), versions_max=1, concurrence=1)
+        send_emails_brevo(messages(2), versions_max=1, concurrence=1)
+
+    assert api_brevo.limiteur_brevo() is api_brevo.limiteur_brevo()
+    # 4 requêtes, une seule d'avance : au moins 3 intervalles de 50 ms
+    assert time.perf_counter() - debut >= 0.14
+
+
+def test_faux_brevo_compte_requetes_et_destinataires(env_brevo, monkeypatch):
+    """De bout en bout contre le faux serveur : 800 destinataires en 8 requêtes"""
+    pytest.importorskip("requests")
+    monkeypatch.setattr(api_brevo, "_session", None)
+
+    with FauxBrevo() as faux:
+        monkeypatch.setenv("BREVO_URL", faux.url)
+        resultats = send_emails_brevo(messages(800), versions_max=100, concurrence=4, debit=0)
+
+    assert faux.requetes == 8
+    assert faux.destinataires == 800
+    assert all(statut == 201 for statut, _ in resultats)
+
+
+def test_envoi_unitaire_avec_timeouts(env_brevo, monkeypatch):
+    """Chaque requête porte les délais de connexion et de lecture configurés"""
+    monkeypatch.setenv("BREVO_TIMEOUT_LECTURE", "2.5")
+    session = Mock()
+    session.post.return_value = Mock(status_code=201, text="ok")
+
+    with patch("utils.api_brevo.session_brevo", return_value=session):
+        assert send_email_brevo("a@ensai.fr", "Sujet", "Texte") == (201, "ok")
+
+    assert session.post.call_args.kwargs["timeout"] == (3.0, 2.5)
+
+
+def test_circuit_ouvert_apres_erreurs_serveur(env_brevo):
+    """Deux 503 ouvrent le circuit : l'envoi suivant échoue sans requête"""
+    session = Mock()
+    session.post.return_value = Mock(status_code=503, text="indisponible")
+
+    with patch("utils.api_brevo.session_brevo", return_value=session):
+        send_email_brevo("a@ensai.fr", "S", "T")
+        send_email_brevo("b@ensai.fr", "S", "T")
+        with pytest.raises(CircuitOuvert):
+            send_email_brevo("c@ensai.fr", "S", "T")
+        resultats = send_emails_brevo(messages(2), debit=0)
+
+    assert session.post.call_count == 2
+    assert resultats[0][0] is None
+
+
+def test_faux_brevo_lent_borne_par_le_timeout(env_brevo, monkeypatch):
+    """Contre un fournisseur lent, l'envoi abandonne au délai de lecture"""
+    pytest.importorskip("requests")
+    monkeypatch.setattr(api_brevo, "_session", None)
+    monkeypatch.setenv("BREVO_TIMEOUT_LECTURE", "0.2")
+
+    with FauxBrevo(latence=1.0) as faux:
+        monkeypatch.setenv("BREVO_URL", faux.url)
+        debut = time.perf_counter()
+        with pytest.raises(Exception):
+            send_email_brevo("a@ensai.fr", "S", "T")
+        assert time.perf_counter() - debut < 0.9
+
+
+def test_envoi_trace_dans_un_span(env_brevo, monkeypatch):
+    """Avec les traces actives, chaque POST est un span avec son statut"""
+    from utils import traces
+
+    exportees = []
+    monkeypatch.setattr(traces, "_traceur", traces.Traceur(1.0, Mock(exporter=exportees.extend)))
+    session = Mock()
+    session.post.return_value = Mock(status_code=201, text="ok")
+
+    with patch("utils.api_brevo.session_brevo", return_value=session):
+        with traces.span("notification"):
+            send_emails_brevo(messages(4), versions_max=2, concurrence=2, debit=0)
+
+    posts = [s for s in exportees if s.nom == "http.post"]
+    assert len(posts) == 2
+    assert all(s.attributs["statut"] == 201 and s.parent_id == exportees[-1].id for s in posts)
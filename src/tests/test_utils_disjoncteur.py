@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+
+from utils.disjoncteur import DEMI_OUVERT, FERME, OUVERT, CircuitOuvert, Disjoncteur
+
+
+class Horloge:
+    """Horloge manuelle pour piloter le délai de réouverture"""
+
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def echouer():
+    raise ConnectionError("délai dépassé")
+
+
+def test_ouverture_apres_echecs_consecutifs():
+    """Le circuit s'ouvre au seuil, puis rejette sans appeler la fonction"""
+    disjoncteur = Disjoncteur("Test", seuil=3, delai=10, horloge=Horloge())
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            disjoncteur.appeler(echouer)
+
+    appels = []
+    with pytest.raises(CircuitOuvert):
+        disjoncteur.appeler(appels.append, 1)
+
+    assert disjoncteur.etat == OUVERT
+    assert appels == []
+    assert disjoncteur.metriques()["rejets"] == 1
+
+
+def test_succes_remet_le_compteur_a_zero():
+    """Seuls les échecs consécutifs comptent"""
+    disjoncteur = Disjoncteur("Test", seuil=2, horloge=Horloge())
+    with pytest.raises(ConnectionError):
+        disjoncteur.appeler(echouer)
+    disjoncteur.appeler(lambda: "ok")
+    with pytest.raises(ConnectionError):
+        disjoncteur.appeler(echouer)
+
+    assert disjoncteur.etat == FERME
+
+
+def test_demi_ouverture_essai_reussi_puis_rate():
+    """Après le délai, un essai réussi referme le circuit ; un essai raté le rouvre"""
+    horloge = Horloge()
+    disjoncteur = Disjoncteur("Test", seuil=1, delai=10, horloge=horloge)
+    with pytest.raises(ConnectionError):
+        disjoncteur.appeler(echouer)
+
+    horloge.t = 10
+    with pytest.raises(ConnectionError):
+        disjoncteur.appeler(echouer)
+    assert disjoncteur.etat == OUVERT
+    with pytest.raises(CircuitOuvert):
+        disjoncteur.appeler(lambda: "ok")
+
+    horloge.t = 20
+    assert disjoncteur.appeler(lambda: "ok") == "ok"
+    assert disjoncteur.etat == FERME
+    metriques = disjoncteur.metriques()
+    assert metriques["temps_ouvert"] == 20
+    assert metriques["ouvertures"] == 1
+
+
+def test_un_seul_essai_a_la_fois():
+    """En demi-ouverture, les appels concurrents de l'essai échouent immédiatement"""
+    horloge = Horloge()
+    disjoncteur = Disjoncteur("Test", seuil=1, delai=1, horloge=horloge)
+    with pytest.raises(ConnectionError):
+        disjoncteur.appeler(echouer)
+    horloge.t = 1
+
+    def essai():
+        assert disjoncteur.etat == DEMI_OUVERT
+        with pytest.raises(CircuitOuvert):
+            disjoncteur.appeler(lambda: "concurrent")
+        return "essai"
+
+    assert disjoncteur.appeler(essai) == "essai"
+
+
+@pytest.mark.parametrize("tardif_echoue", [True, False])
+def test_appel_tardif_ne_decide_pas_de_l_essai(tardif_echoue):
+    """Un appel lancé circuit fermé et terminé pendant l'essai ne change pas l'état"""
+    horloge = Horloge()
+    disjoncteur = Disjoncteur("Test", seuil=1, delai=1, horloge=horloge)
+    demarre = {"tardif": threading.Event(), "essai": threading.Event()}
+    fin = {"tardif": threading.Event(), "essai": threading.Event()}
+
+    def bloquant(nom, echoue):
+        demarre[nom].set()
+        fin[nom].wait(5)
+        if echoue:
+            raise ConnectionError(nom)
+        return nom
+
+    def lancer(nom, echoue):
+        def cible():
+            try:
+                disjoncteur.appeler(bloquant, nom, echoue)
+            except ConnectionError:
+                pass
+        thread = threading.Thread(target=cible)
+        thread.start()
+        assert demarre[nom].wait(5)
+        return thread
+
+    tardif = lancer("tardif", tardif_echoue)
+    with pytest.raises(ConnectionError):
+        disjoncteur.appeler(echouer)
+    horloge.t = 1
+    essai = lancer("essai", False)
+
+    fin["tardif"].set()
+    tardif.join()
+    assert disjoncteur.etat == DEMI_OUVERT
+    with pytest.raises(CircuitOuvert):
+        disjoncteur.appeler(lambda: "second essai")
+
+    fin["essai"].set()
+    essai.join()
+    assert disjoncteur.etat == FERME
+
+
+def test_resultat_en_echec():
+    """est_echec permet de compter un statut 5xx comme un échec"""
+    disjoncteur = Disjoncteur("Test", seuil=1, est_echec=lambda statut: statut >= 500,
+                              horloge=Horloge())
+    assert disjoncteur.appeler(lambda: 503) == 503
+    assert disjoncteur.etat == OUVERT
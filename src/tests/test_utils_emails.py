@@ -0,0 +1,86 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from utils import emails
+from utils.emails import (
+    BackendBrevo,
+    BackendFichier,
+    BackendMemoire,
+    configurer_backend,
+    construire_backend,
+    envoyer_email,
+    envoyer_emails,
+)
+
+
+@pytest.fixture(autouse=True)
+def backend_neuf():
+    """Chaque test repart de la configuration"""
+    configurer_backend(None)
+    yield
+    configurer_backend(None)
+
+
+def message(i):
+    return {"to_email": f"e{i}@ensai.fr", "subject": "Sujet", "message_text": f"Texte {i}"}
+
+
+def test_backend_selon_configuration(monkeypatch):
+    """EMAIL_BACKEND choisit le backend ; Brevo par défaut"""
+    monkeypatch.delenv("EMAIL_BACKEND", raising=False)
+    assert isinstance(construire_backend(), BackendBrevo)
+    monkeypatch.setenv("EMAIL_BACKEND", "memoire")
+    assert isinstance(emails.backend_email(), BackendMemoire)
+    with pytest.raises(ValueError):
+        construire_backend("pigeon")
+
+
+def test_memoire_collecte_les_messages():
+    """Le backend mémoire garde chaque message et répond comme l'API"""
+    memoire = BackendMemoire()
+    configurer_backend(memoire)
+
+    assert envoyer_email("a@ensai.fr", "Sujet", "Texte") == (201, "memoire")
+    assert envoyer_emails([message(1), message(2)]) == [(201, "memoire")] * 2
+    assert [m["to_email"] for m in memoire.envoyes] == ["a@ensai.fr", "e1@ensai.fr", "e2@ensai.fr"]
+
+
+def test_fichier_ecrit_par_paquets(tmp_path):
+    """Le fichier n'est écrit qu'une fois le tampon plein, puis à la vidange"""
+    chemin = tmp_path / "emails-{pid}.jsonl"
+    fichier = BackendFichier(str(chemin), taille_tampon=3)
+    configurer_backend(fichier)
+
+    envoyer_emails([message(1), message(2)])
+    assert not os.path.exists(fichier.chemin)
+    envoyer_emails([message(3)])
+    assert len(open(fichier.chemin).readlines()) == 3
+
+    envoyer_email("z@ensai.fr", "S", "T")
+    configurer_backend(None)
+
+    lignes = [json.loads(ligne) for ligne in open(fichier.chemin)]
+    assert [l["to_email"] for l in lignes][-1] == "z@ensai.fr"
+    assert len(lignes) == 4
+
+
+@patch("utils.api_brevo.send_emails_brevo", return_value=[(201, "ok")] * 2)
+def test_brevo_delegue_a_l_api(mock_lot):
+    """Le backend Brevo délègue les lots à send_emails_brevo"""
+    configurer_backend(BackendBrevo())
+
+    assert envoyer_emails([message(1), message(2)]) == [(201, "ok")] * 2
+    mock_lot.assert_called_once()
+
+
+@patch("utils.api_brevo.send_emails_brevo", return_value=[(201, "ok")])
+def test_brevo_message_seul_garde_ses_parametres(mock_lot):
+    """Un message seul (diffusion à un inscrit) garde params et to_name"""
+    configurer_backend(BackendBrevo())
+    seul = {**message(1), "to_name": "Léa", "params": {"prenom": "Léa"}}
+
+    assert envoyer_emails([seul]) == [(201, "ok")]
+    mock_lot.assert_called_once_with([seul])
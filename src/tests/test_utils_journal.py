@@ -0,0 +1,90 @@
+import gzip
+import json
+import logging
+import threading
+
+import pytest
+
+from utils.journal import arreter_journal, configurer_journal, journal
+
+
+@pytest.fixture
+def fichier_journal(tmp_path):
+    """Journal configuré dans un dossier temporaire, arrêté après le test"""
+    chemin = tmp_path / "logs" / "app.jsonl"
+    configurer_journal(str(chemin), niveau="DEBUG", console=False)
+    yield chemin
+    arreter_journal()
+
+
+def lignes(chemin):
+    arreter_journal()
+    return [json.loads(ligne) for ligne in chemin.read_text(encoding="utf-8").splitlines()]
+
+
+def test_evenement_ecrit_en_json(fichier_journal):
+    """Une ligne JSON par événement, avec son nom et ses champs"""
+    journal("test").info("dao.evenement.creer", "Événement créé", id_event=3)
+
+    ligne, = lignes(fichier_journal)
+    assert ligne["evenement"] == "dao.evenement.creer"
+    assert ligne["message"] == "Événement créé"
+    assert ligne["niveau"] == "INFO"
+    assert ligne["logger"] == "test"
+    assert ligne["id_event"] == 3
+
+
+def test_exception_gardee_a_part(fichier_journal):
+    """La trace est un champ séparé : le message reste lisible"""
+    try:
+        raise ValueError("boum")
+    except ValueError:
+        journal("test").exception("dao.inscription.creer.echec", "Création impossible")
+
+    ligne, = lignes(fichier_journal)
+    assert ligne["message"] == "Création impossible"
+    assert "ValueError: boum" in ligne["exception"]
+
+
+def test_ecriture_par_le_thread_de_fond(fichier_journal):
+    """Le fichier est écrit par le thread du listener, pas par l'appelant"""
+    threads = []
+    fichier = configurer_journal().handlers[0]
+    emettre = fichier.emit
+
+    def espion(record):
+        threads.append(threading.current_thread())
+        emettre(record)
+
+    fichier.emit = espion
+    journal("test").info("test.file")
+
+    ligne, = lignes(fichier_journal)
+    assert threads and threads[0] is not threading.current_thread()
+    assert ligne["thread"] == threading.current_thread().name
+
+
+def test_niveau_filtre(fichier_journal):
+    """Les événements sous le niveau configuré ne sont pas écrits"""
+    logging.getLogger().setLevel(logging.WARNING)
+    journal("test").info("test.ignore")
+    journal("test").avertissement("test.ecrit")
+
+    assert [ligne["evenement"] for ligne in lignes(fichier_journal)] == ["test.ecrit"]
+
+
+def test_rotation_compresse_les_archives(tmp_path, monkeypatch):
+    """Au-delà de la taille maximale, le journal tourne et l'archive est en gzip"""
+    monkeypatch.setenv("LOG_TAILLE_MAX", "500")
+    monkeypatch.setenv("LOG_ARCHIVES", "2")
+    chemin = tmp_path / "app.jsonl"
+    configurer_journal(str(chemin), console=False)
+    for i in range(20):
+        journal("test").info("test.rotation", "x" * 50, i=i)
+    arreter_journal()
+
+    archive = tmp_path / "app.jsonl.1.gz"
+    assert archive.exists()
+    assert not (tmp_path / "app.jsonl.3.gz").exists()
+    with gzip.open(archive, "rt", encoding="utf-8") as f:
+        assert json.loads(f.readline())["evenement"] == "test.rotation"
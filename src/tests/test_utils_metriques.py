@@ -0,0 +1,86 @@
+import threading
+import urllib.request
+
+import pytest
+
+from utils.metriques import Registre
+
+
+@pytest.fixture
+def registre():
+    return Registre()
+
+
+def test_compteur_multithread_sans_perte(registre):
+    """Huit threads incrémentent sans verrou partagé : aucun incrément perdu"""
+    compteur = registre.compteur("t_total", "Test", ("motif",))
+
+    def incrementer():
+        for _ in range(10_000):
+            compteur.inc(motif="complet")
+
+    threads = [threading.Thread(target=incrementer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    compteur.inc(motif="doublon")
+
+    assert compteur.valeurs() == {("complet",): 80_000, ("doublon",): 1}
+    # Fragments des threads terminés fusionnés : il ne reste que celui du thread courant
+    assert len(compteur._fragments) == 1
+
+
+def test_etiquettes_verifiees(registre):
+    compteur = registre.compteur("t_total", "Test", ("motif",))
+    with pytest.raises(ValueError):
+        compteur.inc(raison="complet")
+
+
+def test_histogramme_exposition_cumulative(registre):
+    """Bornes cumulatives, +Inf, somme et nombre au format Prometheus"""
+    histogramme = registre.histogramme("t_secondes", "Latence", ("requete",), bornes=(0.01, 0.1))
+    for valeur in (0.005, 0.05, 0.01, 3):
+        histogramme.observer(valeur, requete="sql_creer")
+
+    texte = registre.exposer()
+    assert "# TYPE t_secondes histogram" in texte
+    assert 't_secondes_bucket{requete="sql_creer",le="0.01"} 2' in texte
+    assert 't_secondes_bucket{requete="sql_creer",le="0.1"} 3' in texte
+    assert 't_secondes_bucket{requete="sql_creer",le="+Inf"} 4' in texte
+    assert 't_secondes_count{requete="sql_creer"} 4' in texte
+
+
+def test_jauge_suivie_et_echappement(registre):
+    registre.jauge("t_file", "File").suivre(lambda: 12)
+    registre.jauge("t_etat", "Etat", ("nom",)).definir(1, nom='a"b')
+
+    texte = registre.exposer()
+    assert "t_file 12" in texte
+    assert 't_etat{nom="a\\"b"} 1' in texte
+
+
+def test_declaration_idempotente(registre):
+    """Deux modules qui déclarent la même métrique partagent l'objet"""
+    premier = registre.compteur("t_total", "Test", ("cache",))
+    assert registre.compteur("t_total", "Test", ("cache",)) is premier
+    with pytest.raises(ValueError):
+        registre.jauge("t_total", "Test", ("cache",))
+
+
+def test_ecrire_et_servir(registre, tmp_path):
+    registre.compteur("t_total", "Test").inc(3)
+
+    chemin = tmp_path / "metriques.prom"
+    registre.ecrire(str(chemin))
+    assert "t_total 3" in chemin.read_text(encoding="utf-8")
+
+    serveur = registre.servir(0)
+    try:
+        url = f"http://127.0.0.1:{serveur.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as reponse:
+            assert reponse.headers["Content-Type"].startswith("text/plain")
+            assert "t_total 3" in reponse.read().decode("utf-8")
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
@@ -0,0 +1,48 @@
+from unittest.mock import Mock
+
+import pytest
+
+from utils.paresseux import Paresseux
+
+
+def test_objet_construit_au_premier_acces():
+    """La fabrique n'est appelée qu'au premier accès à un attribut"""
+    fabrique = Mock(return_value=Mock(valeur=42))
+    proxy = Paresseux(fabrique)
+
+    fabrique.assert_not_called()
+    assert proxy.valeur == 42
+    assert proxy.valeur == 42
+    fabrique.assert_called_once()
+
+
+def test_affectation_transmise_a_l_objet_reel():
+    """Une affectation sur le proxy modifie l'objet réel"""
+    reel = Mock()
+    proxy = Paresseux(lambda: reel)
+
+    proxy.bus_dao = "dao"
+
+    assert reel.bus_dao == "dao"
+
+
+def test_echec_du_prechauffage_releve_au_premier_acces():
+    """Un échec signalé avant la construction est levé au lieu d'appeler la fabrique"""
+    fabrique = Mock()
+    proxy = Paresseux(fabrique)
+
+    proxy.echouer(ConnectionError("base injoignable"))
+
+    with pytest.raises(ConnectionError, match="base injoignable"):
+        proxy.valeur
+    fabrique.assert_not_called()
+
+
+def test_echec_ignore_si_objet_deja_construit():
+    """Un service déjà construit reste utilisable"""
+    proxy = Paresseux(lambda: Mock(valeur=42))
+    proxy.prechauffer()
+
+    proxy.echouer(ConnectionError("base injoignable"))
+
+    assert proxy.valeur == 42
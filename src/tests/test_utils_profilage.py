@@ -0,0 +1,73 @@
+import pstats
+import time
+
+import pytest
+
+from utils import profilage
+from utils.profilage import Profileur, lire_options
+
+
+def calcul_lent():
+    fin = time.perf_counter() + 0.2
+    while time.perf_counter() < fin:
+        sum(range(1000))
+
+
+def test_lire_options_separe_la_commande_batch():
+    options, reste = lire_options(["--profil", "cprofile", "--profil-memoire", "events", "list", "--format", "csv"])
+    assert options.profil == "cprofile" and options.profil_memoire
+    assert reste == ["events", "list", "--format", "csv"]
+
+
+def test_sans_option_rien_n_est_demarre():
+    options, reste = lire_options(["events", "list"])
+    assert options is None and reste == ["events", "list"]
+    assert profilage.demarrer_profilage(options) is None
+
+
+def test_mode_inconnu(tmp_path):
+    with pytest.raises(ValueError):
+        Profileur("perf", str(tmp_path))
+
+
+def test_cprofile_ecrit_pstats(tmp_path):
+    profileur = Profileur("cprofile", str(tmp_path))
+    profileur.demarrer()
+    calcul_lent()
+    chemin_pstats, chemin_texte = profileur.arreter()
+
+    fonctions = {nom for (_, _, nom) in pstats.Stats(chemin_pstats).stats}
+    assert "calcul_lent" in fonctions
+    assert "calcul_lent" in open(chemin_texte, encoding="utf-8").read()
+
+
+def test_echantillonnage_piles_repliees(tmp_path):
+    """Une ligne par pile "thread;appelant;appelé nombre", racine = nom du thread"""
+    profileur = Profileur("echantillonnage", str(tmp_path), intervalle=0.001)
+    profileur.demarrer()
+    calcul_lent()
+    chemin_folded, chemin_texte = profileur.arreter()
+
+    lignes = open(chemin_folded, encoding="utf-8").read().splitlines()
+    piles = [ligne.rsplit(" ", 1) for ligne in lignes]
+    assert all(nombre.isdigit() for _, nombre in piles)
+    assert any(pile.startswith("MainThread;") and "calcul_lent (test_utils_profilage.py:" in pile
+               for pile, _ in piles)
+    assert "calcul_lent" in open(chemin_texte, encoding="utf-8").read()
+
+
+def test_memoire_bilan_par_etape(tmp_path, monkeypatch):
+    """Chaque repère de menu ouvre une étape ; l'allocation retenue y est attribuée"""
+    profileur = Profileur("echantillonnage", str(tmp_path), memoire=True)
+    monkeypatch.setattr(profilage, "_profileur", profileur)
+    profileur.demarrer()
+    profilage.repere("admin.option5")
+    retenu = [bytearray(1024) for _ in range(2000)]
+    profilage.repere("admin.option6")
+    chemin_memoire = profileur.arreter()[-1]
+
+    rapport = open(chemin_memoire, encoding="utf-8").read()
+    etapes = rapport.split("--- ")
+    assert [e.split(" ", 1)[0] for e in etapes[1:]] == ["debut", "admin.option5", "admin.option6"]
+    assert "test_utils_profilage.py" in etapes[2]
+    assert len(retenu) == 2000
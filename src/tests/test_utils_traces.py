@@ -0,0 +1,134 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import traces
+from utils.traces import ExportateurTraces, Traceur, instrumenter, propager, span
+
+
+class ExportateurMemoire:
+    def __init__(self):
+        self.traces = []
+
+    def exporter(self, spans):
+        self.traces.append(list(spans))
+
+
+@pytest.fixture
+def exportateur(monkeypatch):
+    """Traceur actif (tout est échantillonné) qui garde les traces en mémoire"""
+    exportateur = ExportateurMemoire()
+    monkeypatch.setattr(traces, "_traceur", Traceur(1.0, exportateur))
+    return exportateur
+
+
+def test_span_inactif_sans_traceur():
+    with span("rien") as courant:
+        assert courant is None
+
+
+def test_spans_imbriques(exportateur):
+    """Les enfants partagent la trace de la racine ; la trace est exportée à la fin de la racine"""
+    with span("inscription") as racine:
+        with span("sql_compter_par_evenement"):
+            pass
+        with span("http.post", destinataires=1) as http:
+            http.attributs["statut"] = 201
+        assert exportateur.traces == []
+
+    spans, = exportateur.traces
+    assert [s.nom for s in spans] == ["sql_compter_par_evenement", "http.post", "inscription"]
+    assert {s.trace_id for s in spans} == {racine.trace_id}
+    assert all(s.parent_id == racine.id for s in spans[:2])
+    assert spans[1].attributs == {"destinataires": 1, "statut": 201}
+    assert racine.duree >= spans[0].duree
+
+
+def test_erreur_enregistree(exportateur):
+    with pytest.raises(ValueError):
+        with span("creer"):
+            raise ValueError("complet")
+
+    assert exportateur.traces[0][0].attributs["erreur"] == "ValueError: complet"
+
+
+def test_echantillonnage_ecarte_toute_la_trace(monkeypatch):
+    """Trace non retenue : ni la racine ni ses enfants ne sont créés"""
+    exportateur = ExportateurMemoire()
+    monkeypatch.setattr(traces, "_traceur", Traceur(0.0, exportateur))
+
+    with span("inscription") as racine:
+        with span("sql") as enfant:
+            assert racine is None and enfant is None
+    assert exportateur.traces == []
+
+
+def test_propagation_dans_un_pool(exportateur):
+    """propager() rattache les spans des workers à la trace de l'appelant"""
+    def travail(i):
+        with span(f"paquet{i}"):
+            return i
+
+    with span("envoi") as racine:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            taches = [executor.submit(propager(travail), i) for i in range(3)]
+            assert [t.result() for t in taches] == [0, 1, 2]
+
+    spans, = exportateur.traces
+    assert sorted(s.nom for s in spans if s.parent_id == racine.id) == ["paquet0", "paquet1", "paquet2"]
+
+
+def test_instrumenter_methodes_publiques(exportateur):
+    class ServiceFactice:
+        def creer(self):
+            return self._valider()
+
+        def _valider(self):
+            return True
+
+        @staticmethod
+        def generer_code():
+            return 42
+
+        def parcourir(self):
+            yield from (1, 2)
+
+    instrumenter(ServiceFactice)
+    instrumenter(ServiceFactice)  # idempotent
+    with span("parcours"):
+        assert ServiceFactice().creer() is True
+        assert ServiceFactice.generer_code() == 42
+        # Générateur non enveloppé : un span fermé avant l'itération mesurerait 0 ms
+        assert list(ServiceFactice().parcourir()) == [1, 2]
+
+    spans, = exportateur.traces
+    assert [s.nom for s in spans] == ["ServiceFactice.creer", "ServiceFactice.generer_code", "parcours"]
+
+
+@pytest.mark.parametrize("format", ["jsonl", "chrome"])
+def test_exportateur_fichier(tmp_path, monkeypatch, format):
+    chemin = tmp_path / f"traces.{format}"
+    exportateur = ExportateurTraces(str(chemin), format)
+    monkeypatch.setattr(traces, "_traceur", Traceur(1.0, exportateur))
+
+    with span("inscription", id_event=3):
+        with span("sql_creer_inscription"):
+            pass
+    exportateur.arreter()
+
+    texte = chemin.read_text(encoding="utf-8")
+    if format == "chrome":
+        evenements = json.loads(texte.rstrip().rstrip(",") + "]")
+        assert {e["ph"] for e in evenements} == {"X"}
+        assert evenements[1]["args"]["id_event"] == 3
+    else:
+        evenements = [json.loads(ligne) for ligne in texte.splitlines()]
+        assert evenements[0]["parent_id"] == evenements[1]["span_id"]
+    assert [e.get("nom", e.get("name")) for e in evenements] == ["sql_creer_inscription", "inscription"]
+
+
+def test_activer_sans_taux_ne_fait_rien(monkeypatch):
+    monkeypatch.delenv("TRACE_TAUX", raising=False)
+    assert traces.activer_traces() is None
+    assert traces._traceur is None
@@ -2,7 +2,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 from datetime import datetime
 from business_object.bus import Bus
-from dao.bus_dao import BusDAO
+from dao.bus_dao import BusDAO, lignes_reaffectation
 
 
 class TestBusDAO(unittest.TestCase):
@@ -199,6 +199,18 @@ class TestBusDAO(unittest.TestCase):
         
         self.assertFalse(resultat)
 
+    def test_lignes_reaffectation_vide_le_bus_des_non_places(self):
+        """Test 11: Un passager non placé perd son ancien bus, les autres colonnes restent intactes."""
+        plans = {
+            "ALLER": {"affectation": {1: 10}, "non_places": [2]},
+            "RETOUR": {"affectation": {2: 20}, "non_places": []},
+        }
+
+        self.assertEqual(lignes_reaffectation(plans), [
+            (1, True, 10, False, None),
+            (2, True, None, True, 20),
+        ])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+from dao import db_connection
+from dao.bus_dao import SQL_REAFFECTER
+from dao.db_connection import curseur_mesure, nom_requete
+
+
+def test_nom_requete_constante_sql():
+    assert nom_requete(SQL_REAFFECTER) == "sql_reaffecter"
+
+
+def test_nom_requete_texte_execute_values_non_cache():
+    """Les bytes d'execute_values (données incluses) sont décodés et jamais mis en cache"""
+    avant = len(db_connection._noms_construits)
+    sql = b"UPDATE inscription i SET id_bus_aller = v.aller FROM (VALUES (1, 2)) AS v(code, aller)"
+
+    assert nom_requete(sql) == "sql_update_inscription"
+    assert len(db_connection._noms_construits) == avant
+
+
+def test_curseur_mesure_nom_du_lot():
+    """Pendant executer_lot, la mesure porte le nom du gabarit"""
+    class CurseurFactice:
+        def execute(self, query, vars=None):
+            return query
+
+    curseur = curseur_mesure(CurseurFactice)()
+    curseur.nom_lot = "sql_reaffecter"
+    curseur.execute(b"UPDATE inscription ...")
+
+    assert db_connection.DUREE_REQUETES.valeurs().get(("sql_reaffecter",)) is not None
@@ -617,4 +617,61 @@ def test_modifier_statut_exception(mock_db, mock_connection):
     resultat = dao.modifier_statut(5, "complet")
 
     # Assert
-    assert resultat is False
\ No newline at end of file
+    assert resultat is False
+
+# ============================================================
+# TESTS COMPTEURS D'INSCRITS
+# ============================================================
+
+@patch('dao.evenement_dao.DBConnection')
+def test_verifier_compteurs_sans_correction(mock_db):
+    """Les écarts sont rapportés sans verrou ni mise à jour."""
+    # Arrange
+    cursor = MagicMock()
+    mock_db.return_value.transaction.return_value.__enter__.return_value = cursor
+    cursor.fetchall.return_value = [
+        {"table_compteur": "evenement", "id": 1, "nb_inscrits": 3, "attendu": 2}
+    ]
+
+    # Act
+    ecarts = EvenementDAO().verifier_compteurs()
+
+    # Assert
+    assert ecarts == [{"table_compteur": "evenement", "id": 1, "nb_inscrits": 3, "attendu": 2}]
+    cursor.execute.assert_called_once()
+    assert "HAVING e.nb_inscrits <> COUNT(i.code_reservation)" in cursor.execute.call_args[0][0]
+
+
+@patch('dao.evenement_dao.DBConnection')
+def test_verifier_compteurs_avec_correction(mock_db):
+    """La correction verrouille les inscriptions puis recalcule les compteurs."""
+    # Arrange
+    cursor = MagicMock()
+    mock_db.return_value.transaction.return_value.__enter__.return_value = cursor
+    cursor.fetchall.return_value = [{"table_compteur": "bus", "id": 2, "nb_inscrits": 0, "attendu": 1}]
+
+    # Act
+    EvenementDAO().verifier_compteurs(corriger=True)
+
+    # Assert
+    requetes = [appel[0][0] for appel in cursor.execute.call_args_list]
+    assert "LOCK TABLE inscription" in requetes[0]
+    assert "SET nb_inscrits" in requetes[-1]
+
+
+@patch('dao.evenement_dao.DBConnection')
+def test_destinataires_une_seule_jointure(mock_db, mock_connection):
+    """Les adresses des inscrits sont lues en une requête."""
+    # Arrange
+    connection, cursor = mock_connection
+    mock_db.return_value.connection = connection
+    cursor.fetchall.return_value = [{"email": "a@ensai.fr", "nom": "A", "prenom": "Alice"}]
+
+    # Act
+    destinataires = EvenementDAO().destinataires(3)
+
+    # Assert
+    assert destinataires == [{"email": "a@ensai.fr", "nom": "A", "prenom": "Alice"}]
+    cursor.execute.assert_called_once()
+    assert "JOIN utilisateur" in cursor.execute.call_args[0][0]
+    assert cursor.execute.call_args[0][1] == {"id_event": 3}
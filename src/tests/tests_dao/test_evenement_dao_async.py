@@ -0,0 +1,85 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from business_object.evenement import Evenement
+from dao.evenement_dao import SQL_LISTER_EVENEMENTS, sql_get_by_evenement
+from dao.evenement_dao_async import EvenementDAOAsync
+
+
+@pytest.fixture
+def mock_connexion():
+    """Fixture simulant une connexion psycopg 3 empruntée au pool asynchrone."""
+    connection = MagicMock()
+    cursor = MagicMock()
+    cursor.fetchone = AsyncMock()
+    cursor.fetchall = AsyncMock()
+    connection.execute = AsyncMock(return_value=cursor)
+
+    @asynccontextmanager
+    async def connexion():
+        yield connection
+
+    db = MagicMock()
+    db.connexion = connexion
+    with patch("dao.evenement_dao_async.DBConnectionAsync", return_value=db):
+        yield connection, cursor
+
+
+@pytest.fixture
+def ligne_evenement():
+    return {
+        "id_event": 1,
+        "titre": "Concert de Jazz",
+        "description_event": "Soirée jazz",
+        "lieu": "Salle Pleyel",
+        "date_event": date(2025, 6, 15),
+        "capacite_max": 200,
+        "created_by": 1,
+        "created_at": datetime(2024, 1, 10, 14, 30, 0),
+        "tarif": 25.50,
+        "statut": "en_cours",
+    }
+
+
+def test_get_by_meme_requete_que_dao_sync(mock_connexion, ligne_evenement):
+    connection, cursor = mock_connexion
+    cursor.fetchall.return_value = [ligne_evenement]
+
+    resultat = asyncio.run(EvenementDAOAsync().get_by("id_event", 1))
+
+    connection.execute.assert_awaited_once_with(sql_get_by_evenement("id_event"), {"value": 1})
+    assert len(resultat) == 1
+    assert isinstance(resultat[0], Evenement)
+    assert resultat[0].titre == "Concert de Jazz"
+
+
+def test_get_by_colonne_non_autorisee(mock_connexion):
+    with pytest.raises(ValueError):
+        asyncio.run(EvenementDAOAsync().get_by("titre; DROP TABLE evenement", 1))
+
+
+def test_lister_tous(mock_connexion, ligne_evenement):
+    connection, cursor = mock_connexion
+    cursor.fetchall.return_value = [ligne_evenement, {**ligne_evenement, "id_event": 2}]
+
+    resultat = asyncio.run(EvenementDAOAsync().lister_tous())
+
+    connection.execute.assert_awaited_once_with(SQL_LISTER_EVENEMENTS)
+    assert [evt.id_event for evt in resultat] == [1, 2]
+
+
+def test_creer_renseigne_id(mock_connexion):
+    _, cursor = mock_connexion
+    cursor.fetchone.return_value = {"id_event": 42}
+    evenement = Evenement(
+        id_event=None, titre="Gala", description_event="", lieu="Rennes",
+        date_event=date(2025, 6, 15), capacite_max=100, created_by=1,
+        created_at=datetime(2024, 1, 10), tarif=10.0, statut="en_cours",
+    )
+
+    assert asyncio.run(EvenementDAOAsync().creer(evenement)) is True
+    assert evenement.id_event == 42
@@ -1,7 +1,7 @@
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 from datetime import datetime
-from dao.inscription_dao import InscriptionDAO
+from dao.inscription_dao import SQL_CREER_GROUPE, SQL_CREER_INSCRIPTION, SQL_CREER_MULTIPLES, InscriptionDAO
 from business_object.inscription import Inscription
 
 
@@ -383,6 +383,193 @@ class TestInscriptionDAO(unittest.TestCase):
         # Assert
         self.assertFalse(resultat)
 
+    def test_supprimer_et_promouvoir_meme_transaction(self):
+        """Test 19: Suppression et promotion dans la même transaction"""
+        # Arrange
+        inscription = Inscription(
+            code_reservation=12345678, boit=True, mode_paiement="en ligne",
+            id_event=3, nom_event="Test", id_bus_aller=1, id_bus_retour=2, created_by=1
+        )
+        self.mock_cursor.fetchone.return_value = {"id_event": 3}
+        promus = [{"code_reservation": 87654321, "email": "a@ensai.fr"}]
+
+        # Act
+        with patch('dao.inscription_dao.DBConnection') as mock_db, \
+                patch('dao.inscription_dao.ListeAttenteDAO.promouvoir', return_value=promus) as promouvoir:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            resultat = self.dao.supprimer_et_promouvoir(inscription)
+
+        # Assert
+        self.assertEqual(resultat, promus)
+        self.assertIn("DELETE FROM inscription", self.mock_cursor.execute.call_args[0][0])
+        promouvoir.assert_called_once_with(self.mock_cursor, 3)
+
+    def test_supprimer_et_promouvoir_inexistante(self):
+        """Test 20: Rien n'est promu si aucune inscription n'est supprimée"""
+        inscription = Inscription(
+            code_reservation=12345678, boit=True, mode_paiement="en ligne",
+            id_event=3, nom_event="Test", id_bus_aller=1, id_bus_retour=2, created_by=1
+        )
+        self.mock_cursor.fetchone.return_value = None
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db, \
+                patch('dao.inscription_dao.ListeAttenteDAO.promouvoir') as promouvoir:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            resultat = self.dao.supprimer_et_promouvoir(inscription)
+
+        self.assertIsNone(resultat)
+        promouvoir.assert_not_called()
+
+    def _transaction_groupe(self, membres_trouves):
+        """Curseur de transaction rejouant : événement, bus, membres, insertion"""
+        self.mock_cursor.fetchone.return_value = {"titre": "Gala", "statut": "en_cours", "places": 10}
+        self.mock_cursor.fetchall.side_effect = [
+            [{"id_bus": 1, "id_event": 3, "sens": "ALLER", "places": 5},
+             {"id_bus": 2, "id_event": 3, "sens": "RETOUR", "places": 5}],
+            membres_trouves,
+            [{"code_reservation": 11111111, "created_by": 1, "boit": False, "mode_paiement": "espece",
+              "id_event": 3, "id_bus_aller": 1, "id_bus_retour": 2, "created_at": None},
+             {"code_reservation": 22222222, "created_by": 2, "boit": True, "mode_paiement": "espece",
+              "id_event": 3, "id_bus_aller": 1, "id_bus_retour": 2, "created_at": None}],
+        ]
+
+    def test_creer_groupe_insertion_multi_lignes(self):
+        """Test 21: Le groupe est validé en une requête et inséré en une seule requête"""
+        self._transaction_groupe([
+            {"id_utilisateur": 1, "email": "a@ensai.fr", "nom": "A", "prenom": "a", "deja_inscrit": False},
+            {"id_utilisateur": 2, "email": "b@ensai.fr", "nom": "B", "prenom": "b", "deja_inscrit": False},
+        ])
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            lignes = self.dao.creer_groupe(3, 1, 2, [
+                {"created_by": 1, "mode_paiement": "espece"},
+                {"email": "b@ensai.fr", "boit": True, "mode_paiement": "espece"},
+            ])
+
+        self.assertEqual([l["email"] for l in lignes], ["a@ensai.fr", "b@ensai.fr"])
+        self.assertEqual(lignes[0]["nom_event"], "Gala")
+        requetes = [c[0][0] for c in self.mock_cursor.execute.call_args_list]
+        self.assertEqual(len(requetes), 4)
+        self.assertIn("unnest", requetes[3])
+        self.assertEqual(self.mock_cursor.execute.call_args[0][1]["created_by"], [1, 2])
+
+    def test_creations_quittent_la_liste_d_attente(self):
+        """Test 21 bis: Toute création d'inscription retire l'utilisateur de la liste d'attente"""
+        for requete in (SQL_CREER_INSCRIPTION, SQL_CREER_GROUPE, SQL_CREER_MULTIPLES):
+            self.assertIn("DELETE FROM liste_attente l", requete)
+            self.assertIn("l.id_event = c.id_event AND l.created_by = c.created_by", requete)
+
+    def test_creer_groupe_membre_deja_inscrit(self):
+        """Test 22: Un membre déjà inscrit fait refuser tout le groupe, sans insertion"""
+        self._transaction_groupe([
+            {"id_utilisateur": 1, "email": "a@ensai.fr", "nom": "A", "prenom": "a", "deja_inscrit": True},
+        ])
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            lignes = self.dao.creer_groupe(3, 1, 2, [{"created_by": 1}])
+
+        self.assertIsNone(lignes)
+        self.assertEqual(self.mock_cursor.execute.call_count, 3)
+
+    def test_creer_groupe_places_insuffisantes(self):
+        """Test 23: Pas assez de places dans l'événement : aucun membre n'est lu"""
+        self.mock_cursor.fetchone.return_value = {"titre": "Gala", "statut": "en_cours", "places": 1}
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            lignes = self.dao.creer_groupe(3, None, None, [{"created_by": 1}, {"created_by": 2}])
+
+        self.assertIsNone(lignes)
+        self.mock_cursor.execute.assert_called_once()
+
+    def test_creer_groupe_evenement_passe(self):
+        """Test 23 bis: Un événement passé refuse le groupe, comme creer_multiples"""
+        self.mock_cursor.fetchone.return_value = {"titre": "Gala", "statut": "passe", "places": 10}
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            lignes = self.dao.creer_groupe(3, None, None, [{"created_by": 1}])
+
+        self.assertIsNone(lignes)
+        self.mock_cursor.execute.assert_called_once()
+
+    def test_transferer_une_seule_requete(self):
+        """Test 24: Le transfert est une seule requête UPDATE conditionnée au titulaire"""
+        self.mock_cursor.fetchone.return_value = {"code_reservation": 12345678, "created_by": 2}
+        self.mock_connection.cursor.return_value.__enter__.return_value = self.mock_cursor
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.connection.__enter__.return_value = self.mock_connection
+            resultat = self.dao.transferer(12345678, 1, "b@ensai.fr")
+
+        self.assertEqual(resultat["created_by"], 2)
+        requete, parametres = self.mock_cursor.execute.call_args[0]
+        self.assertIn("UPDATE inscription", requete)
+        self.assertIn("NOT EXISTS", requete)
+        self.assertEqual(parametres, {"code_reservation": 12345678, "cedant": 1, "email": "b@ensai.fr"})
+        self.mock_cursor.execute.assert_called_once()
+
+    def test_transferer_refuse(self):
+        """Test 25: Aucune ligne modifiée : transfert refusé"""
+        self.mock_cursor.fetchone.return_value = None
+        self.mock_connection.cursor.return_value.__enter__.return_value = self.mock_cursor
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.connection.__enter__.return_value = self.mock_connection
+            self.assertIsNone(self.dao.transferer(12345678, 1, "b@ensai.fr"))
+
+    def _transaction_multiples(self, places_event_2=5):
+        """Curseur de transaction rejouant : utilisateur, événements, bus, insertion"""
+        self.mock_cursor.fetchone.return_value = {"id_utilisateur": 1, "email": "a@ensai.fr",
+                                                  "nom": "A", "prenom": "a"}
+        self.mock_cursor.fetchall.side_effect = [
+            [{"id_event": 1, "titre": "Soirée", "statut": "en_cours", "places": 5, "deja_inscrit": False},
+             {"id_event": 2, "titre": "Brunch", "statut": "en_cours", "places": places_event_2,
+              "deja_inscrit": False}],
+            [{"id_bus": 10, "id_event": 1, "sens": "ALLER", "places": 5}],
+            [{"code_reservation": 11111111, "created_by": 1, "boit": False, "mode_paiement": "espece",
+              "id_event": 1, "id_bus_aller": 10, "id_bus_retour": None, "created_at": None}],
+        ]
+
+    def test_creer_multiples_tout_ou_rien(self):
+        """Test 26: Un choix impossible : rien n'est inséré en mode tout ou rien"""
+        self._transaction_multiples(places_event_2=0)
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            resultat = self.dao.creer_multiples(1, [(1, 10, None), (2, None, None)], False, "espece")
+
+        self.assertEqual(resultat["inscriptions"], [])
+        self.assertEqual(resultat["refus"], [{"id_event": 2, "motif": "événement complet"}])
+        # utilisateur, événements (une requête), bus (une requête) : pas d'insertion
+        self.assertEqual(self.mock_cursor.execute.call_count, 3)
+
+    def test_creer_multiples_au_mieux(self):
+        """Test 27: En mode au mieux, les choix possibles sont insérés en une requête"""
+        self._transaction_multiples(places_event_2=0)
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            resultat = self.dao.creer_multiples(1, [(1, 10, None), (2, None, None)], False, "espece",
+                                                tout_ou_rien=False)
+
+        self.assertEqual([l["nom_event"] for l in resultat["inscriptions"]], ["Soirée"])
+        self.assertEqual(len(resultat["refus"]), 1)
+        parametres = self.mock_cursor.execute.call_args[0][1]
+        self.assertEqual((parametres["id_event"], parametres["id_bus_aller"]), ([1], [10]))
+
+    def test_creer_multiples_bus_d_un_autre_evenement(self):
+        """Test 28: Un bus qui n'appartient pas à l'événement choisi est refusé"""
+        self._transaction_multiples()
+
+        with patch('dao.inscription_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            resultat = self.dao.creer_multiples(1, [(2, 10, None)], False, "espece")
+
+        self.assertEqual(resultat["refus"], [{"id_event": 2, "motif": "bus aller 10 invalide"}])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
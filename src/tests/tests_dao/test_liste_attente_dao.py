@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from business_object.attente import Attente
+from dao.liste_attente_dao import SQL_PROMOUVOIR, ListeAttenteDAO
+
+
+class TestListeAttenteDAO(unittest.TestCase):
+    """Tests unitaires pour ListeAttenteDAO"""
+
+    def setUp(self):
+        self.dao = ListeAttenteDAO()
+        self.mock_cursor = MagicMock()
+
+    def test_promouvoir_sans_place_libre(self):
+        """Test 1: Aucune promotion si l'événement est toujours complet"""
+        self.mock_cursor.fetchone.return_value = {"places": 0}
+
+        resultat = ListeAttenteDAO.promouvoir(self.mock_cursor, 1)
+
+        self.assertEqual(resultat, [])
+        self.mock_cursor.execute.assert_called_once()
+        self.assertIn("FOR UPDATE", self.mock_cursor.execute.call_args[0][0])
+
+    def test_promouvoir_autant_que_de_places(self):
+        """Test 2: Promotion FIFO limitée au nombre de places libres"""
+        self.mock_cursor.fetchone.return_value = {"places": 2}
+        self.mock_cursor.fetchall.return_value = [{"code_reservation": 11111111},
+                                                   {"code_reservation": 22222222}]
+
+        resultat = ListeAttenteDAO.promouvoir(self.mock_cursor, 7)
+
+        self.assertEqual(len(resultat), 2)
+        requete, parametres = self.mock_cursor.execute.call_args[0]
+        self.assertEqual(requete, SQL_PROMOUVOIR)
+        self.assertIn("ORDER BY created_at, id_attente", requete)
+        self.assertEqual(parametres, {"id_event": 7, "places": 2})
+
+    def test_promouvoir_ignore_les_deja_inscrits(self):
+        """Test 2 bis: Les attentes d'utilisateurs déjà inscrits sont écartées et supprimées"""
+        self.assertIn("perimes AS (\n        DELETE FROM liste_attente", SQL_PROMOUVOIR)
+        self.assertEqual(SQL_PROMOUVOIR.count("SELECT 1 FROM inscription j"), 2)
+        self.assertIn("AND NOT EXISTS", SQL_PROMOUVOIR)
+
+    def test_ajouter_deja_en_attente(self):
+        """Test 3: Un doublon (ON CONFLICT) renvoie None sans promotion"""
+        self.mock_cursor.fetchone.return_value = None
+        attente = Attente(id_event=1, created_by=2, mode_paiement="espece")
+
+        with patch('dao.liste_attente_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            resultat = self.dao.ajouter(attente)
+
+        self.assertIsNone(resultat)
+        self.assertIn("INSERT INTO liste_attente", self.mock_cursor.execute.call_args[0][0])
+
+    def test_ajouter_succes(self):
+        """Test 4: L'ajout renseigne l'identifiant et tente une promotion"""
+        self.mock_cursor.fetchone.side_effect = [{"id_attente": 5, "created_at": None}, {"places": 0}]
+        attente = Attente(id_event=1, created_by=2, mode_paiement="espece")
+
+        with patch('dao.liste_attente_dao.DBConnection') as mock_db:
+            mock_db.return_value.transaction.return_value.__enter__.return_value = self.mock_cursor
+            resultat = self.dao.ajouter(attente)
+
+        self.assertEqual(resultat, [])
+        self.assertEqual(attente.id_attente, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
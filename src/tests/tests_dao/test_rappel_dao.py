@@ -0,0 +1,47 @@
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from dao.rappel_dao import RappelDAO
+
+
+@patch("dao.rappel_dao.DBConnection")
+def test_parcourir_a_envoyer_curseur_serveur_par_paquets(mock_db):
+    """La requête unique est lue sur un curseur nommé, paquet par paquet"""
+    # Arrange
+    cursor = MagicMock()
+    mock_db.return_value.transaction.return_value.__enter__.return_value = cursor
+    serveur = cursor.connection.cursor.return_value.__enter__.return_value
+    serveur.fetchmany.side_effect = [[{"code_reservation": 1}, {"code_reservation": 2}],
+                                     [{"code_reservation": 3}], []]
+
+    # Act
+    paquets = list(RappelDAO().parcourir_a_envoyer(date(2026, 11, 20), "veille", taille_paquet=2))
+
+    # Assert
+    assert [[l["code_reservation"] for l in p] for p in paquets] == [[1, 2], [3]]
+    cursor.connection.cursor.assert_called_once_with(name="rappels")
+    serveur.execute.assert_called_once()
+    requete, parametres = serveur.execute.call_args[0]
+    assert "NOT EXISTS" in requete and "LEFT JOIN bus ba" in requete
+    assert parametres == {"jour": date(2026, 11, 20), "type_rappel": "veille"}
+
+
+@patch("dao.rappel_dao.DBConnection")
+def test_marquer_envoyes_une_requete(mock_db):
+    """Le journal est alimenté en un seul INSERT, doublons ignorés"""
+    # Arrange
+    connection = MagicMock()
+    connection.__enter__.return_value = connection
+    cursor = connection.cursor.return_value.__enter__.return_value
+    cursor.rowcount = 3
+    mock_db.return_value.connection = connection
+
+    # Act
+    resultat = RappelDAO().marquer_envoyes([1, 2, 3], "veille")
+
+    # Assert
+    assert resultat == 3
+    requete, parametres = cursor.execute.call_args[0]
+    assert "ON CONFLICT DO NOTHING" in requete
+    assert parametres == {"codes": [1, 2, 3], "type_rappel": "veille"}
+    assert RappelDAO().marquer_envoyes([], "veille") == 0
@@ -1,27 +1,255 @@
-import requests
+"""
+Envoi d'e-mails transactionnels par l'API Brevo.
+
+`send_email_brevo` envoie un e-mail ; `send_emails_brevo` envoie un lot en
+regroupant les destinataires dans des requêtes `messageVersions` (une version par
+destinataire, avec son sujet, son texte et ses paramètres). Les requêtes passent
+par une session HTTP partagée (connexions keep-alive) et les paquets partent en
+parallèle, sous une limite de requêtes par seconde.
+
+Variables d'environnement :
+    TOKEN_BREVO, EMAIL_BREVO   clé d'API et adresse d'expéditeur
+    BREVO_URL                  point d'entrée (faux serveur local pour les tests de charge)
+    BREVO_DEBIT                requêtes par seconde au maximum, pour tout le processus (10 par défaut)
+    BREVO_CONCURRENCE          requêtes simultanées au maximum (4 par défaut)
+    BREVO_TIMEOUT_CONNEXION    délai d'établissement de la connexion (s, 3 par défaut)
+    BREVO_TIMEOUT_LECTURE      délai d'attente de la réponse (s, 10 par défaut)
+    BREVO_SEUIL_ECHECS         échecs consécutifs qui ouvrent le circuit (5 par défaut)
+    BREVO_DELAI_REOUVERTURE    durée d'ouverture du circuit avant un essai (s, 30 par défaut)
+
+Toutes les requêtes passent par un disjoncteur : après une série d'échecs (erreur
+réseau, délai dépassé, statut 5xx ou 429), les envois échouent immédiatement au
+lieu de bloquer les inscriptions, jusqu'à ce qu'un appel d'essai réussisse.
+"""
+import json
 import os
-from dotenv import load_dotenv
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.disjoncteur import Disjoncteur
+from utils.traces import propager, span
+
+URL_BREVO = "https://api.brevo.com/v3/smtp/email"
+
+# Limites de l'API : 1 000 versions par requête, corps de requête plafonné
+VERSIONS_PAR_REQUETE = 1000
+OCTETS_PAR_REQUETE = 4 * 1024 * 1024
+
+_session = None
+_verrou_session = threading.Lock()
+_limiteur = None
+
+
+def _echec_http(resultat) -> bool:
+    """Un statut 5xx ou 429 compte comme un échec du service."""
+    return resultat.status_code >= 500 or resultat.status_code == 429
+
+
+disjoncteur_brevo = Disjoncteur(
+    "Brevo",
+    seuil=int(os.environ.get("BREVO_SEUIL_ECHECS", 5)),
+    delai=float(os.environ.get("BREVO_DELAI_REOUVERTURE", 30)),
+    est_echec=_echec_http,
+)
+
+
+def url_brevo() -> str:
+    return os.environ.get("BREVO_URL", URL_BREVO)
+
+
+def timeouts_brevo() -> tuple:
+    """(connexion, lecture) en secondes, pour requests."""
+    return (float(os.environ.get("BREVO_TIMEOUT_CONNEXION", 3)),
+            float(os.environ.get("BREVO_TIMEOUT_LECTURE", 10)))
+
+
+def poster(data: dict):
+    """
+    POST vers l'API, borné par les délais et protégé par le disjoncteur.
+
+    raise: CircuitOuvert si le circuit est ouvert, ou l'erreur de requests
+    """
+    with span("http.post", url=url_brevo(),
+              destinataires=len(data.get("messageVersions", [])) or 1) as courant:
+        response = disjoncteur_brevo.appeler(
+            session_brevo().post, url_brevo(), json=data, timeout=timeouts_brevo())
+        if courant is not None:
+            courant.attributs["statut"] = response.status_code
+        return response
+
+
+def session_brevo():
+    """Session HTTP partagée : en-têtes construits une fois, connexions réutilisées."""
+    global _session
+    if _session is None:
+        with _verrou_session:
+            if _session is None:
+                # Import différé : requests n'est chargé qu'au premier envoi d'e-mail
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                taille = max(int(os.environ.get("BREVO_CONCURRENCE", 4)), 1)
+                adaptateur = HTTPAdapter(pool_connections=1, pool_maxsize=taille)
+                session.mount("http://", adaptateur)
+                session.mount("https://", adaptateur)
+                session.headers.update({
+                    "accept": "application/json",
+                    "api-key": os.environ["TOKEN_BREVO"],
+                    "content-type": "application/json",
+                })
+                _session = session
+    return _session
+
+
+def _expediteur() -> dict:
+    return {"name": "BDE Ensai", "email": os.environ["EMAIL_BREVO"]}
 
 
 def send_email_brevo(to_email, subject, message_text):
-    url = "https://api.brevo.com/v3/smtp/email"
-    headers = {
-        "accept": "application/json",
-        "api-key": os.environ["TOKEN_BREVO"],
-        "content-type": "application/json"
-    }
     data = {
-        "sender": {"name": "BDE Ensai", "email": os.environ["EMAIL_BREVO"]},
+        "sender": _expediteur(),
         "to": [{"email": to_email, "name": "Destinataire"}],
         "subject": subject,
         "textContent": message_text
     }
 
-    response = requests.post(url, headers=headers, json=data)
+    limiteur_brevo().attendre()
+    response = poster(data)
     return response.status_code, response.text
 
 
+class LimiteurDebit:
+    """Seau à jetons partagé entre threads : au plus `debit` requêtes par seconde."""
+
+    def __init__(self, debit: float, rafale: int = 1):
+        self.intervalle = 1 / debit if debit > 0 else 0
+        self.rafale = max(rafale, 1)
+        self._jetons = float(self.rafale)
+        self._dernier = time.monotonic()
+        self._verrou = threading.Lock()
+
+    def attendre(self):
+        """Bloque jusqu'à ce qu'une requête puisse partir."""
+        if not self.intervalle:
+            return
+        with self._verrou:
+            maintenant = time.monotonic()
+            self._jetons = min(self.rafale,
+                               self._jetons + (maintenant - self._dernier) / self.intervalle)
+            self._dernier = maintenant
+            self._jetons -= 1
+            attente = -self._jetons * self.intervalle
+        if attente > 0:
+            time.sleep(attente)
+
+
+def limiteur_brevo() -> LimiteurDebit:
+    """
+    Limiteur partagé par tout le processus (BREVO_DEBIT requêtes par seconde) :
+    notifications, diffusions et rappels puisent dans le même budget.
+    """
+    global _limiteur
+    if _limiteur is None:
+        with _verrou_session:
+            if _limiteur is None:
+                _limiteur = LimiteurDebit(float(os.environ.get("BREVO_DEBIT", 10)),
+                                          rafale=int(os.environ.get("BREVO_CONCURRENCE", 4)))
+    return _limiteur
+
+
+def version_message(message: dict) -> dict:
+    """Version personnalisée d'un message : destinataire, sujet, texte, paramètres."""
+    version = {
+        "to": [{"email": message["to_email"], "name": message.get("to_name", "Destinataire")}],
+        "subject": message["subject"],
+        "textContent": message["message_text"],
+    }
+    if message.get("params"):
+        version["params"] = message["params"]
+    return version
+
+
+def decouper_lots(messages: list, versions_max: int = VERSIONS_PAR_REQUETE,
+                  octets_max: int = OCTETS_PAR_REQUETE) -> list[list[int]]:
+    """
+    Répartit les messages en paquets respectant les limites d'une requête.
+
+    return: pour chaque paquet, les indices des messages qu'il contient
+    """
+    paquets, courant, taille = [], [], 0
+    for indice, message in enumerate(messages):
+        octets = len(json.dumps(version_message(message), ensure_ascii=False).encode())
+        if courant and (len(courant) >= versions_max or taille + octets > octets_max):
+            paquets.append(courant)
+            courant, taille = [], 0
+        courant.append(indice)
+        taille += octets
+    if courant:
+        paquets.append(courant)
+    return paquets
+
+
+def corps_lot(messages: list) -> dict:
+    """Corps d'une requête messageVersions ; le premier message sert de modèle de base."""
+    premier = messages[0]
+    return {
+        "sender": _expediteur(),
+        "subject": premier["subject"],
+        "textContent": premier["message_text"],
+        "messageVersions": [version_message(message) for message in messages],
+    }
+
+
+def send_emails_brevo(messages, versions_max: int = VERSIONS_PAR_REQUETE,
+                      concurrence: int = None, debit: float = None):
+    """
+    Envoie un lot d'e-mails en un minimum de requêtes.
+
+    messages: liste de dicts {"to_email", "subject", "message_text"}, avec en option
+              "to_name" et "params" (paramètres de personnalisation Brevo)
+    versions_max: nombre maximal de destinataires par requête
+    concurrence: requêtes simultanées (BREVO_CONCURRENCE par défaut)
+    debit: requêtes par seconde au maximum pour ce seul lot ; par défaut, le
+           limiteur partagé du processus (limiteur_brevo)
+
+    return: liste de (statut, réponse) dans l'ordre des messages ; chaque message
+            reçoit le résultat de la requête qui l'a transporté
+    """
+    if not messages:
+        return []
+    if concurrence is None:
+        concurrence = int(os.environ.get("BREVO_CONCURRENCE", 4))
+
+    paquets = decouper_lots(messages, versions_max)
+    limiteur = limiteur_brevo() if debit is None else LimiteurDebit(debit, rafale=concurrence)
+    resultats = [None] * len(messages)
+
+    def envoyer(paquet):
+        try:
+            limiteur.attendre()
+            response = poster(corps_lot([messages[i] for i in paquet]))
+            resultat = (response.status_code, response.text)
+        except Exception as e:
+            resultat = (None, str(e))
+        for indice in paquet:
+            resultats[indice] = resultat
+
+    if len(paquets) == 1 or concurrence <= 1:
+        for paquet in paquets:
+            envoyer(paquet)
+    else:
+        with ThreadPoolExecutor(max_workers=min(concurrence, len(paquets))) as executeur:
+            # Chaque paquet part dans la trace de l'appelant
+            envois = [executeur.submit(propager(envoyer), paquet) for paquet in paquets]
+            for envoi in envois:
+                envoi.result()
+    return resultats
+
+
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+
     load_dotenv()
 
     # Exemple d’utilisation
@@ -32,4 +260,4 @@ if __name__ == "__main__":
     )
 
     print("Statut :", status)
-    print("Réponse :", response)
\ No newline at end of file
+    print("Réponse :", response)
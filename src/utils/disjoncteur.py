@@ -0,0 +1,148 @@
+"""
+Disjoncteur (circuit breaker) pour les appels à un service externe.
+
+    fermé       les appels passent ; `seuil` échecs consécutifs ouvrent le circuit
+    ouvert      les appels échouent immédiatement (CircuitOuvert) pendant `delai`
+    demi-ouvert après `delai`, un seul appel d'essai passe : un succès referme
+                le circuit, un échec le rouvre pour `delai`
+
+Le disjoncteur tient aussi des métriques : appels, échecs, rejets, latences et
+temps passé ouvert.
+"""
+import threading
+import time
+from collections import deque
+from utils.journal import journal
+
+log = journal(__name__)
+
+FERME = "ferme"
+OUVERT = "ouvert"
+DEMI_OUVERT = "demi_ouvert"
+
+
+class CircuitOuvert(Exception):
+    """Appel refusé sans être tenté : le service est considéré indisponible."""
+
+
+class Disjoncteur:
+    """Compte les échecs consécutifs d'un service et coupe les appels au-delà du seuil."""
+
+    def __init__(self, nom: str, seuil: int = 5, delai: float = 30.0,
+                 est_echec=None, horloge=time.monotonic, taille_historique: int = 1000):
+        """
+        nom: nom du service (messages et métriques)
+        seuil: échecs consécutifs qui ouvrent le circuit
+        delai: durée (s) d'ouverture avant un appel d'essai
+        est_echec: fonction résultat -> bool pour les échecs sans exception
+                   (par exemple un statut HTTP 5xx)
+        horloge: source de temps monotone (remplaçable dans les tests)
+        """
+        self.nom = nom
+        self.seuil = seuil
+        self.delai = delai
+        self.est_echec = est_echec or (lambda resultat: False)
+        self.horloge = horloge
+        self._verrou = threading.Lock()
+        self._etat = FERME
+        self._echecs_consecutifs = 0
+        self._ouvert_depuis = None
+        self._essai_en_cours = False
+        self._latences = deque(maxlen=taille_historique)
+        self._compteurs = {"appels": 0, "succes": 0, "echecs": 0, "rejets": 0, "ouvertures": 0}
+        self._temps_ouvert = 0.0
+
+    @property
+    def etat(self) -> str:
+        with self._verrou:
+            return self._etat
+
+    def appeler(self, fonction, *args, **kwargs):
+        """
+        Exécute fonction(*args, **kwargs) si le circuit le permet.
+
+        raise: CircuitOuvert si l'appel est refusé ; sinon l'exception de la fonction
+        """
+        with self._verrou:
+            essai = self._autoriser()
+        debut = self.horloge()
+        try:
+            resultat = fonction(*args, **kwargs)
+        except Exception:
+            self._enregistrer(False, self.horloge() - debut, essai)
+            raise
+        self._enregistrer(not self.est_echec(resultat), self.horloge() - debut, essai)
+        return resultat
+
+    def _autoriser(self) -> bool:
+        """
+        Laisse passer l'appel ou lève CircuitOuvert.
+
+        return: True si l'appel est l'essai de la demi-ouverture
+        """
+        if self._etat == OUVERT:
+            if self.horloge() - self._ouvert_depuis < self.delai:
+                self._compteurs["rejets"] += 1
+                raise CircuitOuvert(f"{self.nom} indisponible (circuit ouvert)")
+            self._etat = DEMI_OUVERT
+        if self._etat == DEMI_OUVERT:
+            # Un seul appel d'essai à la fois ; les autres échouent immédiatement
+            if self._essai_en_cours:
+                self._compteurs["rejets"] += 1
+                raise CircuitOuvert(f"{self.nom} indisponible (essai en cours)")
+            self._essai_en_cours = True
+        self._compteurs["appels"] += 1
+        return self._etat == DEMI_OUVERT
+
+    def _enregistrer(self, succes: bool, latence: float, essai: bool):
+        """
+        Comptabilise un appel terminé. Seul l'essai (essai=True) fait sortir de la
+        demi-ouverture : un appel lancé circuit fermé et terminé après l'ouverture
+        est compté sans changer l'état.
+        """
+        with self._verrou:
+            self._latences.append(latence)
+            if essai:
+                self._essai_en_cours = False
+            if succes:
+                self._compteurs["succes"] += 1
+                self._echecs_consecutifs = 0
+                if essai:
+                    self._temps_ouvert += self.horloge() - self._ouvert_depuis
+                    self._etat, self._ouvert_depuis = FERME, None
+                    log.info("disjoncteur.fermeture", f"{self.nom} : circuit refermé", nom=self.nom)
+                return
+
+            self._compteurs["echecs"] += 1
+            self._echecs_consecutifs += 1
+            if essai:
+                # Essai raté : nouvelle période d'ouverture, le temps ouvert continue de courir
+                self._etat = OUVERT
+                self._temps_ouvert += self.horloge() - self._ouvert_depuis
+                self._ouvert_depuis = self.horloge()
+            elif self._etat == FERME and self._echecs_consecutifs >= self.seuil:
+                self._etat, self._ouvert_depuis = OUVERT, self.horloge()
+                self._compteurs["ouvertures"] += 1
+                log.avertissement("disjoncteur.ouverture", f"{self.nom} : circuit ouvert",
+                                  nom=self.nom, echecs=self._echecs_consecutifs)
+
+    def metriques(self) -> dict:
+        """Compteurs, latences (s) et temps passé ouvert (s) depuis la création."""
+        with self._verrou:
+            etat, compteurs = self._etat, dict(self._compteurs)
+            latences = sorted(self._latences)
+            temps_ouvert = self._temps_ouvert
+            if self._ouvert_depuis is not None:
+                temps_ouvert += self.horloge() - self._ouvert_depuis
+
+        def centile(p):
+            return latences[min(len(latences) - 1, int(p / 100 * len(latences)))] if latences else 0.0
+
+        return {
+            "etat": etat,
+            **compteurs,
+            "latence_p50": centile(50),
+            "latence_p99": centile(99),
+            "latence_max": latences[-1] if latences else 0.0,
+            "temps_ouvert": temps_ouvert,
+        }
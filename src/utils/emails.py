@@ -0,0 +1,155 @@
+"""
+Backends d'envoi d'e-mails, choisis par configuration.
+
+Les services n'appellent jamais Brevo directement : ils passent par
+`envoyer_email` / `envoyer_emails`, qui délèguent au backend actif.
+
+    EMAIL_BACKEND=brevo     API Brevo (par défaut)
+    EMAIL_BACKEND=memoire   messages gardés en mémoire (tests, benchmarks en threads)
+    EMAIL_BACKEND=fichier   messages écrits en JSON Lines dans EMAIL_FICHIER
+                            (emails.jsonl par défaut ; "{pid}" dans le chemin donne
+                            un fichier par processus), par paquets de EMAIL_TAMPON lignes
+
+Tous les backends respectent le contrat de `send_emails_brevo` : une liste de
+(statut, réponse) dans l'ordre des messages.
+"""
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+
+class BackendEmail:
+    """Interface d'un backend : envoi d'un lot de messages {to_email, subject, message_text}."""
+
+    nom = "abstrait"
+
+    def envoyer(self, messages: list) -> list[tuple]:
+        raise NotImplementedError
+
+    def vider(self):
+        """Termine les écritures en attente (backends tamponnés)."""
+
+
+class BackendBrevo(BackendEmail):
+    """Envoi réel par l'API Brevo (utils/api_brevo.py)."""
+
+    nom = "brevo"
+
+    def envoyer(self, messages: list) -> list[tuple]:
+        # Import différé : requests n'est chargé qu'au premier envoi d'e-mail
+        from utils.api_brevo import send_emails_brevo
+
+        # Même un message seul passe par messageVersions : "params" et "to_name" sont
+        # transmis, et un échec est rendu comme (None, erreur) au lieu d'être levé
+        return send_emails_brevo(messages)
+
+
+class BackendMemoire(BackendEmail):
+    """Conserve les messages envoyés dans `envoyes`, pour les vérifier ensuite."""
+
+    nom = "memoire"
+
+    def __init__(self):
+        self.envoyes = []
+        self._verrou = threading.Lock()
+
+    def envoyer(self, messages: list) -> list[tuple]:
+        with self._verrou:
+            self.envoyes.extend(messages)
+        return [(201, "memoire")] * len(messages)
+
+
+class BackendFichier(BackendEmail):
+    """Écrit les messages en JSON Lines, par paquets pour limiter les écritures disque."""
+
+    nom = "fichier"
+
+    def __init__(self, chemin: str, taille_tampon: int = 500):
+        self.chemin = chemin.format(pid=os.getpid())
+        self.taille_tampon = taille_tampon
+        self._tampon = []
+        self._verrou = threading.Lock()
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+
+    def envoyer(self, messages: list) -> list[tuple]:
+        horodatage = datetime.now().isoformat(timespec="milliseconds")
+        lignes = [json.dumps({"date": horodatage, **message}, ensure_ascii=False, default=str)
+                  for message in messages]
+        with self._verrou:
+            self._tampon.extend(lignes)
+            if len(self._tampon) >= self.taille_tampon:
+                self._ecrire()
+        return [(201, "fichier")] * len(messages)
+
+    def vider(self):
+        with self._verrou:
+            self._ecrire()
+
+    def _ecrire(self):
+        if not self._tampon:
+            return
+        with open(self.chemin, "a", encoding="utf-8") as f:
+            f.write("\n".join(self._tampon) + "\n")
+        self._tampon = []
+
+
+# Backend actif, construit au premier envoi d'après EMAIL_BACKEND
+_backend: Optional[BackendEmail] = None
+_verrou_backend = threading.Lock()
+
+
+def construire_backend(nom: str = None) -> BackendEmail:
+    """Construit le backend nommé (EMAIL_BACKEND par défaut)."""
+    nom = (nom or os.environ.get("EMAIL_BACKEND", "brevo")).lower()
+    if nom == "brevo":
+        return BackendBrevo()
+    if nom == "memoire":
+        return BackendMemoire()
+    if nom == "fichier":
+        return BackendFichier(os.environ.get("EMAIL_FICHIER", "emails.jsonl"),
+                              int(os.environ.get("EMAIL_TAMPON", 500)))
+    raise ValueError(f"Backend d'e-mails inconnu : '{nom}'")
+
+
+def backend_email() -> BackendEmail:
+    """Backend actif (construit d'après la configuration au premier appel)."""
+    global _backend
+    if _backend is None:
+        with _verrou_backend:
+            if _backend is None:
+                _backend = construire_backend()
+                atexit.register(_backend.vider)
+    return _backend
+
+
+def configurer_backend(backend: Optional[BackendEmail]) -> Optional[BackendEmail]:
+    """
+    Remplace le backend actif (None : retour à la configuration).
+
+    return: le backend précédent, vidé de ses écritures en attente
+    """
+    global _backend
+    with _verrou_backend:
+        precedent, _backend = _backend, backend
+    if precedent is not None:
+        precedent.vider()
+    if backend is not None:
+        atexit.register(backend.vider)
+    return precedent
+
+
+def envoyer_emails(messages: list) -> list[tuple]:
+    """Envoie un lot de messages par le backend actif ; retourne un (statut, réponse) par message."""
+    if not messages:
+        return []
+    return backend_email().envoyer(messages)
+
+
+def envoyer_email(to_email: str, subject: str, message_text: str) -> tuple:
+    """Envoie un seul message par le backend actif ; retourne (statut, réponse)."""
+    return envoyer_emails([{"to_email": to_email, "subject": subject, "message_text": message_text}])[0]
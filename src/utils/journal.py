@@ -0,0 +1,205 @@
+"""
+Journalisation structurée (JSON Lines), sans écriture disque sur les chemins chauds.
+
+Les modules écrivent des événements nommés :
+
+    log = journal(__name__)
+    log.erreur("dao.inscription.creer.echec", "Création de l'inscription impossible", erreur=e)
+
+Noms d'événements : "<couche>.<objet>.<action>[.<issue>]", par exemple
+"dao.evenement.supprimer.echec", "email.envoi.echec", "disjoncteur.ouverture".
+
+`configurer_journal()` (appelé par les points d'entrée) place un QueueHandler sur
+le logger racine : un appel de journalisation se limite à poser l'enregistrement
+dans une file. Un QueueListener, sur son propre thread, écrit chaque
+enregistrement en JSON dans un fichier tournant par taille (archives compressées
+en gzip) et affiche les avertissements et erreurs sur stderr.
+
+Sans configuration (tests, scripts), les avertissements et erreurs restent
+visibles sur stderr grâce au gestionnaire de dernier recours de logging.
+
+Variables d'environnement :
+    LOG_FICHIER     fichier du journal (logs/application.jsonl par défaut)
+    LOG_NIVEAU      niveau minimal écrit dans le fichier (INFO par défaut)
+    LOG_TAILLE_MAX  taille (octets) déclenchant la rotation (10 Mo par défaut)
+    LOG_ARCHIVES    nombre d'archives compressées conservées (5 par défaut)
+"""
+import atexit
+import copy
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+# Attributs standard d'un LogRecord, exclus des champs métier
+_ATTRIBUTS_RECORD = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class FormatJSON(logging.Formatter):
+    """Un enregistrement par ligne : horodatage, niveau, logger, événement, message et champs."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        donnees = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "niveau": record.levelname,
+            "logger": record.name,
+            "evenement": getattr(record, "evenement", None),
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        donnees.update(getattr(record, "champs", {}))
+        for cle, valeur in vars(record).items():
+            if cle not in _ATTRIBUTS_RECORD and cle not in ("evenement", "champs"):
+                donnees[cle] = valeur
+        if record.exc_info:
+            donnees["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            donnees["exception"] = record.exc_text
+        return json.dumps(donnees, ensure_ascii=False, default=str)
+
+
+class FormatConsole(logging.Formatter):
+    """Message lisible pour stderr : message, puis nom de l'événement et champs."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        champs = " ".join(f"{cle}={valeur}" for cle, valeur in getattr(record, "champs", {}).items())
+        evenement = getattr(record, "evenement", None)
+        suffixe = " ".join(filter(None, [evenement, champs]))
+        return f"{record.getMessage()}" + (f" [{suffixe}]" if suffixe else "")
+
+
+class FileJournal(QueueHandler):
+    """
+    QueueHandler qui garde l'enregistrement structuré : le message est rendu et la
+    trace d'exception mise en texte (les objets traceback ne traversent pas la file),
+    mais l'événement et les champs restent séparés pour le format JSON.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class FichierTournantCompresse(RotatingFileHandler):
+    """RotatingFileHandler dont les archives sont compressées (journal.jsonl.1.gz, ...)."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.namer = lambda nom: nom + ".gz"
+        self.rotator = self._compresser
+
+    @staticmethod
+    def _compresser(source: str, destination: str):
+        with open(source, "rb") as entree, gzip.open(destination, "wb") as sortie:
+            shutil.copyfileobj(entree, sortie)
+        os.remove(source)
+
+
+class Journal:
+    """Logger d'événements nommés avec champs structurés."""
+
+    def __init__(self, nom: str):
+        self.logger = logging.getLogger(nom)
+
+    def _ecrire(self, niveau: int, evenement: str, message: str, champs: dict, exc_info=False):
+        if self.logger.isEnabledFor(niveau):
+            self.logger.log(niveau, message or evenement, exc_info=exc_info,
+                            extra={"evenement": evenement, "champs": champs})
+
+    def debug(self, evenement: str, message: str = "", **champs):
+        self._ecrire(logging.DEBUG, evenement, message, champs)
+
+    def info(self, evenement: str, message: str = "", **champs):
+        self._ecrire(logging.INFO, evenement, message, champs)
+
+    def avertissement(self, evenement: str, message: str = "", **champs):
+        self._ecrire(logging.WARNING, evenement, message, champs)
+
+    def erreur(self, evenement: str, message: str = "", **champs):
+        self._ecrire(logging.ERROR, evenement, message, champs)
+
+    def exception(self, evenement: str, message: str = "", **champs):
+        """Erreur avec la trace de l'exception en cours."""
+        self._ecrire(logging.ERROR, evenement, message, champs, exc_info=True)
+
+
+def journal(nom: str) -> Journal:
+    return Journal(nom)
+
+
+# Listener actif, None tant qu'un point d'entrée n'a pas configuré la journalisation
+_listener: Optional[QueueListener] = None
+_niveau_precedent = logging.WARNING
+
+
+def configurer_journal(chemin: str = None, niveau: str = None, console: bool = True) -> QueueListener:
+    """
+    Branche le logger racine sur une file traitée par un thread d'écriture.
+
+    chemin: fichier JSON Lines (LOG_FICHIER par défaut)
+    niveau: niveau minimal (LOG_NIVEAU par défaut)
+    console: affiche aussi avertissements et erreurs sur stderr
+
+    return: le QueueListener démarré (arrêté et vidé à la sortie du programme)
+    """
+    global _listener, _niveau_precedent
+    if _listener is not None:
+        return _listener
+
+    chemin = chemin or os.environ.get("LOG_FICHIER", os.path.join("logs", "application.jsonl"))
+    dossier = os.path.dirname(chemin)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+
+    fichier = FichierTournantCompresse(
+        chemin,
+        maxBytes=int(os.environ.get("LOG_TAILLE_MAX", 10 * 1024 * 1024)),
+        backupCount=int(os.environ.get("LOG_ARCHIVES", 5)),
+        encoding="utf-8",
+    )
+    fichier.setFormatter(FormatJSON())
+    gestionnaires = [fichier]
+    if console:
+        sortie = logging.StreamHandler()
+        sortie.setLevel(logging.WARNING)
+        sortie.setFormatter(FormatConsole())
+        gestionnaires.append(sortie)
+
+    file = queue.SimpleQueue()
+    racine = logging.getLogger()
+    _niveau_precedent = racine.level
+    racine.setLevel((niveau or os.environ.get("LOG_NIVEAU", "INFO")).upper())
+    for gestionnaire in list(racine.handlers):
+        racine.removeHandler(gestionnaire)
+    racine.addHandler(FileJournal(file))
+
+    _listener = QueueListener(file, *gestionnaires, respect_handler_level=True)
+    _listener.start()
+    atexit.register(arreter_journal)
+    return _listener
+
+
+def arreter_journal():
+    """Vide la file, arrête le thread d'écriture et rend le logger racine à sa configuration."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for gestionnaire in _listener.handlers:
+        gestionnaire.close()
+    racine = logging.getLogger()
+    for gestionnaire in list(racine.handlers):
+        if isinstance(gestionnaire, QueueHandler):
+            racine.removeHandler(gestionnaire)
+    racine.setLevel(_niveau_precedent)
+    _listener = None
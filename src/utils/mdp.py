@@ -1,15 +1,34 @@
 "Gère le hachage et la vérification des mots de passe"
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError, VerificationError, InvalidHash
+import time
+from threading import Lock
+from utils.metriques import histogramme
 
-# Initialisation du hasher Argon2
-ph = PasswordHasher(
-    time_cost=3,       # nombre d’itérations
-    memory_cost=65536, # mémoire utilisée (en KB) → 64 Mo
-    parallelism=4,     # nombre de threads
-    hash_len=32,       # longueur du hash généré
-    salt_len=16        # taille du sel aléatoire
-)
+# Argon2 coûte ~50-100 ms par appel : bornes adaptées
+DUREE_ARGON2 = histogramme("bde_argon2_secondes", "Durée des opérations Argon2", ("operation",),
+                           bornes=(0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0, 2.5))
+
+# Le hasher Argon2 (et le module argon2) n'est chargé qu'au premier hachage :
+# le démarrage du CLI n'a pas à payer cet import tant que personne ne se connecte.
+_ph = None
+_verrou = Lock()
+
+
+def _hasher():
+    """Retourne le hasher Argon2, créé au premier appel."""
+    global _ph
+    if _ph is None:
+        with _verrou:
+            if _ph is None:
+                from argon2 import PasswordHasher
+
+                _ph = PasswordHasher(
+                    time_cost=3,       # nombre d’itérations
+                    memory_cost=65536, # mémoire utilisée (en KB) → 64 Mo
+                    parallelism=4,     # nombre de threads
+                    hash_len=32,       # longueur du hash généré
+                    salt_len=16        # taille du sel aléatoire
+                )
+    return _ph
 
 
 def hash_password(plain_password: str) -> str:
@@ -17,7 +36,12 @@ def hash_password(plain_password: str) -> str:
     Hache un mot de passe en utilisant Argon2.
     Retourne une chaîne sécurisée pour le stockage en BDD.
     """
-    return ph.hash(plain_password)
+    hasher = _hasher()
+    debut = time.perf_counter()
+    try:
+        return hasher.hash(plain_password)
+    finally:
+        DUREE_ARGON2.observer(time.perf_counter() - debut, operation="hachage")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -25,7 +49,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Vérifie si le mot de passe correspond au hash stocké.
     Retourne True si valide, False sinon.
     """
+    from argon2.exceptions import VerifyMismatchError, VerificationError, InvalidHash
+
+    hasher = _hasher()
+    debut = time.perf_counter()
     try:
-        return ph.verify(hashed_password, plain_password)
+        return hasher.verify(hashed_password, plain_password)
     except (VerifyMismatchError, VerificationError, InvalidHash):
         return False
+    finally:
+        DUREE_ARGON2.observer(time.perf_counter() - debut, operation="verification")
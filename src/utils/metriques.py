@@ -0,0 +1,302 @@
+"""
+Métriques de l'application (compteurs, jauges, histogrammes) au format texte Prometheus.
+
+Les modules déclarent leurs métriques au chargement :
+
+    INSCRIPTIONS_REFUSEES = compteur("bde_inscriptions_refusees_total",
+                                     "Inscriptions refusées", ("motif",))
+    INSCRIPTIONS_REFUSEES.inc(motif="complet")
+
+Les mises à jour ne prennent aucun verrou : chaque thread écrit dans son propre
+fragment (un dict par thread et par métrique), que la lecture additionne. Seule la
+création du fragment, une fois par thread, est verrouillée. Les fragments des
+threads terminés sont fusionnés à la lecture suivante.
+
+`exposer_metriques()` (appelé par les points d'entrée) publie le registre :
+    METRIQUES_PORT        sert /metrics sur 127.0.0.1:<port>
+    METRIQUES_FICHIER     écrit le texte dans ce fichier toutes les
+                          METRIQUES_INTERVALLE secondes (10 par défaut) et à la sortie
+"""
+import atexit
+import os
+import threading
+from bisect import bisect_left
+from typing import Callable, Optional
+
+# Bornes par défaut des histogrammes de latence, en secondes
+BORNES_LATENCE = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def _echapper(valeur: str) -> str:
+    return valeur.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _nombre(valeur: float) -> str:
+    if valeur == float("inf"):
+        return "+Inf"
+    return repr(float(valeur)) if isinstance(valeur, float) else str(valeur)
+
+
+class Metrique:
+    """Base commune : nom, aide, étiquettes et fragments par thread."""
+
+    type = "untyped"
+
+    def __init__(self, nom: str, aide: str, etiquettes: tuple = ()):
+        self.nom = nom
+        self.aide = aide
+        self.etiquettes = tuple(etiquettes)
+        self._local = threading.local()
+        self._verrou = threading.Lock()
+        self._fragments = []  # (thread, valeurs)
+        self._base = {}       # valeurs des threads terminés
+
+    def _cle(self, etiquettes: dict) -> tuple:
+        if set(etiquettes) != set(self.etiquettes):
+            raise ValueError(f"{self.nom} attend les étiquettes {self.etiquettes}")
+        return tuple(str(etiquettes[nom]) for nom in self.etiquettes)
+
+    def _fragment(self) -> dict:
+        try:
+            return self._local.valeurs
+        except AttributeError:
+            valeurs = {}
+            with self._verrou:
+                self._fragments.append((threading.current_thread(), valeurs))
+            self._local.valeurs = valeurs
+            return valeurs
+
+    def _fusionner(self, cible: dict, valeurs: dict):
+        raise NotImplementedError
+
+    def valeurs(self) -> dict:
+        """Valeurs agrégées par combinaison d'étiquettes."""
+        with self._verrou:
+            vivants = []
+            for thread, valeurs in self._fragments:
+                if thread.is_alive():
+                    vivants.append((thread, valeurs))
+                else:
+                    self._fusionner(self._base, valeurs)
+            self._fragments = vivants
+            total = {}
+            self._fusionner(total, self._base)
+            for _, valeurs in vivants:
+                # Copie en une opération : le thread propriétaire peut écrire en même temps
+                self._fusionner(total, dict(valeurs))
+        return total
+
+    def _libelle(self, cle: tuple, supplement: dict = None) -> str:
+        paires = list(zip(self.etiquettes, cle)) + list((supplement or {}).items())
+        if not paires:
+            return ""
+        return "{" + ",".join(f'{nom}="{_echapper(str(v))}"' for nom, v in paires) + "}"
+
+    def lignes(self) -> list[str]:
+        return [f"# HELP {self.nom} {self.aide}", f"# TYPE {self.nom} {self.type}"]
+
+
+class Compteur(Metrique):
+    """Valeur qui ne fait que croître (inscriptions créées, connexions...)."""
+
+    type = "counter"
+
+    def inc(self, valeur: float = 1, **etiquettes):
+        valeurs = self._fragment()
+        cle = self._cle(etiquettes)
+        valeurs[cle] = valeurs.get(cle, 0) + valeur
+
+    def _fusionner(self, cible: dict, valeurs: dict):
+        for cle, valeur in valeurs.items():
+            cible[cle] = cible.get(cle, 0) + valeur
+
+    def lignes(self) -> list[str]:
+        return super().lignes() + [
+            f"{self.nom}{self._libelle(cle)} {_nombre(valeur)}"
+            for cle, valeur in sorted(self.valeurs().items())
+        ]
+
+
+class Jauge(Metrique):
+    """
+    Valeur instantanée, fixée par definir() ou lue à chaque exposition sur une
+    fonction (suivre()), par exemple la taille d'une file.
+    """
+
+    type = "gauge"
+
+    def __init__(self, nom: str, aide: str, etiquettes: tuple = ()):
+        super().__init__(nom, aide, etiquettes)
+        self._valeurs = {}
+        self._fonction: Optional[Callable[[], float]] = None
+
+    def definir(self, valeur: float, **etiquettes):
+        cle = self._cle(etiquettes)
+        with self._verrou:
+            self._valeurs[cle] = valeur
+
+    def suivre(self, fonction: Callable[[], float]):
+        """Lit la valeur sur `fonction` à chaque exposition (jauge sans étiquette)."""
+        self._fonction = fonction
+
+    def valeurs(self) -> dict:
+        if self._fonction is not None:
+            return {(): self._fonction()}
+        with self._verrou:
+            return dict(self._valeurs)
+
+    def lignes(self) -> list[str]:
+        return super().lignes() + [
+            f"{self.nom}{self._libelle(cle)} {_nombre(valeur)}"
+            for cle, valeur in sorted(self.valeurs().items())
+        ]
+
+
+class Histogramme(Metrique):
+    """Répartition d'observations (latences) par bornes, avec somme et nombre."""
+
+    type = "histogram"
+
+    def __init__(self, nom: str, aide: str, etiquettes: tuple = (), bornes: tuple = BORNES_LATENCE):
+        super().__init__(nom, aide, etiquettes)
+        self.bornes = tuple(sorted(bornes))
+
+    def observer(self, valeur: float, **etiquettes):
+        valeurs = self._fragment()
+        cle = self._cle(etiquettes)
+        cellule = valeurs.get(cle)
+        if cellule is None:
+            # Un compteur par borne, +Inf, puis somme et nombre d'observations
+            cellule = valeurs[cle] = [0] * (len(self.bornes) + 3)
+        cellule[bisect_left(self.bornes, valeur)] += 1
+        cellule[-2] += valeur
+        cellule[-1] += 1
+
+    def _fusionner(self, cible: dict, valeurs: dict):
+        for cle, cellule in valeurs.items():
+            total = cible.setdefault(cle, [0] * (len(self.bornes) + 3))
+            for i, valeur in enumerate(list(cellule)):
+                total[i] += valeur
+
+    def lignes(self) -> list[str]:
+        lignes = super().lignes()
+        for cle, cellule in sorted(self.valeurs().items()):
+            cumul = 0
+            for borne, nombre in zip(self.bornes + (float("inf"),), cellule):
+                cumul += nombre
+                le = {"le": _nombre(float(borne))}
+                lignes.append(f"{self.nom}_bucket{self._libelle(cle, le)} {cumul}")
+            lignes.append(f"{self.nom}_sum{self._libelle(cle)} {_nombre(cellule[-2])}")
+            lignes.append(f"{self.nom}_count{self._libelle(cle)} {cellule[-1]}")
+        return lignes
+
+
+class Registre:
+    """Ensemble des métriques déclarées, exposées ensemble."""
+
+    def __init__(self):
+        self._metriques = {}
+        self._verrou = threading.Lock()
+
+    def _declarer(self, classe, nom: str, aide: str, etiquettes: tuple, **options):
+        with self._verrou:
+            metrique = self._metriques.get(nom)
+            if metrique is None:
+                metrique = self._metriques[nom] = classe(nom, aide, etiquettes, **options)
+            elif type(metrique) is not classe or metrique.etiquettes != tuple(etiquettes):
+                raise ValueError(f"Métrique '{nom}' déjà déclarée autrement")
+            return metrique
+
+    def compteur(self, nom: str, aide: str, etiquettes: tuple = ()) -> Compteur:
+        return self._declarer(Compteur, nom, aide, etiquettes)
+
+    def jauge(self, nom: str, aide: str, etiquettes: tuple = ()) -> Jauge:
+        return self._declarer(Jauge, nom, aide, etiquettes)
+
+    def histogramme(self, nom: str, aide: str, etiquettes: tuple = (),
+                    bornes: tuple = BORNES_LATENCE) -> Histogramme:
+        return self._declarer(Histogramme, nom, aide, etiquettes, bornes=bornes)
+
+    def metrique(self, nom: str) -> Optional[Metrique]:
+        return self._metriques.get(nom)
+
+    def exposer(self) -> str:
+        """Texte au format d'exposition Prometheus (version 0.0.4)."""
+        with self._verrou:
+            metriques = sorted(self._metriques.values(), key=lambda m: m.nom)
+        return "".join(ligne + "\n" for metrique in metriques for ligne in metrique.lignes())
+
+    def ecrire(self, chemin: str):
+        """Écrit l'exposition dans un fichier (remplacement atomique)."""
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        temporaire = f"{chemin}.tmp"
+        with open(temporaire, "w", encoding="utf-8") as f:
+            f.write(self.exposer())
+        os.replace(temporaire, chemin)
+
+    def servir(self, port: int, hote: str = "127.0.0.1"):
+        """
+        Sert l'exposition sur http://hote:port/metrics depuis un thread de fond.
+
+        return: le ThreadingHTTPServer démarré
+        """
+        # Import différé : http.server n'est chargé que si les métriques sont servies
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registre = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                corps = registre.exposer().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, *args):
+                pass
+
+        serveur = ThreadingHTTPServer((hote, port), Gestionnaire)
+        serveur.daemon_threads = True
+        threading.Thread(target=serveur.serve_forever, name="metriques", daemon=True).start()
+        return serveur
+
+
+REGISTRE = Registre()
+compteur = REGISTRE.compteur
+jauge = REGISTRE.jauge
+histogramme = REGISTRE.histogramme
+
+# Vrai dès qu'un point d'entrée a publié les métriques
+_expose = False
+
+
+def exposer_metriques(port: int = None, chemin: str = None, intervalle: float = None):
+    """
+    Publie le registre d'après la configuration (METRIQUES_PORT, METRIQUES_FICHIER).
+    Sans configuration, les métriques sont tenues mais pas publiées.
+
+    return: le serveur HTTP des métriques, None s'il n'est pas demandé
+    """
+    global _expose
+    if _expose:
+        return None
+    _expose = True
+    port = port or int(os.environ.get("METRIQUES_PORT", 0))
+    chemin = chemin or os.environ.get("METRIQUES_FICHIER")
+    if chemin:
+        intervalle = intervalle or float(os.environ.get("METRIQUES_INTERVALLE", 10))
+        arret = threading.Event()
+
+        def ecrire_periodiquement():
+            while not arret.wait(intervalle):
+                REGISTRE.ecrire(chemin)
+
+        threading.Thread(target=ecrire_periodiquement, name="metriques-fichier", daemon=True).start()
+        # atexit appelle en ordre inverse : arrêt du thread puis dernière écriture
+        atexit.register(REGISTRE.ecrire, chemin)
+        atexit.register(arret.set)
+    return REGISTRE.servir(port) if port else None
@@ -0,0 +1,45 @@
+from threading import Lock
+
+
+class Paresseux:
+    """
+    Proxy qui ne construit l'objet réel qu'au premier accès à l'un de ses attributs.
+
+    Utilisé au démarrage du CLI : les services (et donc psycopg2, argon2...) ne sont
+    importés et instanciés que lorsqu'on en a besoin, ou en tâche de fond par
+    `prechauffer()`.
+    """
+
+    def __init__(self, fabrique):
+        """
+        fabrique: fonction sans argument qui construit l'objet réel
+        """
+        object.__setattr__(self, "_fabrique", fabrique)
+        object.__setattr__(self, "_objet", None)
+        object.__setattr__(self, "_verrou", Lock())
+        object.__setattr__(self, "_echec", None)
+
+    def prechauffer(self):
+        """Construit l'objet réel s'il ne l'est pas encore et le retourne."""
+        if self._objet is None:
+            with self._verrou:
+                if self._echec is not None:
+                    raise self._echec
+                if self._objet is None:
+                    object.__setattr__(self, "_objet", self._fabrique())
+        return self._objet
+
+    def echouer(self, erreur: Exception):
+        """
+        Signale un échec du préchauffage : si l'objet n'est pas encore construit,
+        le premier accès lève `erreur` au lieu d'appeler la fabrique.
+        """
+        with self._verrou:
+            if self._objet is None:
+                object.__setattr__(self, "_echec", erreur)
+
+    def __getattr__(self, nom):
+        return getattr(self.prechauffer(), nom)
+
+    def __setattr__(self, nom, valeur):
+        setattr(self.prechauffer(), nom, valeur)
@@ -0,0 +1,235 @@
+"""
+Mode profilage du CLI, sans modifier le code profilé.
+
+    python src/main.py --profil cprofile                       session interactive
+    python src/main.py --profil echantillonnage events list    commande batch
+    python src/main.py --profil cprofile --profil-memoire      + allocations (tracemalloc)
+
+Modes :
+    cprofile         profil déterministe du thread principal : <nom>.pstats (snakeviz,
+                     python -m pstats) et <nom>.txt (fonctions par temps cumulé)
+    echantillonnage  relevé périodique des piles de tous les threads, sans instrumenter
+                     les appels : <nom>.folded (piles repliées pour flamegraph.pl ou
+                     speedscope) et <nom>.txt (fonctions par échantillons)
+
+Avec --profil-memoire, un instantané tracemalloc est pris à chaque frontière de menu
+(repere()) : <nom>-memoire.txt liste les plus grosses allocations en fin de session
+et ce que chaque étape (option de menu) a alloué sans le libérer.
+
+Le module est importé à chaque démarrage (main.py, menus) : argparse, cProfile,
+pstats et tracemalloc ne sont chargés qu'en mode profilage.
+"""
+import io
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+MODES = ("cprofile", "echantillonnage")
+
+
+class EchantillonneurPile:
+    """Relève la pile de chaque thread toutes les `intervalle` secondes."""
+
+    def __init__(self, intervalle: float = 0.005):
+        self.intervalle = intervalle
+        self.piles = Counter()
+        self.echantillons = 0
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._relever, name="echantillonneur", daemon=True)
+
+    def demarrer(self):
+        self._thread.start()
+
+    def arreter(self):
+        self._arret.set()
+        self._thread.join()
+
+    def _relever(self):
+        moi = threading.get_ident()
+        while not self._arret.wait(self.intervalle):
+            noms = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, cadre in sys._current_frames().items():
+                if ident == moi:
+                    continue
+                pile = []
+                while cadre is not None:
+                    code = cadre.f_code
+                    pile.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    cadre = cadre.f_back
+                pile.append(noms.get(ident, str(ident)))
+                self.piles[tuple(reversed(pile))] += 1
+            self.echantillons += 1
+
+    def replier(self) -> str:
+        """Piles repliées : "thread;appelant;appelé nombre", une pile par ligne."""
+        return "".join(f"{';'.join(pile)} {nombre}\n" for pile, nombre in self.piles.most_common())
+
+    def resume(self, nb: int = 30) -> str:
+        """Fonctions par échantillons propres (en haut de pile) et inclusifs."""
+        propres, inclusifs = Counter(), Counter()
+        for pile, nombre in self.piles.items():
+            propres[pile[-1]] += nombre
+            for cadre in set(pile[1:]):
+                inclusifs[cadre] += nombre
+        total = sum(self.piles.values()) or 1
+        lignes = [f"{self.echantillons} relevés, intervalle {self.intervalle * 1000:g} ms", "",
+                  "Temps propre (haut de pile) :"]
+        lignes += [f"{100 * n / total:6.2f} %  {cadre}" for cadre, n in propres.most_common(nb)]
+        lignes += ["", "Temps inclusif :"]
+        lignes += [f"{100 * n / total:6.2f} %  {cadre}" for cadre, n in inclusifs.most_common(nb)]
+        return "\n".join(lignes) + "\n"
+
+
+class Profileur:
+    """Profil d'une session (cProfile ou échantillonnage), avec instantanés mémoire optionnels."""
+
+    def __init__(self, mode: str = "cprofile", dossier: str = "profils", memoire: bool = False,
+                 intervalle: float = 0.005, nb_top: int = 30):
+        if mode not in MODES:
+            raise ValueError(f"Mode de profilage inconnu : '{mode}' ({', '.join(MODES)})")
+        self.mode = mode
+        self.dossier = dossier
+        self.memoire = memoire
+        self.nb_top = nb_top
+        self.nom = f"profil-{datetime.now():%Y%m%d-%H%M%S}"
+        if mode == "cprofile":
+            import cProfile
+
+            self._profil = cProfile.Profile()
+        else:
+            self._profil = None
+        self._echantillonneur = EchantillonneurPile(intervalle) if mode == "echantillonnage" else None
+        self._instantanes = []
+
+    def demarrer(self):
+        if self.memoire:
+            import tracemalloc
+
+            tracemalloc.start()
+            self.repere("debut")
+        if self._profil is not None:
+            self._profil.enable()
+        else:
+            self._echantillonneur.demarrer()
+
+    def repere(self, nom: str):
+        """Instantané mémoire à une frontière (entrée dans une option de menu)."""
+        if not self.memoire:
+            return
+        import tracemalloc
+
+        if tracemalloc.is_tracing():
+            self._instantanes.append((nom, time.perf_counter(), tracemalloc.take_snapshot()))
+
+    def arreter(self) -> list[str]:
+        """Arrête le profilage et écrit les rapports ; retourne les fichiers écrits."""
+        if self.memoire:
+            import tracemalloc
+
+            # Dernier instantané avant l'écriture des rapports, qui alloue elle aussi
+            self.repere("fin")
+            tracemalloc.stop()
+        os.makedirs(self.dossier, exist_ok=True)
+        base = os.path.join(self.dossier, self.nom)
+        ecrits = []
+        if self._profil is not None:
+            import pstats
+
+            self._profil.disable()
+            self._profil.dump_stats(base + ".pstats")
+            texte = io.StringIO()
+            pstats.Stats(self._profil, stream=texte).sort_stats("cumulative").print_stats(self.nb_top)
+            self._ecrire(base + ".txt", texte.getvalue())
+            ecrits += [base + ".pstats", base + ".txt"]
+        else:
+            self._echantillonneur.arreter()
+            self._ecrire(base + ".folded", self._echantillonneur.replier())
+            self._ecrire(base + ".txt", self._echantillonneur.resume(self.nb_top))
+            ecrits += [base + ".folded", base + ".txt"]
+        if self.memoire:
+            self._ecrire(base + "-memoire.txt", self.rapport_memoire())
+            ecrits.append(base + "-memoire.txt")
+        return ecrits
+
+    def rapport_memoire(self) -> str:
+        """Plus grosses allocations vivantes en fin de session, puis bilan de chaque étape."""
+        if not self._instantanes:
+            return "Aucun instantané mémoire.\n"
+        import tracemalloc
+
+        filtres = (tracemalloc.Filter(False, tracemalloc.__file__),
+                   tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"))
+        instantanes = [(nom, t, instantane.filter_traces(filtres)) for nom, t, instantane in self._instantanes]
+
+        _, _, final = instantanes[-1]
+        total = sum(stat.size for stat in final.statistics("filename"))
+        lignes = [f"Allocations vivantes en fin de session : {total / 1024:.1f} Kio", ""]
+        lignes += [f"{stat.size / 1024:10.1f} Kio {stat.count:8d} blocs  {stat.traceback}"
+                   for stat in final.statistics("lineno")[:self.nb_top]]
+
+        for (nom, debut, avant), (_, fin, apres) in zip(instantanes, instantanes[1:]):
+            ecarts = [e for e in apres.compare_to(avant, "lineno") if e.size_diff]
+            bilan = sum(e.size_diff for e in ecarts)
+            lignes += ["", f"--- {nom} ({fin - debut:.2f} s) : {bilan / 1024:+.1f} Kio"]
+            lignes += [f"{e.size_diff / 1024:+10.1f} Kio {e.count_diff:+8d} blocs  {e.traceback}"
+                       for e in sorted(ecarts, key=lambda e: -abs(e.size_diff))[:10]]
+        return "\n".join(lignes) + "\n"
+
+    @staticmethod
+    def _ecrire(chemin: str, texte: str):
+        with open(chemin, "w", encoding="utf-8") as f:
+            f.write(texte)
+
+
+# Profileur actif, None hors mode profilage
+_profileur: Optional[Profileur] = None
+
+
+def repere(nom: str):
+    """Frontière de menu : instantané mémoire si le profilage mémoire est actif."""
+    if _profileur is not None:
+        _profileur.repere(nom)
+
+
+def lire_options(argv: list) -> tuple:
+    """
+    Sépare les options de profilage des autres arguments (commande batch).
+
+    return: (options argparse ou None sans option de profilage, arguments restants)
+    """
+    if not any(argument.startswith("--profil") for argument in argv):
+        return None, argv
+    import argparse
+
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    parser.add_argument("--profil", choices=MODES)
+    parser.add_argument("--profil-dossier", default="profils")
+    parser.add_argument("--profil-memoire", action="store_true")
+    parser.add_argument("--profil-intervalle", type=float, default=0.005,
+                        help="période d'échantillonnage en secondes")
+    return parser.parse_known_args(argv)
+
+
+def demarrer_profilage(options) -> Optional[Profileur]:
+    """Démarre le profileur demandé par les options (None si aucun)."""
+    global _profileur
+    if options is None or not (options.profil or options.profil_memoire):
+        return None
+    _profileur = Profileur(options.profil or "echantillonnage", options.profil_dossier,
+                           options.profil_memoire, options.profil_intervalle)
+    _profileur.demarrer()
+    return _profileur
+
+
+def arreter_profilage():
+    """Arrête le profileur actif et indique sur stderr les rapports écrits."""
+    global _profileur
+    if _profileur is None:
+        return
+    profileur, _profileur = _profileur, None
+    for chemin in profileur.arreter():
+        print(f"Profil écrit : {chemin}", file=sys.stderr)
@@ -1,13 +1,22 @@
+from threading import Lock
+
+
 class Singleton(type):
     """
     Toutes les classes qui hériteront de Singleton n'auront qu'une seule et unique instance
     -> https://refactoring.guru/fr/design-patterns/singleton
+
+    La création est protégée par un verrou : plusieurs threads qui demandent
+    l'instance en même temps (ex. DBConnection) n'en construisent qu'une seule.
     """
 
     _instances = {}
+    _verrou = Lock()
 
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
-            instance = super().__call__(*args, **kwargs)
-            cls._instances[cls] = instance
-        return cls._instances[cls]
\ No newline at end of file
+            with Singleton._verrou:
+                if cls not in cls._instances:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
+        return cls._instances[cls]
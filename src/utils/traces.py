@@ -0,0 +1,291 @@
+"""
+Traces légères : spans imbriqués propagés par contextvars.
+
+Un span mesure une étape (méthode de service ou de DAO, requête SQL, appel HTTP)
+et garde son parent : un parcours lent (inscription, connexion...) se lit de bout
+en bout, étape par étape.
+
+    with span("inscription.valider", id_event=3):
+        ...
+
+    @trace()
+    def generer_code_reservation(self): ...
+
+Sans activation, span() ne coûte qu'un test. `activer_traces()` (appelé par les
+points d'entrée quand TRACE_TAUX > 0) instrumente les méthodes publiques des
+services et des DAO et échantillonne les parcours : la décision est prise sur le
+span racine et s'applique à toute la trace.
+
+Les traces terminées sont écrites par un thread de fond :
+    TRACE_TAUX      part des parcours tracés, de 0 à 1 (0 : désactivé)
+    TRACE_FICHIER   fichier de sortie (traces.jsonl ou traces.json par défaut)
+    TRACE_FORMAT    jsonl (un span par ligne) ou chrome (chrome://tracing, Perfetto)
+"""
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+FORMATS = ("jsonl", "chrome")
+
+
+class Span:
+    """Étape mesurée d'une trace."""
+
+    __slots__ = ("nom", "trace_id", "id", "parent_id", "attributs", "debut", "duree",
+                 "thread", "racine", "termines", "_debut_perf")
+
+    def __init__(self, nom: str, attributs: dict, parent: "Span" = None):
+        self.nom = nom
+        self.id = os.urandom(4).hex()
+        self.attributs = attributs
+        if parent is None:
+            self.trace_id, self.parent_id, self.racine = os.urandom(8).hex(), None, self
+            # Spans terminés de la trace, exportés ensemble à la fin de la racine
+            self.termines = []
+        else:
+            self.trace_id, self.parent_id, self.racine = parent.trace_id, parent.id, parent.racine
+            self.termines = None
+        self.debut = time.time()
+        self.duree = None
+        self.thread = threading.get_ident()
+        self._debut_perf = time.perf_counter()
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.id,
+            "parent_id": self.parent_id,
+            "nom": self.nom,
+            "debut": self.debut,
+            "duree_ms": round(self.duree * 1000, 3),
+            "thread": self.thread,
+            "attributs": self.attributs,
+        }
+
+    def to_chrome(self) -> dict:
+        """Événement complet ("X") du format Trace Event de Chrome."""
+        return {
+            "name": self.nom,
+            "ph": "X",
+            "ts": round(self.debut * 1e6),
+            "dur": round(self.duree * 1e6),
+            "pid": os.getpid(),
+            "tid": self.thread,
+            "args": {"trace_id": self.trace_id, "span_id": self.id, **self.attributs},
+        }
+
+
+# Span courant ; NON_ECHANTILLONNE marque une trace écartée par l'échantillonnage
+NON_ECHANTILLONNE = object()
+_span_courant = contextvars.ContextVar("span_courant", default=None)
+
+
+class ExportateurTraces:
+    """Écrit les traces terminées depuis un thread de fond (aucune écriture sur l'appelant)."""
+
+    def __init__(self, chemin: str, format: str = "jsonl"):
+        if format not in FORMATS:
+            raise ValueError(f"Format de trace inconnu : '{format}' ({', '.join(FORMATS)})")
+        self.chemin = chemin
+        self.format = format
+        self._file = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._ecrire, name="traces", daemon=True)
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        if format == "chrome":
+            # Tableau JSON laissé ouvert : format accepté par chrome://tracing et Perfetto,
+            # un programme interrompu laisse un fichier lisible
+            with open(chemin, "w", encoding="utf-8") as f:
+                f.write("[\n")
+        self._thread.start()
+
+    def exporter(self, spans: list):
+        self._file.put(spans)
+
+    def arreter(self):
+        self._file.put(None)
+        self._thread.join(timeout=5)
+
+    def _ecrire(self):
+        while True:
+            spans = self._file.get()
+            if spans is None:
+                return
+            with open(self.chemin, "a", encoding="utf-8") as f:
+                for s in spans:
+                    if self.format == "chrome":
+                        f.write(json.dumps(s.to_chrome(), ensure_ascii=False, default=str) + ",\n")
+                    else:
+                        f.write(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+class Traceur:
+    """Décide de l'échantillonnage et transmet les traces terminées à l'exportateur."""
+
+    def __init__(self, taux: float, exportateur):
+        self.taux = taux
+        self.exportateur = exportateur
+
+    @contextmanager
+    def span(self, nom: str, **attributs):
+        parent = _span_courant.get()
+        if parent is NON_ECHANTILLONNE:
+            yield None
+            return
+        if parent is None and random.random() >= self.taux:
+            # Trace écartée : ses spans enfants ne coûtent plus qu'une lecture du contexte
+            jeton = _span_courant.set(NON_ECHANTILLONNE)
+            try:
+                yield None
+            finally:
+                _span_courant.reset(jeton)
+            return
+
+        courant = Span(nom, attributs, parent)
+        jeton = _span_courant.set(courant)
+        try:
+            yield courant
+        except BaseException as e:
+            courant.attributs["erreur"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            courant.duree = time.perf_counter() - courant._debut_perf
+            _span_courant.reset(jeton)
+            courant.racine.termines.append(courant)
+            if parent is None:
+                self.exportateur.exporter(courant.termines)
+
+
+# Traceur actif, None tant qu'un point d'entrée n'a pas activé les traces
+_traceur: Optional[Traceur] = None
+
+
+@contextmanager
+def _span_inactif():
+    yield None
+
+
+def span(nom: str, **attributs):
+    """Ouvre un span enfant du span courant (ou la racine d'une nouvelle trace)."""
+    if _traceur is None:
+        return _span_inactif()
+    return _traceur.span(nom, **attributs)
+
+
+def trace(nom: str = None):
+    """Décorateur : exécute la fonction dans un span (nom qualifié par défaut)."""
+
+    def decorateur(fonction):
+        nom_span = nom or fonction.__qualname__
+
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            if _traceur is None:
+                return fonction(*args, **kwargs)
+            with _traceur.span(nom_span):
+                return fonction(*args, **kwargs)
+
+        enveloppe.__trace__ = True
+        return enveloppe
+
+    return decorateur
+
+
+def _instrumentable(fonction) -> bool:
+    """
+    Fonction synchrone ordinaire, pas encore tracée. Les générateurs sont exclus :
+    leur span se fermerait à la création du générateur (0 ms), avant le travail
+    fait pendant l'itération (par exemple RappelDAO.parcourir_a_envoyer).
+    """
+    return (inspect.isfunction(fonction)
+            and not getattr(fonction, "__trace__", False)
+            and not inspect.iscoroutinefunction(fonction)
+            and not inspect.isgeneratorfunction(fonction)
+            and not inspect.isasyncgenfunction(fonction))
+
+
+def instrumenter(classe) -> type:
+    """
+    Enveloppe dans un span chaque méthode publique définie par la classe
+    (les méthodes héritées, privées, asynchrones, génératrices et déjà tracées
+    sont laissées telles quelles).
+    """
+    for nom, attribut in list(vars(classe).items()):
+        if nom.startswith("_"):
+            continue
+        if isinstance(attribut, staticmethod):
+            if _instrumentable(attribut.__func__):
+                setattr(classe, nom, staticmethod(trace(f"{classe.__name__}.{nom}")(attribut.__func__)))
+        elif _instrumentable(attribut):
+            setattr(classe, nom, trace(f"{classe.__name__}.{nom}")(attribut))
+    return classe
+
+
+def propager(fonction):
+    """
+    Lie `fonction` au contexte courant, pour qu'un pool de threads l'exécute dans
+    la trace de l'appelant (les executors ne copient pas les contextvars).
+    """
+    return functools.partial(contextvars.copy_context().run, fonction)
+
+
+# Classes instrumentées par activer_traces() : couches service et DAO
+CLASSES_TRACEES = (
+    ("service.bus_service", "BusService"),
+    ("service.evenement_service", "EvenementService"),
+    ("service.inscription_service", "InscriptionService"),
+    ("service.rappel_service", "RappelService"),
+    ("service.utilisateur_service", "UtilisateurService"),
+    ("dao.bus_dao", "BusDAO"),
+    ("dao.evenement_dao", "EvenementDAO"),
+    ("dao.inscription_dao", "InscriptionDAO"),
+    ("dao.liste_attente_dao", "ListeAttenteDAO"),
+    ("dao.rappel_dao", "RappelDAO"),
+    ("dao.utilisateur_dao", "UtilisateurDAO"),
+)
+
+
+def activer_traces(taux: float = None, chemin: str = None, format: str = None) -> Optional[Traceur]:
+    """
+    Active les traces d'après la configuration (TRACE_TAUX, TRACE_FICHIER, TRACE_FORMAT)
+    et instrumente les services et les DAO. Sans taux positif, ne fait rien.
+
+    return: le traceur actif, None si les traces sont désactivées
+    """
+    global _traceur
+    if _traceur is not None:
+        return _traceur
+    taux = float(os.environ.get("TRACE_TAUX", 0)) if taux is None else taux
+    if taux <= 0:
+        return None
+    format = (format or os.environ.get("TRACE_FORMAT", "jsonl")).lower()
+    chemin = chemin or os.environ.get(
+        "TRACE_FICHIER", "traces.json" if format == "chrome" else "traces.jsonl")
+
+    import importlib
+
+    for module, nom in CLASSES_TRACEES:
+        instrumenter(getattr(importlib.import_module(module), nom))
+
+    exportateur = ExportateurTraces(chemin, format)
+    atexit.register(exportateur.arreter)
+    _traceur = Traceur(min(taux, 1.0), exportateur)
+    return _traceur
+
+
+def desactiver_traces():
+    """Arrête l'export (les méthodes instrumentées redeviennent quasi gratuites)."""
+    global _traceur
+    if _traceur is not None:
+        _traceur.exportateur.arreter()
+        _traceur = None
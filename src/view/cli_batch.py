@@ -0,0 +1,359 @@
+"""
+Interface en ligne de commande non interactive pour les opérations d'administration.
+
+Chaque service est exposé sous forme de sous-commande, ce qui permet de scripter
+les tâches répétitives :
+
+    python src/main.py events list --statut en_cours --format csv
+    python src/main.py events create --from evenements.json --jobs 4
+    python src/main.py events broadcast --event 3 --message "Départ avancé à 19h"
+    python src/main.py buses create --from bus.csv --jobs 8
+    python src/main.py registrations export --event 3 --output inscrits.csv --format csv
+    python src/main.py status refresh --jobs 8
+    python src/main.py counters check --fix
+    python src/main.py reminders send --date 2026-11-20
+
+Les fichiers d'entrée sont en JSON (liste d'objets) ou en CSV (une ligne d'en-tête).
+Les messages des services sont redirigés vers stderr : stdout ne contient que le résultat.
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from datetime import date, datetime
+from utils.traces import propager, span
+
+
+def lire_fichier(chemin: str) -> list[dict]:
+    """Lit une liste d'enregistrements depuis un fichier JSON ou CSV."""
+    with open(chemin, encoding="utf-8", newline="") as f:
+        if chemin.lower().endswith(".csv"):
+            return [dict(ligne) for ligne in csv.DictReader(f)]
+        donnees = json.load(f)
+    return donnees if isinstance(donnees, list) else [donnees]
+
+
+def ecrire(lignes: list[dict], format_sortie: str, sortie):
+    """Écrit les résultats en JSON ou en CSV."""
+    if format_sortie == "csv":
+        colonnes = list(dict.fromkeys(cle for ligne in lignes for cle in ligne))
+        writer = csv.DictWriter(sortie, fieldnames=colonnes)
+        writer.writeheader()
+        writer.writerows(lignes)
+    else:
+        json.dump(lignes, sortie, indent=2, ensure_ascii=False, default=str)
+        sortie.write("\n")
+
+
+def executer_en_parallele(operation, elements: list, jobs: int) -> list:
+    """
+    Applique une opération indépendante à chaque élément, sur un pool de `jobs` workers.
+    L'ordre des résultats suit celui des éléments.
+    """
+    if jobs <= 1 or len(elements) <= 1:
+        return [operation(element) for element in elements]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        # Chaque opération s'exécute dans la trace de la commande
+        taches = [executor.submit(propager(operation), element) for element in elements]
+        return [tache.result() for tache in taches]
+
+
+# ==========================================================================
+# Commandes
+# ==========================================================================
+
+def _resultat(entree: dict, objet, erreur: str = None) -> dict:
+    """Ligne de résultat pour une création : l'objet créé ou l'erreur rencontrée."""
+    if objet is not None:
+        return {"resultat": "ok", **objet.to_dict()}
+    return {"resultat": "erreur", "erreur": erreur or "création refusée", **entree}
+
+
+def cmd_events_list(services, args) -> list[dict]:
+    if args.statut:
+        evenements = services["evenement"].get_evenement_by("statut", args.statut)
+    else:
+        evenements = services["evenement"].get_tous_les_evenement()
+    return [evt.to_dict() for evt in evenements]
+
+
+def cmd_events_create(services, args) -> list[dict]:
+    def creer(entree: dict) -> dict:
+        try:
+            evenement = services["evenement"].creer_evenement(
+                titre=entree.get("titre", ""),
+                lieu=entree.get("lieu", ""),
+                date_event=date.fromisoformat(str(entree["date_event"])),
+                capacite_max=int(entree["capacite_max"]),
+                description_event=entree.get("description_event", ""),
+                tarif=float(entree.get("tarif") or 0),
+                created_by=int(entree.get("created_by") or args.created_by),
+            )
+            return _resultat(entree, evenement)
+        except (KeyError, TypeError, ValueError) as e:
+            return _resultat(entree, None, f"entrée invalide : {e}")
+
+    return executer_en_parallele(creer, lire_fichier(args.fichier), args.jobs)
+
+
+def cmd_events_broadcast(services, args) -> list[dict]:
+    from service.diffusion import progression_diffusion
+
+    id_diffusion = services["evenement"].diffuser_message(args.event, args.message)
+    if id_diffusion is None:
+        return [{"id_event": args.event, "resultat": "erreur", "erreur": "diffusion impossible"}]
+    if args.no_wait:
+        return [{"id_event": args.event, "id_diffusion": id_diffusion, "resultat": "ok",
+                 **progression_diffusion(id_diffusion)}]
+
+    # Suivi sur stderr jusqu'à la fin de l'envoi
+    while True:
+        etat = progression_diffusion(id_diffusion)
+        print(f"{etat['traites']}/{etat['total']} traité(s), {etat['echecs']} échec(s)")
+        if etat["statut"] == "termine":
+            break
+        time.sleep(args.interval)
+    return [{**etat, "resultat": "ok" if etat["echecs"] == 0 else "erreur"}]
+
+
+def cmd_buses_list(services, args) -> list[dict]:
+    if args.event:
+        bus = services["bus"].get_bus_by("id_event", args.event) or []
+    else:
+        bus = services["bus"].get_tous_les_bus()
+    return [b.to_dict() for b in bus]
+
+
+def cmd_buses_create(services, args) -> list[dict]:
+    def creer(entree: dict) -> dict:
+        try:
+            bus = services["bus"].creer_bus(
+                id_event=int(entree["id_event"]),
+                sens=entree["sens"],
+                description=entree.get("description", ""),
+                heure_depart=datetime.strptime(str(entree["heure_depart"])[:5], "%H:%M").time(),
+                capacite_max=int(entree["capacite_max"]),
+            )
+            return _resultat(entree, bus)
+        except (KeyError, TypeError, ValueError) as e:
+            return _resultat(entree, None, f"entrée invalide : {e}")
+
+    return executer_en_parallele(creer, lire_fichier(args.fichier), args.jobs)
+
+
+def cmd_buses_plan(services, args) -> list[dict]:
+    besoins = services["bus"].planifier_flotte(
+        args.capacity, fenetre_jours=args.window, id_event=args.event)
+    if not args.create:
+        return besoins
+
+    def heure(valeur: str):
+        return datetime.strptime(valeur, "%H:%M").time() if valeur else None
+
+    bus = services["bus"].creer_flotte(
+        besoins, args.capacity, heure(args.heure_aller), heure(args.heure_retour))
+    a_creer = sum(ligne["a_creer_aller"] + ligne["a_creer_retour"] for ligne in besoins)
+    resultat = "ok" if len(bus) == a_creer else "erreur"
+    return [{**ligne, "resultat": resultat} for ligne in besoins]
+
+
+def cmd_buses_schedule(services, args) -> list[dict]:
+    jour = date.fromisoformat(args.date)
+    conflits = {ligne["id_bus"]: ligne["conflits"] for ligne in services["bus"].conflits_horaires(jour)}
+    lignes = []
+    for numero, bus in enumerate(services["bus"].planning_vehicules(jour), start=1):
+        for id_bus in bus:
+            ligne = {"vehicule": numero, "id_bus": id_bus, "resultat": "ok"}
+            if id_bus in conflits:
+                ligne.update(resultat="erreur", erreur="chevauchement",
+                             conflits=" ".join(map(str, conflits[id_bus])))
+            lignes.append(ligne)
+    return lignes
+
+
+def cmd_registrations_export(services, args) -> list[dict]:
+    if args.event:
+        inscriptions = services["inscription"].get_inscription_by("id_event", args.event)
+    else:
+        inscriptions = services["inscription"].lister_toutes_inscriptions()
+    return [ins.to_dict() for ins in inscriptions]
+
+
+def cmd_status_refresh(services, args) -> list[dict]:
+    if args.event:
+        ids = [args.event]
+    else:
+        ids = [evt.id_event for evt in services["evenement"].get_tous_les_evenement()]
+
+    def rafraichir(id_event: int) -> dict:
+        ok = services["evenement"].modifier_statut(id_event)
+        statut = services["evenement"].get_evenement_by("id_event", id_event)
+        return {
+            "id_event": id_event,
+            "resultat": "ok" if ok else "erreur",
+            "statut": statut[0].statut if statut else None,
+        }
+
+    return executer_en_parallele(rafraichir, ids, args.jobs)
+
+
+def cmd_counters_check(services, args) -> list[dict]:
+    ecarts = services["evenement"].verifier_compteurs(corriger=args.fix)
+    return [
+        {
+            **ecart,
+            "resultat": "corrige" if args.fix else "erreur",
+            **({} if args.fix else {"erreur": "compteur désynchronisé"}),
+        }
+        for ecart in ecarts
+    ]
+
+
+def cmd_reminders_send(services, args) -> list[dict]:
+    jour = date.fromisoformat(args.date) if args.date else None
+    rapport = services["rappel"].envoyer_rappels(jour, taille_paquet=args.batch_size)
+    return [{**rapport, "resultat": "ok" if rapport["echecs"] == 0 else "erreur"}]
+
+
+# ==========================================================================
+# Analyse des arguments
+# ==========================================================================
+
+def construire_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur d'arguments et ses sous-commandes."""
+    commun = argparse.ArgumentParser(add_help=False)
+    commun.add_argument("--format", choices=["json", "csv"], default="json",
+                        help="format de sortie (json par défaut)")
+    commun.add_argument("--output", help="fichier de sortie (stdout par défaut)")
+    commun.add_argument("--jobs", type=int, default=1,
+                        help="nombre d'opérations indépendantes exécutées en parallèle")
+
+    parser = argparse.ArgumentParser(prog="main.py", description="Administration en mode batch")
+    ressources = parser.add_subparsers(dest="ressource", required=True)
+
+    events = ressources.add_parser("events", help="événements").add_subparsers(
+        dest="action", required=True)
+    p = events.add_parser("list", parents=[commun], help="lister les événements")
+    p.add_argument("--statut", choices=["en_cours", "passe", "complet"])
+    p.set_defaults(commande=cmd_events_list)
+    p = events.add_parser("create", parents=[commun], help="créer des événements depuis un fichier")
+    p.add_argument("--from", dest="fichier", required=True, help="fichier JSON ou CSV")
+    p.add_argument("--created-by", type=int,
+                   help="ID du créateur si absent du fichier")
+    p.set_defaults(commande=cmd_events_create)
+
+    p = events.add_parser("broadcast", parents=[commun],
+                          help="envoyer un message à tous les inscrits d'un événement")
+    p.add_argument("--event", type=int, required=True, help="identifiant de l'événement")
+    p.add_argument("--message", required=True, help="texte de l'annonce")
+    p.add_argument("--no-wait", action="store_true", help="rendre la main sans attendre la fin de l'envoi")
+    p.add_argument("--interval", type=float, default=1.0, help="période du suivi (s)")
+    p.set_defaults(commande=cmd_events_broadcast)
+
+    buses = ressources.add_parser("buses", help="bus").add_subparsers(dest="action", required=True)
+    p = buses.add_parser("list", parents=[commun], help="lister les bus")
+    p.add_argument("--event", type=int, help="ID de l'événement")
+    p.set_defaults(commande=cmd_buses_list)
+    p = buses.add_parser("create", parents=[commun], help="créer des bus depuis un fichier")
+    p.add_argument("--from", dest="fichier", required=True, help="fichier JSON ou CSV")
+    p.set_defaults(commande=cmd_buses_create)
+    p = buses.add_parser("plan", parents=[commun],
+                         help="estimer (et créer) les bus nécessaires aux événements en cours")
+    p.add_argument("--capacity", type=int, required=True, help="capacité d'un véhicule")
+    p.add_argument("--window", type=int, default=7,
+                   help="jours pris en compte pour le rythme d'inscription (7 par défaut)")
+    p.add_argument("--event", type=int, help="ID de l'événement (tous les événements en cours par défaut)")
+    p.add_argument("--create", action="store_true", help="créer les bus manquants")
+    p.add_argument("--heure-aller", help="heure de départ des bus aller créés (HH:MM)")
+    p.add_argument("--heure-retour", help="heure de départ des bus retour créés (HH:MM)")
+    p.set_defaults(commande=cmd_buses_plan)
+    p = buses.add_parser("schedule", parents=[commun],
+                         help="planning minimal des véhicules et chevauchements d'une date")
+    p.add_argument("--date", required=True, help="date des départs (AAAA-MM-JJ)")
+    p.set_defaults(commande=cmd_buses_schedule)
+
+    registrations = ressources.add_parser("registrations", help="inscriptions").add_subparsers(
+        dest="action", required=True)
+    p = registrations.add_parser("export", parents=[commun], help="exporter les inscriptions")
+    p.add_argument("--event", type=int, help="ID de l'événement")
+    p.set_defaults(commande=cmd_registrations_export)
+
+    status = ressources.add_parser("status", help="statuts des événements").add_subparsers(
+        dest="action", required=True)
+    p = status.add_parser("refresh", parents=[commun], help="recalculer les statuts")
+    p.add_argument("--event", type=int, help="ID de l'événement (tous par défaut)")
+    p.set_defaults(commande=cmd_status_refresh)
+
+    counters = ressources.add_parser("counters", help="compteurs d'inscrits").add_subparsers(
+        dest="action", required=True)
+    p = counters.add_parser("check", parents=[commun],
+                            help="recalculer les compteurs et signaler les écarts")
+    p.add_argument("--fix", action="store_true", help="corriger les compteurs désynchronisés")
+    p.set_defaults(commande=cmd_counters_check)
+
+    reminders = ressources.add_parser("reminders", help="rappels par e-mail").add_subparsers(
+        dest="action", required=True)
+    p = reminders.add_parser("send", parents=[commun],
+                             help="envoyer les rappels de la veille (à planifier chaque jour)")
+    p.add_argument("--date", help="date des événements (YYYY-MM-DD, demain par défaut)")
+    p.add_argument("--batch-size", type=int, default=1000, help="inscrits lus et envoyés par paquet")
+    p.set_defaults(commande=cmd_reminders_send)
+
+    return parser
+
+
+def construire_services() -> dict:
+    """Instancie les services nécessaires aux commandes."""
+    from dao.bus_dao import BusDAO
+    from dao.evenement_dao import EvenementDAO
+    from dao.inscription_dao import InscriptionDAO
+    from dao.utilisateur_dao import UtilisateurDAO
+    from service.bus_service import BusService
+    from service.catalogue_service import activer_rafraichissement
+    from service.diffusion import activer_diffusion
+    from service.evenement_service import EvenementService
+    from service.inscription_service import InscriptionService
+    from service.rappel_service import RappelService
+    from utils.journal import configurer_journal
+    from utils.metriques import exposer_metriques
+    from utils.traces import activer_traces
+
+    configurer_journal()
+    exposer_metriques()
+    activer_traces()
+    # Un seul rafraîchissement du catalogue pour toutes les créations d'un lot
+    activer_rafraichissement()
+    activer_diffusion()
+    return {
+        "evenement": EvenementService(EvenementDAO(), InscriptionDAO(), UtilisateurDAO(), BusDAO()),
+        "inscription": InscriptionService(InscriptionDAO(), EvenementDAO(), UtilisateurDAO()),
+        "bus": BusService(),
+        "rappel": RappelService(),
+    }
+
+
+def main(argv=None, services: dict = None) -> int:
+    """
+    Exécute une commande batch.
+
+    return: code de sortie (0 si toutes les opérations ont réussi, 1 sinon)
+    """
+    args = construire_parser().parse_args(argv)
+
+    # Les messages des services partent sur stderr pour garder stdout exploitable
+    with redirect_stdout(sys.stderr):
+        if services is None:
+            services = construire_services()
+        with span(f"batch.{args.commande.__name__}"):
+            lignes = args.commande(services, args)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            ecrire(lignes, args.format, f)
+    else:
+        ecrire(lignes, args.format, sys.stdout)
+
+    return 1 if any(ligne.get("resultat") == "erreur" for ligne in lignes) else 0
@@ -1,10 +1,11 @@
 """
 Menu principal de l'application.
 Affiche les options de base : création de compte, connexion, quitter.
+Les sous-vues (et les services qu'elles importent) ne sont chargées qu'au choix
+de l'option correspondante, pour que le menu s'affiche le plus tôt possible.
 """
 
-from view.connexion_vue import connexion_terminal
-from view.creer_compte_vue import creer_compte_terminal
+from utils.profilage import repere
 
 
 class MenuPrincipal:
@@ -29,13 +30,18 @@ class MenuPrincipal:
             print("3. Quitter")
 
             choix = input("Choisissez une option : ").strip()
+            repere(f"menu.option{choix}")
 
             if choix == "1":
                 # Vue : création de compte
+                from view.creer_compte_vue import creer_compte_terminal
+
                 creer_compte_terminal(self.service_utilisateur)
 
             elif choix == "2":
                 # Vue : connexion
+                from view.connexion_vue import connexion_terminal
+
                 connexion_terminal(
                     self.service_utilisateur,
                     self.service_evenement,
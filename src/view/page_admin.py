@@ -3,7 +3,9 @@ from service.utilisateur_service import UtilisateurService
 from service.evenement_service import EvenementService
 from service.inscription_service import InscriptionService
 from service.bus_service import BusService
+from service.catalogue_service import CatalogueService
 from business_object.bus import Bus
+from utils.profilage import repere
 
 
 def page_admin(utilisateur, evenement_service: EvenementService, inscription_service: InscriptionService):
@@ -13,6 +15,7 @@ def page_admin(utilisateur, evenement_service: EvenementService, inscription_ser
     """
     bus_service = BusService()
     utilisateur_service = UtilisateurService()
+    catalogue_service = CatalogueService()
 
     while True:
         print("\n=== Espace Admin ===")
@@ -22,23 +25,23 @@ def page_admin(utilisateur, evenement_service: EvenementService, inscription_ser
         print("4. Supprimer un événement")
         print("5. Voir les inscrits à un événement")
         print("6. Déconnexion")
+        print("7. Modifier la capacité d'un événement")
+        print("8. Affecter les inscrits aux bus")
+        print("9. Planifier la flotte de bus")
+        print("10. Supprimer un bus")
+        print("11. Envoyer un message aux inscrits d'un événement")
         choix = input("Choisissez une option : ").strip()
+        repere(f"admin.option{choix}")
 
         # ---- OPTION 1 : Liste des événements ----
         if choix == "1":
-            evenements = evenement_service.get_evenement_by("statut", "en_cours")
+            evenements = catalogue_service.lister_catalogue()
             if not evenements:
                 print("Aucun événement disponible pour le moment.")
             else:
                 print("\nÉvénements disponibles :")
                 for evt in evenements:
-                    places_restantes = (
-                        evt.capacite_max - len(inscription_service.get_inscription_by("id_event", evt.id_event))
-                    )
-                    print(
-                        f"- ID: {evt.id_event}, Titre: {evt.titre}, Lieu: {evt.lieu}, "
-                        f"Date: {evt.date_event}, Places restantes: {places_restantes}"
-                    )
+                    print(evt)
 
         # ---- OPTION 2 : Création d’un nouvel événement ----
         elif choix == "2":
@@ -225,7 +228,120 @@ def page_admin(utilisateur, evenement_service: EvenementService, inscription_ser
                     # Cas improbable mais propre
                     print(f"- Utilisateur inconnu (ID: {ins.created_by})")
 
+        # ---- OPTION 7 : Modifier la capacité (promotion de la liste d'attente) ----
+        elif choix == "7":
+            print("\n=== Modification de la capacité d'un événement ===")
+            try:
+                id_event = int(input("ID de l'événement : ").strip())
+                capacite_max = int(input("Nouvelle capacité maximale : ").strip())
+            except ValueError:
+                print("❌ Valeur invalide.")
+                continue
+
+            if evenement_service.modifier_capacite(id_event, capacite_max):
+                print("✅ Capacité modifiée.")
+            else:
+                print("❌ La modification a échoué.")
+
+        # ---- OPTION 8 : Affectation automatique des bus ----
+        elif choix == "8":
+            print("\n=== Affectation des inscrits aux bus ===")
+            try:
+                id_event = int(input("ID de l'événement : ").strip())
+            except ValueError:
+                print("❌ Valeur invalide.")
+                continue
+            reequilibrer = input("Réaffecter aussi les inscrits déjà placés ? (o/n) : ").strip().lower() == "o"
+
+            rapport = bus_service.affecter_bus(id_event, reequilibrer=reequilibrer)
+            if rapport is None:
+                print("❌ L'affectation a échoué.")
+                continue
+            for sens, resultat in rapport.items():
+                print(f"{sens} : {resultat['affectes']} passager(s) affecté(s), "
+                      f"bus utilisés : {resultat['bus_utilises']}")
+                if resultat["non_places"]:
+                    print(f"  ⚠️ Sans place ({len(resultat['non_places'])}) : {resultat['non_places']}")
+
+        # ---- OPTION 9 : Dimensionnement de la flotte ----
+        elif choix == "9":
+            print("\n=== Planification de la flotte de bus ===")
+            try:
+                capacite = int(input("Capacité d'un bus : ").strip())
+            except ValueError:
+                print("❌ Valeur invalide.")
+                continue
+
+            besoins = bus_service.planifier_flotte(capacite)
+            if not besoins:
+                print("Aucun événement en cours.")
+                continue
+            for ligne in besoins:
+                print(f"- {ligne['titre']} ({ligne['date_event']}) : {ligne['inscrits']} inscrits, "
+                      f"{ligne['projection']} prévus, "
+                      f"aller {ligne['bus_aller']} bus (+{ligne['a_creer_aller']}), "
+                      f"retour {ligne['bus_retour']} bus (+{ligne['a_creer_retour']})")
+
+            if not any(ligne["a_creer_aller"] or ligne["a_creer_retour"] for ligne in besoins):
+                print("✅ La flotte actuelle suffit.")
+                continue
+            if input("Créer les bus manquants ? (o/n) : ").strip().lower() != "o":
+                continue
+            try:
+                heure_aller = datetime.strptime(input("Heure de départ aller (HH:MM) : ").strip(), "%H:%M").time()
+                heure_retour = datetime.strptime(input("Heure de départ retour (HH:MM) : ").strip(), "%H:%M").time()
+            except ValueError as e:
+                print(f"❌ Erreur dans les données saisies : {e}")
+                continue
+
+            bus_crees = bus_service.creer_flotte(besoins, capacite, heure_aller, heure_retour)
+            if bus_crees:
+                print(f"✅ {len(bus_crees)} bus créés.")
+            else:
+                print("❌ La création des bus a échoué.")
 
+        # ---- OPTION 10 : Suppression d'un bus ----
+        elif choix == "10":
+            print("\n=== Suppression d'un bus ===")
+            try:
+                id_bus = int(input("ID du bus : ").strip())
+            except ValueError:
+                print("❌ Valeur invalide.")
+                continue
+            redistribuer = input("Replacer ses passagers dans les autres bus ? (o/n) : ").strip().lower() == "o"
+
+            if not redistribuer:
+                if bus_service.supprimer_bus(id_bus):
+                    print("✅ Bus supprimé.")
+                else:
+                    print("❌ La suppression a échoué.")
+                continue
+
+            rapport = bus_service.supprimer_bus_et_redistribuer(id_bus)
+            if rapport is None:
+                print("❌ La suppression a échoué.")
+                continue
+            print(f"✅ Bus supprimé, {len(rapport['replaces'])} passager(s) replacé(s).")
+            for passager in rapport["non_places"]:
+                print(f"  ⚠️ Sans bus : {passager['nom']} {passager['prenom']} "
+                      f"(réservation {passager['code_reservation']})")
+
+        # ---- OPTION 11 : Diffusion aux inscrits ----
+        elif choix == "11":
+            print("\n=== Message aux inscrits d'un événement ===")
+            try:
+                id_event = int(input("ID de l'événement : ").strip())
+            except ValueError:
+                print("❌ Valeur invalide.")
+                continue
+            texte = input("Message : ").strip()
+
+            # L'envoi se poursuit en arrière-plan pendant que l'admin continue
+            id_diffusion = evenement_service.diffuser_message(id_event, texte)
+            if id_diffusion:
+                print(f"✅ Envoi en cours (diffusion {id_diffusion}).")
+            else:
+                print("❌ Aucun message envoyé.")
 
         else:
             print("❌ Option invalide, réessayez.")
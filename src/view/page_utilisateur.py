@@ -3,7 +3,9 @@ from service.utilisateur_service import UtilisateurService
 from service.evenement_service import EvenementService
 from service.inscription_service import InscriptionService
 from service.bus_service import BusService
+from service.catalogue_service import CatalogueService
 import getpass
+from utils.profilage import repere
 
 def page_utilisateur(utilisateur, evenement_service: EvenementService, inscription_service: InscriptionService, bus_service: BusService):
     """
@@ -11,6 +13,8 @@ def page_utilisateur(utilisateur, evenement_service: EvenementService, inscripti
     Permet de lister les événements, de s'inscrire, d'annuler une inscription via son code de réservation,
     et de consulter ses inscriptions.
     """
+    catalogue_service = CatalogueService()
+
     while True:
         print("\n=== Espace Utilisateur ===")
         print("1. Voir les événements disponibles")
@@ -18,24 +22,23 @@ def page_utilisateur(utilisateur, evenement_service: EvenementService, inscripti
         print("3. Annuler une inscription")
         print("4. Voir mes inscriptions")
         print("5. Déconnexion")
+        print("6. Inscrire un groupe d'amis")
+        print("7. Transférer une inscription à un ami")
+        print("8. S'inscrire à plusieurs événements")
         choix = input("Choisissez une option : ").strip()
+        repere(f"utilisateur.option{choix}")
 
         # ---------------- Option 1 : Voir les événements ----------------
         if choix == "1":
-            evenements = evenement_service.get_evenement_by("statut", "en_cours")
+            # Catalogue pré-calculé : places et bus par sens en une seule lecture
+            evenements = catalogue_service.lister_catalogue()
             if not evenements:
                 print("Aucun événement disponible pour le moment.")
                 continue
 
             print("\nÉvénements disponibles :")
             for evt in evenements:
-                # Calcul des places restantes
-                inscriptions = inscription_service.get_inscription_by("id_event", evt.id_event)
-                places_restantes = evt.capacite_max - len(inscriptions) if inscriptions else evt.capacite_max
-                print(
-                    f"- ID: {evt.id_event}, Titre: {evt.titre}, Lieu: {evt.lieu}, "
-                    f"Date: {evt.date_event}, Places restantes: {places_restantes}"
-                )
+                print(evt)
 
         # ---------------- Option 2 : S'inscrire ----------------
 
@@ -50,8 +53,7 @@ def page_utilisateur(utilisateur, evenement_service: EvenementService, inscripti
             bus_aller_disponibles = bus_service.get_bus_by("sens", "ALLER")
             if bus_aller_disponibles:
                 for bus in bus_aller_disponibles:
-                    inscriptions_bus_aller = inscription_service.get_inscription_by("id_bus_aller", int(bus.id_bus))
-                    places_restantes = bus.capacite_max - len(inscriptions_bus_aller)
+                    places_restantes = bus.capacite_max - bus.nb_inscrits
                     print(f"- ID: {bus.id_bus}, Places restantes: {places_restantes}")
             else:
                 print("Aucun bus Aller disponible.")
@@ -60,15 +62,14 @@ def page_utilisateur(utilisateur, evenement_service: EvenementService, inscripti
             bus_retour_disponibles = bus_service.get_bus_by("sens", "RETOUR")
             if bus_retour_disponibles:
                 for bus in bus_retour_disponibles:
-                    inscriptions_bus_retour = inscription_service.get_inscription_by("id_bus_retour", int(bus.id_bus))
-                    places_restantes = bus.capacite_max - len(inscriptions_bus_retour)
+                    places_restantes = bus.capacite_max - bus.nb_inscrits
                     print(f"- ID: {bus.id_bus}, Places restantes: {places_restantes}")
             else:
                 print("Aucun bus Retour disponible.")
 
             # 🔹 Saisie des bus
-            id_bus_a = input("Entrez l'ID du bus Aller : ").strip()
-            id_bus_r = input("Entrez l'ID du bus Retour : ").strip()
+            id_bus_a = input("Entrez l'ID du bus Aller (vide = affectation automatique) : ").strip()
+            id_bus_r = input("Entrez l'ID du bus Retour (vide = affectation automatique) : ").strip()
 
             try:
                 id_event_int = int(id_event)
@@ -94,8 +95,7 @@ def page_utilisateur(utilisateur, evenement_service: EvenementService, inscripti
                 if not bus_aller or bus_aller[0].sens != "ALLER":
                     print("❌ Bus Aller invalide.")
                     continue
-                inscriptions_bus_aller = inscription_service.get_inscription_by("id_bus_aller", id_bus_aller_int)
-                if len(inscriptions_bus_aller) >= bus_aller[0].capacite_max:
+                if bus_aller[0].nb_inscrits >= bus_aller[0].capacite_max:
                     print("❌ Bus Aller complet. Inscription impossible.")
                     continue
 
@@ -105,8 +105,7 @@ def page_utilisateur(utilisateur, evenement_service: EvenementService, inscripti
                 if not bus_retour or bus_retour[0].sens != "RETOUR":
                     print("❌ Bus Retour invalide.")
                     continue
-                inscriptions_bus_retour = inscription_service.get_inscription_by("id_bus_retour", id_bus_retour_int)
-                if len(inscriptions_bus_retour) >= bus_retour[0].capacite_max:
+                if bus_retour[0].nb_inscrits >= bus_retour[0].capacite_max:
                     print("❌ Bus Retour complet. Inscription impossible.")
                     continue
 
@@ -126,6 +125,112 @@ def page_utilisateur(utilisateur, evenement_service: EvenementService, inscripti
             else:
                 print("❌ Inscription échouée.")
 
+                # Événement complet : proposition de la liste d'attente
+                evenement_a_jour = evenement_service.get_evenement_by("id_event", id_event_int)
+                if evenement_a_jour and evenement_a_jour[0].nb_inscrits >= evenement_a_jour[0].capacite_max:
+                    reponse = input(
+                        "L'événement est complet. Rejoindre la liste d'attente ? (oui/non) : "
+                    ).strip().lower()
+                    if reponse == "oui":
+                        attente = inscription_service.rejoindre_liste_attente(
+                            boit=boit,
+                            mode_paiement=mode_paiement,
+                            id_event=id_event_int,
+                            id_bus_aller=id_bus_aller_int,
+                            id_bus_retour=id_bus_retour_int,
+                            created_by=utilisateur.id_utilisateur,
+                        )
+                        if attente:
+                            position = inscription_service.position_liste_attente(
+                                id_event_int, utilisateur.id_utilisateur
+                            )
+                            if position:
+                                print(f"⏳ Vous êtes en position {position} sur la liste d'attente. "
+                                      "Vous serez inscrit automatiquement et prévenu par e-mail.")
+                            else:
+                                print("✅ Une place s'est libérée : vous êtes inscrit !")
+
+
+        # ---------------- Option 6 : Inscription de groupe ----------------
+        elif choix == "6":
+            try:
+                id_event_int = int(input("Entrez l'ID de l'événement : ").strip())
+                id_bus_a = input("ID du bus Aller commun (vide = affectation automatique) : ").strip()
+                id_bus_r = input("ID du bus Retour commun (vide = affectation automatique) : ").strip()
+                id_bus_aller_int = int(id_bus_a) if id_bus_a else None
+                id_bus_retour_int = int(id_bus_r) if id_bus_r else None
+            except ValueError:
+                print("❌ ID d'événement ou de bus invalide.")
+                continue
+
+            membres = []
+            inclure_moi = input("Vous inscrire aussi ? (oui/non) : ").strip().lower() == "oui"
+            if inclure_moi:
+                membres.append({"created_by": utilisateur.id_utilisateur})
+            print("E-mails des membres du groupe (ligne vide pour terminer) :")
+            while True:
+                email = input("  E-mail : ").strip().lower()
+                if not email:
+                    break
+                membres.append({"email": email})
+
+            for membre in membres:
+                nom = "vous" if membre.get("created_by") else membre["email"]
+                membre["boit"] = input(f"{nom} consomme de l'alcool ? (oui/non) : ").strip().lower() == "oui"
+                membre["mode_paiement"] = input(f"Mode de paiement pour {nom} (espece/en ligne) : ").strip().lower()
+
+            inscriptions = inscription_service.inscrire_groupe(
+                id_event_int, id_bus_aller_int, id_bus_retour_int, membres
+            )
+            if inscriptions:
+                print(f"✅ Groupe inscrit ({len(inscriptions)} personne(s)).")
+            else:
+                print("❌ Inscription du groupe refusée : personne n'a été inscrit.")
+
+        # ---------------- Option 7 : Transfert d'inscription ----------------
+        elif choix == "7":
+            try:
+                code_reservation = int(input("Code de réservation à transférer : ").strip())
+            except ValueError:
+                print("❌ Code invalide.")
+                continue
+            email = input("E-mail du destinataire : ").strip().lower()
+
+            if inscription_service.transferer_inscription(code_reservation, utilisateur.id_utilisateur, email):
+                print("✅ Inscription transférée.")
+            else:
+                print("❌ Le transfert a échoué.")
+
+        # ---------------- Option 8 : Inscription à plusieurs événements ----------------
+        elif choix == "8":
+            print("Pour chaque événement : ID, bus aller et bus retour séparés par des espaces")
+            print("(bus vide ou 0 = affectation automatique), ligne vide pour terminer.")
+            selection = []
+            while True:
+                ligne = input("  Événement bus_aller bus_retour : ").strip()
+                if not ligne:
+                    break
+                try:
+                    valeurs = [int(v) for v in ligne.split()] + [0, 0]
+                except ValueError:
+                    print("❌ Valeurs invalides, ligne ignorée.")
+                    continue
+                selection.append((valeurs[0], valeurs[1] or None, valeurs[2] or None))
+            if not selection:
+                continue
+
+            boit = input("Consommez-vous de l'alcool ? (oui/non) : ").strip().lower() == "oui"
+            mode_paiement = input("Mode de paiement (espece/en ligne) : ").strip().lower()
+            tout_ou_rien = input("Annuler tout si un événement est impossible ? (oui/non) : ").strip().lower() != "non"
+
+            resultat = inscription_service.inscrire_plusieurs_evenements(
+                utilisateur.id_utilisateur, selection, boit, mode_paiement, tout_ou_rien
+            )
+            if resultat and resultat["inscriptions"]:
+                for inscription in resultat["inscriptions"]:
+                    print(f"✅ {inscription}")
+            else:
+                print("❌ Aucune inscription n'a été créée.")
 
         # ---------------- Option 5 : Déconnexion ----------------
         elif choix == "5":